@@ -10,37 +10,37 @@ Uses direct database access via pblib functions (no HTTP API dependency).
 
 import sys
 import time
+import json
 import datetime
 import threading
+import unicodedata
 import queue
 import gc
 import resource
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set
 
 # Explicit imports instead of wildcard
 from pblib import (
-    debug_log, config, configstruct, refresh_config,
-    create_db_connection,
-    get_solver_by_name_from_db, get_solver_by_id_from_db,
-    get_last_sheet_activity_for_puzzle, get_last_activity_for_puzzle,
+    debug_log, config, configstruct, maybe_refresh_config,
+    create_db_connection, acquire_read_connection,
+    get_solver_ids, get_solver_by_id_from_db,
+    get_last_sheet_activity_for_puzzle,
     log_activity, assign_solver_to_puzzle, update_puzzle_field,
-    update_botstat, get_all_rounds_with_puzzles,
+    update_botstat, get_all_rounds_with_puzzles, get_last_activity_times,
+    prune_change_log, get_bot_state, set_bot_state,
 )
 from pbgooglelib import (
     get_puzzle_sheet_info_activity,
     get_puzzle_sheet_info_legacy,
     repair_activity_sheet,
     get_quota_failure_count,
+    get_drive_changes_start_token,
+    list_drive_changes,
     initdrive,
 )
 import pblib
 
 # Module-level constants and state
-EXIT_FLAG = 0
-QUEUE_LOCK = threading.Lock()
-WORK_QUEUE = queue.Queue(300)
-THREAD_COUNTER = 0
-THREADS = []
 LOOP_ITERATIONS_TOTAL = 0
 
 # Track consecutive _pb_activity failures per drive_id for skip/repair logic
@@ -48,6 +48,15 @@ _sheet_failure_counts: Dict[str, int] = {}
 _REPAIR_AFTER_FAILURES = 3      # Attempt repair after this many consecutive failures
 _SKIP_AFTER_FAILURES = 6        # Stop trying entirely after this many (repair failed)
 
+# Per drive_id, how far the bot has read an append-style _pb_activity sheet:
+# {"row": last consumed sheet row, "anchor": that row's [editor, timestamp]},
+# or None for sheets read whole. Mirrored in bot_state across restarts.
+_activity_cursors: Dict[str, Optional[Dict[str, Any]]] = {}
+_ACTIVITY_CURSOR_KEY = "pb_activity_cursor:{}"
+
+# Per puzzle id, Unix time of the newest recorded sheet edit (see _get_sheet_watermark)
+_sheet_watermarks: Dict[int, float] = {}
+
 
 # ── Database Connection ───────────────────────────────────────────────
 
@@ -81,10 +90,92 @@ def _get_db_connection():
 
 # ── Solver Lookup ───────────────────────────────────────────────────────
 
+SOLVER_MISS_TTL_SECONDS = 60             # an unknown name is not looked up again for this long
+SOLVER_DIRECTORY_RELOAD_SECONDS = 600    # full reload, to drop renamed or deleted solvers
+
+
+def _solver_key(name: str) -> str:
+    """Comparison key for a solver name. Approximates the solver.name
+    column's utf8mb4_unicode_ci collation, which the per-edit
+    `WHERE name = %s` lookup matched under: case- and accent-insensitive,
+    trailing spaces ignored."""
+    decomposed = unicodedata.normalize("NFKD", name.rstrip(" "))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class SolverDirectory:
+    """In-memory solver username -> id map for attributing sheet edits.
+
+    Keyed by _solver_key, so a name matches here exactly when the database
+    would match it. There is no email index: the solver table stores no
+    email, and an edit's email address is matched by its local part (see
+    _get_solver_id), as it always was.
+
+    Loaded whole on first use. A name that misses tops it up with solvers
+    added since (ids above the highest known); a name still unknown after
+    that is not looked up again for SOLVER_MISS_TTL_SECONDS, so an editor
+    who never registered costs one query a minute rather than one per
+    poll. Reloaded whole every SOLVER_DIRECTORY_RELOAD_SECONDS to drop
+    renamed and deleted solvers. Thread safe.
+    """
+
+    def __init__(self, miss_ttl: float = SOLVER_MISS_TTL_SECONDS,
+                 reload_interval: float = SOLVER_DIRECTORY_RELOAD_SECONDS):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._misses: Dict[str, float] = {}
+        self._loaded_at: Optional[float] = None
+        self._miss_ttl = miss_ttl
+        self._reload_interval = reload_interval
+
+    def lookup(self, username: str) -> int:
+        """Return the id of the solver named username, 0 if there is none.
+        Raises if the database query it needs fails."""
+        username = _solver_key(username)
+        now = time.time()
+        with self._lock:
+            if self._loaded_at is None or now - self._loaded_at >= self._reload_interval:
+                self._ids = self._load()
+                self._misses = {
+                    name: t for name, t in self._misses.items() if now - t < self._miss_ttl
+                }
+                self._loaded_at = now
+                debug_log(4, f"Loaded solver directory: {len(self._ids)} solvers")
+            elif username not in self._ids:
+                missed = self._misses.get(username)
+                if missed is not None and now - missed < self._miss_ttl:
+                    return 0
+                self._misses.pop(username, None)
+                self._ids.update(self._load(max(self._ids.values(), default=0)))
+
+            solver_id = self._ids.get(username, 0)
+            if solver_id:
+                self._misses.pop(username, None)
+            else:
+                self._misses.setdefault(username, now)
+            return solver_id
+
+    @staticmethod
+    def _load(after_id: int = 0) -> Dict[str, int]:
+        return {
+            _solver_key(name): solver_id
+            for name, solver_id in get_solver_ids(_get_db_connection(), after_id).items()
+        }
+
+    def clear(self) -> None:
+        """Forget everything; the next lookup reloads."""
+        with self._lock:
+            self._ids = {}
+            self._misses = {}
+            self._loaded_at = None
+
+
+solver_directory = SolverDirectory()
+
 
 def _get_solver_id(identifier: str, match_type: str = "name") -> int:
     """
-    Look up solver ID by name or email via direct database query.
+    Look up solver ID by name or email in the in-memory solver directory.
 
     Args:
         identifier: Solver name or email address
@@ -102,13 +193,12 @@ def _get_solver_id(identifier: str, match_type: str = "name") -> int:
     debug_log(4, f"Looking up solver by {match_type}: {identifier} (username: {username})")
 
     try:
-        conn = _get_db_connection()
-        solver = get_solver_by_name_from_db(username, conn)
-        if solver is None:
+        solver_id = solver_directory.lookup(username)
+        if solver_id == 0:
             debug_log(4, f"Solver {username} not found in database")
             return 0
-        debug_log(4, f"Found solver {username} with id: {solver['id']}")
-        return solver["id"]
+        debug_log(4, f"Found solver {username} with id: {solver_id}")
+        return solver_id
     except Exception as e:
         debug_log(2, f"Error looking up solver {username}: {e}")
         return 0
@@ -150,11 +240,14 @@ def _record_solver_activity(
             real edit time, so duplicate detection works correctly.
 
     Returns:
-        True on success, False on failure
+        True on success, False on failure (log_activity reports a failed
+        insert by returning False rather than raising)
     """
     try:
         conn = _get_db_connection()
-        log_activity(puzzle_id, "revise", solver_id, "bigjimmybot", conn, timestamp=edit_ts)
+        if not log_activity(puzzle_id, "revise", solver_id, "bigjimmybot", conn, timestamp=edit_ts):
+            debug_log(2, f"[Thread: {threadname}] Failed to record activity for puzzle {puzzle_id}")
+            return False
         debug_log(
             4,
             f"[Thread: {threadname}] Recorded activity for puzzle {puzzle_id}, solver {solver_id}"
@@ -318,11 +411,93 @@ def _process_activity_records(
         # above uses the solver's pre-existing activity, not the one we're about to create).
         # Pass edit_ts so the activity row's time matches the actual sheet edit,
         # not the server's current time — this is critical for duplicate detection.
-        _record_solver_activity(puzzle["id"], solver_id, threadname, edit_ts=edit_ts)
+        if _record_solver_activity(puzzle["id"], solver_id, threadname, edit_ts=edit_ts):
+            _sheet_watermarks[puzzle["id"]] = max(_sheet_watermarks.get(puzzle["id"], 0), edit_ts)
 
 
 # ── Sheet Info & Metadata ───────────────────────────────────────────────
 
+def _get_activity_cursor(drive_id: str) -> Optional[Dict[str, Any]]:
+    """Return the _pb_activity read cursor for drive_id, loading it from
+    bot_state the first time the sheet is seen."""
+    if drive_id not in _activity_cursors:
+        cursor = None
+        try:
+            stored = get_bot_state(_ACTIVITY_CURSOR_KEY.format(drive_id), _get_db_connection())
+            cursor = json.loads(stored) if stored else None
+        except Exception as e:
+            debug_log(2, f"Failed to load _pb_activity cursor for {drive_id}: {e}")
+        _activity_cursors[drive_id] = cursor
+    return _activity_cursors[drive_id]
+
+
+def _set_activity_cursor(drive_id: str, cursor: Optional[Dict[str, Any]]) -> None:
+    """Record (and persist, if it changed) the _pb_activity read cursor."""
+    if drive_id in _activity_cursors and _activity_cursors[drive_id] == cursor:
+        return
+    _activity_cursors[drive_id] = cursor
+    try:
+        set_bot_state(
+            _ACTIVITY_CURSOR_KEY.format(drive_id),
+            json.dumps(cursor) if cursor else None,
+            _get_db_connection(),
+        )
+    except Exception as e:
+        debug_log(2, f"Failed to save _pb_activity cursor for {drive_id}: {e}")
+
+
+def _read_activity_sheet(puzzle: Dict[str, Any], threadname: str) -> Dict[str, Any]:
+    """
+    Read a puzzle's _pb_activity sheet, only the rows added since the last
+    read when the sheet's layout allows it.
+
+    The stock onEdit tracker keeps one row per editor and rewrites it in
+    place, so its sheets are read whole; they only grow with the number of
+    editors. A tracker that appends a row per edit (custom
+    GOOGLE_APPS_SCRIPT_CODE) lists an editor more than once; those sheets
+    are read from the last consumed row down. That row comes back as an
+    anchor, and if it no longer matches (sheet truncated, rewritten or
+    repaired) the sheet is read whole again to resync.
+
+    Args:
+        puzzle: Puzzle dictionary from database
+        threadname: Name of worker thread (for logging)
+
+    Returns:
+        Sheet info dict from get_puzzle_sheet_info_activity
+    """
+    drive_id = puzzle["drive_id"]
+    cursor = _get_activity_cursor(drive_id)
+    if cursor:
+        sheet_info = get_puzzle_sheet_info_activity(
+            drive_id, puzzle["name"], start_row=cursor["row"]
+        )
+        if sheet_info.get("error"):
+            return sheet_info
+        if sheet_info.get("anchor") == cursor["anchor"]:
+            if sheet_info["end_row"] > cursor["row"]:
+                _set_activity_cursor(
+                    drive_id, {"row": sheet_info["end_row"], "anchor": sheet_info["last_row"]}
+                )
+            return sheet_info
+        debug_log(
+            3,
+            f"[Thread: {threadname}] _pb_activity for {puzzle['name']} changed at row "
+            f"{cursor['row']}, rereading it whole",
+        )
+
+    sheet_info = get_puzzle_sheet_info_activity(drive_id, puzzle["name"])
+    if sheet_info.get("error"):
+        return sheet_info
+    editors = [e["solvername"] for e in sheet_info.get("editors", [])]
+    if len(set(editors)) < len(editors) and sheet_info.get("last_row"):
+        _set_activity_cursor(
+            drive_id, {"row": sheet_info["end_row"], "anchor": sheet_info["last_row"]}
+        )
+    else:
+        _set_activity_cursor(drive_id, None)
+    return sheet_info
+
 
 def _fetch_sheet_info(
     puzzle: Dict[str, Any], threadname: str
@@ -352,14 +527,14 @@ def _fetch_sheet_info(
                 f"[Thread: {threadname}] Skipping {puzzle['name']} — "
                 f"in failure cooldown ({fail_count} failures)",
             )
-            return {"editors": [], "sheetcount": None, "error": True}, 1
+            return {"editors": [], "sheetcount": None, "error": True, "skipped": True}, 1
 
         # Sheet has add-on enabled, use the hidden sheet approach
         debug_log(
             4,
             f"[Thread: {threadname}] Using hidden sheet tracking for {puzzle['name']} (sheetenabled=1)",
         )
-        sheet_info = get_puzzle_sheet_info_activity(puzzle["drive_id"], puzzle["name"])
+        sheet_info = _read_activity_sheet(puzzle, threadname)
 
         if sheet_info.get("error"):
             _sheet_failure_counts[drive_id] = _sheet_failure_counts.get(drive_id, 0) + 1
@@ -385,6 +560,7 @@ def _fetch_sheet_info(
                             f"resetting failure count",
                         )
                         _sheet_failure_counts[drive_id] = 0
+                        _set_activity_cursor(drive_id, None)
                         # Don't re-read this cycle — let next loop pick up the fresh sheet
                     else:
                         debug_log(
@@ -508,6 +684,33 @@ def _fetch_last_sheet_activity(
         return None
 
 
+def _get_sheet_watermark(puzzle: Dict[str, Any], threadname: str) -> float:
+    """
+    Unix time of the newest recorded sheet edit on puzzle (0 if none).
+
+    Read from the database the first time the bot polls a puzzle, then kept
+    in _sheet_watermarks and advanced by _process_activity_records as it
+    records edits: bigjimmybot is the only writer of 'revise' activity, so
+    later polls need no query.
+
+    Args:
+        puzzle: Puzzle dictionary from database
+        threadname: Name of worker thread (for logging)
+    """
+    last_sheet_act_ts = _sheet_watermarks.get(puzzle["id"])
+    if last_sheet_act_ts is None:
+        last_sheet_act = _fetch_last_sheet_activity(puzzle, threadname)
+
+        # Note: last_sheet_act can be None for puzzles with no previous sheet activity
+        # This is normal and should be treated as timestamp=0, not as an error
+        last_sheet_act_ts = 0
+        if last_sheet_act and last_sheet_act.get("time"):
+            # MySQL returns datetime objects directly; convert to Unix timestamp
+            last_sheet_act_ts = last_sheet_act["time"].timestamp()
+        _sheet_watermarks[puzzle["id"]] = last_sheet_act_ts
+    return last_sheet_act_ts
+
+
 def _process_sheet_activity(
     puzzle: Dict[str, Any], sheet_info: Dict[str, Any], sheetenabled: int, threadname: str
 ) -> None:
@@ -520,17 +723,7 @@ def _process_sheet_activity(
         sheetenabled: 1 for hidden sheet, 0 for legacy
         threadname: Name of worker thread (for logging)
     """
-    # Fetch last sheet activity for this puzzle
-    last_sheet_act = _fetch_last_sheet_activity(puzzle, threadname)
-
-    # Note: last_sheet_act can be None for puzzles with no previous sheet activity
-    # This is normal and should be treated as timestamp=0, not as an error
-
-    # Convert to Unix timestamp for comparison
-    last_sheet_act_ts = 0
-    if last_sheet_act and last_sheet_act.get("time"):
-        # MySQL returns datetime objects directly; convert to Unix timestamp
-        last_sheet_act_ts = last_sheet_act["time"].timestamp()
+    last_sheet_act_ts = _get_sheet_watermark(puzzle, threadname)
 
     debug_log(
         5,
@@ -559,90 +752,86 @@ def _process_sheet_activity(
 # ── Abandoned Puzzle Detection ──────────────────────────────────────────
 
 
-def _check_abandoned_puzzle(puzzle: Dict[str, Any], threadname: str) -> None:
+def _check_abandoned_puzzles(puzzles: List[Dict[str, Any]], last_activity: Dict[int, float],
+                             threadname: str = "main") -> None:
     """
-    Check if puzzle is abandoned and mark it accordingly.
+    Mark abandoned puzzles, once per round for every open puzzle.
 
     A puzzle is abandoned if it's "Being worked" with no solvers and no recent activity.
+    Candidates come from the round's activity map; a puzzle it shows
+    without activity (none yet) or active within the timeout is skipped.
+    The candidates are re-read in one query, since the map predates this
+    round's sheet edits, and only those still past the timeout are marked.
 
     Args:
-        puzzle: Puzzle dictionary from database
-        threadname: Name of worker thread (for logging)
+        puzzles: Open puzzles, as loaded this round
+        last_activity: {puzzle_id: Unix time of latest activity}, from
+            get_last_activity_times at the start of the round
+        threadname: Name of calling thread (for logging)
     """
-    if puzzle.get("status") != "Being worked":
-        return
-
-    cur_solvers = puzzle.get("cursolvers")
-    if cur_solvers and cur_solvers.strip():
-        return  # Has solvers, not abandoned
-
-    # No current solvers, check if activity is stale
     abandoned_timeout_minutes = int(
         configstruct.get("BIGJIMMY_ABANDONED_TIMEOUT_MINUTES", 10)
     )
     abandoned_timeout_seconds = abandoned_timeout_minutes * 60
     abandoned_status = configstruct.get("BIGJIMMY_ABANDONED_STATUS", "Abandoned")
 
-    # Fetch lastact (any activity type - superset of lastsheetact)
+    now = time.time()
+    candidates = [
+        puzzle for puzzle in puzzles
+        if puzzle.get("status") == "Being worked"
+        and not (puzzle.get("cursolvers") or "").strip()
+        and last_activity.get(puzzle["id"]) is not None
+        and now - last_activity[puzzle["id"]] > abandoned_timeout_seconds
+    ]
+    if not candidates:
+        return
+
     try:
         conn = _get_db_connection()
-        lastact = get_last_activity_for_puzzle(puzzle["id"], conn)
+        current = get_last_activity_times(conn, [puzzle["id"] for puzzle in candidates])
     except Exception as e:
-        debug_log(
-            2,
-            f"[Thread: {threadname}] Error fetching lastact for {puzzle['name']}: {e}",
-        )
+        debug_log(2, f"[Thread: {threadname}] Error fetching lastact for abandoned check: {e}")
         return
 
-    if not lastact or not lastact.get("time"):
-        # No activity recorded, wait for next cycle
+    now = time.time()
+    for puzzle in candidates:
+        lastact_time = current.get(puzzle["id"])
+        if lastact_time is None:
+            continue
+        time_since_activity = now - lastact_time
+        if time_since_activity <= abandoned_timeout_seconds:
+            continue
         debug_log(
-            4,
-            f"[Thread: {threadname}] Puzzle {puzzle['name']} has no activity yet, will check again next cycle",
+            3,
+            f"[Thread: {threadname}] Puzzle {puzzle['name']} inactive for {time_since_activity / 60:.1f} min "
+            f"(threshold: {abandoned_timeout_minutes}), no solvers",
         )
-        return
-
-    try:
-        # MySQL returns datetime objects directly
-        lastact_time = lastact["time"]
-        now = datetime.datetime.utcnow()
-        time_since_activity = (now - lastact_time).total_seconds()
-
-        if time_since_activity > abandoned_timeout_seconds:
+        try:
+            update_puzzle_field(puzzle["id"], "status", abandoned_status, conn, source="bigjimmybot")
             debug_log(
                 3,
-                f"[Thread: {threadname}] Puzzle {puzzle['name']} inactive for {time_since_activity / 60:.1f} min "
-                f"(threshold: {abandoned_timeout_minutes}), no solvers",
+                f"[Thread: {threadname}] Set puzzle {puzzle['name']} status to '{abandoned_status}'",
+            )
+        except Exception as e:
+            debug_log(
+                1,
+                f"[Thread: {threadname}] Failed to update status for {puzzle['name']}: {e}",
             )
-
-            try:
-                conn = _get_db_connection()
-                update_puzzle_field(puzzle["id"], "status", abandoned_status, conn, source="bigjimmybot")
-                debug_log(
-                    3,
-                    f"[Thread: {threadname}] Set puzzle {puzzle['name']} status to '{abandoned_status}'",
-                )
-            except Exception as e:
-                debug_log(
-                    1,
-                    f"[Thread: {threadname}] Failed to update status for {puzzle['name']}: {e}",
-                )
-    except Exception as e:
-        debug_log(
-            2,
-            f"[Thread: {threadname}] Error processing lastact time for {puzzle['name']}: {e}",
-        )
 
 
 # ── Puzzle Processing ──────────────────────────────────────────────────
 
-def _process_puzzle(puzzle: Dict[str, Any], threadname: str) -> None:
+def _process_puzzle(puzzle: Dict[str, Any], threadname: str) -> bool:
     """
-    Process a single puzzle: fetch sheet info, track activity, check abandoned status.
+    Process a single puzzle: fetch sheet info, track activity.
 
     Args:
         puzzle: Puzzle dictionary from database
         threadname: Name of worker thread (for logging)
+
+    Returns:
+        False if the sheet read failed and is worth retrying (a sheet in
+        failure cooldown is skipped, not failed), True otherwise
     """
     puzzle_start_time = time.time()
     debug_log(4, f"[Thread: {threadname}] Fetched from queue puzzle: {puzzle['name']}")
@@ -656,76 +845,284 @@ def _process_puzzle(puzzle: Dict[str, Any], threadname: str) -> None:
     # Process sheet activity and update solver assignments
     _process_sheet_activity(puzzle, sheet_info, sheetenabled, threadname)
 
-    # Check for abandoned puzzles
-    _check_abandoned_puzzle(puzzle, threadname)
-
     # Log per-puzzle timing
     puzzle_elapsed = time.time() - puzzle_start_time
     debug_log(
         4,
         f"[Thread: {threadname}] Finished processing puzzle {puzzle['name']} in {puzzle_elapsed:.2f} seconds",
     )
+    return not sheet_info.get("error") or bool(sheet_info.get("skipped"))
 
 
-# ── Worker Thread ──────────────────────────────────────────────────────
+# ── Worker Pool ────────────────────────────────────────────────────────
 
-def _check_puzzle_from_queue(threadname: str, q: queue.Queue) -> int:
-    """
-    Worker thread main loop: process puzzles from queue.
+WORKER_IDLE_TIMEOUT = 5.0  # seconds an idle worker blocks before rechecking
 
-    Args:
-        threadname: Name of this worker thread (for logging)
-        q: Queue containing puzzle dictionaries
 
-    Returns:
-        0 on normal exit
+class _Batch:
+    """One iteration's puzzles: counts them off as workers finish them."""
+
+    def __init__(self, size: int):
+        self._pending = size
+        self._lock = threading.Lock()
+        self.done = threading.Event()
+        self.failed: List[Dict[str, Any]] = []
+        if size == 0:
+            self.done.set()
+
+    def finish_one(self, puzzle: Dict[str, Any], ok: bool) -> None:
+        with self._lock:
+            if not ok:
+                self.failed.append(puzzle)
+            self._pending -= 1
+            if self._pending == 0:
+                self.done.set()
+
+
+class PuzzleWorkerPool:
+    """Long-lived worker threads processing puzzles from one queue.
+
+    Workers are started once and kept across iterations. An idle worker
+    blocks in queue.get() (waking every WORKER_IDLE_TIMEOUT seconds only to
+    see whether it has been retired), so waiting for work — or for the Google
+    rate limiter, which sleeps — costs no CPU. The queue is unbounded:
+    run() enqueues a whole iteration without blocking, whatever the puzzle
+    count, and waits on that iteration's own completion event.
     """
-    global EXIT_FLAG
 
-    while not EXIT_FLAG:
-        QUEUE_LOCK.acquire()
-        if not WORK_QUEUE.empty():
-            puzzle = q.get()
-            QUEUE_LOCK.release()
+    def __init__(self, process=None):
+        self._process = process or _process_puzzle
+        self._queue: queue.Queue = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        self._retired: set = set()
+        self._lock = threading.Lock()
+        self._started = 0
+
+    def resize(self, count: int) -> None:
+        """Grow or shrink to count workers (BIGJIMMY_THREADCOUNT). Retired
+        workers finish the puzzle in hand, then exit."""
+        count = max(count, 1)
+        with self._lock:
+            self._workers = [w for w in self._workers if w.is_alive()]
+            active = [w for w in self._workers if w.name not in self._retired]
+            for worker in active[count:]:
+                self._retired.add(worker.name)
+            for _ in range(count - len(active)):
+                self._started += 1
+                worker = threading.Thread(
+                    target=self._work, name=str(self._started), daemon=True
+                )
+                self._workers.append(worker)
+                worker.start()
 
-            # Rate limiting is now handled by _rate_limiter.acquire() in pbgooglelib
+    def size(self) -> int:
+        with self._lock:
+            return sum(1 for w in self._workers if w.name not in self._retired)
 
+    def run(self, puzzles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Process one iteration's puzzles; return when all are done, with
+        the puzzles whose poll failed (process raised or returned False)."""
+        batch = _Batch(len(puzzles))
+        for puzzle in puzzles:
+            self._queue.put((batch, puzzle))
+        batch.done.wait()
+        return batch.failed
+
+    def _work(self) -> None:
+        threadname = threading.current_thread().name
+        while threadname not in self._retired:
             try:
-                _process_puzzle(puzzle, threadname)
+                batch, puzzle = self._queue.get(timeout=WORKER_IDLE_TIMEOUT)
+            except queue.Empty:
+                continue
+            ok = False
+            try:
+                ok = self._process(puzzle, threadname) is not False
             except Exception as e:
                 debug_log(
                     1,
                     f"[Thread: {threadname}] Error processing puzzle {puzzle.get('name', 'unknown')}: {e}",
                 )
             finally:
-                WORK_QUEUE.task_done()
-        else:
-            QUEUE_LOCK.release()
+                batch.finish_one(puzzle, ok)
+        with self._lock:
+            self._retired.discard(threadname)
+        debug_log(4, f"Exiting puzzthread {threadname}")
+
+
+# ── Poll Scheduling ────────────────────────────────────────────────────
+#
+# Each round polls only the puzzles that are due, hottest first, within what
+# BIGJIMMY_GOOGLE_API_QPM allows per round. A puzzle's interval follows how
+# likely it is to have a new edit: someone on it or activity in the last few
+# minutes, a working status, activity within the hour, nothing at all, or a
+# parked status. Puzzles not polled for BIGJIMMY_MAX_POLL_INTERVAL_SECONDS
+# go ahead of everything else, so no open puzzle waits longer than that as
+# long as the bound leaves room in the budget (open puzzles / bound <= QPM).
+
+POLL_ROUND_SECONDS = 15          # scheduling round; also the shortest sleep
+POLL_HOT_SECONDS = 30            # solvers on it, or activity in the last 10 min
+POLL_WARM_SECONDS = 120          # working status, or activity in the last hour
+POLL_IDLE_SECONDS = 300          # no recent activity
+POLL_MAX_INTERVAL_SECONDS = 900  # parked statuses; BIGJIMMY_MAX_POLL_INTERVAL_SECONDS overrides
+HOT_ACTIVITY_SECONDS = 600
+WARM_ACTIVITY_SECONDS = 3600
+WORKING_STATUSES = {"Critical", "Being worked", "Needs eyes", "WTF", "Grind", "Under control"}
+PARKED_STATUSES = {"Abandoned", "Speculative", "Unnecessary", "Waiting for HQ", "[hidden]"}
+
+
+def _poll_interval(puzzle: Dict[str, Any], last_activity: Optional[float],
+                   now: float, max_interval: float) -> float:
+    """Seconds between polls of puzzle's sheet, from its current activity."""
+    recent = None if last_activity is None else now - last_activity
+    if puzzle.get("cursolvers") or (recent is not None and recent < HOT_ACTIVITY_SECONDS):
+        interval = POLL_HOT_SECONDS
+    elif puzzle.get("status") in PARKED_STATUSES:
+        interval = max_interval
+    elif puzzle.get("status") in WORKING_STATUSES or (
+        recent is not None and recent < WARM_ACTIVITY_SECONDS
+    ):
+        interval = POLL_WARM_SECONDS
+    else:
+        interval = POLL_IDLE_SECONDS
+    return min(interval, max_interval)
 
-    debug_log(4, f"Exiting puzzthread {threadname}")
-    return 0
 
+def _poll_cost(puzzle: Dict[str, Any]) -> int:
+    """Google API calls one poll spends: hidden-sheet reads take one, the
+    legacy Revisions path a sheet read plus a revisions list."""
+    return 1 if puzzle.get("sheetenabled") else 2
 
-class PuzzleThread(threading.Thread):
-    """Worker thread for processing puzzles from the queue."""
 
-    def __init__(self, thread_id: int, name: str, q: queue.Queue):
-        """
-        Initialize puzzle worker thread.
+class PollScheduler:
+    """Picks each round's puzzles to poll; remembers when each was polled."""
+
+    def __init__(self):
+        self._last_polled: Dict[int, float] = {}
+        self._changed: Set[str] = set()
+        self._claimed: Set[str] = set()
+
+    def select(self, puzzles: List[Dict[str, Any]], last_activity: Dict[int, float],
+               now: float, budget: int, max_interval: float,
+               changed: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """Return the puzzles to poll now, most urgent first, spending at most
+        budget API calls (always at least one puzzle if any is due), and
+        mark them polled.
 
-        Args:
-            thread_id: Unique thread ID
-            name: Thread name (for logging)
-            q: Queue to process puzzles from
+        changed is the set of drive ids modified since the previous round
+        (see SheetChangeFeed), or None when that is unknown. While it is
+        known, only changed sheets and sheets not polled for max_interval
+        are polled, and changes left over for lack of budget carry to later
+        rounds; otherwise polls follow _poll_interval. A change is consumed
+        when its puzzle is selected; poll_failed puts it back.
         """
-        threading.Thread.__init__(self)
-        self.thread_id = thread_id
-        self.name = name
-        self.q = q
+        self._last_polled = {
+            p["id"]: self._last_polled[p["id"]] for p in puzzles if p["id"] in self._last_polled
+        }
+        if changed is not None:
+            self._changed.update(changed)
+        self._changed.intersection_update(p.get("drive_id") for p in puzzles)
+
+        candidates = []
+        for puzzle in puzzles:
+            interval = _poll_interval(puzzle, last_activity.get(puzzle["id"]), now, max_interval)
+            # A puzzle seen for the first time is due now, counting toward
+            # the staleness bound from here rather than jumping the queue.
+            last = self._last_polled.setdefault(puzzle["id"], now - interval)
+            age = now - last
+            if changed is not None and puzzle.get("drive_id"):
+                # Drive doesn't report every edit a poll would find (or a
+                # change can be lost with a failed feed call), so the
+                # staleness bound still holds for unchanged sheets
+                if puzzle["drive_id"] not in self._changed and age < max_interval:
+                    continue
+            elif age < interval:
+                continue
+            # Sheets Drive reports changed first (a known edit); then past
+            # the staleness bound; then shortest interval; then longest
+            # waiting.
+            is_changed = puzzle.get("drive_id") in self._changed
+            candidates.append(((not is_changed, age < max_interval, interval, -age), puzzle))
+        candidates.sort(key=lambda c: c[0])
+
+        selected = []
+        self._claimed = set()
+        for _, puzzle in candidates:
+            cost = _poll_cost(puzzle)
+            if selected and cost > budget:
+                break
+            budget -= cost
+            selected.append(puzzle)
+            self._last_polled[puzzle["id"]] = now
+            if puzzle.get("drive_id") in self._changed:
+                self._changed.discard(puzzle["drive_id"])
+                self._claimed.add(puzzle["drive_id"])
+        return selected
+
+    def poll_failed(self, puzzles: List[Dict[str, Any]]) -> None:
+        """Put back the changes that the last select() consumed for puzzles
+        whose poll then failed, so they are retried next round instead of
+        waiting for another edit to show up in the feed."""
+        for puzzle in puzzles:
+            if puzzle.get("drive_id") in self._claimed:
+                self._changed.add(puzzle["drive_id"])
+
+    def oldest_poll_age(self, now: float) -> float:
+        """Seconds since the least recently polled open puzzle was polled."""
+        return max((now - last for last in self._last_polled.values()), default=0.0)
+
 
-    def run(self):
-        """Thread main loop."""
-        _check_puzzle_from_queue(self.name, self.q)
+DRIVE_CHANGES_TOKEN_KEY = "drive_changes_page_token"
+
+
+class SheetChangeFeed:
+    """Which sheets changed on Drive since the last round, from the Drive
+    changes feed: one changes.list call per round instead of a sheet read
+    per puzzle.
+
+    The page token is kept in bot_state so that edits made while the bot
+    was down are picked up after a restart.
+    """
+
+    def __init__(self):
+        self._token: Optional[str] = None
+        self._loaded = False
+
+    def changed(self) -> Optional[Set[str]]:
+        """Return the drive ids changed since the previous call, or None if
+        that is unknown (first run, or the feed failed), in which case the
+        round falls back to polling by schedule."""
+        if not self._loaded:
+            self._loaded = True
+            try:
+                self._token = get_bot_state(DRIVE_CHANGES_TOKEN_KEY, _get_db_connection())
+            except Exception as e:
+                debug_log(2, f"Failed to load Drive changes page token: {e}")
+
+        if self._token is None:
+            # Changes are listed from here on; this round polls as usual
+            self._save(get_drive_changes_start_token())
+            return None
+
+        file_ids, next_token = list_drive_changes(self._token)
+        if next_token is None:
+            # Restart the feed from now; whatever changed in between is
+            # left to the scheduled polls
+            debug_log(2, "Drive changes feed failed; polling by schedule this round")
+            self._save(get_drive_changes_start_token())
+            return None
+        if next_token != self._token:
+            self._save(next_token)
+        return file_ids
+
+    def _save(self, token: Optional[str]) -> None:
+        self._token = token
+        if token is None:
+            return
+        try:
+            set_bot_state(DRIVE_CHANGES_TOKEN_KEY, token, _get_db_connection())
+        except Exception as e:
+            debug_log(2, f"Failed to save Drive changes page token: {e}")
 
 
 # ── Metrics & Stats ─────────────────────────────────────────────────────
@@ -763,8 +1160,12 @@ def _post_botstats_metrics(
 # ── Main Bot Loop ───────────────────────────────────────────────────────
 
 def main():
-    """Main bot loop: fetch puzzles, spawn workers, wait for completion."""
-    global EXIT_FLAG, THREAD_COUNTER, THREADS, LOOP_ITERATIONS_TOTAL
+    """Main bot loop: fetch puzzles, hand them to the workers, wait for completion."""
+    global LOOP_ITERATIONS_TOTAL
+
+    workers = PuzzleWorkerPool()
+    scheduler = PollScheduler()
+    change_feed = SheetChangeFeed()
 
     # Initialize Google Drive API
     if initdrive() != 0:
@@ -784,11 +1185,21 @@ def main():
     except Exception:
         pass
 
+    # Subscribe to config version announcements; until Redis is up (or if it
+    # is disabled) maybe_refresh_config polls the config_version row instead.
+    try:
+        import pbcachelib
+
+        pbcachelib.ensure_cache_initialized(_get_db_connection())
+    except Exception as e:
+        debug_log(2, f"Cache init failed, config changes will be polled: {e}")
+
     while True:
-        # Reload config from database each loop
+        round_start_time = time.time()
+
+        # Reload config only if it changed since the last loop
         try:
-            refresh_config()
-            debug_log(5, "Config reloaded from database")
+            maybe_refresh_config()
         except Exception as e:
             debug_log(1, f"Error refreshing config: {e}")
 
@@ -800,6 +1211,15 @@ def main():
         except Exception as e:
             debug_log(2, f"Failed to post loop iteration counter: {e}")
 
+        # Keep the /all/changes sequence table bounded (runs even when the
+        # Google API is disabled, since pbrest keeps appending to it).
+        try:
+            pruned = prune_change_log(_get_db_connection())
+            if pruned:
+                debug_log(4, f"Pruned {pruned} change_log rows")
+        except Exception as e:
+            debug_log(2, f"Failed to prune change_log: {e}")
+
         # Skip if Google API is disabled
         if configstruct.get("SKIP_GOOGLE_API", "false") == "true":
             debug_log(3, "SKIP_GOOGLE_API is true, sleeping 5 seconds")
@@ -815,10 +1235,16 @@ def main():
         # Start timing setup phase
         setup_start_time = time.time()
 
-        # Fetch all puzzles directly from database
+        # Fetch all puzzles and their latest activity directly from database
+        # (the read replica when one is configured and current; writes from
+        # a previous round are replicated well within a round)
         try:
-            conn = _get_db_connection()
-            rounds = get_all_rounds_with_puzzles(conn)
+            conn, pool = acquire_read_connection()
+            try:
+                rounds = get_all_rounds_with_puzzles(conn)
+                last_activity = get_last_activity_times(conn)
+            finally:
+                pool.release(conn)
         except Exception as e:
             debug_log(1, f"Error fetching puzzle data from database: {e}")
             time.sleep(5)  # Brief backoff before retrying on DB error
@@ -827,7 +1253,7 @@ def main():
         debug_log(4, "loaded round list")
 
         # Build list of unsolved puzzles
-        puzzles = []
+        open_puzzles = []
         for rnd in rounds:
             puzzles_in_round = rnd["puzzles"]
             debug_log(
@@ -835,49 +1261,58 @@ def main():
             )
             for puzzle in puzzles_in_round:
                 if puzzle["status"] != "Solved":
-                    puzzles.append(puzzle)
+                    open_puzzles.append(puzzle)
                 else:
                     debug_log(4, f"skipping solved puzzle {puzzle['name']}")
         debug_log(4, "full puzzle structure loaded")
 
-        # Spawn worker threads
-        thread_count = int(configstruct["BIGJIMMY_THREADCOUNT"])
-        for i in range(1, thread_count + 1):
-            thread = PuzzleThread(THREAD_COUNTER, i, WORK_QUEUE)
-            thread.start()
-            THREADS.append(thread)
-            THREAD_COUNTER += 1
+        # Poll only what is due this round, hottest first, within the
+        # round's share of the Google API budget
+        config_snapshot = pblib.get_config()
+        qpm = config_snapshot.get("BIGJIMMY_GOOGLE_API_QPM", 55)
+        max_interval = config_snapshot.get(
+            "BIGJIMMY_MAX_POLL_INTERVAL_SECONDS", POLL_MAX_INTERVAL_SECONDS
+        )
+        # Skip sheets Drive reports unchanged (one call, counted against
+        # the budget like any other)
+        changed = change_feed.changed()
+        budget = max(1, int(qpm * POLL_ROUND_SECONDS / 60) - 1)
+        now = time.time()
+        puzzles = scheduler.select(
+            open_puzzles, last_activity, now, budget, max_interval, changed=changed
+        )
 
-        # Put all puzzles in the queue
-        QUEUE_LOCK.acquire()
-        for puzzle in puzzles:
-            WORK_QUEUE.put(puzzle)
-        QUEUE_LOCK.release()
+        # Follow BIGJIMMY_THREADCOUNT; workers persist across iterations
+        workers.resize(int(configstruct["BIGJIMMY_THREADCOUNT"]))
 
         # Setup complete, start timing processing phase
         setup_elapsed = time.time() - setup_start_time
         processing_start_time = time.time()
         debug_log(
             4,
-            f"Beginning iteration of bigjimmy bot across all puzzles (setup took {setup_elapsed:.2f} sec)",
+            f"Beginning poll round: {len(puzzles)} of {len(open_puzzles)} open puzzles due, "
+            f"{'unknown' if changed is None else len(changed)} sheets changed "
+            f"(setup took {setup_elapsed:.2f} sec)",
         )
 
-        # Wait for all tasks to complete
-        WORK_QUEUE.join()
+        # Queue this round's puzzles and wait for them to finish; changed
+        # sheets whose read failed are retried next round
+        scheduler.poll_failed(workers.run(puzzles))
 
-        # Signal threads to exit and wait for them
-        EXIT_FLAG = 1
-        for t in THREADS:
-            t.join()
+        # Every open puzzle gets the (database-only) abandoned check, polled
+        # or not: a sheet nobody edits never shows up as changed. At most
+        # one query per round, and none while nothing is past the timeout
+        _check_abandoned_puzzles(open_puzzles, last_activity)
 
         processing_elapsed = time.time() - processing_start_time
         loop_elapsed = setup_elapsed + processing_elapsed
-        debug_log(4, "Completed iteration of bigjimmy bot across all puzzles")
         debug_log(
             3,
-            f"Full iteration completed: {len(puzzles)} puzzles in {loop_elapsed:.2f} sec "
-            f"(setup: {setup_elapsed:.2f} sec, processing: {processing_elapsed:.2f} sec, "
-            f"{processing_elapsed / len(puzzles) if puzzles else 0:.2f} sec/puzzle avg)",
+            f"Poll round completed: {len(puzzles)} of {len(open_puzzles)} puzzles in "
+            f"{loop_elapsed:.2f} sec (setup: {setup_elapsed:.2f} sec, processing: "
+            f"{processing_elapsed:.2f} sec, "
+            f"{processing_elapsed / len(puzzles) if puzzles else 0:.2f} sec/puzzle avg, "
+            f"oldest poll {scheduler.oldest_poll_age(now):.0f} sec ago)",
         )
 
         # Post timing stats to database for Prometheus metrics
@@ -890,10 +1325,6 @@ def main():
         except Exception:
             pass  # Non-fatal — don't crash the bot over a health file
 
-        # Reset for next iteration
-        EXIT_FLAG = 0
-        THREADS = []
-
         # Force garbage collection and log memory usage for leak detection
         gc.collect()
         rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
@@ -901,6 +1332,9 @@ def main():
         rss_mb = rss_kb / 1024 if sys.platform == "linux" else rss_kb / (1024 * 1024)
         debug_log(3, f"Memory: RSS={rss_mb:.1f} MB after gc.collect() (iteration {LOOP_ITERATIONS_TOTAL})")
 
+        # Rounds start at most every POLL_ROUND_SECONDS; the budget is per round
+        time.sleep(max(0.0, POLL_ROUND_SECONDS - (time.time() - round_start_time)))
+
 
 if __name__ == "__main__":
     main()
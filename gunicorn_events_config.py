@@ -0,0 +1,26 @@
+"""
+Gunicorn configuration for the /events Server-Sent Events stream.
+
+SSE clients hold their connection open for as long as the page is open. On
+the sync workers in gunicorn_config.py each client would pin a whole worker,
+so the same app is served here on gevent workers, where an idle stream costs
+one greenlet. Apache routes only /events to this server; everything else
+stays on the sync workers.
+
+Usage:
+    gunicorn -c gunicorn_events_config.py wsgi:app
+"""
+
+import os
+
+# Shares the Prometheus multiprocess dir and worker-exit cleanup with the main
+# server. on_starting is deliberately NOT imported: it wipes the shared metrics
+# dir, which must happen once, from the main server.
+from gunicorn_config import child_exit, prometheus_multiproc_dir  # noqa: F401
+
+bind = os.environ.get("GUNICORN_EVENTS_BIND", "127.0.0.1:5001")
+workers = int(os.environ.get("GUNICORN_EVENTS_WORKERS", 2))
+worker_class = "gevent"
+# Concurrent streams per worker.
+worker_connections = int(os.environ.get("GUNICORN_EVENTS_CONNECTIONS", 2000))
+timeout = 60
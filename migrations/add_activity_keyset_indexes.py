@@ -0,0 +1,57 @@
+"""
+Add composite indexes for keyset-paged activity listings.
+
+Background:
+    /puzzles/<id>/activity, /solvers/<id>/activity and /activitysearch page
+    newest-first by (time, id) with continuation cursors
+    (pblib.get_activity_page): each page continues from WHERE time <= T and
+    stops after limit + 1 rows. That is a bounded index range scan only if
+    an index leads with the filter column and continues with time:
+
+      (puzzle_id, time)      already there (add_activity_puzzle_time_index)
+      (solver_id, time, id)  solver activity, /activitysearch?solver_id=
+      (type, time)           /activitysearch?types=, one range per type
+      (time)                 already there, for unfiltered searches
+
+    InnoDB appends the primary key (id) to every secondary index, so
+    (type, time) also orders ties by id; solver's index names it anyway.
+
+    Without them, solver and type filters sort every matching row before
+    returning a page, and the cost grows with how deep the client pages.
+
+Idempotent: safe to re-run. Adds only the indexes that are missing.
+"""
+
+name = "add_activity_keyset_indexes"
+description = "Add (solver_id, time, id) and (type, time) indexes to activity for keyset pagination"
+
+INDEXES = {
+    "idx_solver_time": "(solver_id, time, id)",
+    "idx_type_time": "(type, time)",
+}
+
+
+def run(conn):
+    """Add whichever indexes are missing. Returns (success, message)."""
+    cursor = conn.cursor()
+
+    cursor.execute(
+        """
+        SELECT DISTINCT INDEX_NAME FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'activity'
+        """
+    )
+    existing = {row["INDEX_NAME"] for row in cursor.fetchall()}
+    missing = [index for index in INDEXES if index not in existing]
+    if not missing:
+        return True, "Activity keyset indexes already exist, nothing to do"
+
+    # One ALTER builds both in a single pass. Online DDL: INPLACE with no
+    # table copy on MySQL 8; does not block reads/writes.
+    cursor.execute(
+        "ALTER TABLE activity "
+        + ", ".join(f"ADD INDEX {index} {INDEXES[index]}" for index in missing)
+    )
+    conn.commit()
+    return True, f"Added {', '.join(missing)} to activity"
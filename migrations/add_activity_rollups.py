@@ -0,0 +1,106 @@
+"""
+Add the activity rollup tables behind GET /activity, and (re)build them.
+
+Background:
+    /activity (www/status.php, www/activity.php, www/metrics.php) used to
+    GROUP BY the whole activity table, self-join its create and solve rows
+    for the solve timer and join every open puzzle's create rows, on every
+    page load. activity grows by a row for every sheet edit bigjimmybot
+    sees, so the endpoint got slower all hunt.
+
+    activity_counts         (type, source) -> count
+    puzzle_activity_rollup  per puzzle: number and sum of UNIX times of its
+                            create and solve rows, last solve time
+
+    pblib adds every activity row it inserts to these in the same
+    transaction, and pblib.get_activity_summary answers /activity from them
+    with the same numbers the old queries produced. NULL type/source are
+    stored as '' (part of the primary key) and reported as null again.
+
+    Until this runs, get_activity_summary falls back to the old queries.
+    Re-running it also drops first_create_time, a column earlier versions
+    of this migration created but nothing read.
+
+Rebuild: this migration is also the rebuild command. Re-run it whenever
+the rollups may have drifted from activity (rows written by scripts that
+bypass pblib, such as scripts/perf_sim_activity.py, or hand edits). The
+rebuild runs in one transaction; its locking reads of activity briefly
+hold up concurrent activity inserts, which then land on the rebuilt rows.
+
+Idempotent: safe to re-run.
+"""
+
+name = "add_activity_rollups"
+description = "Add activity_counts/puzzle_activity_rollup for /activity and rebuild them from activity (re-run to rebuild)"
+
+CREATE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS activity_counts (
+      type varchar(32) NOT NULL DEFAULT '',
+      source varchar(32) NOT NULL DEFAULT '',
+      count bigint(20) NOT NULL DEFAULT 0,
+      PRIMARY KEY (type, source)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS puzzle_activity_rollup (
+      puzzle_id int(11) NOT NULL,
+      create_count int(11) NOT NULL DEFAULT 0,
+      create_time_sum bigint(20) NOT NULL DEFAULT 0,
+      solve_count int(11) NOT NULL DEFAULT 0,
+      solve_time_sum bigint(20) NOT NULL DEFAULT 0,
+      last_solve_time timestamp NULL DEFAULT NULL,
+      PRIMARY KEY (puzzle_id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+]
+
+REBUILD = [
+    "DELETE FROM activity_counts",
+    """
+    INSERT INTO activity_counts (type, source, count)
+    SELECT IFNULL(type, ''), IFNULL(source, ''), COUNT(*)
+    FROM activity
+    GROUP BY type, source
+    """,
+    "DELETE FROM puzzle_activity_rollup",
+    """
+    INSERT INTO puzzle_activity_rollup (puzzle_id, create_count, create_time_sum,
+        solve_count, solve_time_sum, last_solve_time)
+    SELECT puzzle_id,
+        SUM(type = 'create'), SUM(IF(type = 'create', UNIX_TIMESTAMP(time), 0)),
+        SUM(type = 'solve'), SUM(IF(type = 'solve', UNIX_TIMESTAMP(time), 0)),
+        MAX(IF(type = 'solve', time, NULL))
+    FROM activity
+    WHERE type IN ('create', 'solve') AND puzzle_id IS NOT NULL
+    GROUP BY puzzle_id
+    """,
+]
+
+
+def run(conn):
+    """Create the tables if needed and rebuild them. Returns (success, message)."""
+    cursor = conn.cursor()
+
+    for statement in CREATE_TABLES:
+        cursor.execute(statement)
+    cursor.execute(
+        """
+        SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'puzzle_activity_rollup'
+          AND COLUMN_NAME = 'first_create_time'
+        """
+    )
+    if cursor.fetchone():
+        cursor.execute("ALTER TABLE puzzle_activity_rollup DROP COLUMN first_create_time")
+
+    for statement in REBUILD:
+        cursor.execute(statement)
+    conn.commit()
+
+    cursor.execute("SELECT COALESCE(SUM(count), 0) AS n FROM activity_counts")
+    rows = cursor.fetchone()["n"]
+    cursor.execute("SELECT COUNT(*) AS n FROM puzzle_activity_rollup")
+    puzzles = cursor.fetchone()["n"]
+    return True, f"Rolled up {rows} activity row(s) and {puzzles} puzzle timer(s)"
@@ -0,0 +1,47 @@
+"""
+Add the bot_state table for bigjimmybot's non-metric bookkeeping.
+
+Background:
+    bigjimmybot follows the Google Drive changes feed so that it only reads
+    sheets that changed since its last round. The feed is resumed from a
+    page token, which must survive bot restarts so edits made while the bot
+    was down are still seen. botstats is not a fit: every botstats row is
+    exported as a Prometheus metric.
+
+    Until this migration runs, pblib.get_bot_state returns None and
+    set_bot_state logs and skips; the bot then keeps the token in memory
+    only and polls every sheet once after each restart.
+
+Idempotent: safe to re-run. Skips if the table already exists.
+"""
+
+name = "add_bot_state_table"
+description = "Add bot_state table for bigjimmybot's Drive changes page token"
+
+
+def run(conn):
+    """Create bot_state if it doesn't exist. Returns (success, message)."""
+    cursor = conn.cursor()
+
+    cursor.execute(
+        """
+        SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'bot_state'
+        """
+    )
+    if cursor.fetchone():
+        return True, "Table bot_state already exists, nothing to do"
+
+    cursor.execute(
+        """
+        CREATE TABLE bot_state (
+          `key` varchar(100) NOT NULL,
+          `val` varchar(1000) DEFAULT NULL,
+          `updated` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+          PRIMARY KEY (`key`)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    )
+    conn.commit()
+    return True, "Created bot_state table"
@@ -7,7 +7,9 @@ Background:
     Redis rewrite lost those increments, leaving the Grafana "Cache HitRate"
     panel without data. The app now re-increments them (pbrest._get_all_with_cache)
     and also exposes new Redis-specific counters (write-through failures,
-    rebuild-lock contention, cold-start backfills).
+    rebuild-lock contention, cold-start backfills, fresh vs. stale serves of
+    the stale-while-revalidate blob, background rebuilder latency and
+    coalescing).
 
     METRICS_METADATA (config table) drives www/metrics.php: only keys listed
     there get HELP/TYPE headers in the Prometheus export. Fresh installs get
@@ -44,11 +46,32 @@ NEW_METRICS = {
         "type": "counter",
         "description": "Total lastact hash cold-start backfills from DB (Redis flush/restart)",
     },
+    "cache_fresh_serves_total": {
+        "type": "counter",
+        "description": "Total /all responses served from a fresh cached blob",
+    },
+    "cache_stale_serves_total": {
+        "type": "counter",
+        "description": "Total /all responses served from a stale cached blob while another worker rebuilt it",
+    },
+    "cache_background_rebuilds_total": {
+        "type": "counter",
+        "description": "Total /all blob rebuilds done by the background rebuilder",
+    },
+    "cache_rebuild_requests_total": {
+        "type": "counter",
+        "description": "Total invalidations consumed by the background rebuilder (divide by rebuilds for the coalescing ratio)",
+    },
+    "cache_rebuild_seconds": {
+        "type": "gauge",
+        "description": "Duration in seconds of the last background /all blob rebuild",
+    },
 }
 
 # Also refresh the invalidations description to match the schema seed.
 UPDATED_DESCRIPTIONS = {
     "cache_invalidations_total": "Total /all blob cache invalidations (structural mutations)",
+    "cache_rebuild_lock_contentions_total": "Total /all cold misses served from DB because the concurrent rebuild did not land in time",
 }
 
 
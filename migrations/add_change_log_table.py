@@ -0,0 +1,50 @@
+"""
+Add the change_log table backing GET /all/changes delta sync.
+
+Background:
+    Every write that changes what /all serves (puzzles, rounds, hints,
+    lastact) appends an (entity, entity_id) row to change_log inside its own
+    transaction. The AUTO_INCREMENT id is a durable, monotonic sequence:
+    clients poll /all/changes?since=<seq> and receive only the entities
+    touched since then, instead of the full ~1MB /all document every 5s.
+
+    bigjimmybot prunes the table to the newest pblib.CHANGE_LOG_RETENTION
+    rows each loop; clients behind the retained window get a full snapshot.
+
+    Until this migration runs, pblib.record_change logs and skips its insert,
+    and /all/changes errors — /all itself is unaffected.
+
+Idempotent: safe to re-run. Skips if the table already exists.
+"""
+
+name = "add_change_log_table"
+description = "Add change_log table for /all/changes delta sync"
+
+
+def run(conn):
+    """Create change_log if it doesn't exist. Returns (success, message)."""
+    cursor = conn.cursor()
+
+    cursor.execute(
+        """
+        SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'change_log'
+        """
+    )
+    if cursor.fetchone():
+        return True, "Table change_log already exists, nothing to do"
+
+    cursor.execute(
+        """
+        CREATE TABLE change_log (
+          id bigint(20) NOT NULL AUTO_INCREMENT,
+          entity enum('puzzle','round','hint','lastact') NOT NULL,
+          entity_id int(11) NOT NULL,
+          time timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+          PRIMARY KEY (id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    )
+    conn.commit()
+    return True, "Created change_log table"
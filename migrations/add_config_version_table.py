@@ -0,0 +1,47 @@
+"""
+Add the config_version table behind push-based config reloads.
+
+Background:
+    Every pbrest worker and bigjimmybot used to re-read puzzleboss.yaml and
+    SELECT * FROM config on a fresh MySQL connection every 30s (bigjimmybot
+    every loop). Now POST /config bumps a single-row version counter in the
+    same transaction as the change and announces it over Redis, and
+    processes reload only when the version moves. With Redis down they poll
+    this one row instead of the whole table.
+
+    Until this migration runs, processes fall back to the old periodic full
+    reload.
+
+Idempotent: safe to re-run. Skips if the table already exists.
+"""
+
+name = "add_config_version_table"
+description = "Add config_version table for push-based config reloads"
+
+
+def run(conn):
+    """Create config_version if it doesn't exist. Returns (success, message)."""
+    cursor = conn.cursor()
+
+    cursor.execute(
+        """
+        SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'config_version'
+        """
+    )
+    if cursor.fetchone():
+        return True, "Table config_version already exists, nothing to do"
+
+    cursor.execute(
+        """
+        CREATE TABLE config_version (
+          id tinyint(4) NOT NULL DEFAULT 1,
+          version bigint(20) NOT NULL DEFAULT 0,
+          PRIMARY KEY (id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    )
+    cursor.execute("INSERT INTO config_version (id, version) VALUES (1, 0)")
+    conn.commit()
+    return True, "Created config_version table"
@@ -0,0 +1,133 @@
+"""
+Add the solver_state table and serve solver_view from it.
+
+Background:
+    bigjimmybot looks up the editing solver for every sheet edit it sees
+    (get_solver_by_name_from_db, then get_solver_by_id_from_db), and
+    GET /solvers/<id> does the same. Each lookup assembled the solver's
+    current puzzle and history from the assignment tables and found the last
+    activity with an ORDER BY time DESC over all of the solver's activity
+    rows, which grows with the hunt.
+
+    solver_state keeps one row per solver:
+      current_puzzle_id / current_puzzle_name
+      history_puzzle_ids  - JSON array of puzzle ids
+      last_activity_id / last_activity_time
+    pblib writes it in the same transaction as the assignment, history or
+    activity change it mirrors (assign/unassign/clear, the history
+    endpoints, log_activity, puzzle renames). solver_view reads it with a
+    primary-key join, and get_last_activity_for_solver fetches the activity
+    row by last_activity_id. The API output is unchanged.
+
+    Requires normalize_solver_assignments (the backfill reads its tables).
+
+    Online: pblib starts writing solver_state as soon as the table exists
+    (writes fail harmlessly before that), and the backfill recomputes every
+    row from the assignment tables and the activity table. A change
+    committed while the backfill runs can be overwritten by the value it
+    read a moment earlier; re-run the migration after deploying to be sure.
+
+Idempotent: safe to re-run. Rows are recomputed and the view redefined
+each time.
+"""
+
+name = "add_solver_state_table"
+description = "Add solver_state table (current puzzle, history, last activity per solver) and point solver_view at it"
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS solver_state (
+      solver_id int(11) NOT NULL,
+      current_puzzle_id int(11) DEFAULT NULL,
+      current_puzzle_name varchar(255) DEFAULT NULL,
+      history_puzzle_ids json DEFAULT NULL,
+      last_activity_id int(11) DEFAULT NULL,
+      last_activity_time timestamp NULL DEFAULT NULL,
+      PRIMARY KEY (solver_id),
+      KEY idx_solver_state_current_puzzle (current_puzzle_id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# One pass over activity (window function) rather than a lookup per solver.
+BACKFILL = """
+    INSERT INTO solver_state (solver_id, current_puzzle_id, current_puzzle_name,
+                              history_puzzle_ids, last_activity_id, last_activity_time)
+    SELECT
+        s.id,
+        c.puzzle_id,
+        p.name,
+        IFNULL((
+            SELECT JSON_ARRAYAGG(h.puzzle_id)
+            FROM puzzle_solver_history h
+            WHERE h.solver_id = s.id
+        ), JSON_ARRAY()),
+        la.id,
+        la.time
+    FROM solver s
+    LEFT JOIN puzzle_current_solver c ON c.solver_id = s.id
+    LEFT JOIN puzzle p ON p.id = c.puzzle_id
+    LEFT JOIN (
+        SELECT id, solver_id, time FROM (
+            SELECT id, solver_id, time,
+                   ROW_NUMBER() OVER (PARTITION BY solver_id ORDER BY time DESC, id DESC) AS rn
+            FROM activity
+        ) ranked
+        WHERE rn = 1
+    ) la ON la.solver_id = s.id
+    ON DUPLICATE KEY UPDATE
+        current_puzzle_id = VALUES(current_puzzle_id),
+        current_puzzle_name = VALUES(current_puzzle_name),
+        history_puzzle_ids = VALUES(history_puzzle_ids),
+        last_activity_id = VALUES(last_activity_id),
+        last_activity_time = VALUES(last_activity_time)
+"""
+
+# Same definition as scripts/puzzleboss.sql.
+SOLVER_VIEW = """
+    CREATE OR REPLACE VIEW solver_view AS
+    SELECT
+        solver.id,
+        solver.name,
+        IFNULL((
+            SELECT GROUP_CONCAT(DISTINCT p.name ORDER BY p.name)
+            FROM JSON_TABLE(
+                ss.history_puzzle_ids,
+                '$[*]' COLUMNS (
+                    puzzle_id INT PATH '$'
+                )
+            ) AS jt
+            JOIN puzzle p ON p.id = jt.puzzle_id
+        ), '') AS puzzles,
+        IFNULL(ss.current_puzzle_name, '') AS puzz,
+        solver.fullname,
+        solver.chat_uid,
+        solver.chat_name
+    FROM solver
+    LEFT JOIN solver_state ss ON ss.solver_id = solver.id
+"""
+
+
+def run(conn):
+    """Create, backfill and switch solver_view over. Returns (success, message)."""
+    cursor = conn.cursor()
+
+    cursor.execute(
+        """
+        SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'puzzle_current_solver'
+        """
+    )
+    if not cursor.fetchone():
+        return False, "Run normalize_solver_assignments first"
+
+    cursor.execute(CREATE_TABLE)
+    cursor.execute(BACKFILL)
+    conn.commit()
+
+    cursor.execute("SELECT COUNT(*) AS n FROM solver_state")
+    count = cursor.fetchone()["n"]
+
+    cursor.execute(SOLVER_VIEW)
+    conn.commit()
+
+    return True, f"solver_state holds {count} solver(s); solver_view now reads it"
@@ -0,0 +1,237 @@
+"""
+Move solver assignments into indexed tables.
+
+Background:
+    Current and historical assignments live in the puzzle.current_solvers and
+    puzzle.solver_history JSON columns. Finding the puzzle a solver is on
+    (assign_solver_to_puzzle, solver_view's get_current_puzzle) meant a
+    JSON_TABLE expansion of every puzzle row, and puzzle_view expanded both
+    columns with correlated JSON_TABLE subqueries for every puzzle.
+
+    This adds
+      puzzle_current_solver (solver_id PK, puzzle_id) - one row per assigned
+          solver; the primary key enforces one current puzzle per solver
+      puzzle_solver_history (puzzle_id, solver_id) PK, plus a solver_id index
+    backfills them from the JSON columns, then redefines puzzle_view,
+    solver_view and the get_current_solvers / get_all_solvers /
+    get_current_puzzle / get_all_puzzles functions to read them. The API
+    output is unchanged: the views return the same columns and values.
+
+    Online: pblib already writes both the JSON columns and these tables
+    (table writes fail harmlessly until they exist), so the backfill only has
+    to copy what was there before the tables were created. The JSON columns
+    stay written so older code keeps working; they can be dropped later.
+    A solver listed on several puzzles in current_solvers (stale data) keeps
+    the lowest puzzle id, which is the one get_current_puzzle reported.
+
+Idempotent: safe to re-run. Existing rows are kept (INSERT IGNORE) and the
+views/functions are redefined each time.
+"""
+
+name = "normalize_solver_assignments"
+description = "Add puzzle_current_solver/puzzle_solver_history tables, backfill from JSON, and point views at them"
+
+CREATE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS puzzle_current_solver (
+      solver_id int(11) NOT NULL,
+      puzzle_id int(11) NOT NULL,
+      PRIMARY KEY (solver_id),
+      KEY idx_current_solver_puzzle (puzzle_id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS puzzle_solver_history (
+      puzzle_id int(11) NOT NULL,
+      solver_id int(11) NOT NULL,
+      PRIMARY KEY (puzzle_id, solver_id),
+      KEY idx_solver_history_solver (solver_id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+]
+
+BACKFILL = [
+    (
+        "puzzle_current_solver",
+        """
+        INSERT IGNORE INTO puzzle_current_solver (solver_id, puzzle_id)
+        SELECT jt.solver_id, p.id
+        FROM puzzle p,
+        JSON_TABLE(
+            p.current_solvers,
+            '$.solvers[*]' COLUMNS (
+                solver_id INT PATH '$.solver_id'
+            )
+        ) AS jt
+        WHERE jt.solver_id IS NOT NULL
+        ORDER BY p.id
+        """,
+    ),
+    (
+        "puzzle_solver_history",
+        """
+        INSERT IGNORE INTO puzzle_solver_history (puzzle_id, solver_id)
+        SELECT p.id, jt.solver_id
+        FROM puzzle p,
+        JSON_TABLE(
+            p.solver_history,
+            '$.solvers[*]' COLUMNS (
+                solver_id INT PATH '$.solver_id'
+            )
+        ) AS jt
+        WHERE jt.solver_id IS NOT NULL
+        """,
+    ),
+]
+
+# Same definitions as scripts/puzzleboss.sql. Function parameters shadow
+# unqualified column names, so every column below is table-qualified.
+REDEFINE = [
+    "DROP FUNCTION IF EXISTS get_current_solvers",
+    """
+    CREATE FUNCTION get_current_solvers(puzzle_id INT)
+    RETURNS TEXT
+    DETERMINISTIC
+    SQL SECURITY INVOKER
+    BEGIN
+        DECLARE result TEXT;
+        SELECT GROUP_CONCAT(solver.name ORDER BY solver.name) INTO result
+        FROM puzzle_current_solver c
+        JOIN solver ON solver.id = c.solver_id
+        WHERE c.puzzle_id = puzzle_id;
+        RETURN IFNULL(result, '');
+    END
+    """,
+    "DROP FUNCTION IF EXISTS get_all_solvers",
+    """
+    CREATE FUNCTION get_all_solvers(puzzle_id INT)
+    RETURNS TEXT
+    DETERMINISTIC
+    SQL SECURITY INVOKER
+    BEGIN
+        DECLARE result TEXT;
+        SELECT GROUP_CONCAT(DISTINCT solver.name ORDER BY solver.name) INTO result
+        FROM puzzle_solver_history h
+        JOIN solver ON solver.id = h.solver_id
+        WHERE h.puzzle_id = puzzle_id;
+        RETURN IFNULL(result, '');
+    END
+    """,
+    "DROP FUNCTION IF EXISTS get_current_puzzle",
+    """
+    CREATE FUNCTION get_current_puzzle(solver_id INT)
+    RETURNS TEXT CHARACTER SET utf8mb4
+    DETERMINISTIC
+    SQL SECURITY INVOKER
+    BEGIN
+        DECLARE result TEXT CHARACTER SET utf8mb4;
+        SELECT p.name INTO result
+        FROM puzzle_current_solver c
+        JOIN puzzle p ON p.id = c.puzzle_id
+        WHERE c.solver_id = solver_id;
+        RETURN IFNULL(result, '');
+    END
+    """,
+    "DROP FUNCTION IF EXISTS get_all_puzzles",
+    """
+    CREATE FUNCTION get_all_puzzles(solver_id INT)
+    RETURNS TEXT CHARACTER SET utf8mb4
+    DETERMINISTIC
+    SQL SECURITY INVOKER
+    BEGIN
+        DECLARE result TEXT CHARACTER SET utf8mb4;
+        SELECT GROUP_CONCAT(DISTINCT p.name ORDER BY p.name) INTO result
+        FROM puzzle_solver_history h
+        JOIN puzzle p ON p.id = h.puzzle_id
+        WHERE h.solver_id = solver_id;
+        RETURN IFNULL(result, '');
+    END
+    """,
+    """
+    CREATE OR REPLACE VIEW puzzle_view AS
+    SELECT
+        p.id,
+        p.name,
+        p.status,
+        p.answer,
+        r.name AS roundname,
+        p.round_id,
+        p.comments,
+        p.drive_uri,
+        p.chat_channel_name,
+        p.chat_channel_id,
+        p.chat_channel_link,
+        p.drive_id,
+        p.puzzle_uri,
+        p.ismeta,
+        (
+            SELECT GROUP_CONCAT(DISTINCT s.name ORDER BY s.name)
+            FROM puzzle_solver_history h
+            JOIN solver s ON s.id = h.solver_id
+            WHERE h.puzzle_id = p.id
+        ) AS solvers,
+        (
+            SELECT GROUP_CONCAT(DISTINCT s.name ORDER BY s.name)
+            FROM puzzle_current_solver c
+            JOIN solver s ON s.id = c.solver_id
+            WHERE c.puzzle_id = p.id
+        ) AS cursolvers,
+        p.xyzloc,
+        p.sheetcount,
+        p.sheetenabled,
+        (
+            SELECT GROUP_CONCAT(DISTINCT t.name ORDER BY t.name)
+            FROM JSON_TABLE(
+                p.tags,
+                '$[*]' COLUMNS (
+                    tag_id INT PATH '$'
+                )
+            ) AS jt
+            JOIN tag t ON t.id = jt.tag_id
+        ) AS tags
+    FROM puzzle p
+    LEFT JOIN round r ON p.round_id = r.id
+    """,
+    """
+    CREATE OR REPLACE VIEW solver_view AS
+    SELECT
+        solver.id,
+        solver.name,
+        IFNULL((
+            SELECT GROUP_CONCAT(DISTINCT p.name ORDER BY p.name)
+            FROM puzzle_solver_history h
+            JOIN puzzle p ON p.id = h.puzzle_id
+            WHERE h.solver_id = solver.id
+        ), '') AS puzzles,
+        IFNULL((
+            SELECT p.name
+            FROM puzzle_current_solver c
+            JOIN puzzle p ON p.id = c.puzzle_id
+            WHERE c.solver_id = solver.id
+        ), '') AS puzz,
+        solver.fullname,
+        solver.chat_uid,
+        solver.chat_name
+    FROM solver
+    """,
+]
+
+
+def run(conn):
+    """Create, backfill and switch over. Returns (success, message)."""
+    cursor = conn.cursor()
+
+    for statement in CREATE_TABLES:
+        cursor.execute(statement)
+
+    copied = []
+    for table, statement in BACKFILL:
+        cursor.execute(statement)
+        copied.append(f"{cursor.rowcount} {table} row(s)")
+    conn.commit()
+
+    for statement in REDEFINE:
+        cursor.execute(statement)
+    conn.commit()
+
+    return True, f"Backfilled {', '.join(copied)}; views and functions now read the tables"
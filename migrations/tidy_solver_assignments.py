@@ -0,0 +1,121 @@
+"""
+Drop assignment rows left behind by deleted puzzles and solvers, and sort
+the solver and puzzle name lists.
+
+Background:
+    Deleting a puzzle cleared its current solvers but left its
+    puzzle_solver_history rows, and deleting a solver left all of its
+    puzzle_current_solver, puzzle_solver_history and solver_state rows.
+    pblib.delete_puzzle / delete_solver now remove them in the same
+    transaction as the delete; this removes the ones already orphaned and
+    recomputes solver_state.history_puzzle_ids from what is left.
+
+    The solvers/cursolvers columns of puzzle_view, the puzzles column of
+    solver_view and the get_current_solvers / get_all_solvers /
+    get_all_puzzles functions used GROUP_CONCAT without ORDER BY, so the
+    order of names depended on the plan MySQL picked and could change
+    between two reads of an unchanged puzzle. They now sort by name, like
+    tags. This redefines them on installs where normalize_solver_assignments
+    and add_solver_state_table already ran.
+
+    Requires normalize_solver_assignments. Can run during the hunt.
+
+Idempotent: safe to re-run. Orphans are deleted and the views/functions
+are redefined each time.
+"""
+
+from .add_solver_state_table import SOLVER_VIEW
+from .normalize_solver_assignments import REDEFINE
+
+name = "tidy_solver_assignments"
+description = "Delete assignment rows of deleted puzzles/solvers and sort solver/puzzle name lists by name"
+
+CLEANUP = [
+    (
+        "puzzle_current_solver",
+        """
+        DELETE c FROM puzzle_current_solver c
+        LEFT JOIN puzzle p ON p.id = c.puzzle_id
+        LEFT JOIN solver s ON s.id = c.solver_id
+        WHERE p.id IS NULL OR s.id IS NULL
+        """,
+    ),
+    (
+        "puzzle_solver_history",
+        """
+        DELETE h FROM puzzle_solver_history h
+        LEFT JOIN puzzle p ON p.id = h.puzzle_id
+        LEFT JOIN solver s ON s.id = h.solver_id
+        WHERE p.id IS NULL OR s.id IS NULL
+        """,
+    ),
+]
+
+SOLVER_STATE_CLEANUP = [
+    (
+        "solver_state",
+        """
+        DELETE ss FROM solver_state ss
+        LEFT JOIN solver s ON s.id = ss.solver_id
+        WHERE s.id IS NULL
+        """,
+    ),
+    (
+        "solver_state current puzzle",
+        """
+        UPDATE solver_state ss
+        LEFT JOIN puzzle p ON p.id = ss.current_puzzle_id
+        SET ss.current_puzzle_id = NULL, ss.current_puzzle_name = NULL
+        WHERE ss.current_puzzle_id IS NOT NULL AND p.id IS NULL
+        """,
+    ),
+]
+
+REBUILD_HISTORY = """
+    UPDATE solver_state ss
+    SET ss.history_puzzle_ids = IFNULL((
+        SELECT JSON_ARRAYAGG(h.puzzle_id)
+        FROM puzzle_solver_history h
+        WHERE h.solver_id = ss.solver_id
+    ), JSON_ARRAY())
+"""
+
+
+def _table_exists(cursor, table):
+    cursor.execute(
+        """
+        SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = %s
+        """,
+        (table,),
+    )
+    return cursor.fetchone() is not None
+
+
+def run(conn):
+    """Clean up and redefine. Returns (success, message)."""
+    cursor = conn.cursor()
+
+    if not _table_exists(cursor, "puzzle_current_solver"):
+        return False, "Run normalize_solver_assignments first"
+    has_solver_state = _table_exists(cursor, "solver_state")
+
+    cleanup = CLEANUP + (SOLVER_STATE_CLEANUP if has_solver_state else [])
+    removed = []
+    for table, statement in cleanup:
+        cursor.execute(statement)
+        removed.append(f"{cursor.rowcount} {table} row(s)")
+    if has_solver_state:
+        cursor.execute(REBUILD_HISTORY)
+    conn.commit()
+
+    # normalize_solver_assignments' solver_view reads the assignment tables;
+    # once solver_state exists, keep serving it from there.
+    for statement in REDEFINE:
+        if has_solver_state and "VIEW solver_view" in statement:
+            statement = SOLVER_VIEW
+        cursor.execute(statement)
+    conn.commit()
+
+    return True, f"Cleaned up {', '.join(removed)}; name lists now sorted"
@@ -3,21 +3,72 @@ PuzzleBoss Cache Library - Redis operations
 
 This module provides Redis-backed caching:
 
-- The /all response blob (``CACHE_KEY``): structural rounds/puzzles data,
-  15s TTL, invalidated only on structural changes (see pblib's allowlist).
+- The /all response blob: structural rounds/puzzles data, stored as one
+  JSON fragment per round (``ROUND_KEY_PREFIX``) plus the hint queue
+  (``HINTS_KEY``) and a small index (``INDEX_KEY``: round order and
+  puzzle→round map), and assembled with one MGET. Structural changes (see
+  pblib's allowlist) record which puzzles/rounds they touched in
+  ``DIRTY_KEY`` (each marker with a generation bumped on every change), so
+  the rebuild re-queries only those rounds and clears only the markers no
+  write has touched since it read them. Served
+  stale-while-revalidate: a freshness marker (``FRESH_KEY``) carries the
+  15s soft TTL and is the only thing invalidation deletes; the fragments
+  live for the hard TTL, so while one worker rebuilds, the others keep
+  serving the previous blob. ``AS_OF_KEY`` records the newest database
+  state the blob reflects, so a refresh from a lagging read replica never
+  replaces it with older data.
 - The lastact hash (``LASTACT_KEY``): one field per puzzle id holding the
-  puzzle's most recent activity row as JSON. Write-through: updated in place
-  by pblib.log_activity() on every activity insert, never invalidated.
+  puzzle's most recent activity row as a compact fixed-layout record
+  (``LASTACT_RECORD``). Write-through: updated in place by
+  pblib.log_activity() on every activity insert, never invalidated. Read
+  together with the blob's index in one pipelined round trip
+  (all_snapshot_get). Binary values, so it goes through ``rcb``.
 - A rebuild lock (``LOCK_KEY``): SET NX guard so concurrent /all cache
   misses produce one rebuild instead of a stampede.
+- A rebuild queue (``REBUILD_QUEUE_KEY``): every invalidation pushes a
+  request; one elected pbrest process (``BlobRebuilder``, holding
+  ``REBUILDER_LEASE_KEY``) drains it after a short debounce and rebuilds the
+  blob once per burst, so readers rarely pay the rebuild themselves.
+- Two version stamps backing the /all ETag: ``BLOB_VERSION_KEY`` (a content
+  hash of the assembled blob, written and expired with its fragments) and
+  ``LASTACT_VERSION_KEY`` (an INCR counter bumped after every lastact hash
+  write). A conditional GET compares both with one MGET and never decodes
+  the blob.
+- Ready-to-send /all response bodies (``BODY_KEY_PREFIX`` + ETag): the
+  complete response (blob + lastact) serialized once and stored gzip- and
+  brotli-compressed per (blob version, lastact version), so a hit streams
+  bytes from Redis with no decode/attach/re-encode. Binary values, so these
+  go through a second client (``rcb``) without response decoding.
+- A pub/sub channel (``EVENTS_CHANNEL``): a small JSON event is published on
+  every blob invalidation and lastact write-through. Each pbrest process
+  holds one subscription (``EventHub``) and fans events out to its
+  connected /events SSE clients.
+- The config version (``CONFIG_VERSION_KEY`` / ``CONFIG_CHANNEL``): POST
+  /config announces the new config_version row here, and every process's
+  ``ConfigWatcher`` passes it to pblib, which reloads config only when the
+  version moves.
 
 All operations are fail-safe: if Redis is unavailable they return None /
 no-op and the caller falls through to the database.
 """
 
+import gzip
+import hashlib
 import json
+import os
+import queue
+import socket
+import struct
+import threading
+import time
 
-from pblib import debug_log, increment_botstat
+from pblib import (
+    count_botstat,
+    debug_log,
+    increment_botstat,
+    note_config_version,
+    subscribe_config,
+)
 
 # Optional redis support
 try:
@@ -28,6 +79,14 @@ except ImportError:
     REDIS_AVAILABLE = False
     debug_log(3, "redis-py not installed - caching disabled")
 
+# Optional brotli support for pre-compressed /all bodies (gzip always works)
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 # Tracks whether the last Redis operation succeeded, so we log one SEV2 line
 # per worker on the working→down transition (and a SEV3 line on recovery)
 # instead of a flood of identical per-request errors. None = no op attempted
@@ -55,40 +114,74 @@ def _note_redis_ok():
     _redis_healthy = True
 
 
-def _incr(stat):
-    """Fail-safe counter bump that opens its own short-lived DB connection.
-    Used for cache metrics on paths that don't already hold a conn. Never
-    raises — a stats failure must not affect the cache operation."""
-    try:
-        from pblib import create_db_connection
-
-        conn = create_db_connection()
-        try:
-            increment_botstat(stat, conn)
-        finally:
-            conn.close()
-    except Exception as e:
-        debug_log(3, f"failed to increment {stat}: {e}")
-
-
-# Redis client (initialized later after config is available)
+# Redis clients (initialized later after config is available). rcb shares
+# the server but returns raw bytes, for the compressed /all bodies and the
+# packed lastact records.
 rc = None
-CACHE_KEY = "puzzleboss:all"
-CACHE_TTL = 15  # seconds
+rcb = None
+CACHE_TTL = 15  # seconds — soft TTL: the blob is rebuilt after this
+CACHE_HARD_TTL = 300  # seconds — how long a stale blob may still be served
+FRESH_KEY = "puzzleboss:all:fresh"
+ROUND_KEY_PREFIX = "puzzleboss:all:round:"
+HINTS_KEY = "puzzleboss:all:hints"
+INDEX_KEY = "puzzleboss:all:index"
+# Hash of "puzzle:<id>" / "round:<id>" / "hints" / "*" markers left by
+# invalidations, each mapped to a generation that every invalidation of it
+# bumps. A rebuild clears a marker only if its generation is still the one
+# the rebuild read, so a change that lands mid-rebuild keeps it dirty.
+DIRTY_KEY = "puzzleboss:all:dirty_markers"
+# Present for the soft TTL after a full rebuild; targeted rebuilds only
+# happen while it is.
+FULL_KEY = "puzzleboss:all:full"
+# Unix time of the newest database state the blob reflects: the read time
+# minus the replica lag the rebuild read at.
+AS_OF_KEY = "puzzleboss:all:as_of"
 LASTACT_KEY = "puzzleboss:lastact"
 LOCK_KEY = "puzzleboss:all:lock"
 LOCK_TTL = 5  # seconds — bounds how long a crashed rebuilder blocks others
+# How long a cold-miss lock loser waits for the holder's blob before giving
+# up and reading MySQL itself. Only hit when there is no blob at all, stale or
+# fresh (first request after a Redis flush or a hard-TTL expiry).
+REBUILD_WAIT = 1.0  # seconds
+REBUILD_WAIT_POLL = 0.05  # seconds
+REBUILD_QUEUE_KEY = "puzzleboss:all:rebuild"
+REBUILD_QUEUE_MAX = 1000  # a burst only needs to be seen, not replayed
+REBUILDER_LEASE_KEY = "puzzleboss:all:rebuilder"
+REBUILDER_LEASE_TTL = 15  # seconds — failover time if the rebuilder's worker dies
+# Invalidations within this window after the first are folded into one rebuild.
+REBUILD_DEBOUNCE = 0.25  # seconds
+# Lock value an invalidation parks on LOCK_KEY for the rebuilder, so readers
+# of the stale blob keep serving it instead of each claiming the rebuild.
+# Expires quickly in case the rebuilder never picks it up.
+REBUILD_CLAIM = "queued"
+REBUILD_CLAIM_TTL = 2  # seconds
+# BLPOP timeout; must stay under the client's 1s socket timeout.
+_REBUILD_POLL = 0.5  # seconds
+BLOB_VERSION_KEY = "puzzleboss:all:version"
+LASTACT_VERSION_KEY = "puzzleboss:lastact:version"
+EVENTS_CHANNEL = "puzzleboss:events"
+CONFIG_CHANNEL = "puzzleboss:config"
+CONFIG_VERSION_KEY = "puzzleboss:config:version"
+BODY_KEY_PREFIX = "puzzleboss:all:body:"
+# Stored encodings, in server preference order. Identity is served by
+# decompressing the gzip copy (~1ms) rather than storing a third, largest copy.
+BODY_ENCODINGS = ("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)
+# Fast settings: a body is rebuilt once per lastact version, which can change
+# several times a second during a hunt — ratio matters less than build time.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
 
 # Flag to track if the cache client has been successfully initialized.
 # Latched only on a working connection; see ensure_cache_initialized.
 _cache_initialized = False
 _last_init_attempt = None
 _INIT_RETRY_INTERVAL = 30  # seconds — retry cadence while cache is disabled/down
+_init_lock = threading.Lock()
 
 
 def init_cache(configstruct):
     """Initialize Redis client from config. Call after DB config is loaded."""
-    global rc
+    global rc, rcb
     if not REDIS_AVAILABLE:
         # Already logged once at import; stay quiet here to avoid duplication.
         return
@@ -115,10 +208,17 @@ def init_cache(configstruct):
         )
         # Test connection
         rc.set("_test", "ok", ex=1)
+        rcb = redis.Redis(
+            host=host,
+            port=port,
+            socket_timeout=1,
+            socket_connect_timeout=1,
+        )
         debug_log(3, f"Cache: Redis initialized successfully ({host}:{port})")
     except Exception as e:
         debug_log(2, f"Cache: failed to initialize Redis: {e}")
         rc = None
+        rcb = None
 
 
 def cache_get(key):
@@ -147,20 +247,460 @@ def cache_set(key, value, ttl=CACHE_TTL):
         _note_redis_error("cache_set", e)
 
 
-def cache_delete(key):
+def cache_delete(*keys):
     """Safe cache delete - fails silently if disabled"""
     if rc is None:
         return
     try:
-        rc.delete(key)
-        debug_log(5, f"cache_delete: deleted {key}")
+        rc.delete(*keys)
+        debug_log(5, f"cache_delete: deleted {', '.join(keys)}")
         _note_redis_ok()
     except Exception as e:
         _note_redis_error("cache_delete", e)
 
 
+# ── /all blob: per-round fragments + version stamps (ETag) ───────────────
+
+
+def _round_key(round_id):
+    return f"{ROUND_KEY_PREFIX}{round_id}"
+
+
+def _assemble(fragments, hints):
+    """Join stored JSON fragments into the /all blob without decoding them.
+
+    Matches json.dumps({"rounds": [...], "hints": [...]}) byte for byte.
+    """
+    return '{"rounds": [' + ", ".join(fragments) + '], "hints": ' + hints + "}"
+
+
+def _blob_version(blob):
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def _index_apply(index, rounds):
+    """Update an index document in place for rebuilt ({id: round}) and
+    deleted ({id: None}) rounds."""
+    changed = set(rounds)
+    puzzles = {p: r for p, r in index["puzzles"].items() if r not in changed}
+    round_ids = [r for r in index["rounds"] if r not in changed]
+    for rid, rnd in rounds.items():
+        if rnd is None:
+            continue
+        round_ids.append(rid)
+        for puzzle in rnd["puzzles"]:
+            puzzles[str(puzzle["id"])] = rid
+    index["rounds"] = sorted(round_ids)
+    index["puzzles"] = puzzles
+
+
+# Drop each (marker, generation) pair in ARGV from KEYS[1] whose generation
+# is unchanged; if any marker is left, delete the freshness marker KEYS[2].
+# Returns how many markers are left.
+_DIRTY_RELEASE_SCRIPT = """
+for i = 1, #ARGV, 2 do
+    if redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[i + 1] then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+    end
+end
+local left = redis.call('HLEN', KEYS[1])
+if left > 0 then
+    redis.call('DEL', KEYS[2])
+end
+return left
+"""
+
+
+def _finish_rebuild(pipe, processed):
+    """Queue the dirty-marker bookkeeping at the end of a rebuild MULTI and
+    run it: clear the markers this rebuild covered ({marker: generation}
+    from all_dirty_get) unless they were bumped since, and leave the blob
+    stale if any marker remains."""
+    args = [value for item in (processed or {}).items() for value in item]
+    pipe.eval(_DIRTY_RELEASE_SCRIPT, 2, DIRTY_KEY, FRESH_KEY, *args)
+    pipe.execute()
+
+
+def all_fragments_set(data, processed=None, ttl=CACHE_TTL, hard_ttl=CACHE_HARD_TTL, lag=0):
+    """Store a fully rebuilt /all blob as per-round fragments, marked fresh.
+
+    data is the {"rounds": [...], "hints": [...]} structure. Each round
+    (with its puzzles) becomes one fragment; the index lists the round ids
+    in order and maps every puzzle to its round, so a later targeted rebuild
+    knows which fragment a changed puzzle lives in. The version is a short
+    hash of the assembled blob, so a TTL-driven rebuild that produces
+    identical content keeps the same ETag. Everything lives for hard_ttl;
+    the freshness and full-rebuild markers for ttl. One MULTI, so a reader
+    never sees a version that doesn't match the fragments. processed is the
+    {dirty marker: generation} map this rebuild covered. lag is how many seconds behind the
+    primary the data was read (a read replica's): the blob is recorded as
+    of that much earlier, and is fresh for that much less, so it is never
+    served as fresh past ttl seconds after the state it shows. Returns the
+    version, or None if nothing was stored.
+    """
+    if rc is None:
+        return None
+    fresh_ms = max(1000, int((ttl - lag) * 1000))
+    fragments = {rnd["id"]: json.dumps(rnd) for rnd in data["rounds"]}
+    hints = json.dumps(data["hints"])
+    index = {"rounds": [], "puzzles": {}}
+    _index_apply(index, {rnd["id"]: rnd for rnd in data["rounds"]})
+    index["rounds"] = list(fragments)  # keep the database's order
+    version = _blob_version(_assemble(list(fragments.values()), hints))
+    try:
+        pipe = rc.pipeline(transaction=True)
+        for rid, fragment in fragments.items():
+            pipe.set(_round_key(rid), fragment, ex=hard_ttl)
+        pipe.set(HINTS_KEY, hints, ex=hard_ttl)
+        pipe.set(INDEX_KEY, json.dumps(index), ex=hard_ttl)
+        pipe.set(BLOB_VERSION_KEY, version, ex=hard_ttl)
+        pipe.set(AS_OF_KEY, repr(time.time() - lag), ex=hard_ttl)
+        pipe.set(FRESH_KEY, "1", px=fresh_ms)
+        pipe.set(FULL_KEY, "1", px=fresh_ms)
+        _finish_rebuild(pipe, processed)
+        debug_log(5, f"all_fragments_set: stored {len(fragments)} rounds, version {version}")
+        _note_redis_ok()
+        return version
+    except Exception as e:
+        _note_redis_error("all_fragments_set", e)
+        return None
+
+
+def all_fragments_update(rounds, hints=None, processed=None, hard_ttl=CACHE_HARD_TTL):
+    """Apply a targeted rebuild on top of the stored fragments.
+
+    rounds is {round_id: rebuilt round dict, or None if the round is gone};
+    hints is the new hint list, or None if unchanged. Every other fragment is
+    reused as stored. The blob stays fresh only until the last full rebuild's
+    soft TTL runs out, so non-structural edits still surface on schedule.
+    The rounds must have been read from the primary: the blob is recorded
+    as of now. Returns (blob, version), or (None, None) when there is
+    nothing to build on (the caller then does a full rebuild).
+    """
+    if rc is None:
+        return None, None
+    try:
+        pipe = rc.pipeline(transaction=False)
+        pipe.get(INDEX_KEY)
+        pipe.get(HINTS_KEY)
+        pipe.pttl(FULL_KEY)
+        index_json, hints_json, full_pttl = pipe.execute()
+        if not index_json or hints_json is None or full_pttl <= 0:
+            return None, None
+        index = json.loads(index_json)
+        _index_apply(index, rounds)
+        fresh = {rid: json.dumps(rnd) for rid, rnd in rounds.items() if rnd is not None}
+        reused = [rid for rid in index["rounds"] if rid not in fresh]
+        fragments = dict(fresh)
+        if reused:
+            fragments.update(zip(reused, rc.mget([_round_key(rid) for rid in reused])))
+        if any(fragment is None for fragment in fragments.values()):
+            return None, None
+        if hints is not None:
+            hints_json = json.dumps(hints)
+        blob = _assemble([fragments[rid] for rid in index["rounds"]], hints_json)
+        version = _blob_version(blob)
+
+        pipe = rc.pipeline(transaction=True)
+        for rid, fragment in fresh.items():
+            pipe.set(_round_key(rid), fragment, ex=hard_ttl)
+        for rid in reused:
+            pipe.expire(_round_key(rid), hard_ttl)
+        pipe.set(HINTS_KEY, hints_json, ex=hard_ttl)
+        pipe.set(INDEX_KEY, json.dumps(index), ex=hard_ttl)
+        pipe.set(BLOB_VERSION_KEY, version, ex=hard_ttl)
+        pipe.set(AS_OF_KEY, repr(time.time()), ex=hard_ttl)
+        pipe.set(FRESH_KEY, "1", px=full_pttl)
+        _finish_rebuild(pipe, processed)
+        debug_log(5, f"all_fragments_update: rebuilt rounds {sorted(rounds)}, version {version}")
+        _note_redis_ok()
+        return blob, version
+    except Exception as e:
+        _note_redis_error("all_fragments_update", e)
+        return None, None
+
+
+def _text(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _read_all(client, with_lastact):
+    """Shared read behind all_blob_get / all_snapshot_get (either client).
+
+    One pipelined round trip for the index, version, freshness marker and
+    hints (and, with_lastact, the raw lastact hash), then one MGET for the
+    round fragments the index names. Returns (blob, version, fresh, raw
+    lastact hash or None); blob is None on a miss.
+    """
+    pipe = client.pipeline(transaction=False)
+    pipe.mget(INDEX_KEY, BLOB_VERSION_KEY, FRESH_KEY, HINTS_KEY)
+    if with_lastact:
+        pipe.hgetall(LASTACT_KEY)
+    replies = pipe.execute()
+    index_json, version, fresh, hints = (_text(v) for v in replies[0])
+    blob = None
+    if index_json and hints is not None:
+        round_ids = json.loads(index_json)["rounds"]
+        fragments = client.mget([_round_key(rid) for rid in round_ids]) if round_ids else []
+        if all(fragment is not None for fragment in fragments):
+            blob = _assemble([_text(f) for f in fragments], hints)
+    return blob, version, bool(fresh), replies[1] if with_lastact else None
+
+
+def all_blob_get():
+    """Return (blob, version, fresh), assembling the blob from its fragments.
+
+    The version is read first, so it can only be older than the fragments,
+    never newer. fresh is False once the soft TTL has passed or a structural
+    change has marked the blob stale; the blob is still returned so it can be
+    served while someone rebuilds. (None, None, False) on a miss or when
+    Redis is unavailable.
+    """
+    if rc is None:
+        return None, None, False
+    try:
+        blob, version, fresh, _ = _read_all(rc, with_lastact=False)
+        debug_log(5, f"all_blob_get: {'miss' if not blob else 'hit' if fresh else 'stale'}")
+        _note_redis_ok()
+        if blob is None:
+            return None, None, False
+        return blob, version, fresh
+    except Exception as e:
+        _note_redis_error("all_blob_get", e)
+        return None, None, False
+
+
+def all_snapshot_get():
+    """Return (blob, version, fresh, lastact) for an /all read.
+
+    Like all_blob_get, but the lastact hash rides in the same pipelined
+    round trip as the blob's index and is decoded in one pass (see
+    decode_lastact_many). lastact is None when it could not be read, which
+    callers treat like Redis being down for lastact. On a blob miss the
+    lastact map is still returned.
+    """
+    if rcb is None:
+        return None, None, False, None
+    try:
+        blob, version, fresh, raw = _read_all(rcb, with_lastact=True)
+        debug_log(5, f"all_snapshot_get: {'miss' if not blob else 'hit' if fresh else 'stale'}")
+        _note_redis_ok()
+    except Exception as e:
+        _note_redis_error("all_snapshot_get", e)
+        return None, None, False, None
+    lastact = decode_lastact_many(raw)
+    if blob is None:
+        return None, None, False, lastact
+    return blob, version, fresh, lastact
+
+
+def all_dirty_get():
+    """Return (full, {dirty marker: generation}, {puzzle_id: round_id}) for
+    the next rebuild. The markers go back to all_fragments_set/update as
+    processed once the rebuild is stored.
+
+    full is True when nothing short of a full rebuild will do: an untargeted
+    invalidation ("*"), the last full rebuild's soft TTL has run out (which
+    is how non-structural edits reach the blob), no fragments are cached, or
+    Redis is unavailable. Otherwise the markers name the puzzles, rounds and
+    hints to rebuild, and the puzzle map (from the index) says which round a
+    changed puzzle used to be in.
+    """
+    if rc is None:
+        return True, {}, {}
+    try:
+        pipe = rc.pipeline(transaction=False)
+        pipe.hgetall(DIRTY_KEY)
+        pipe.exists(FULL_KEY)
+        pipe.get(INDEX_KEY)
+        members, full_alive, index_json = pipe.execute()
+        _note_redis_ok()
+        if "*" in members or not full_alive or not index_json:
+            return True, members, {}
+        puzzles = json.loads(index_json)["puzzles"]
+        return False, members, {int(pid): rid for pid, rid in puzzles.items()}
+    except Exception as e:
+        _note_redis_error("all_dirty_get", e)
+        return True, {}, {}
+
+
+def all_as_of_get():
+    """Return the Unix time the cached blob is as of (see AS_OF_KEY), or
+    None when there is no blob or Redis is unavailable."""
+    if rc is None:
+        return None
+    try:
+        as_of = rc.get(AS_OF_KEY)
+        _note_redis_ok()
+    except Exception as e:
+        _note_redis_error("all_as_of_get", e)
+        return None
+    try:
+        return float(as_of) if as_of is not None else None
+    except ValueError:
+        return None
+
+
+def all_versions():
+    """Return (blob_version, lastact_version, fresh) without touching the blob.
+
+    This is the whole cost of an /all conditional GET: one MGET of three
+    short strings. blob_version is None when the blob is missing (hard TTL
+    expired), in which case the caller must rebuild rather than answer 304;
+    when fresh is False the caller should try to claim the rebuild first.
+    lastact_version is "0" until the first lastact write.
+    """
+    if rc is None:
+        return None, None, False
+    try:
+        blob_version, lastact_version, fresh = rc.mget(
+            BLOB_VERSION_KEY, LASTACT_VERSION_KEY, FRESH_KEY
+        )
+        _note_redis_ok()
+        return blob_version, lastact_version or "0", bool(fresh)
+    except Exception as e:
+        _note_redis_error("all_versions", e)
+        return None, None, False
+
+
+def encode_body(body):
+    """Compress a serialized /all body into every stored encoding.
+
+    body is the UTF-8 JSON bytes. Returns {encoding: bytes}.
+    """
+    encoded = {"gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+    if BROTLI_AVAILABLE:
+        encoded["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return encoded
+
+
+def all_body_set(etag, encoded, ttl=CACHE_TTL):
+    """Store pre-compressed /all bodies for one ETag (one HSET + EXPIRE).
+
+    Keyed by the full ETag, so a body is only ever served for the exact
+    (blob version, lastact version) it was built at; superseded bodies just
+    expire.
+    """
+    if rcb is None:
+        return
+    key = BODY_KEY_PREFIX + etag
+    try:
+        pipe = rcb.pipeline(transaction=True)
+        pipe.hset(key, mapping=encoded)
+        pipe.expire(key, ttl)
+        pipe.execute()
+        debug_log(5, f"all_body_set: stored {', '.join(encoded)} for {etag}")
+        _note_redis_ok()
+    except Exception as e:
+        _note_redis_error("all_body_set", e)
+
+
+def all_body_get(etag, encoding):
+    """Return the stored body bytes for etag in `encoding`, or None.
+
+    "identity" is served from the gzip copy.
+    """
+    if rcb is None:
+        return None
+    field = "gzip" if encoding == "identity" else encoding
+    try:
+        body = rcb.hget(BODY_KEY_PREFIX + etag, field)
+        _note_redis_ok()
+    except Exception as e:
+        _note_redis_error("all_body_get", e)
+        return None
+    if body is not None and encoding == "identity":
+        body = gzip.decompress(body)
+    return body
+
+
+def _bump_lastact_version():
+    """Advance the lastact version after a hash write. Always called after the
+    write, so a reader that reads the version first never pairs a newer
+    version with older lastact content."""
+    rc.incr(LASTACT_VERSION_KEY)
+
+
 # ── lastact write-through hash ────────────────────────────────────────────
 
+# Compact lastact records. An activity row is stored as one fixed-layout
+# struct: a format byte, id, time (naive ISO 8601 at second resolution,
+# always 19 bytes), solver_id, and the type/source enum codes (0 = NULL).
+# puzzle_id is the hash field, and uri / source_version are never set by
+# activity inserts, so neither is stored. 30 bytes instead of ~160 of JSON,
+# and a whole HGETALL decodes in one struct.iter_unpack pass. Rows that don't
+# fit the layout (and entries written before it) are stored/read as JSON,
+# which can never start with the format byte.
+LASTACT_RECORD = struct.Struct("<BI19sIBB")
+LASTACT_FORMAT = 1
+# Mirror the activity.type / activity.source enums; append only.
+ACTIVITY_TYPES = (
+    None, "create", "revise", "comment", "interact", "solve", "change", "status", "assignment",
+)
+ACTIVITY_SOURCES = (None, "puzzleboss", "bigjimmybot", "discord")
+_TYPE_CODES = {name: code for code, name in enumerate(ACTIVITY_TYPES)}
+_SOURCE_CODES = {name: code for code, name in enumerate(ACTIVITY_SOURCES)}
+
+
+def encode_lastact(puzzle_id, activity_row):
+    """Encode a JSON-safe activity row for the lastact hash (bytes)."""
+    try:
+        when = activity_row["time"].encode("ascii")
+        if (
+            len(when) != 19
+            or int(activity_row["puzzle_id"]) != int(puzzle_id)
+            or activity_row.get("uri") is not None
+            or activity_row.get("source_version") is not None
+        ):
+            raise ValueError("row does not fit the compact layout")
+        return LASTACT_RECORD.pack(
+            LASTACT_FORMAT,
+            activity_row["id"],
+            when,
+            activity_row["solver_id"],
+            _TYPE_CODES[activity_row.get("type")],
+            _SOURCE_CODES[activity_row.get("source")],
+        )
+    except (KeyError, ValueError, TypeError, AttributeError, struct.error):
+        return json.dumps(activity_row).encode("utf-8")
+
+
+def decode_lastact_many(raw):
+    """Decode {hash field: stored value} into {puzzle_id (int): activity_row}.
+
+    Compact records are unpacked together from their concatenation; JSON
+    values one at a time. A corrupt entry is skipped (logged) so it degrades
+    only that puzzle, to a DB fallback in pbrest.
+    """
+    result = {}
+    packed_pids, packed = [], []
+    for field, value in raw.items():
+        try:
+            pid = int(field)
+            if len(value) == LASTACT_RECORD.size and value[0] == LASTACT_FORMAT:
+                packed_pids.append(pid)
+                packed.append(value)
+            else:
+                result[pid] = json.loads(value)
+        except (ValueError, TypeError) as e:
+            debug_log(2, f"lastact: skipping corrupt entry for pid {field!r}: {e}")
+    records = LASTACT_RECORD.iter_unpack(b"".join(packed))
+    for pid, (_, activity_id, when, solver_id, type_code, source_code) in zip(packed_pids, records):
+        try:
+            result[pid] = {
+                "id": activity_id,
+                "time": when.decode("ascii"),
+                "solver_id": solver_id,
+                "puzzle_id": pid,
+                "source": ACTIVITY_SOURCES[source_code],
+                "type": ACTIVITY_TYPES[type_code],
+                "uri": None,
+                "source_version": None,
+            }
+        except (IndexError, UnicodeDecodeError) as e:
+            debug_log(2, f"lastact: skipping corrupt entry for pid {pid}: {e}")
+    return result
+
 
 def lastact_set(puzzle_id, activity_row):
     """Write-through a puzzle's latest activity row to the lastact hash.
@@ -169,15 +709,18 @@ def lastact_set(puzzle_id, activity_row):
     Fail-safe: a missed write leaves that puzzle's entry stale until its
     next activity; readers self-heal via the DB fallback in pbrest.
     """
-    if rc is None:
+    if rcb is None:
         return
     try:
-        rc.hset(LASTACT_KEY, str(int(puzzle_id)), json.dumps(activity_row))
+        rcb.hset(LASTACT_KEY, str(int(puzzle_id)), encode_lastact(puzzle_id, activity_row))
+        _bump_lastact_version()
         debug_log(5, f"lastact_set: puzzle {puzzle_id}")
         _note_redis_ok()
     except Exception as e:
         _note_redis_error("lastact_set", e)
-        _incr("cache_write_through_failures_total")
+        count_botstat("cache_write_through_failures_total")
+        return
+    publish_event("lastact", puzzle_id=int(puzzle_id), lastact=activity_row)
 
 
 def lastact_get_all():
@@ -186,81 +729,330 @@ def lastact_get_all():
     Returns None (not {}) when Redis is unavailable so callers can
     distinguish "cache down — use the DB" from "no activity yet".
     """
-    if rc is None:
+    if rcb is None:
         return None
     try:
-        raw = rc.hgetall(LASTACT_KEY)
+        raw = rcb.hgetall(LASTACT_KEY)
         _note_redis_ok()
     except Exception as e:
         _note_redis_error("lastact_get_all", e)
         return None
-    # Decode per-item so one corrupt entry degrades only that puzzle (to a DB
-    # fallback in pbrest), not all of them. A malformed value here is a
-    # data-quality issue, not a Redis-down condition, so don't return None.
-    result = {}
-    for pid, val in raw.items():
-        try:
-            result[int(pid)] = json.loads(val)
-        except (ValueError, TypeError) as e:
-            debug_log(2, f"lastact_get_all: skipping corrupt entry for pid {pid!r}: {e}")
-    return result
+    # A malformed value is a data-quality issue, not a Redis-down condition:
+    # it is skipped by the decode rather than returning None for everyone.
+    return decode_lastact_many(raw)
 
 
 def lastact_get(puzzle_id):
     """Return one puzzle's latest activity row from the hash, or None."""
-    if rc is None:
+    if rcb is None:
         return None
     try:
-        raw = rc.hget(LASTACT_KEY, str(int(puzzle_id)))
+        pid = int(puzzle_id)
+        raw = rcb.hget(LASTACT_KEY, str(pid))
         _note_redis_ok()
-        return json.loads(raw) if raw else None
+        return decode_lastact_many({pid: raw}).get(pid) if raw else None
     except Exception as e:
         _note_redis_error("lastact_get", e)
         return None
 
 
+def lastact_get_many(puzzle_ids):
+    """Return {puzzle_id (int): activity_row or None} via one HMGET.
+
+    Returns None when Redis is unavailable, like lastact_get_all. A missing
+    or corrupt entry maps to None so the caller can fall back per puzzle.
+    """
+    if rcb is None:
+        return None
+    pids = [int(pid) for pid in puzzle_ids]
+    if not pids:
+        return {}
+    try:
+        raw = rcb.hmget(LASTACT_KEY, [str(pid) for pid in pids])
+        _note_redis_ok()
+    except Exception as e:
+        _note_redis_error("lastact_get_many", e)
+        return None
+    found = decode_lastact_many({pid: val for pid, val in zip(pids, raw) if val})
+    return {pid: found.get(pid) for pid in pids}
+
+
 def lastact_delete(puzzle_id):
     """Remove a puzzle from the lastact hash (call on puzzle deletion)."""
     if rc is None:
         return
     try:
         rc.hdel(LASTACT_KEY, str(int(puzzle_id)))
+        _bump_lastact_version()
         debug_log(5, f"lastact_delete: puzzle {puzzle_id}")
         _note_redis_ok()
     except Exception as e:
         _note_redis_error("lastact_delete", e)
 
 
+# HSETNX every (field, value) pair in ARGV; returns how many were set.
+_LASTACT_BACKFILL_SCRIPT = """
+local n = 0
+for i = 1, #ARGV, 2 do
+    n = n + redis.call('HSETNX', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return n
+"""
+
+
 def lastact_set_many(rows_by_pid):
     """Bulk-populate the lastact hash (cold-start backfill from the DB).
 
     A cold-start backfill means the hash was empty (Redis flushed/restarted or
     freshly deployed) and the /all read fell back to the DB GROUP BY. Logged at
     SEV3 and counted so the recovery is visible in production.
+
+    Only fills puzzles the hash has no entry for (HSETNX, in one script
+    call): the rows may come from a lagging read replica, and a
+    write-through that landed since the hash was found empty is newer.
     """
-    if rc is None or not rows_by_pid:
+    if rcb is None or not rows_by_pid:
         return
+    args = []
+    for pid, row in rows_by_pid.items():
+        args += [str(int(pid)), encode_lastact(pid, row)]
     try:
-        rc.hset(
-            LASTACT_KEY,
-            mapping={str(int(pid)): json.dumps(row) for pid, row in rows_by_pid.items()},
-        )
-        debug_log(3, f"lastact cold-start backfill: {len(rows_by_pid)} puzzles from DB")
+        added = rcb.eval(_LASTACT_BACKFILL_SCRIPT, 1, LASTACT_KEY, *args)
+        _bump_lastact_version()
+        debug_log(3, f"lastact cold-start backfill: {added} of {len(rows_by_pid)} puzzles from DB")
         _note_redis_ok()
-        _incr("cache_cold_start_backfills_total")
+        count_botstat("cache_cold_start_backfills_total")
     except Exception as e:
         _note_redis_error("lastact_set_many", e)
 
 
+# ── change events (pub/sub → SSE) ─────────────────────────────────────────
+
+# Per-client buffer in the EventHub. A client this far behind is dropped with
+# a "resync" event rather than buffering without bound; it reconnects and
+# refetches /all.
+EVENT_QUEUE_SIZE = 256
+# How long the hub's listener blocks per poll; bounds how quickly it notices
+# its last client leaving.
+_EVENT_POLL_TIMEOUT = 5  # seconds
+
+
+def publish_event(event, **payload):
+    """Publish a change event to /events subscribers. Fire-and-forget: a
+    failed publish only delays connected clients until their safety poll."""
+    if rc is None:
+        return
+    try:
+        rc.publish(EVENTS_CHANNEL, json.dumps({"event": event, **payload}))
+        _note_redis_ok()
+    except Exception as e:
+        _note_redis_error("publish_event", e)
+
+
+def format_sse(event, data):
+    """Encode one Server-Sent Events frame. data is a JSON string."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+class EventSubscription:
+    """One SSE client's view of the EventHub: a bounded queue of ready-to-send
+    SSE frames, plus an overflow flag set when the client fell too far behind."""
+
+    def __init__(self):
+        self.frames = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self.overflowed = False
+
+    def get(self, timeout):
+        """Return the next frame, or None after `timeout` seconds of quiet."""
+        try:
+            return self.frames.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventHub:
+    """Per-process fan-out of EVENTS_CHANNEL to SSE subscriptions.
+
+    A single listener thread holds this process's one Redis subscription, so
+    Redis sees one connection per worker however many clients are attached.
+    Each message is encoded to an SSE frame once and handed to every
+    subscriber. The listener starts with the first subscriber and exits after
+    the last one leaves. Under gevent workers the thread and queues are
+    monkey-patched into greenlet-friendly equivalents.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._listener = None
+
+    def subscribe(self):
+        sub = EventSubscription()
+        with self._lock:
+            self._subscribers.add(sub)
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="pb-events", daemon=True
+                )
+                self._listener.start()
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def broadcast(self, frame):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            try:
+                sub.frames.put_nowait(frame)
+            except queue.Full:
+                sub.overflowed = True
+
+    def _listen(self):
+        retry_delay = 1
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._listener = None
+                    return
+            pubsub = None
+            try:
+                if rc is None:
+                    raise RuntimeError("Redis not initialized")
+                pubsub = rc.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(EVENTS_CHANNEL)
+                if retry_delay > 1:
+                    # Back after an outage: events may have been missed.
+                    self.broadcast(format_sse("resync", "{}"))
+                    retry_delay = 1
+                while self.subscriber_count():
+                    msg = pubsub.get_message(timeout=_EVENT_POLL_TIMEOUT)
+                    if msg and msg["type"] == "message":
+                        self._dispatch(msg["data"])
+                _note_redis_ok()
+            except Exception as e:
+                _note_redis_error("event subscription", e)
+                # Back off while Redis is down; clients ride their safety
+                # poll and get a resync once the subscription is restored.
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, _INIT_RETRY_INTERVAL)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def _dispatch(self, data):
+        try:
+            event = json.loads(data)["event"]
+        except (ValueError, TypeError, KeyError) as e:
+            debug_log(2, f"event hub: skipping malformed event {data!r}: {e}")
+            return
+        self.broadcast(format_sse(event, data))
+
+
+event_hub = EventHub()
+
+
+# ── config version push ───────────────────────────────────────────────────
+
+
+def publish_config_version(version):
+    """Announce a committed config version to every process (ConfigWatcher).
+    Fail-safe: without it, processes notice the change by polling the
+    config_version row instead."""
+    if rc is None or version is None:
+        return
+    try:
+        pipe = rc.pipeline(transaction=False)
+        pipe.set(CONFIG_VERSION_KEY, int(version))
+        pipe.publish(CONFIG_CHANNEL, int(version))
+        pipe.execute()
+        debug_log(4, f"announced config version {version}")
+        _note_redis_ok()
+    except Exception as e:
+        _note_redis_error("publish_config_version", e)
+
+
+class ConfigWatcher:
+    """Per-process subscription to CONFIG_CHANNEL feeding pblib's reloads.
+
+    Every announced version goes to pblib.note_config_version, so
+    maybe_refresh_config only compares two ints. On each (re)subscribe the
+    current version is read from CONFIG_VERSION_KEY, which covers
+    announcements missed while disconnected; while the subscription is down
+    pblib falls back to polling the config_version row. Started once Redis
+    is initialized (see ensure_cache_initialized).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="pb-config", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        retry_delay = 1
+        while True:
+            if self._listen():
+                retry_delay = 1
+            time.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, _INIT_RETRY_INTERVAL)
+
+    def _listen(self):
+        """Hold one subscription until it fails. Returns True if it was up."""
+        pubsub = None
+        subscribed = False
+        try:
+            if rc is None:
+                raise RuntimeError("Redis not initialized")
+            pubsub = rc.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CONFIG_CHANNEL)
+            # Subscribed before reading, so no announcement falls in between.
+            note_config_version(rc.get(CONFIG_VERSION_KEY), live=True)
+            subscribed = True
+            _note_redis_ok()
+            while True:
+                msg = pubsub.get_message(timeout=_EVENT_POLL_TIMEOUT)
+                if msg and msg["type"] == "message":
+                    note_config_version(msg["data"])
+        except Exception as e:
+            note_config_version(live=False)
+            _note_redis_error("config subscription", e)
+        finally:
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+        return subscribed
+
+
+config_watcher = ConfigWatcher()
+
+
 # ── rebuild stampede lock ─────────────────────────────────────────────────
 
 
 def try_acquire_rebuild_lock():
     """Try to become the one worker rebuilding the /all blob.
 
-    Returns True if acquired (caller rebuilds and cache_sets), False if
-    another worker holds it (caller serves from the DB without caching).
-    With Redis down, returns True — everyone rebuilds, same as no cache.
+    Returns True if acquired (caller rebuilds and stores the blob), False if
+    another worker holds it (caller serves the stale blob, or on a cold miss
+    waits for the holder's). With Redis down, returns True — everyone
+    rebuilds, same as no cache.
     """
     if rc is None:
         return True
@@ -283,23 +1075,200 @@ def release_rebuild_lock():
         _note_redis_error("rebuild lock release", e)
 
 
+def wait_for_all_blob(timeout=REBUILD_WAIT):
+    """Poll for the blob another worker is rebuilding after a cold miss.
+
+    Returns (blob, version), or (None, None) if it didn't appear within
+    timeout (slow or failed rebuild) or Redis is unavailable.
+    """
+    deadline = time.monotonic() + timeout
+    while rc is not None and time.monotonic() < deadline:
+        time.sleep(REBUILD_WAIT_POLL)
+        blob, version, _ = all_blob_get()
+        if blob:
+            return blob, version
+    return None, None
+
+
+# ── background rebuilder ──────────────────────────────────────────────────
+
+
+def request_rebuild():
+    """Queue a background rebuild of the /all blob.
+
+    If a rebuilder is running, also parks a short-lived claim on the rebuild
+    lock on its behalf: readers that find the blob stale in the meantime
+    serve it rather than rebuilding it themselves. Without a rebuilder the
+    request just expires and readers rebuild as before.
+    """
+    if rc is None:
+        return
+    try:
+        pipe = rc.pipeline(transaction=False)
+        pipe.rpush(REBUILD_QUEUE_KEY, "1")
+        pipe.ltrim(REBUILD_QUEUE_KEY, -REBUILD_QUEUE_MAX, -1)
+        pipe.expire(REBUILD_QUEUE_KEY, REBUILDER_LEASE_TTL)
+        pipe.exists(REBUILDER_LEASE_KEY)
+        *_, has_rebuilder = pipe.execute()
+        if has_rebuilder:
+            rc.set(LOCK_KEY, REBUILD_CLAIM, nx=True, ex=REBUILD_CLAIM_TTL)
+        _note_redis_ok()
+    except Exception as e:
+        _note_redis_error("request_rebuild", e)
+
+
+class BlobRebuilder:
+    """Proactive /all blob rebuilds, one elected process per deployment.
+
+    Every pbrest worker starts one of these threads; the one holding
+    REBUILDER_LEASE_KEY consumes the rebuild queue, the rest stand by to take
+    over if its lease lapses. After the first request of a burst it waits
+    REBUILD_DEBOUNCE, drains whatever else arrived, and rebuilds once under
+    the rebuild lock. The rebuild itself is supplied by pbrest (the loader
+    lives there) and must release the lock when done.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._rebuild = None
+        self._lease_renewed_at = 0
+        self.ident = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self, rebuild):
+        """Start this process's rebuilder thread (no-op once started).
+
+        rebuild(requests) is called with the number of coalesced requests.
+        """
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._rebuild = rebuild
+            self._thread = threading.Thread(
+                target=self._run, name="pb-rebuilder", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        retry_delay = 1
+        while True:
+            try:
+                if rc is None:
+                    raise RuntimeError("Redis not initialized")
+                self._step()
+                retry_delay = 1
+            except Exception as e:
+                _note_redis_error("blob rebuilder", e)
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, _INIT_RETRY_INTERVAL)
+
+    def _step(self):
+        """One iteration: wait for a request, debounce, drain, rebuild."""
+        if not self._hold_lease():
+            time.sleep(REBUILDER_LEASE_TTL / 3)
+            return
+        if rc.blpop(REBUILD_QUEUE_KEY, timeout=_REBUILD_POLL) is None:
+            return
+        time.sleep(REBUILD_DEBOUNCE)
+        pipe = rc.pipeline(transaction=True)
+        pipe.llen(REBUILD_QUEUE_KEY)
+        pipe.delete(REBUILD_QUEUE_KEY)
+        drained, _ = pipe.execute()
+        _note_redis_ok()
+        if not self._claim_lock():
+            # A reader's rebuild held the lock past LOCK_TTL; the blob stays
+            # stale and the next reader rebuilds it.
+            debug_log(3, "blob rebuilder: rebuild lock busy, skipping")
+            return
+        self._rebuild(1 + drained)
+
+    def _hold_lease(self):
+        """Acquire or renew the rebuilder lease. True if this process holds it."""
+        now = time.monotonic()
+        if now - self._lease_renewed_at < REBUILDER_LEASE_TTL / 3:
+            return True
+        if rc.set(REBUILDER_LEASE_KEY, self.ident, nx=True, ex=REBUILDER_LEASE_TTL):
+            debug_log(3, f"blob rebuilder: elected ({self.ident})")
+        elif rc.get(REBUILDER_LEASE_KEY) == self.ident:
+            rc.expire(REBUILDER_LEASE_KEY, REBUILDER_LEASE_TTL)
+        else:
+            self._lease_renewed_at = 0
+            return False
+        self._lease_renewed_at = now
+        return True
+
+    def _claim_lock(self):
+        """Take the rebuild lock, taking over a queued claim or waiting out a
+        reader's in-flight rebuild (at most LOCK_TTL)."""
+        deadline = time.monotonic() + LOCK_TTL
+        while time.monotonic() < deadline:
+            if rc.set(LOCK_KEY, self.ident, nx=True, ex=LOCK_TTL):
+                return True
+            if rc.get(LOCK_KEY) == REBUILD_CLAIM and rc.set(
+                LOCK_KEY, self.ident, xx=True, ex=LOCK_TTL
+            ):
+                return True
+            time.sleep(REBUILD_WAIT_POLL)
+        return False
+
+
+blob_rebuilder = BlobRebuilder()
+
+
 # ── lifecycle ─────────────────────────────────────────────────────────────
 
 
-def invalidate_all_cache(conn):
-    """Invalidate the /all blob. Call ONLY for structural changes (puzzle
+def mark_all_dirty(puzzles=(), rounds=(), hints=False):
+    """Record what the next /all rebuild must refresh and mark the blob stale.
+
+    With no scope at all, the whole blob is rebuilt.
+    """
+    if rc is None:
+        return
+    members = [f"puzzle:{int(pid)}" for pid in puzzles]
+    members += [f"round:{int(rid)}" for rid in rounds]
+    if hints:
+        members.append("hints")
+    try:
+        pipe = rc.pipeline(transaction=True)
+        for member in members or ["*"]:
+            pipe.hincrby(DIRTY_KEY, member, 1)
+        pipe.expire(DIRTY_KEY, CACHE_HARD_TTL)
+        pipe.delete(FRESH_KEY)
+        pipe.execute()
+        debug_log(5, f"mark_all_dirty: {', '.join(members) or 'everything'}")
+        _note_redis_ok()
+    except Exception as e:
+        _note_redis_error("mark_all_dirty", e)
+
+
+def invalidate_all_cache(conn, puzzles=(), rounds=(), hints=False):
+    """Mark the /all blob stale. Call ONLY for structural changes (puzzle
     create/delete, round create/update/delete, status transitions) — see
     STRUCTURAL_PUZZLE_FIELDS in pblib. The lastact hash is write-through
     and is never invalidated.
 
+    Pass the puzzle ids, round ids and/or hints flag the write touched, so
+    the rebuild re-queries only the affected rounds (a puzzle's old round
+    comes from the cached index, so moves rebuild both). With no scope the
+    whole blob is rebuilt.
+
     Counts every call in the cache_invalidations_total botstat. This is the
-    single chokepoint for blob deletion, so all invalidation paths are
+    single chokepoint for blob invalidation, so all invalidation paths are
     counted. increment_botstat is fail-safe: a stats failure never blocks
     the invalidation.
     """
     ensure_cache_initialized(conn)
-    cache_delete(CACHE_KEY)
-    # The delete is the job; the counter is best-effort. Guard locally so the
+    # Mark stale rather than delete, so readers never fall through to MySQL
+    # while the rebuild runs. The next request claims the rebuild; until it
+    # lands (a few tens of ms) the old blob — and the old ETag's 304s — are
+    # served only to workers that lost the rebuild lock.
+    mark_all_dirty(puzzles, rounds, hints)
+    request_rebuild()
+    publish_event("all")
+    # Marking stale is the job; the counter is best-effort. Guard locally so the
     # "stats failure never blocks the invalidation" contract holds here rather
     # than depending on increment_botstat's internal error handling.
     try:
@@ -318,15 +1287,19 @@ def ensure_cache_initialized(conn):
     flipping REDIS_ENABLED=true during a cutover) take effect without a
     worker restart.
     """
-    # No lock needed: Gunicorn sync workers are separate processes, so these
-    # module globals are per-process and never contended. (If ever switching to
-    # gevent/eventlet workers, where coroutines share a process, add a
-    # threading.Lock around the global mutations below.)
+    # The /events server runs gevent workers, where greenlets share these
+    # module globals — serialize the check-and-init.
+    if _cache_initialized:
+        return
+    with _init_lock:
+        _ensure_cache_initialized_locked(conn)
+
+
+def _ensure_cache_initialized_locked(conn):
     global _cache_initialized, _last_init_attempt
     if _cache_initialized:
         return
 
-    import time
     now = time.time()
     if _last_init_attempt is not None and (now - _last_init_attempt) < _INIT_RETRY_INTERVAL:
         return
@@ -346,3 +1319,14 @@ def ensure_cache_initialized(conn):
     # retry on a later call (rate-limited above).
     if rc is not None:
         _cache_initialized = True
+        config_watcher.start()
+
+
+def _on_redis_config_change(cfg):
+    """A REDIS_* change makes the next ensure_cache_initialized retry right
+    away instead of waiting out _INIT_RETRY_INTERVAL."""
+    global _last_init_attempt
+    _last_init_attempt = None
+
+
+subscribe_config(_on_redis_config_change, keys=("REDIS_ENABLED", "REDIS_HOST", "REDIS_PORT"))
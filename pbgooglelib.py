@@ -15,7 +15,7 @@ import httplib2
 import pblib
 import datetime
 import json
-from pblib import debug_log, configstruct
+from pblib import debug_log, configstruct, subscribe_config
 
 
 service = None
@@ -69,18 +69,23 @@ class _GoogleApiRateLimiter:
 
     Threads call acquire() before making any Google API request.
     Each call reserves the next available time slot and sleeps until
-    that slot arrives. QPM is read from config on each call so it
-    can be tuned at runtime via the admin UI.
+    that slot arrives. QPM follows BIGJIMMY_GOOGLE_API_QPM through a
+    config subscription (see below), so it can be tuned at runtime via
+    the admin UI without being re-read on every call.
     """
 
-    def __init__(self):
+    def __init__(self, qpm=_DEFAULT_QPM):
         self._lock = threading.Lock()
         self._next_slot = 0.0
+        self.set_qpm(qpm)
+
+    def set_qpm(self, qpm):
+        """Change the call rate. QPM below 1 is treated as 1."""
+        self._min_interval = 60.0 / max(int(qpm), 1)
 
     def acquire(self):
         """Block until the next API call slot is available."""
-        qpm = int(configstruct.get("BIGJIMMY_GOOGLE_API_QPM", _DEFAULT_QPM))
-        min_interval = 60.0 / max(qpm, 1)
+        min_interval = self._min_interval
 
         with self._lock:
             now = time.time()
@@ -100,6 +105,13 @@ class _GoogleApiRateLimiter:
 _rate_limiter = _GoogleApiRateLimiter()
 
 
+def _apply_qpm_config(cfg):
+    _rate_limiter.set_qpm(cfg.get("BIGJIMMY_GOOGLE_API_QPM", _DEFAULT_QPM))
+
+
+subscribe_config(_apply_qpm_config, keys=("BIGJIMMY_GOOGLE_API_QPM",))
+
+
 def _increment_quota_failure():
     """Thread-safe increment of quota failure counter."""
     global quota_failure_count
@@ -264,7 +276,7 @@ def initdrive():
     return 0
 
 
-def get_puzzle_sheet_info_activity(myfileid, puzzlename=None):
+def get_puzzle_sheet_info_activity(myfileid, puzzlename=None, start_row=1):
     """
     Get editor activity from the hidden '_pb_activity' sheet.
     Returns dict with 'editors' (list of {solvername, timestamp}) and 'sheetcount' (int or None).
@@ -279,23 +291,34 @@ def get_puzzle_sheet_info_activity(myfileid, puzzlename=None):
     THREAD SAFE.
     Includes retry logic for rate limit (429) errors.
 
+    With start_row > 1 only rows from start_row down are read: the row at
+    start_row is returned as 'anchor' ([editor, timestamp] as strings, or
+    None if the sheet has no such row) rather than parsed, so the caller can
+    check it is the row it last consumed. 'end_row' is the sheet row number
+    of the last row read, and 'last_row' that row as [editor, timestamp].
+
     Args:
         myfileid: Google Sheets file ID
         puzzlename: Optional puzzle name for logging
+        start_row: First sheet row to read (1 = whole sheet, header included)
     """
     puzz_label = puzzlename if puzzlename else myfileid
-    debug_log(5, f"start _pb_activity read for puzzle {puzz_label} (fileid: {myfileid})")
+    debug_log(5, f"start _pb_activity read for puzzle {puzz_label} (fileid: {myfileid}, from row {start_row})")
 
     max_retries = int(configstruct.get("BIGJIMMY_QUOTAFAIL_MAX_RETRIES", _DEFAULT_MAX_RETRIES))
     retry_delay = int(configstruct.get("BIGJIMMY_QUOTAFAIL_DELAY", _DEFAULT_RETRY_DELAY_SECONDS))
 
-    result = {"editors": [], "sheetcount": None, "error": False}
+    result = {
+        "editors": [], "sheetcount": None, "error": False,
+        "anchor": None, "end_row": start_row - 1, "last_row": None,
+    }
 
     if configstruct["SKIP_GOOGLE_API"] == "true":
         debug_log(3, "google API skipped by config.")
         return result
 
     threadsafe_http = _get_thread_http()
+    datarange = "_pb_activity!A:C" if start_row <= 1 else f"_pb_activity!A{start_row}:C"
 
     for attempt in range(max_retries):
         try:
@@ -305,7 +328,7 @@ def get_puzzle_sheet_info_activity(myfileid, puzzlename=None):
                 .values()
                 .get(
                     spreadsheetId=myfileid,
-                    range="_pb_activity!A:C",
+                    range=datarange,
                 )
                 .execute(http=threadsafe_http)
             )
@@ -313,10 +336,15 @@ def get_puzzle_sheet_info_activity(myfileid, puzzlename=None):
             rows = response.get("values", [])
             debug_log(
                 4,
-                f"[{puzz_label}] _pb_activity returned {len(rows)} rows (including header)",
+                f"[{puzz_label}] _pb_activity returned {len(rows)} rows from row {start_row}",
             )
+            if rows:
+                result["end_row"] = start_row + len(rows) - 1
+                result["last_row"] = [str(v) for v in rows[-1][:2]]
+                if start_row > 1:
+                    result["anchor"] = [str(v) for v in rows[0][:2]]
 
-            # Skip header row (editor, timestamp, num_sheets)
+            # Skip the header row (editor, timestamp, num_sheets) or the anchor
             for row in rows[1:]:
                 if len(row) < 2:
                     continue
@@ -520,6 +548,95 @@ def get_puzzle_sheet_info_legacy(myfileid, puzzlename=None):
     return result
 
 
+# Only the ids matter: a change entry is just "this file moved on", and the
+# caller decides which sheets to read.
+_CHANGES_FIELDS = "nextPageToken,newStartPageToken,changes(fileId)"
+_CHANGES_PAGE_SIZE = 1000
+
+
+def _drive_changes_call(label, request):
+    """Execute one Drive changes request with the usual 429 retry.
+
+    Returns the response dict, or None on a non-rate-limit error or when
+    retries run out.
+    """
+    max_retries = int(configstruct.get("BIGJIMMY_QUOTAFAIL_MAX_RETRIES", _DEFAULT_MAX_RETRIES))
+    retry_delay = int(configstruct.get("BIGJIMMY_QUOTAFAIL_DELAY", _DEFAULT_RETRY_DELAY_SECONDS))
+    threadsafe_http = _get_thread_http()
+
+    for attempt in range(max_retries):
+        try:
+            _rate_limiter.acquire()
+            return request().execute(http=threadsafe_http)
+        except Exception as e:
+            if "429" in str(e) or "RATE_LIMIT_EXCEEDED" in str(e):
+                _increment_quota_failure()
+                debug_log(
+                    3,
+                    f"Rate limit hit {label}, waiting {retry_delay} seconds (attempt {attempt + 1}/{max_retries})",
+                )
+                time.sleep(retry_delay * random.uniform(0.5, 1.5))
+            else:
+                debug_log(1, f"Error {label}: {e}")
+                return None
+    if max_retries > 0:
+        debug_log(1, f"EXHAUSTED all {max_retries} retries {label} - giving up")
+    return None
+
+
+def get_drive_changes_start_token():
+    """Return a Drive changes page token for "now", or None on error.
+
+    Listing from this token later returns every file changed after this call.
+    THREAD SAFE.
+    """
+    response = _drive_changes_call(
+        "getting Drive changes start token",
+        lambda: service.changes().getStartPageToken(supportsAllDrives=True),
+    )
+    return response.get("startPageToken") if response else None
+
+
+def list_drive_changes(page_token):
+    """List Drive changes since page_token (from get_drive_changes_start_token
+    or a previous call).
+
+    One rate-limited call per page of up to 1000 changes, so a quiet hunt
+    costs one call however many sheets it has.
+
+    Returns (file_ids, next_token): the set of ids of files changed since
+    page_token, and the token to pass next time. Returns (None, None) on
+    error, including a token Drive no longer accepts; the caller should get
+    a fresh start token and assume everything changed.
+    THREAD SAFE.
+    """
+    file_ids = set()
+    token = page_token
+    while True:
+        response = _drive_changes_call(
+            "listing Drive changes",
+            lambda: service.changes().list(
+                pageToken=token,
+                pageSize=_CHANGES_PAGE_SIZE,
+                spaces="drive",
+                # Shared drives are included so a hunt folder on one is followed too.
+                includeItemsFromAllDrives=True,
+                supportsAllDrives=True,
+                fields=_CHANGES_FIELDS,
+            ),
+        )
+        if response is None:
+            return None, None
+        file_ids.update(c["fileId"] for c in response.get("changes", []) if c.get("fileId"))
+        if "newStartPageToken" in response:
+            debug_log(5, f"Drive changes since {page_token}: {len(file_ids)} files")
+            return file_ids, response["newStartPageToken"]
+        token = response.get("nextPageToken")
+        if not token:
+            debug_log(1, "Drive changes response had neither nextPageToken nor newStartPageToken")
+            return None, None
+
+
 def repair_activity_sheet(sheet_id: str, puzzlename: Optional[str] = None) -> bool:
     """
     Repair a corrupt _pb_activity sheet by deleting and recreating it.
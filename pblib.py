@@ -2,24 +2,49 @@
 
 import yaml
 import sys
+import os
+import atexit
+import threading
 import inspect
 import datetime
 import smtplib
 import MySQLdb
 import MySQLdb.cursors
 import json
+import base64
+import collections
+import csv
+import io
 from email.message import EmailMessage
+from types import MappingProxyType
 
 # Global config variable for YAML config
 config = None
 huntfolderid = "undefined"
 
-# Pre-initialize configstruct with default LOGLEVEL
+# Raw config table strings, for existing callers. Pre-initialized with a
+# default LOGLEVEL; hot paths use the typed get_config() snapshot instead.
 configstruct = {"LOGLEVEL": "4"}
 
 # Track last config refresh time for periodic refresh
 _last_config_refresh = None
-CONFIG_REFRESH_INTERVAL = 30  # seconds
+CONFIG_REFRESH_INTERVAL = 30  # seconds — version-row poll while push is down
+
+# Push-based reloads. POST /config bumps the config_version row and
+# announces it over Redis; pbcachelib.ConfigWatcher hands announced versions
+# to note_config_version(). While that subscription is up, the per-request
+# check in maybe_refresh_config is a memory read. _config_version is the
+# version the loaded configstruct reflects — None until the config_version
+# table exists, in which case the old timed full reload applies.
+_config_version = None
+_announced_config_version = None
+_config_push_live = False
+
+# Per-process MySQL pools (primary, optional read replica); created once the
+# YAML config is loaded (below).
+db_pool = None
+read_pool = None
+replica_pool = None
 
 
 def get_mysql_ssl_config(config):
@@ -42,62 +67,467 @@ def get_mysql_ssl_config(config):
     return ssl_config
 
 
-def create_db_connection():
+def create_db_connection(init_command=None, section="MYSQL"):
     """Create a new MySQLdb connection using the global config.
 
     Returns a connection with DictCursor and utf8mb4 charset.
     This centralizes connection parameters so all consumers (bigjimmybot,
-    pbrest, scripts) use identical settings.
+    pbrest, scripts) use identical settings. init_command, if given, is run
+    by the client once per connection (session variables). section
+    "MYSQL_REPLICA" connects to the read replica; keys it leaves out
+    (credentials, DATABASE, SSL) are taken from MYSQL.
     """
+    settings = dict(config["MYSQL"])
+    if section != "MYSQL":
+        settings.update(config.get(section) or {})
     connect_params = {
-        "host": config["MYSQL"]["HOST"],
-        "user": config["MYSQL"]["USERNAME"],
-        "passwd": config["MYSQL"]["PASSWORD"],
-        "db": config["MYSQL"]["DATABASE"],
+        "host": settings["HOST"],
+        "user": settings["USERNAME"],
+        "passwd": settings["PASSWORD"],
+        "db": settings["DATABASE"],
         "cursorclass": MySQLdb.cursors.DictCursor,
         "charset": "utf8mb4",
     }
-    ssl_config = get_mysql_ssl_config(config)
+    ssl_config = get_mysql_ssl_config({"MYSQL": settings})
     if ssl_config:
         connect_params["ssl"] = ssl_config
+    if init_command:
+        connect_params["init_command"] = init_command
     return MySQLdb.connect(**connect_params)
 
 
-def configure_flask_mysql(app):
-    """Configure a Flask app's MYSQL_* settings from the global config.
+# Session setup for read-pool connections. pbrest's lag-tolerant reads have
+# always run READ UNCOMMITTED (they used to SET it on every _read_cursor
+# call); read_pool and replica_pool connections get it once, at connect
+# time. db_pool, which serves writes and the reads that must see them, keeps
+# the server's default isolation.
+READ_UNCOMMITTED = "SET SESSION TRANSACTION ISOLATION LEVEL READ UNCOMMITTED"
+DB_POOL_SIZE = 4  # idle connections kept per process; MYSQL.POOL_SIZE overrides
+
+
+class ConnectionPool:
+    """Per-process pool of MySQL connections, reused across requests.
 
-    Call this before creating a Flask-MySQLdb MySQL(app) instance.
-    Centralizes config so pbrest.py doesn't duplicate connection parameters.
+    A new MySQL connection costs several round trips plus the TLS handshake
+    (~40ms with SSL); a pooled one costs a ping. acquire() hands out an idle
+    connection after a ping (dropping dead ones) or creates a new one;
+    release() rolls back whatever the caller left open, so no transaction or
+    snapshot leaks into the next user, and keeps up to size connections
+    idle. size 0 disables pooling: every connection is closed on release.
+    A forked child starts with an empty pool rather than sharing its
+    parent's sockets.
     """
-    app.config["MYSQL_HOST"] = config["MYSQL"]["HOST"]
-    app.config["MYSQL_USER"] = config["MYSQL"]["USERNAME"]
-    app.config["MYSQL_PASSWORD"] = config["MYSQL"]["PASSWORD"]
-    app.config["MYSQL_DB"] = config["MYSQL"]["DATABASE"]
-    app.config["MYSQL_CURSORCLASS"] = "DictCursor"
-    app.config["MYSQL_CHARSET"] = "utf8mb4"
-    ssl_config = get_mysql_ssl_config(config)
-    if ssl_config:
-        app.config["MYSQL_CUSTOM_OPTIONS"] = {"ssl": ssl_config}
+
+    def __init__(self, size=DB_POOL_SIZE, init_command=None, section="MYSQL"):
+        self.size = size
+        self.init_command = init_command
+        self.section = section
+        self._idle = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._idle, self._pid = [], os.getpid()
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return create_db_connection(init_command=self.init_command, section=self.section)
+            try:
+                conn.ping()
+                return conn
+            except Exception as e:
+                debug_log(4, f"dropping dead pooled connection: {e}")
+                _close_quietly(conn)
+
+    def staleness(self):
+        """Seconds this pool's reads may be behind the primary."""
+        return 0
+
+    def release(self, conn, discard=False):
+        """Return a connection to the pool. discard closes it instead (use
+        after an error that may have left the connection unusable)."""
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+        with self._lock:
+            if not discard and self._pid == os.getpid() and len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        _close_quietly(conn)
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+REPLICA_MAX_LAG_SECONDS = 5  # MYSQL_REPLICA.MAX_LAG_SECONDS overrides
+REPLICA_CHECK_INTERVAL = 5  # seconds a replica health verdict is reused
+
+
+class ReplicaPool(ConnectionPool):
+    """ConnectionPool for the optional MYSQL_REPLICA read replica.
+
+    healthy() says whether reads should go there: the replica answered and
+    is at most max_lag seconds behind its source. The verdict is reused for
+    REPLICA_CHECK_INTERVAL seconds, so the check costs one query per
+    process per interval rather than one per request; while a check runs,
+    other threads use the previous verdict. mark_down() records a failure
+    seen by a caller so reads stay on the primary until the next check.
+    staleness() bounds how far behind the last check found it.
+    """
+
+    def __init__(self, size=DB_POOL_SIZE, init_command=None,
+                 max_lag=REPLICA_MAX_LAG_SECONDS, check_interval=REPLICA_CHECK_INTERVAL):
+        super().__init__(size, init_command, section="MYSQL_REPLICA")
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._healthy = False
+        self._checked_at = None
+        self._lag = None
+
+    def staleness(self):
+        # Seconds_Behind_Source is whole seconds, rounded down.
+        return self.max_lag if self._lag is None else self._lag + 1
+
+    def healthy(self):
+        import time
+
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return self._healthy
+            self._checked_at = now
+        healthy = self._check()
+        with self._lock:
+            if healthy != self._healthy:
+                debug_log(2 if not healthy else 3,
+                          f"read replica {'back in use' if healthy else 'out of use'}")
+            self._healthy = healthy
+        return healthy
+
+    def mark_down(self, error):
+        import time
+
+        debug_log(2, f"read replica unavailable, reading from primary: {error}")
+        with self._lock:
+            self._healthy = False
+            self._checked_at = time.monotonic()
+
+    def _check(self):
+        try:
+            conn = self.acquire()
+        except Exception as e:
+            debug_log(2, f"read replica unreachable: {e}")
+            return False
+        try:
+            lag = replica_lag(conn)
+        except Exception as e:
+            debug_log(2, f"read replica status check failed: {e}")
+            self.release(conn, discard=True)
+            return False
+        self.release(conn)
+        self._lag = lag
+        if lag is None:
+            debug_log(2, "read replica is not replicating")
+            return False
+        if lag > self.max_lag:
+            debug_log(3, f"read replica {lag}s behind (max {self.max_lag}s)")
+            return False
+        return True
+
+
+def replica_lag(conn):
+    """Seconds the server behind conn is behind its replication source.
+
+    None when replication is stopped or broken (Seconds_Behind_Source is
+    NULL). 0 when the server reports no replica status at all, as managed
+    reader endpoints (Aurora) do — they keep their own lag bound. Needs the
+    REPLICATION CLIENT privilege; raises if the status can't be read.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SHOW REPLICA STATUS")
+    except Exception:
+        cursor.execute("SHOW SLAVE STATUS")  # MySQL < 8.0.22
+    row = cursor.fetchone()
+    if not row:
+        return 0
+    lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+    return None if lag is None else int(lag)
+
+
+def acquire_read_connection():
+    """Borrow a connection for read-only queries that tolerate replication
+    lag: (conn, pool), to be given back with pool.release(conn).
+
+    From replica_pool while it is healthy, else from read_pool on the
+    primary (no replica configured, unreachable, or lagging past
+    MAX_LAG_SECONDS). Both run READ UNCOMMITTED. Reads of rows the caller
+    has just written must use a db_pool connection instead.
+    """
+    if replica_pool is not None and replica_pool.healthy():
+        try:
+            return replica_pool.acquire(), replica_pool
+        except Exception as e:
+            replica_pool.mark_down(e)
+    return read_pool.acquire(), read_pool
 
 
 def maybe_refresh_config():
-    """Refresh config if enough time has passed since last refresh.
-    Call this periodically (e.g., on each request) to ensure config stays current.
+    """Reload config if it has changed. Call on each request / loop iteration.
+
+    While the Redis push channel is up this is a memory read: reload only
+    when an announced version is newer than the loaded one (a reload can
+    pick up a later version than was announced, and an older announcement
+    arriving after it must not reload again on every call). Otherwise poll
+    the config_version row every CONFIG_REFRESH_INTERVAL seconds and reload
+    only if it moved (or unconditionally, before that table exists).
     """
     global _last_config_refresh
     import time
 
-    now = time.time()
-    if (
-        _last_config_refresh is None
-        or (now - _last_config_refresh) >= CONFIG_REFRESH_INTERVAL
-    ):
+    if _config_push_live and _config_version is not None:
+        if _announced_config_version is None or _announced_config_version <= _config_version:
+            return
+    else:
+        now = time.time()
+        if (
+            _last_config_refresh is not None
+            and (now - _last_config_refresh) < CONFIG_REFRESH_INTERVAL
+        ):
+            return
+        _last_config_refresh = now
+        version = read_config_version()
+        if version is not None and version == _config_version:
+            return
+    try:
+        refresh_config()
+    except Exception as e:
+        # Don't crash on refresh failure, just log it
+        debug_log(2, f"Config refresh failed: {e}")
+
+
+def note_config_version(version=None, live=True):
+    """Record a pushed config version and whether the push channel is up.
+
+    Called from pbcachelib.ConfigWatcher's thread. version may be None (no
+    announcement yet) or anything int() accepts; a malformed one is ignored.
+    """
+    global _announced_config_version, _config_push_live
+    if version is not None:
         try:
-            refresh_config()
-            _last_config_refresh = now
-        except Exception as e:
-            # Don't crash on refresh failure, just log it
-            debug_log(2, f"Config refresh failed: {e}")
+            _announced_config_version = int(version)
+        except (TypeError, ValueError):
+            debug_log(2, f"ignoring malformed config version {version!r}")
+    _config_push_live = live
+
+
+def _read_config_version(cursor):
+    """Return the config_version row's version via cursor, or None if the
+    table doesn't exist yet (migration not run)."""
+    try:
+        cursor.execute("SELECT version FROM config_version WHERE id = 1")
+        row = cursor.fetchone()
+    except Exception as e:
+        debug_log(5, f"config_version unavailable: {e}")
+        return None
+    if not row:
+        return None
+    return int(row["version"] if isinstance(row, dict) else row[0])
+
+
+def read_config_version():
+    """Return the current config version from the database (pooled
+    connection), or None if unavailable."""
+    try:
+        conn = db_pool.acquire()
+    except Exception as e:
+        debug_log(2, f"config version check failed: {e}")
+        return None
+    try:
+        return _read_config_version(conn.cursor())
+    finally:
+        db_pool.release(conn)
+
+
+def bump_config_version(cursor):
+    """Advance the config version inside the caller's transaction (commit
+    it together with the config change, then announce it with
+    pbcachelib.publish_config_version). Returns the new version, or None if
+    the config_version table doesn't exist yet.
+    """
+    try:
+        cursor.execute("UPDATE config_version SET version = version + 1 WHERE id = 1")
+    except Exception as e:
+        debug_log(3, f"config_version not bumped: {e}")
+        return None
+    return _read_config_version(cursor)
+
+
+# ── Typed configuration snapshot ──────────────────────────────────────────
+#
+# Every reload builds one immutable ConfigSnapshot with the keys in
+# CONFIG_TYPES already parsed, and swaps it in with a single assignment.
+# Hot paths read get_config() instead of re-parsing configstruct strings;
+# components that hold derived state register with subscribe_config() and
+# are called back when their keys change. A value that fails to parse is
+# rejected when the snapshot is built (the key keeps its previous value, or
+# is absent so callers fall back to their default), and POST /config refuses
+# it up front via validate_config_value.
+
+
+def _parse_bool(val):
+    lowered = str(val).strip().lower()
+    if lowered not in ("true", "false"):
+        raise ValueError(f"expected true or false, got {val!r}")
+    return lowered == "true"
+
+
+def _parse_csv(val):
+    return tuple(s.strip() for s in str(val).split(",") if s.strip())
+
+
+def _parse_status_metadata(val):
+    """STATUS_METADATA: JSON list of {name, emoji, text, order} -> read-only
+    {name: entry} map."""
+    items = json.loads(val)
+    if not isinstance(items, list):
+        raise ValueError("expected a JSON list")
+    by_name = {}
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("name"), str):
+            raise ValueError(f"entry without a name: {item!r}")
+        by_name[item["name"]] = MappingProxyType(dict(item))
+    return MappingProxyType(by_name)
+
+
+CONFIG_TYPES = {
+    "LOGLEVEL": int,
+    "BIGJIMMY_ABANDONED_TIMEOUT_MINUTES": int,
+    "BIGJIMMY_AUTOASSIGN": _parse_bool,
+    "BIGJIMMY_GOOGLE_API_QPM": int,
+    "BIGJIMMY_MAX_POLL_INTERVAL_SECONDS": int,
+    "BIGJIMMY_QUOTAFAIL_DELAY": int,
+    "BIGJIMMY_QUOTAFAIL_MAX_RETRIES": int,
+    "BIGJIMMY_THREADCOUNT": int,
+    "ACTIVITY_SOURCES": _parse_csv,
+    "REDIS_ENABLED": _parse_bool,
+    "REDIS_PORT": int,
+    "SKIP_GOOGLE_API": _parse_bool,
+    "SKIP_PUZZCORD": _parse_bool,
+    "STATUS_METADATA": _parse_status_metadata,
+}
+
+
+def validate_config_value(key, val):
+    """Return why val is not acceptable for key, or None if it is."""
+    parse = CONFIG_TYPES.get(key)
+    if parse is None:
+        return None
+    try:
+        parse(val)
+    except (TypeError, ValueError) as e:
+        return f"invalid value for {key}: {e}"
+    return None
+
+
+class ConfigSnapshot:
+    """One loaded config version. Never mutated; reloads replace it.
+
+    snapshot.get(key, default) returns the parsed value for CONFIG_TYPES
+    keys and the raw string otherwise. raw holds the table as read; errors
+    maps each rejected key to its parse error.
+    """
+
+    __slots__ = ("version", "raw", "errors", "_values")
+
+    def __init__(self, raw, version=None, previous=None):
+        values = {}
+        errors = {}
+        for key, val in raw.items():
+            parse = CONFIG_TYPES.get(key)
+            if parse is None:
+                values[key] = val
+                continue
+            try:
+                values[key] = parse(val)
+            except (TypeError, ValueError) as e:
+                errors[key] = str(e)
+                if previous is not None and key in previous._values:
+                    values[key] = previous._values[key]
+        self.version = version
+        self.raw = MappingProxyType(dict(raw))
+        self.errors = MappingProxyType(errors)
+        self._values = MappingProxyType(values)
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def changed_keys(self, other):
+        """Keys whose parsed value differs between self and other."""
+        return frozenset(
+            key
+            for key in self._values.keys() | other._values.keys()
+            if self._values.get(key) != other._values.get(key)
+        )
+
+
+_config_snapshot = ConfigSnapshot(configstruct)
+_config_subscribers = []  # (callback, keys or None for any key)
+_config_subscribers_lock = threading.Lock()
+
+
+def get_config():
+    """Return the current ConfigSnapshot."""
+    return _config_snapshot
+
+
+def subscribe_config(callback, keys=None):
+    """Call callback(snapshot) now, and after every reload that changes one
+    of keys (any key when None). Callbacks run on the reloading thread, so
+    keep them short; exceptions are logged, not raised. Returns callback.
+    """
+    keys = frozenset(keys) if keys is not None else None
+    with _config_subscribers_lock:
+        _config_subscribers.append((callback, keys))
+    _notify_config_subscriber(callback, _config_snapshot)
+    return callback
+
+
+def _notify_config_subscriber(callback, snapshot):
+    try:
+        callback(snapshot)
+    except Exception as e:
+        debug_log(1, f"config subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+
+
+def _install_config_snapshot(snapshot):
+    """Make snapshot current and notify subscribers whose keys changed."""
+    global _config_snapshot
+    previous, _config_snapshot = _config_snapshot, snapshot
+    for key, error in snapshot.errors.items():
+        debug_log(1, f"Rejected config value for {key}: {error}")
+    changed = previous.changed_keys(snapshot)
+    if not changed:
+        return
+    with _config_subscribers_lock:
+        subscribers = list(_config_subscribers)
+    for callback, keys in subscribers:
+        if keys is None or keys & changed:
+            _notify_config_subscriber(callback, snapshot)
 
 
 def debug_log(sev, message):
@@ -109,7 +539,7 @@ def debug_log(sev, message):
     # 4 = debug
     # 5 = trace
 
-    if int(configstruct["LOGLEVEL"]) >= sev:
+    if _config_snapshot.get("LOGLEVEL", 4) >= sev:
         timestamp = datetime.datetime.now(tz=datetime.timezone.utc).isoformat()
         print(
             f"[{timestamp}] [SEV{sev}] {inspect.currentframe().f_back.f_code.co_name}: {message}",
@@ -122,7 +552,7 @@ def refresh_config():
     """Reload configuration from both YAML file and database.
     Only updates and logs if there are actual changes.
     """
-    global configstruct, config, _last_config_refresh
+    global configstruct, config, _last_config_refresh, _config_version
     import time
 
     # Reload YAML config (rarely changes at runtime, so no comparison)
@@ -135,23 +565,35 @@ def refresh_config():
 
     # Reload database config with change detection
     try:
-        connect_params = {
-            "host": config["MYSQL"]["HOST"],
-            "user": config["MYSQL"]["USERNAME"],
-            "passwd": config["MYSQL"]["PASSWORD"],
-            "db": config["MYSQL"]["DATABASE"],
-        }
-        ssl_config = get_mysql_ssl_config(config)
-        if ssl_config:
-            connect_params["ssl"] = ssl_config
-
-        db_connection = MySQLdb.connect(**connect_params)
-        cursor = db_connection.cursor()
-        cursor.execute("SELECT * FROM config")
-        configdump = cursor.fetchall()
-        db_connection.close()
+        if db_pool is not None:
+            db_connection = db_pool.acquire()
+        else:
+            # Initial load, before the pool exists.
+            connect_params = {
+                "host": config["MYSQL"]["HOST"],
+                "user": config["MYSQL"]["USERNAME"],
+                "passwd": config["MYSQL"]["PASSWORD"],
+                "db": config["MYSQL"]["DATABASE"],
+            }
+            ssl_config = get_mysql_ssl_config(config)
+            if ssl_config:
+                connect_params["ssl"] = ssl_config
+            db_connection = MySQLdb.connect(**connect_params)
+        try:
+            cursor = db_connection.cursor(MySQLdb.cursors.Cursor)
+            # Version first: it can only be older than the rows read after
+            # it (costing one extra reload), never newer.
+            version = _read_config_version(cursor)
+            cursor.execute("SELECT `key`, `val` FROM config")
+            configdump = cursor.fetchall()
+        finally:
+            if db_pool is not None:
+                db_pool.release(db_connection)
+            else:
+                db_connection.close()
 
         new_config = dict(configdump)
+        _config_version = version
         _last_config_refresh = time.time()  # Update timestamp
 
         # Check if this is initial load (only default LOGLEVEL present)
@@ -159,8 +601,7 @@ def refresh_config():
 
         if is_initial_load:
             # Initial load - just set config, no comparison
-            configstruct.clear()
-            configstruct.update(new_config)
+            _replace_raw_config(new_config)
             debug_log(3, "Initial configuration loaded")
         else:
             # Compare and detect changes
@@ -187,20 +628,51 @@ def refresh_config():
 
             # Only update if there were changes
             if changes_found:
-                configstruct.clear()
-                configstruct.update(new_config)
+                _replace_raw_config(new_config)
                 debug_log(3, "Configuration updated with changes")
             else:
                 debug_log(5, "Configuration checked, no changes detected")
 
+        _install_config_snapshot(
+            ConfigSnapshot(new_config, version=version, previous=_config_snapshot)
+        )
+
     except Exception as e:
         debug_log(0, f"FATAL EXCEPTION reading database configuration: {e}")
         sys.exit(255)
 
 
+def _replace_raw_config(new_config):
+    """Bring configstruct in line with new_config in place (other modules
+    hold a reference to it) without the empty window of clear() + update()."""
+    configstruct.update(new_config)
+    for key in [key for key in configstruct if key not in new_config]:
+        configstruct.pop(key, None)
+
+
 # Initial configuration load
 refresh_config()
 
+# Shared by pbrest (one connection per request context), the botstat
+# flusher and config reloads.
+db_pool = ConnectionPool(size=int(config["MYSQL"].get("POOL_SIZE", DB_POOL_SIZE)))
+
+# The primary's READ UNCOMMITTED connections for acquire_read_connection,
+# kept apart so a dirty-read session never carries a write transaction.
+read_pool = ConnectionPool(
+    size=int(config["MYSQL"].get("POOL_SIZE", DB_POOL_SIZE)),
+    init_command=READ_UNCOMMITTED,
+)
+
+# Optional read replica (MYSQL_REPLICA in puzzleboss.yaml), for the
+# lag-tolerant reads routed through acquire_read_connection.
+if config.get("MYSQL_REPLICA"):
+    replica_pool = ReplicaPool(
+        size=int(config["MYSQL_REPLICA"].get("POOL_SIZE", DB_POOL_SIZE)),
+        init_command=READ_UNCOMMITTED,
+        max_lag=float(config["MYSQL_REPLICA"].get("MAX_LAG_SECONDS", REPLICA_MAX_LAG_SECONDS)),
+    )
+
 
 def sanitize_puzzle_name(text):
     import re
@@ -282,8 +754,9 @@ def check_round_completion(round_id, conn):
             cursor.execute(
                 "UPDATE round SET status = 'Solved' WHERE id = %s", (round_id,)
             )
+            record_change("round", round_id, conn)
             conn.commit()
-            _invalidate_cache(conn)
+            _invalidate_cache(conn, rounds=[round_id])
             debug_log(
                 3, f"Round {round_id} marked as solved - all meta puzzles completed"
             )
@@ -293,8 +766,9 @@ def check_round_completion(round_id, conn):
                 "UPDATE round SET status = 'New' WHERE id = %s AND status = 'Solved'", (round_id,)
             )
             if cursor.rowcount > 0:
+                record_change("round", round_id, conn)
                 conn.commit()
-                _invalidate_cache(conn)
+                _invalidate_cache(conn, rounds=[round_id])
                 debug_log(
                     3, f"Round {round_id} unmarked as solved - not all meta puzzles completed"
                 )
@@ -316,6 +790,13 @@ def assign_solver_to_puzzle(puzzle_id, solver_id, conn, source="system"):
         - Logs "assignment" activity for the assignment
         - Unassigns solver from any other puzzle first
 
+    Runs as one transaction with one commit. The solver row, then every
+    puzzle row involved (the target and any puzzle the solver is leaving,
+    in id order) is locked with SELECT ... FOR UPDATE, so concurrent
+    assignments of the same solver or to the same puzzle queue up instead
+    of overwriting each other's current_solvers, and can't deadlock. Cache
+    invalidation and the lastact write-through run after the commit.
+
     Args:
         puzzle_id: Puzzle database ID (int or string, normalized to int)
         solver_id: Solver database ID (int or string, normalized to int)
@@ -331,79 +812,209 @@ def assign_solver_to_puzzle(puzzle_id, solver_id, conn, source="system"):
     debug_log(4, f"Started with puzzle id {puzzle_id}")
     cursor = conn.cursor()
 
-    # Validate solver exists
-    if not solver_exists(solver_id, conn):
-        raise ValueError(f"Solver {solver_id} does not exist")
-
-    # Find and unassign from any other puzzle the solver is currently on.
-    # JSON_TABLE with INT PATH extracts solver_ids as integers for comparison.
-    cursor.execute(
-        """
-        SELECT DISTINCT p.id FROM puzzle p,
-        JSON_TABLE(
-            p.current_solvers,
-            '$.solvers[*]' COLUMNS (
-                solver_id INT PATH '$.solver_id'
+    try:
+        # Validate solver exists; its row lock serializes this solver's moves.
+        cursor.execute("SELECT id FROM solver WHERE id = %s FOR UPDATE", (solver_id,))
+        if cursor.fetchone() is None:
+            raise ValueError(f"Solver {solver_id} does not exist")
+
+        leaving = [pid for pid in get_current_puzzle_ids(solver_id, conn) if pid != puzzle_id]
+        puzzles = _lock_puzzles([puzzle_id, *leaving], conn)
+
+        # Validate puzzle exists and is not solved
+        row = puzzles.get(puzzle_id)
+        if row is None:
+            raise ValueError(f"Puzzle {puzzle_id} does not exist")
+        if row["status"] == "Solved":
+            raise ValueError(f"Cannot assign solver to puzzle {puzzle_id} - puzzle is already solved")
+
+        # Unassign from any other puzzle the solver is currently on.
+        for old_id in leaving:
+            if old_id in puzzles:
+                _remove_current_solver(old_id, puzzles[old_id]["current_solvers"], solver_id, conn)
+
+        # One UPDATE for everything that changes on the target row.
+        updates = {}
+        activities = []
+        # Transition puzzle out of "New" or "Abandoned" when a solver is assigned,
+        # logged as "status" activity like any other status change.
+        status_changed = row["status"] in ("New", "Abandoned")
+        if status_changed:
+            debug_log(3, f"Auto-transitioning puzzle {puzzle_id} from '{row['status']}' to 'Being worked'")
+            updates["status"] = "Being worked"
+            activities.append(("status", 100))
+
+        current_solvers = _parse_solver_list(row["current_solvers"])
+        if not any(s["solver_id"] == solver_id for s in current_solvers["solvers"]):
+            current_solvers["solvers"].append({"solver_id": solver_id})
+            updates["current_solvers"] = json.dumps(current_solvers)
+
+        history = _parse_solver_list(row["solver_history"])
+        if not any(s["solver_id"] == solver_id for s in history["solvers"]):
+            history["solvers"].append({"solver_id": solver_id})
+            debug_log(5, f"Storing solver_history for puzzle {puzzle_id}: {json.dumps(history)}")
+            updates["solver_history"] = json.dumps(history)
+
+        if updates:
+            assignments = ", ".join(f"{column} = %s" for column in updates)
+            cursor.execute(
+                f"UPDATE puzzle SET {assignments} WHERE id = %s",
+                (*updates.values(), puzzle_id),
             )
-        ) AS jt
-        WHERE jt.solver_id = %s
-    """,
-        (solver_id,),
-    )
-    current_puzzles = cursor.fetchall()
-    for current_puzzle in current_puzzles:
-        if current_puzzle["id"] != puzzle_id:
-            unassign_solver_from_puzzle(current_puzzle["id"], solver_id, conn, source)
+        _write_derived_tables(
+            conn,
+            "INSERT INTO puzzle_current_solver (solver_id, puzzle_id) VALUES (%s, %s) "
+            "ON DUPLICATE KEY UPDATE puzzle_id = VALUES(puzzle_id)",
+            (solver_id, puzzle_id),
+        )
+        _write_derived_tables(
+            conn,
+            "INSERT INTO solver_state (solver_id, current_puzzle_id, current_puzzle_name) "
+            "VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE "
+            "current_puzzle_id = VALUES(current_puzzle_id), "
+            "current_puzzle_name = VALUES(current_puzzle_name)",
+            (solver_id, puzzle_id, row["name"]),
+        )
+        sync_solver_history(puzzle_id, solver_id, conn, present=True)
+
+        # Invariant: all assignments are logged as "assignment" activity.
+        activities.append(("assignment", solver_id))
+        _insert_activities(puzzle_id, activities, source, conn, raising=True)
+        record_changes([("puzzle", puzzle_id), ("lastact", puzzle_id)], conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if status_changed:
+        _invalidate_cache(conn, puzzles=[puzzle_id])
+    _write_through_lastact(puzzle_id, conn)
 
-    # Fetch puzzle and validate it exists and is not solved
+
+def _lock_puzzles(puzzle_ids, conn):
+    """SELECT ... FOR UPDATE the given puzzle rows in id order (a fixed lock
+    order, so two transactions locking overlapping sets can't deadlock).
+    Returns {id: row} with name, status, current_solvers and solver_history;
+    missing ids are absent."""
+    puzzle_ids = sorted(set(puzzle_ids))
+    cursor = conn.cursor()
+    placeholders = ", ".join(["%s"] * len(puzzle_ids))
     cursor.execute(
-        "SELECT current_solvers, status FROM puzzle WHERE id = %s",
-        (puzzle_id,),
+        f"SELECT id, name, status, current_solvers, solver_history FROM puzzle "
+        f"WHERE id IN ({placeholders}) ORDER BY id FOR UPDATE",
+        tuple(puzzle_ids),
     )
-    row = cursor.fetchone()
-    if row is None:
-        raise ValueError(f"Puzzle {puzzle_id} does not exist")
-    if row["status"] == "Solved":
-        raise ValueError(f"Cannot assign solver to puzzle {puzzle_id} - puzzle is already solved")
+    return {row["id"]: row for row in cursor.fetchall()}
 
-    current_solvers_str = row["current_solvers"] or json.dumps(
-        {"solvers": []}
-    )
-    current_solvers = json.loads(current_solvers_str)
 
-    # Transition puzzle out of "New" or "Abandoned" when a solver is assigned.
-    # Use update_puzzle_field so the status-change activity logging invariant fires.
-    if row["status"] in ("New", "Abandoned"):
-        debug_log(3, f"Auto-transitioning puzzle {puzzle_id} from '{row['status']}' to 'Being worked'")
-        update_puzzle_field(puzzle_id, "status", "Being worked", conn, source)
+def _parse_solver_list(value):
+    """Parse a current_solvers / solver_history JSON column."""
+    return json.loads(value or json.dumps({"solvers": []}))
 
-    if not any(s["solver_id"] == solver_id for s in current_solvers["solvers"]):
-        current_solvers["solvers"].append({"solver_id": solver_id})
-        cursor.execute(
-            "UPDATE puzzle SET current_solvers = %s WHERE id = %s",
-            (json.dumps(current_solvers), puzzle_id),
-        )
 
-    # Update history
-    cursor.execute(
-        "SELECT solver_history FROM puzzle WHERE id = %s",
-        (puzzle_id,),
+def _remove_current_solver(puzzle_id, current_solvers_json, solver_id, conn):
+    """Drop solver_id from a locked puzzle's current solvers. Does NOT commit."""
+    current_solvers = _parse_solver_list(current_solvers_json)
+    current_solvers["solvers"] = [
+        s for s in current_solvers["solvers"] if s["solver_id"] != solver_id
+    ]
+    conn.cursor().execute(
+        "UPDATE puzzle SET current_solvers = %s WHERE id = %s",
+        (json.dumps(current_solvers), puzzle_id),
+    )
+    _write_derived_tables(
+        conn,
+        "DELETE FROM puzzle_current_solver WHERE solver_id = %s AND puzzle_id = %s",
+        (solver_id, puzzle_id),
+    )
+    _write_derived_tables(
+        conn,
+        "UPDATE solver_state SET current_puzzle_id = NULL, current_puzzle_name = NULL "
+        "WHERE solver_id = %s AND current_puzzle_id = %s",
+        (solver_id, puzzle_id),
     )
-    history_str = cursor.fetchone()["solver_history"] or json.dumps({"solvers": []})
-    history = json.loads(history_str)
+    record_change("puzzle", puzzle_id, conn)
 
-    if not any(s["solver_id"] == solver_id for s in history["solvers"]):
-        history["solvers"].append({"solver_id": solver_id})
-        debug_log(5, f"Storing solver_history for puzzle {puzzle_id}: {json.dumps(history)}")
+
+def get_current_puzzle_ids(solver_id, conn):
+    """Return the ids of the puzzles solver_id is currently assigned to.
+
+    A primary-key lookup on puzzle_current_solver (so at most one id). Until
+    the normalize_solver_assignments migration has run, falls back to the
+    JSON_TABLE scan over every puzzle's current_solvers.
+    """
+    solver_id = int(solver_id)
+    cursor = conn.cursor()
+    try:
         cursor.execute(
-            "UPDATE puzzle SET solver_history = %s WHERE id = %s",
-            (json.dumps(history), puzzle_id),
+            "SELECT puzzle_id AS id FROM puzzle_current_solver WHERE solver_id = %s",
+            (solver_id,),
         )
+    except Exception as e:
+        debug_log(5, f"puzzle_current_solver unavailable, scanning JSON: {e}")
+        cursor.execute(
+            """
+            SELECT DISTINCT p.id FROM puzzle p,
+            JSON_TABLE(
+                p.current_solvers,
+                '$.solvers[*]' COLUMNS (
+                    solver_id INT PATH '$.solver_id'
+                )
+            ) AS jt
+            WHERE jt.solver_id = %s
+        """,
+            (solver_id,),
+        )
+    return [row["id"] for row in cursor.fetchall()]
 
-    conn.commit()
 
-    # Invariant: all assignments are logged as "assignment" activity.
-    log_activity(puzzle_id, "assignment", solver_id, source, conn)
+def _write_derived_tables(conn, sql, params):
+    """Mirror an assignment or activity change into a table derived from it
+    (puzzle_current_solver, puzzle_solver_history, solver_state, the
+    activity rollups). Does NOT commit.
+
+    The JSON columns are still written alongside (so older code and a
+    rollback see the same data). Like record_change, a missing table is
+    skipped: before the table's migration (normalize_solver_assignments,
+    add_solver_state_table, add_activity_rollups) the statement fails alone
+    and the migration's backfill picks the change up. Any other error
+    (deadlock, lock wait timeout) has already aborted the transaction, so
+    it is raised for the caller to roll back.
+    """
+    try:
+        conn.cursor().execute(sql, params)
+    except Exception as e:
+        if not _is_missing_table(e):
+            raise
+        debug_log(5, f"derived table not updated: {e}")
+
+
+def sync_solver_history(puzzle_id, solver_id, conn, present):
+    """Add (present=True) or remove a puzzle_solver_history row to match a
+    solver_history JSON change, and refresh the solver's solver_state
+    history from it. Does NOT commit."""
+    puzzle_id, solver_id = int(puzzle_id), int(solver_id)
+    if present:
+        sql = "INSERT IGNORE INTO puzzle_solver_history (puzzle_id, solver_id) VALUES (%s, %s)"
+    else:
+        sql = "DELETE FROM puzzle_solver_history WHERE puzzle_id = %s AND solver_id = %s"
+    _write_derived_tables(conn, sql, (puzzle_id, solver_id))
+    _rebuild_history_puzzle_ids(solver_id, conn)
+
+
+def _rebuild_history_puzzle_ids(solver_id, conn):
+    """Recompute solver_state.history_puzzle_ids for one solver. Does NOT
+    commit."""
+    # Rebuilt from the solver's own (indexed) history rows rather than
+    # edited in place, so add and remove share one statement.
+    _write_derived_tables(
+        conn,
+        "INSERT INTO solver_state (solver_id, history_puzzle_ids) "
+        "SELECT %s, IFNULL(JSON_ARRAYAGG(puzzle_id), JSON_ARRAY()) "
+        "FROM puzzle_solver_history WHERE solver_id = %s "
+        "ON DUPLICATE KEY UPDATE history_puzzle_ids = VALUES(history_puzzle_ids)",
+        (solver_id, solver_id),
+    )
 
 
 def unassign_solver_from_puzzle(puzzle_id, solver_id, conn, source="system"):
@@ -420,31 +1031,16 @@ def unassign_solver_from_puzzle(puzzle_id, solver_id, conn, source="system"):
     """
     solver_id = int(solver_id)  # Normalize to int
     puzzle_id = int(puzzle_id)
-    cursor = conn.cursor()
-
-    cursor.execute(
-        "SELECT current_solvers FROM puzzle WHERE id = %s",
-        (puzzle_id,),
-    )
-    row = cursor.fetchone()
-    if row is None:
-        raise ValueError(f"Puzzle {puzzle_id} does not exist")
-
-    current_solvers_str = row["current_solvers"] or json.dumps(
-        {"solvers": []}
-    )
-    current_solvers = json.loads(current_solvers_str)
-
-    current_solvers["solvers"] = [
-        s for s in current_solvers["solvers"] if s["solver_id"] != solver_id
-    ]
 
-    cursor.execute(
-        "UPDATE puzzle SET current_solvers = %s WHERE id = %s",
-        (json.dumps(current_solvers), puzzle_id),
-    )
-
-    conn.commit()
+    try:
+        row = _lock_puzzles([puzzle_id], conn).get(puzzle_id)
+        if row is None:
+            raise ValueError(f"Puzzle {puzzle_id} does not exist")
+        _remove_current_solver(puzzle_id, row["current_solvers"], solver_id, conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
 
 def clear_puzzle_solvers(puzzle_id, conn):
@@ -461,17 +1057,131 @@ def clear_puzzle_solvers(puzzle_id, conn):
     """,
         (puzzle_id,),
     )
+    _write_derived_tables(
+        conn, "DELETE FROM puzzle_current_solver WHERE puzzle_id = %s", (puzzle_id,)
+    )
+    _write_derived_tables(
+        conn,
+        "UPDATE solver_state SET current_puzzle_id = NULL, current_puzzle_name = NULL "
+        "WHERE current_puzzle_id = %s",
+        (puzzle_id,),
+    )
+    record_change("puzzle", puzzle_id, conn)
 
     conn.commit()
 
 
+def _history_solver_ids(puzzle_id, conn):
+    """Return the ids of the solvers in a puzzle's puzzle_solver_history
+    ([] before the normalize_solver_assignments migration)."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT solver_id FROM puzzle_solver_history WHERE puzzle_id = %s", (puzzle_id,)
+        )
+    except Exception as e:
+        if not _is_missing_table(e):
+            raise
+        return []
+    return [row["solver_id"] for row in cursor.fetchall()]
+
+
+def _history_puzzle_ids(solver_id, conn):
+    """Return the ids of the puzzles in a solver's puzzle_solver_history
+    ([] before the normalize_solver_assignments migration)."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT puzzle_id FROM puzzle_solver_history WHERE solver_id = %s", (solver_id,)
+        )
+    except Exception as e:
+        if not _is_missing_table(e):
+            raise
+        return []
+    return [row["puzzle_id"] for row in cursor.fetchall()]
+
+
+def delete_puzzle(puzzle_id, conn):
+    """Delete a puzzle together with its puzzle_current_solver and
+    puzzle_solver_history rows, in one transaction.
+
+    Solvers working on it are left with no current puzzle in solver_state,
+    and the puzzle is dropped from the history_puzzle_ids of everyone who
+    worked on it. Rolls back and raises on failure.
+    """
+    puzzle_id = int(puzzle_id)
+    try:
+        history_solvers = _history_solver_ids(puzzle_id, conn)
+        _write_derived_tables(
+            conn, "DELETE FROM puzzle_current_solver WHERE puzzle_id = %s", (puzzle_id,)
+        )
+        _write_derived_tables(
+            conn,
+            "UPDATE solver_state SET current_puzzle_id = NULL, current_puzzle_name = NULL "
+            "WHERE current_puzzle_id = %s",
+            (puzzle_id,),
+        )
+        _write_derived_tables(
+            conn, "DELETE FROM puzzle_solver_history WHERE puzzle_id = %s", (puzzle_id,)
+        )
+        for solver_id in history_solvers:
+            _rebuild_history_puzzle_ids(solver_id, conn)
+        conn.cursor().execute("DELETE FROM puzzle WHERE id = %s", (puzzle_id,))
+        record_change("puzzle", puzzle_id, conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def delete_solver(name, conn):
+    """Delete a solver by name together with its puzzle_current_solver,
+    puzzle_solver_history and solver_state rows, in one transaction.
+
+    The solver is also dropped from the current_solvers JSON of the puzzle
+    it was working on. Returns the ids of the puzzles whose solver lists
+    changed ([] if there is no such solver). Rolls back and raises on
+    failure.
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id FROM solver WHERE name = %s FOR UPDATE", (name,))
+        row = cursor.fetchone()
+        if row is None:
+            conn.rollback()
+            return []
+        solver_id = row["id"]
+
+        current_ids = get_current_puzzle_ids(solver_id, conn)
+        current = _lock_puzzles(current_ids, conn) if current_ids else {}
+        for puzzle_id, puzzle in current.items():
+            _remove_current_solver(puzzle_id, puzzle["current_solvers"], solver_id, conn)
+        history = sorted(set(_history_puzzle_ids(solver_id, conn)) - set(current))
+        _write_derived_tables(
+            conn, "DELETE FROM puzzle_solver_history WHERE solver_id = %s", (solver_id,)
+        )
+        _write_derived_tables(
+            conn, "DELETE FROM solver_state WHERE solver_id = %s", (solver_id,)
+        )
+        if history:
+            record_changes([("puzzle", puzzle_id) for puzzle_id in history], conn)
+        cursor.execute("DELETE FROM solver WHERE id = %s", (solver_id,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return sorted(set(current) | set(history))
+
+
 def log_activity(puzzle_id, activity_type, solver_id, source, conn, timestamp=None):
     """
     Log an activity entry to the activity table.
 
-    Non-raising: on failure, logs a SEV1 error and returns False. This ensures
-    that a logging failure never rolls back an already-committed mutation or
-    prevents subsequent operations in the same call chain.
+    Non-raising: on failure, logs a SEV1 error, rolls back the half-written
+    activity and returns False. This ensures that a logging failure never
+    rolls back an already-committed mutation or prevents subsequent
+    operations in the same call chain, and that the next commit on conn
+    can't land the activity row without its rollups.
 
     Args:
         puzzle_id: Puzzle database ID
@@ -492,25 +1202,337 @@ def log_activity(puzzle_id, activity_type, solver_id, source, conn, timestamp=No
     try:
         puzzle_id = int(puzzle_id)
         solver_id = int(solver_id)
-        cursor = conn.cursor()
-        if timestamp is not None:
-            cursor.execute(
-                "INSERT INTO activity (puzzle_id, solver_id, source, type, time) VALUES (%s, %s, %s, %s, FROM_UNIXTIME(%s))",
-                (puzzle_id, solver_id, source, activity_type, timestamp),
-            )
-        else:
-            cursor.execute(
-                "INSERT INTO activity (puzzle_id, solver_id, source, type) VALUES (%s, %s, %s, %s)",
-                (puzzle_id, solver_id, source, activity_type),
-            )
+        _insert_activities(
+            puzzle_id, [(activity_type, solver_id)], source, conn,
+            raising=True, timestamp=timestamp,
+        )
+        record_change("lastact", puzzle_id, conn)
         conn.commit()
         _write_through_lastact(puzzle_id, conn)
         return True
     except Exception as e:
         debug_log(1, f"CRITICAL: Failed to log activity (puzzle={puzzle_id}, type={activity_type}, solver={solver_id}, source={source}): {e}")
+        try:
+            conn.rollback()
+        except Exception as rollback_error:
+            debug_log(1, f"rollback after failed activity log failed: {rollback_error}")
         return False
 
 
+def _insert_activities(puzzle_id, activities, source, conn, raising=False, timestamp=None):
+    """Insert (activity_type, solver_id) rows for one puzzle in a single
+    statement, timestamped now (or at the Unix timestamp given), point each
+    solver's solver_state at its new row and add them to the activity
+    rollups. Does NOT commit.
+
+    Non-raising by default (a failed insert is logged and only rolls back
+    this statement). Callers inside a larger transaction pass raising=True:
+    a deadlock or lock wait timeout aborts the whole transaction, which
+    must then be rolled back rather than committed half-done.
+    """
+    solver_ids = [int(solver_id) for _, solver_id in activities]
+    if timestamp is None:
+        columns, row = "(puzzle_id, solver_id, source, type)", "(%s, %s, %s, %s)"
+        extra = ()
+    else:
+        columns, row = "(puzzle_id, solver_id, source, type, time)", "(%s, %s, %s, %s, FROM_UNIXTIME(%s))"
+        extra = (timestamp,)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            f"INSERT INTO activity {columns} VALUES " + ", ".join([row] * len(activities)),
+            tuple(
+                value
+                for (activity_type, _), solver_id in zip(activities, solver_ids)
+                for value in (puzzle_id, solver_id, source, activity_type, *extra)
+            ),
+        )
+    except Exception as e:
+        if raising:
+            raise
+        debug_log(1, f"CRITICAL: Failed to log activity (puzzle={puzzle_id}, {activities}, source={source}): {e}")
+        return
+    _note_solver_activity(cursor.lastrowid, puzzle_id, solver_ids, conn)
+    _roll_up_activities(cursor.lastrowid, puzzle_id, activities, source, conn)
+
+
+def _note_solver_activity(first_id, puzzle_id, solver_ids, conn):
+    """Point solver_state.last_activity_* at activity rows just inserted
+    (ids from first_id up, for puzzle_id). Does NOT commit.
+
+    A row only replaces the solver's current one if it isn't older:
+    bigjimmybot logs sheet edits with historical timestamps, and the latest
+    activity is the latest by time, as in the ORDER BY time DESC lookup
+    this replaces.
+    """
+    placeholders = ", ".join(["%s"] * len(set(solver_ids)))
+    newer = "last_activity_time IS NULL OR VALUES(last_activity_time) >= last_activity_time"
+    _write_derived_tables(
+        conn,
+        "INSERT INTO solver_state (solver_id, last_activity_id, last_activity_time) "
+        "SELECT solver_id, id, time FROM activity "
+        f"WHERE id >= %s AND puzzle_id = %s AND solver_id IN ({placeholders}) ORDER BY id "
+        "ON DUPLICATE KEY UPDATE "
+        f"last_activity_id = IF({newer}, VALUES(last_activity_id), last_activity_id), "
+        f"last_activity_time = IF({newer}, VALUES(last_activity_time), last_activity_time)",
+        (first_id, puzzle_id, *sorted(set(solver_ids))),
+    )
+
+
+# Activity types whose times feed puzzle_activity_rollup (the /activity
+# solve and open-puzzle timers).
+TIMED_ACTIVITY_TYPES = ("create", "solve")
+
+
+def _roll_up_activities(first_id, puzzle_id, activities, source, conn):
+    """Add activity rows just inserted (ids from first_id up, for puzzle_id)
+    to activity_counts and, for create/solve rows, puzzle_activity_rollup.
+    Does NOT commit.
+
+    Counts need only the types, so the common case (bigjimmybot revise
+    rows) is a single upsert. Timed rows are read back for their stored
+    time, which may be the database's clock or a historical timestamp.
+    """
+    counts = collections.Counter((activity_type, source or "") for activity_type, _ in activities)
+    _write_derived_tables(
+        conn,
+        "INSERT INTO activity_counts (type, source, count) VALUES "
+        + ", ".join(["(%s, %s, %s)"] * len(counts))
+        + " ON DUPLICATE KEY UPDATE count = count + VALUES(count)",
+        tuple(value for (t, src), n in counts.items() for value in (t, src, n)),
+    )
+
+    timed = sum(1 for activity_type, _ in activities if activity_type in TIMED_ACTIVITY_TYPES)
+    if not timed:
+        return
+    _write_derived_tables(
+        conn,
+        """
+        INSERT INTO puzzle_activity_rollup (puzzle_id, create_count, create_time_sum,
+            solve_count, solve_time_sum, last_solve_time)
+        SELECT puzzle_id,
+            SUM(type = 'create'), SUM(IF(type = 'create', UNIX_TIMESTAMP(time), 0)),
+            SUM(type = 'solve'), SUM(IF(type = 'solve', UNIX_TIMESTAMP(time), 0)),
+            MAX(IF(type = 'solve', time, NULL))
+        FROM (
+            SELECT puzzle_id, type, time FROM activity
+            WHERE id >= %s AND puzzle_id = %s AND type IN ('create', 'solve')
+            ORDER BY id LIMIT %s
+        ) AS inserted
+        GROUP BY puzzle_id
+        ON DUPLICATE KEY UPDATE
+            create_count = create_count + VALUES(create_count),
+            create_time_sum = create_time_sum + VALUES(create_time_sum),
+            solve_count = solve_count + VALUES(solve_count),
+            solve_time_sum = solve_time_sum + VALUES(solve_time_sum),
+            last_solve_time = COALESCE(GREATEST(last_solve_time, VALUES(last_solve_time)),
+                                       last_solve_time, VALUES(last_solve_time))
+        """,
+        (first_id, puzzle_id, timed),
+    )
+
+
+def get_activity_summary(conn):
+    """Activity counts and puzzle timers for GET /activity.
+
+    Reads the activity_counts and puzzle_activity_rollup tables (a few
+    small rows, whatever the size of activity). The solve timer sums
+    solve time minus create time over every (solve, create) pair of a
+    puzzle, so per puzzle it is create_count * solve_time_sum -
+    solve_count * create_time_sum. Until the add_activity_rollups migration
+    has run, falls back to aggregating the activity table.
+
+    Returns:
+        dict with "activity" ({type: {source: count}}), "puzzle_solves_timer",
+        "open_puzzles_timer" and "seconds_since_last_solve".
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT type, source, count FROM activity_counts")
+        counts = [
+            {"type": row["type"] or None, "source": row["source"] or None, "count": row["count"]}
+            for row in cursor.fetchall()
+        ]
+        cursor.execute(
+            """
+            SELECT
+                SUM(r.create_count > 0 AND r.solve_count > 0) AS total_solves,
+                SUM(IF(r.create_count > 0 AND r.solve_count > 0,
+                       r.create_count * r.solve_time_sum - r.solve_count * r.create_time_sum,
+                       0)) AS total_solve_time,
+                SUM(r.create_count > 0 AND p.status NOT IN ('Solved', '[hidden]')) AS total_open,
+                SUM(IF(r.create_count > 0 AND p.status NOT IN ('Solved', '[hidden]'),
+                       r.create_count * UNIX_TIMESTAMP() - r.create_time_sum,
+                       0)) AS total_open_time,
+                TIMESTAMPDIFF(SECOND, MAX(r.last_solve_time), NOW()) AS seconds_since_last_solve
+            FROM puzzle_activity_rollup r
+            LEFT JOIN puzzle p ON p.id = r.puzzle_id
+            """
+        )
+        timers = cursor.fetchone() or {}
+        solve_timing = open_timing = last_solve = timers
+    except Exception as e:
+        debug_log(5, f"activity rollups unavailable, aggregating activity: {e}")
+        counts, solve_timing, open_timing, last_solve = _scan_activity_summary(cursor)
+
+    # Build nested dict: {type: {source: count, ...}, ...}
+    activity_counts = {}
+    for row in counts:
+        activity_counts.setdefault(row["type"], {})[row["source"]] = int(row["count"])
+
+    return {
+        "activity": activity_counts,
+        "puzzle_solves_timer": {
+            "total_solves": int(solve_timing.get("total_solves") or 0),
+            "total_solve_time_seconds": int(solve_timing.get("total_solve_time") or 0),
+        },
+        "open_puzzles_timer": {
+            "total_open": int(open_timing.get("total_open") or 0),
+            "total_open_time_seconds": int(open_timing.get("total_open_time") or 0),
+        },
+        "seconds_since_last_solve": last_solve.get("seconds_since_last_solve"),
+    }
+
+
+def _scan_activity_summary(cursor):
+    """The pre-rollup /activity queries, over the whole activity table."""
+    # Get activity counts by type and source
+    cursor.execute(
+        """
+        SELECT type, source, COUNT(*) as count
+        FROM activity
+        GROUP BY type, source
+        """
+    )
+    counts = cursor.fetchall()
+
+    # Get puzzle solve timing information
+    cursor.execute(
+        """
+        SELECT
+            COUNT(DISTINCT a1.puzzle_id) as total_solves,
+            SUM(TIMESTAMPDIFF(SECOND, a2.time, a1.time)) as total_solve_time
+        FROM activity a1
+        JOIN activity a2 ON a1.puzzle_id = a2.puzzle_id AND a2.type = 'create'
+        WHERE a1.type = 'solve'
+        """
+    )
+    solve_timing = cursor.fetchone()
+
+    # Get open puzzles timing information
+    cursor.execute(
+        """
+        SELECT
+            COUNT(DISTINCT p.id) as total_open,
+            SUM(TIMESTAMPDIFF(SECOND, a.time, NOW())) as total_open_time
+        FROM puzzle p
+        JOIN activity a ON p.id = a.puzzle_id AND a.type = 'create'
+        WHERE p.status != 'Solved' AND p.status != '[hidden]'
+        """
+    )
+    open_timing = cursor.fetchone()
+
+    # Get time since last solve
+    cursor.execute(
+        """
+        SELECT TIMESTAMPDIFF(SECOND, time, NOW()) as seconds_since_last_solve
+        FROM activity
+        WHERE type = 'solve'
+        ORDER BY time DESC
+        LIMIT 1
+        """
+    )
+    last_solve = cursor.fetchone() or {}
+    return counts, solve_timing, open_timing, last_solve
+
+
+# Activity listings page newest-first by (time, id); the id breaks ties
+# between rows logged in the same second.
+ACTIVITY_PAGE_ORDER = "ORDER BY time DESC, id DESC"
+
+
+def encode_activity_cursor(row):
+    """Opaque continuation token for the page after activity row `row`."""
+    raw = json.dumps([row["time"].isoformat(), int(row["id"])], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_activity_cursor(token):
+    """Inverse of encode_activity_cursor: (time, id).
+
+    Raises:
+        ValueError: If the token is malformed (callers answer 400).
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        time_str, activity_id = json.loads(raw)
+        return datetime.datetime.fromisoformat(time_str), int(activity_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+def get_activity_page(conn, select, conditions, params, limit, after=None, split=None):
+    """Fetch one newest-first page of an activity listing by keyset.
+
+    Each page is a range scan on an index ending in (time, id) — the
+    per-puzzle, per-solver, per-type or time index, whichever the filters
+    lead with — that stops after limit + 1 rows, however deep the client
+    has paged. OFFSET would re-read every earlier page.
+
+    Args:
+        conn: Database connection
+        select: "SELECT ... FROM activity a ..." producing at least `id` and
+            `time` columns, with no WHERE clause
+        conditions / params: Filter predicates on `a` and their parameters
+        limit: Page size, or None for every matching row in one response
+            (the listings' unpaginated default)
+        after: (time, id) from decode_activity_cursor, or None for page one
+        split: Optional (column, values) for an equality filter on one or
+            more values, such as a.type IN (...). Several values run one
+            branch per value, merged by UNION ALL, so each branch is a
+            bounded range on (column, time) instead of one filesort over
+            every matching row.
+
+    Returns:
+        (rows, next_cursor): at most `limit` rows; next_cursor is None on
+        the last page (and always when limit is None).
+    """
+    conditions, params = list(conditions), list(params)
+    if after is not None:
+        # The redundant a.time <= %s keeps the index range bounded; the OR
+        # only breaks ties within that one second.
+        conditions.append("a.time <= %s AND (a.time < %s OR a.id < %s)")
+        params += [after[0], after[0], after[1]]
+
+    limit_sql, limit_params = ("", []) if limit is None else (" LIMIT %s", [limit + 1])
+
+    def branch(extra_conditions, extra_params):
+        where = " AND ".join(conditions + extra_conditions) or "1=1"
+        return (
+            f"{select} WHERE {where} ORDER BY a.time DESC, a.id DESC{limit_sql}",
+            params + extra_params + limit_params,
+        )
+
+    if split and len(split[1]) > 1:
+        column, values = split
+        parts = [branch([f"{column} = %s"], [value]) for value in values]
+        sql = " UNION ALL ".join(f"({part_sql})" for part_sql, _ in parts)
+        sql += f" {ACTIVITY_PAGE_ORDER}{limit_sql}"
+        query_params = [p for _, part_params in parts for p in part_params] + limit_params
+    elif split:
+        sql, query_params = branch([f"{split[0]} = %s"], list(split[1]))
+    else:
+        sql, query_params = branch([], [])
+
+    cursor = conn.cursor()
+    cursor.execute(sql, tuple(query_params))
+    rows = list(cursor.fetchall())
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_activity_cursor(rows[-1])
+    return rows, None
+
+
 def serialize_activity(row):
     """Return a copy of an activity row with time converted to ISO 8601 string.
 
@@ -525,6 +1547,112 @@ def serialize_activity(row):
     return row
 
 
+# The activity.type enum, in schema order.
+ACTIVITY_TYPES = (
+    "create", "revise", "comment", "interact", "solve", "change", "status", "assignment",
+)
+ACTIVITY_EXPORT_COLUMNS = (
+    "id", "time", "solver_id", "puzzle_id", "source", "type", "uri", "source_version",
+)
+ACTIVITY_EXPORT_FORMATS = ("ndjson", "csv")
+ACTIVITY_EXPORT_BATCH = 1000  # rows pulled off the socket per fetchmany
+# The server blocks on a slow reader for up to net_write_timeout while an
+# unbuffered result is open (default 60s), then aborts the statement.
+ACTIVITY_EXPORT_SESSION = "SET SESSION net_write_timeout = 600"
+
+
+def export_activity(conn, fmt="ndjson", since_id=None, start=None, end=None,
+                    types=None, puzzle_id=None, limit=None,
+                    batch_size=ACTIVITY_EXPORT_BATCH):
+    """Stream the activity log in id order as NDJSON lines or CSV.
+
+    Generator of text chunks, one per batch, for a streamed response. Rows
+    come through an unbuffered server-side cursor (SSCursor) as tuples and
+    are encoded batch by batch, so memory stays flat however large the
+    table: a DictCursor fetchall() would hold every row as a dict first.
+
+    Ordering by id makes exports resumable: pass the last id received as
+    since_id to pick up where an interrupted or earlier export stopped.
+
+    conn should be a connection of its own (pbrest opens one with
+    ACTIVITY_EXPORT_SESSION); it is closed when the generator finishes or is
+    closed early. An abandoned unbuffered result can only be discarded by
+    reading it to the end or dropping the connection, and a client that
+    disconnects halfway through a large export should not cost the rest.
+
+    Args:
+        conn: Dedicated database connection, closed by this generator
+        fmt: "ndjson" (one JSON object per line) or "csv" (with header row)
+        since_id: Only rows with id > since_id
+        start / end: Only rows with start <= time < end (datetimes)
+        types: Only these activity types
+        puzzle_id: Only this puzzle's activity
+        limit: Stop after this many rows (None for no limit)
+        batch_size: Rows per fetchmany()
+    """
+    conditions, params = [], []
+    if since_id is not None:
+        conditions.append("id > %s")
+        params.append(since_id)
+    if start is not None:
+        conditions.append("time >= %s")
+        params.append(start)
+    if end is not None:
+        conditions.append("time < %s")
+        params.append(end)
+    if types:
+        conditions.append(f"type IN ({','.join(['%s'] * len(types))})")
+        params.extend(types)
+    if puzzle_id is not None:
+        conditions.append("puzzle_id = %s")
+        params.append(puzzle_id)
+    sql = (
+        f"SELECT {', '.join(ACTIVITY_EXPORT_COLUMNS)} FROM activity"
+        f" WHERE {' AND '.join(conditions) or '1=1'} ORDER BY id"
+    )
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+
+    try:
+        if fmt not in ACTIVITY_EXPORT_FORMATS:
+            raise ValueError(f"fmt must be one of {', '.join(ACTIVITY_EXPORT_FORMATS)}")
+        cursor = conn.cursor(MySQLdb.cursors.SSCursor)
+        cursor.execute(sql, tuple(params))
+        if fmt == "csv":
+            out = io.StringIO()
+            writer = csv.writer(out, lineterminator="\n")
+            writer.writerow(ACTIVITY_EXPORT_COLUMNS)
+            yield out.getvalue()
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            if fmt == "csv":
+                out.seek(0)
+                out.truncate()
+                writer.writerows(
+                    (row[0], row[1].isoformat() if row[1] else None) + tuple(row[2:])
+                    for row in batch
+                )
+                yield out.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(ACTIVITY_EXPORT_COLUMNS, row)), default=_export_default)
+                    + "\n"
+                    for row in batch
+                )
+    finally:
+        conn.close()
+
+
+def _export_default(value):
+    """json.dumps default for export rows: times as ISO 8601."""
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
 def _write_through_lastact(puzzle_id, conn):
     """Refresh a puzzle's entry in the Redis lastact hash after an activity
     insert.
@@ -574,6 +1702,18 @@ def get_solver_by_name_from_db(name, conn):
     return cursor.fetchone()
 
 
+def get_solver_ids(conn, after_id=0):
+    """Return {lowercased username: solver id} for solvers with id > after_id.
+
+    Reads the solver table itself rather than solver_view, so it stays
+    cheap enough to load every solver at once (bigjimmybot's solver
+    directory). Raises on query failure.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, name FROM solver WHERE id > %s", (int(after_id),))
+    return {row["name"].lower(): row["id"] for row in cursor.fetchall()}
+
+
 def solver_exists(identifier, conn):
     """
     Check if a solver exists in the database.
@@ -607,15 +1747,85 @@ def solver_exists(identifier, conn):
 STRUCTURAL_PUZZLE_FIELDS = {"status", "name", "round_id", "answer", "ismeta"}
 
 
-def _invalidate_cache(conn):
+# MySQL error for a statement against a table that doesn't exist yet (a
+# migration not run). The only error the best-effort side-table writes
+# skip; anything else means the surrounding transaction has failed.
+ER_NO_SUCH_TABLE = 1146
+
+
+def _is_missing_table(error):
+    """True if error is MySQL's ER_NO_SUCH_TABLE."""
+    return bool(getattr(error, "args", None)) and error.args[0] == ER_NO_SUCH_TABLE
+
+
+# Durable mutation sequence backing /all/changes delta sync. Every write that
+# changes what /all serves appends (entity, entity_id) to change_log inside
+# the mutation's own transaction; the AUTO_INCREMENT id is the sequence.
+# bigjimmybot prunes it to the newest CHANGE_LOG_RETENTION rows; a client
+# that falls behind the retained window gets a full snapshot instead.
+CHANGE_ENTITIES = ("puzzle", "round", "hint", "lastact")
+CHANGE_LOG_RETENTION = 20000
+
+
+def record_change(entity, entity_id, conn):
+    """Append a change_log row for a mutated entity. Does NOT commit — call
+    before the caller's own commit so the sequence entry lands atomically
+    with the change.
+
+    Skipped while the add_change_log_table migration hasn't run (the insert
+    fails alone and delta clients miss the entry until their next full
+    snapshot). Any other error is raised: a deadlock or lock wait timeout
+    means the caller's transaction is gone and must be rolled back.
+    """
+    record_changes([(entity, entity_id)], conn)
+
+
+def record_changes(changes, conn):
+    """record_change for several (entity, entity_id) pairs in one INSERT."""
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO change_log (entity, entity_id) VALUES "
+            + ", ".join(["(%s, %s)"] * len(changes)),
+            tuple(v for entity, entity_id in changes for v in (entity, int(entity_id))),
+        )
+    except Exception as e:
+        if not _is_missing_table(e):
+            raise
+        debug_log(3, f"change_log insert failed for {changes}: {e}")
+
+
+def prune_change_log(conn, keep=CHANGE_LOG_RETENTION):
+    """Delete all but the newest `keep` change_log rows.
+
+    Returns the number of rows deleted (0 on failure).
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT MAX(id) AS max_seq FROM change_log")
+        row = cursor.fetchone()
+        if not row or not row["max_seq"] or row["max_seq"] <= keep:
+            return 0
+        cursor.execute("DELETE FROM change_log WHERE id <= %s", (row["max_seq"] - keep,))
+        conn.commit()
+        return cursor.rowcount
+    except Exception as e:
+        debug_log(2, f"change_log prune failed: {e}")
+        return 0
+
+
+def _invalidate_cache(conn, **scope):
     """Invalidate the puzzle/round cache after a structural database mutation.
 
+    scope (puzzles=, rounds=) limits the /all rebuild to the rounds the write
+    touched; see pbcachelib.invalidate_all_cache.
+
     Uses a lazy import to avoid circular dependency (pbcachelib imports pblib).
     Fails silently if cache is not available — cache misses are safe, stale data is not.
     """
     try:
         from pbcachelib import invalidate_all_cache
-        invalidate_all_cache(conn)
+        invalidate_all_cache(conn, **scope)
     except ImportError:
         pass  # pbcachelib/redis not installed — no cache to invalidate
     except Exception as e:
@@ -654,6 +1864,13 @@ def update_puzzle_field(puzzle_id, field, value, conn, source="system"):
         # Handle other puzzle updates
         cursor = conn.cursor()
         cursor.execute(f"UPDATE puzzle SET {field} = %s WHERE id = %s", (value, puzzle_id))
+        if field == "name":
+            _write_derived_tables(
+                conn,
+                "UPDATE solver_state SET current_puzzle_name = %s WHERE current_puzzle_id = %s",
+                (value, puzzle_id),
+            )
+        record_change("puzzle", puzzle_id, conn)
         conn.commit()
 
         # Invariant: all non-Solved status changes are logged as "status" activity.
@@ -667,7 +1884,7 @@ def update_puzzle_field(puzzle_id, field, value, conn, source="system"):
     # Non-structural fields ride the blob's 15s TTL — invalidating for them
     # couples cache lifetime to high-churn writes (see REDIS_MIGRATION.md).
     if field in STRUCTURAL_PUZZLE_FIELDS:
-        _invalidate_cache(conn)
+        _invalidate_cache(conn, puzzles=[puzzle_id])
 
 
 def get_solver_by_id_from_db(solver_id, conn):
@@ -699,13 +1916,25 @@ def get_last_activity_for_solver(solver_id, conn):
 
     Returns:
         Activity dict with 'time' as datetime object, or None if no activity.
+
+    Two primary-key lookups via solver_state.last_activity_id. Until the
+    add_solver_state_table migration has run, falls back to sorting the
+    solver's activity rows.
     """
     solver_id = int(solver_id)
     cursor = conn.cursor()
-    cursor.execute(
-        "SELECT * from activity where solver_id = %s ORDER BY time DESC LIMIT 1",
-        (solver_id,),
-    )
+    try:
+        cursor.execute(
+            "SELECT a.* FROM solver_state s JOIN activity a ON a.id = s.last_activity_id "
+            "WHERE s.solver_id = %s",
+            (solver_id,),
+        )
+    except Exception as e:
+        debug_log(5, f"solver_state unavailable, scanning activity: {e}")
+        cursor.execute(
+            "SELECT * from activity where solver_id = %s ORDER BY time DESC LIMIT 1",
+            (solver_id,),
+        )
     return cursor.fetchone()
 
 
@@ -747,6 +1976,29 @@ def get_last_activity_for_puzzle(puzzle_id, conn):
     return cursor.fetchone()
 
 
+def get_last_activity_times(conn, puzzle_ids=None):
+    """Return {puzzle_id: unix time of its latest activity} for every puzzle
+    with any, or only for puzzle_ids if given. One loose index scan over
+    idx_puzzle_time."""
+    cursor = conn.cursor()
+    if puzzle_ids is None:
+        cursor.execute(
+            "SELECT puzzle_id, UNIX_TIMESTAMP(MAX(time)) AS last_time FROM activity "
+            "WHERE puzzle_id IS NOT NULL GROUP BY puzzle_id"
+        )
+    else:
+        puzzle_ids = sorted({int(pid) for pid in puzzle_ids})
+        if not puzzle_ids:
+            return {}
+        placeholders = ", ".join(["%s"] * len(puzzle_ids))
+        cursor.execute(
+            "SELECT puzzle_id, UNIX_TIMESTAMP(MAX(time)) AS last_time FROM activity "
+            f"WHERE puzzle_id IN ({placeholders}) GROUP BY puzzle_id",
+            tuple(puzzle_ids),
+        )
+    return {row["puzzle_id"]: float(row["last_time"]) for row in cursor.fetchall()}
+
+
 def update_botstat(key, value, conn):
     """Insert or update a bot statistic.
 
@@ -763,63 +2015,200 @@ def update_botstat(key, value, conn):
     conn.commit()
 
 
-def increment_botstat(stat_name, conn):
+def increment_botstat(stat_name, conn, by=1):
     """Increment a counter in the botstats table (atomic upsert).
 
     Args:
         stat_name: The botstats key to increment
         conn: Database connection
+        by: Amount to add (default 1)
     """
     try:
         cursor = conn.cursor()
         # Use INSERT ... ON DUPLICATE KEY to atomically increment
         cursor.execute(
-            """INSERT INTO botstats (`key`, `val`) VALUES (%s, '1')
-               ON DUPLICATE KEY UPDATE `val` = CAST(`val` AS UNSIGNED) + 1""",
-            (stat_name,),
+            """INSERT INTO botstats (`key`, `val`) VALUES (%s, %s)
+               ON DUPLICATE KEY UPDATE `val` = CAST(`val` AS UNSIGNED) + %s""",
+            (stat_name, str(by), by),
         )
         conn.commit()
     except Exception as e:
         debug_log(3, f"increment_botstat error for {stat_name}: {e}")
 
 
-def get_all_rounds_with_puzzles(conn):
-    """Fetch all rounds with their nested puzzles from database.
+def get_bot_state(key, conn):
+    """Return a bot_state value (string), or None if unset.
+
+    bot_state holds bot bookkeeping that is not a metric (botstats rows are
+    all exported to Prometheus). Non-raising: returns None if the
+    add_bot_state_table migration has not run.
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT `val` FROM bot_state WHERE `key` = %s", (key,))
+        row = cursor.fetchone()
+        return row["val"] if row else None
+    except Exception as e:
+        debug_log(3, f"bot_state read failed for {key}: {e}")
+        return None
+
+
+def set_bot_state(key, value, conn):
+    """Insert or update a bot_state value. Non-raising; returns True on success."""
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO bot_state (`key`, `val`) VALUES (%s, %s) ON DUPLICATE KEY UPDATE `val`=%s",
+            (key, value, value),
+        )
+        conn.commit()
+        return True
+    except Exception as e:
+        debug_log(3, f"bot_state write failed for {key}: {e}")
+        return False
+
+
+# ── Buffered botstats counters ─────────────────────────────────────────────
+# Hot-path counters (cache hits/misses and the like) are accumulated in
+# process memory and flushed to botstats as one aggregated delta per key every
+# BOTSTAT_FLUSH_INTERVAL seconds and at process exit. Deltas are added with
+# the same atomic upsert as increment_botstat, so totals stay exact across
+# gunicorn workers; readers of botstats lag by up to one interval.
+BOTSTAT_FLUSH_INTERVAL = 10  # seconds
+_pending_counts = {}
+_pending_pid = None  # process that owns _pending_counts (reset on fork)
+_counts_lock = threading.Lock()
+
+
+def count_botstat(stat_name, by=1):
+    """Buffer a botstats counter increment. No DB work on the caller's path;
+    a per-process thread flushes it (see flush_botstat_counts).
 
     Args:
-        conn: Database connection
+        stat_name: The botstats key to increment
+        by: Amount to add (default 1)
+    """
+    global _pending_pid
+    with _counts_lock:
+        if _pending_pid != os.getpid():
+            # First count in this process, or a forked child holding a copy
+            # of its parent's buffer — which is the parent's to flush.
+            _pending_counts.clear()
+            _pending_pid = os.getpid()
+            _start_count_flusher()
+        _pending_counts[stat_name] = _pending_counts.get(stat_name, 0) + by
+
+
+def flush_botstat_counts(conn=None):
+    """Write this process's buffered counter deltas to botstats.
+
+    Borrows a pooled connection unless conn is given. On failure
+    the deltas are put back for the next flush, so a DB blip loses nothing.
 
     Returns:
-        List of round dicts, each with a 'puzzles' key containing list of puzzle dicts.
+        Number of counters written.
     """
-    cursor = conn.cursor()
-    cursor.execute("SELECT * from puzzle_view")
-    puzzle_view = cursor.fetchall()
+    with _counts_lock:
+        if _pending_pid != os.getpid() or not _pending_counts:
+            return 0
+        pending = dict(_pending_counts)
+        _pending_counts.clear()
+    own_conn = conn is None
+    try:
+        if own_conn:
+            conn = db_pool.acquire()
+        cursor = conn.cursor()
+        for stat_name, by in pending.items():
+            cursor.execute(
+                """INSERT INTO botstats (`key`, `val`) VALUES (%s, %s)
+                   ON DUPLICATE KEY UPDATE `val` = CAST(`val` AS UNSIGNED) + %s""",
+                (stat_name, str(by), by),
+            )
+        conn.commit()
+    except Exception as e:
+        debug_log(3, f"botstat counter flush failed, will retry: {e}")
+        with _counts_lock:
+            for stat_name, by in pending.items():
+                _pending_counts[stat_name] = _pending_counts.get(stat_name, 0) + by
+        return 0
+    finally:
+        if own_conn and conn is not None:
+            db_pool.release(conn)
+    debug_log(5, f"flushed {len(pending)} botstat counters")
+    return len(pending)
 
-    all_puzzles = {}
-    for puzzle in puzzle_view:
-        all_puzzles[puzzle["id"]] = puzzle
 
-    cursor.execute("SELECT * from round_view")
-    round_view = cursor.fetchall()
+def _start_count_flusher():
+    """Start this process's flush thread. Caller holds _counts_lock."""
+    threading.Thread(target=_run_count_flusher, name="botstat-flush", daemon=True).start()
 
-    def is_int(val):
-        try:
-            int(val)
-            return True
-        except Exception:
-            return False
 
-    rounds = []
-    for rnd in round_view:
-        if "puzzles" in rnd and rnd["puzzles"]:
-            rnd["puzzles"] = [
-                all_puzzles[int(pid)]
-                for pid in rnd["puzzles"].split(",")
-                if is_int(pid) and int(pid) in all_puzzles
-            ]
-        else:
-            rnd["puzzles"] = []
-        rounds.append(rnd)
+def _run_count_flusher():
+    import time
+
+    while True:
+        time.sleep(BOTSTAT_FLUSH_INTERVAL)
+        flush_botstat_counts()
+
+
+# Flush what's left when the process exits (gunicorn workers exit through
+# sys.exit, so this runs on restarts and graceful shutdown).
+atexit.register(flush_botstat_counts)
+
+
+# Round columns served in /all, in the order round_view used to give them.
+ROUND_COLUMNS = "id, name, round_uri, drive_uri, drive_id, comments, status"
+
 
+def get_all_rounds_with_puzzles(conn, round_ids=None):
+    """Fetch rounds with their nested puzzles from database.
+
+    The shared /all loader for pbrest, bigjimmybot and (through pbrest)
+    pbllmlib. Two set-based reads — rounds by id, puzzle_view by (round_id,
+    id) — merged in one pass by assemble_rounds. round_view's GROUP_CONCAT
+    id list is not used: past group_concat_max_len (1024 bytes by default,
+    about 200 puzzle ids) MySQL truncates it silently and big rounds lose
+    puzzles.
+
+    Args:
+        conn: Database connection
+        round_ids: Only these rounds (None for all of them)
+
+    Returns:
+        List of round dicts ordered by id, each with a 'puzzles' key
+        containing its puzzle_view rows ordered by id.
+    """
+    round_filter = puzzle_filter = ""
+    params = ()
+    if round_ids is not None:
+        params = tuple(sorted(round_ids))
+        if not params:
+            return []
+        placeholders = ", ".join(["%s"] * len(params))
+        round_filter = f" WHERE id IN ({placeholders})"
+        puzzle_filter = f" WHERE round_id IN ({placeholders})"
+
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {ROUND_COLUMNS} FROM round{round_filter} ORDER BY id", params)
+    rounds = cursor.fetchall()
+    cursor.execute(f"SELECT * FROM puzzle_view{puzzle_filter} ORDER BY round_id, id", params)
+    return assemble_rounds(rounds, cursor.fetchall())
+
+
+def assemble_rounds(rounds, puzzles):
+    """Nest puzzles under their rounds in one merge pass.
+
+    Both inputs must be ordered by round id (puzzles by round_id, then id).
+    Sets each round's 'puzzles' list in place and returns the rounds as a
+    list; puzzles whose round is not among rounds are dropped.
+    """
+    rounds = list(rounds)
+    puzzles = iter(puzzles)
+    puzzle = next(puzzles, None)
+    for rnd in rounds:
+        rnd["puzzles"] = members = []
+        while puzzle is not None and puzzle["round_id"] <= rnd["id"]:
+            if puzzle["round_id"] == rnd["id"]:
+                members.append(puzzle)
+            puzzle = next(puzzles, None)
     return rounds
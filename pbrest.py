@@ -7,19 +7,20 @@ import pblib
 import traceback
 import json
 import os
-from flask import Flask, request
+import time
+from flask import Flask, Response, g, has_request_context, request
 from flask_restful import Api
-from flask_mysqldb import MySQL
 from pblib import (
-    debug_log, config, configstruct, maybe_refresh_config,
-    configure_flask_mysql,
+    debug_log, config, configstruct, maybe_refresh_config, db_pool,
     get_solver_by_name_from_db, get_solver_by_id_from_db,
     get_last_activity_for_puzzle, get_last_sheet_activity_for_puzzle,
     get_last_activity_for_solver, log_activity,
     assign_solver_to_puzzle, unassign_solver_from_puzzle,
-    clear_puzzle_solvers, check_round_completion,
-    update_puzzle_field, update_botstat, increment_botstat, sanitize_puzzle_name,
-    email_user_verification, solver_exists,
+    get_current_puzzle_ids, sync_solver_history,
+    clear_puzzle_solvers, check_round_completion, record_change,
+    update_puzzle_field, update_botstat, increment_botstat, count_botstat,
+    bump_config_version, get_config, validate_config_value,
+    sanitize_puzzle_name, email_user_verification, solver_exists,
 )
 import pbgooglelib
 from pbgooglelib import (
@@ -84,19 +85,88 @@ from pbcachelib import (
     ensure_cache_initialized,
     lastact_get,
     lastact_get_all,
+    lastact_get_many,
     lastact_delete,
     lastact_set_many,
+    event_hub,
+    publish_config_version,
+    format_sse,
     try_acquire_rebuild_lock,
     release_rebuild_lock,
-    CACHE_KEY,
+    wait_for_all_blob,
+    blob_rebuilder,
+    all_snapshot_get,
+    all_as_of_get,
+    all_fragments_set,
+    all_fragments_update,
+    all_dirty_get,
+    all_versions,
+    all_body_get,
+    all_body_set,
+    encode_body,
+    BODY_ENCODINGS,
     CACHE_TTL,
 )
 import pbcachelib
 
 app = Flask(__name__)
 app.url_map.strict_slashes = False  # Allow trailing slashes on all routes
-configure_flask_mysql(app)
-mysql = MySQL(app)
+
+
+class PooledMySQL:
+    """Stands in for flask_mysqldb's MySQL: mysql.connection is one
+    connection per app context, borrowed from pblib.db_pool on first use
+    and given back at teardown.
+
+    mysql.read_connection is the connection for lag-tolerant reads: the
+    read replica (pblib.acquire_read_connection) in GET requests and
+    background work, the primary connection in requests that write — their
+    follow-up lookups must see their own writes — and wherever
+    read_primary() has pinned it."""
+
+    def __init__(self, app, pool):
+        self.pool = pool
+        app.teardown_appcontext(self.teardown)
+
+    @property
+    def connection(self):
+        if "db_conn" not in g:
+            g.db_conn = self.pool.acquire()
+        return g.db_conn
+
+    @property
+    def read_connection(self):
+        if g.get("read_primary") or (
+            has_request_context() and request.method not in ("GET", "HEAD")
+        ):
+            return self.connection
+        if "db_read" not in g:
+            g.db_read = pblib.acquire_read_connection()
+        return g.db_read[0]
+
+    def read_primary(self):
+        """Send this app context's remaining reads to the primary."""
+        g.read_primary = True
+
+    def read_lag(self):
+        """Seconds read_connection may be behind the primary: the replica's
+        last measured lag, or 0 when reads go to the primary."""
+        self.read_connection  # route first, so db_read reflects this context
+        if g.get("read_primary") or "db_read" not in g:
+            return 0
+        return g.db_read[1].staleness()
+
+    def teardown(self, exception):
+        conn = g.pop("db_conn", None)
+        if conn is not None:
+            self.pool.release(conn, discard=exception is not None)
+        read = g.pop("db_read", None)
+        if read is not None:
+            conn, pool = read
+            pool.release(conn, discard=exception is not None)
+
+
+mysql = PooledMySQL(app, db_pool)
 api = Api(app)
 swagger = flasgger.Swagger(app)
 
@@ -118,11 +188,12 @@ if PROMETHEUS_AVAILABLE:
         PROMETHEUS_AVAILABLE = False
 
 # Helper to invalidate cache
-def invalidate_cache_with_stats():
+def invalidate_cache_with_stats(**scope):
     """Invalidate the /all cache. Stats counting happens inside
-    invalidate_all_cache (the deletion chokepoint), so all invalidation
-    paths are counted, not just pbrest's."""
-    invalidate_all_cache(mysql.connection)
+    invalidate_all_cache (the invalidation chokepoint), so all invalidation
+    paths are counted, not just pbrest's. scope is passed through (puzzles=,
+    rounds=, hints=) to limit the rebuild to what the write touched."""
+    invalidate_all_cache(mysql.connection, **scope)
 
 
 # ── Internal helpers ──────────────────────────────────────────────────────
@@ -134,10 +205,46 @@ def _cursor():
 
 
 def _read_cursor():
-    """Get a DB cursor with READ UNCOMMITTED for read-only queries."""
-    conn, cursor = _cursor()
-    cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ UNCOMMITTED")
-    return conn, cursor
+    """Get a DB cursor for read-only queries, on the read replica when one
+    is configured and healthy (see PooledMySQL.read_connection). Read-pool
+    connections already run READ UNCOMMITTED (set once per connection, see
+    pblib.READ_UNCOMMITTED); the request's own connection keeps the server
+    default."""
+    conn = mysql.read_connection
+    return conn, conn.cursor()
+
+
+# Page size for /puzzles/<id>/activity and /solvers/<id>/activity once a
+# client asks for pages. Without ?limit= or ?cursor= they return every row,
+# as they did before paging existed.
+ACTIVITY_PAGE_DEFAULT = 200
+ACTIVITY_PAGE_MAX = 500
+
+
+def _activity_page_args():
+    """Parse ?limit= and ?cursor= for a paged activity listing.
+
+    Returns (limit, after) where after is None for the first page and
+    limit is None (every row) when neither parameter is given.
+    Raises ValueError with a client-facing message (answered with a 400).
+    """
+    token = request.args.get("cursor")
+    if "limit" not in request.args and not token:
+        return None, None
+    try:
+        limit = int(request.args.get("limit", ACTIVITY_PAGE_DEFAULT))
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if not 1 <= limit <= ACTIVITY_PAGE_MAX:
+        raise ValueError(f"limit must be between 1 and {ACTIVITY_PAGE_MAX}")
+    after = pblib.decode_activity_cursor(token) if token else None
+    return limit, after
+
+
+ACTIVITY_COLUMNS = (
+    "SELECT a.id, a.time, a.solver_id, a.puzzle_id, a.source, a.type, a.uri, "
+    "a.source_version FROM activity a"
+)
 
 
 def _get_status_names():
@@ -229,47 +336,20 @@ def _promote_top_hint(cursor):
 def _get_all_from_db():
     """Internal function to fetch all rounds/puzzles from database."""
     debug_log(4, "fetching all from database")
-    try:
-        conn, cursor = _read_cursor()
-        cursor.execute("SELECT * from puzzle_view")
-        puzzle_view = cursor.fetchall()
-    except Exception as e:
-        raise Exception("Exception in querying puzzle_view") from e
-
-    all_puzzles = {}
-    for puzzle in puzzle_view:
-        all_puzzles[puzzle["id"]] = puzzle
-
     # Note: lastact is NOT part of this blob. It changes on every activity
     # write, so it lives in the write-through Redis hash and gets attached
     # fresh per request in _attach_lastact().
-
     try:
         conn, cursor = _read_cursor()
-        cursor.execute("SELECT * from round_view")
-        round_view = cursor.fetchall()
+        rounds = pblib.get_all_rounds_with_puzzles(conn)
     except Exception as e:
-        raise Exception("Exception in querying round_view") from e
+        raise Exception("Exception in querying rounds and puzzles") from e
+
+    return {"rounds": rounds, "hints": _get_hints_from_db()}
 
-    def is_int(val):
-        try:
-            int(val)
-            return True
-        except Exception:
-            return False
-
-    rounds = []
-    for round in round_view:
-        if "puzzles" in round and round["puzzles"]:
-            round["puzzles"] = [
-                all_puzzles[int(id)]
-                for id in round["puzzles"].split(",")
-                if is_int(id) and int(id) in all_puzzles
-            ]
-        else:
-            round["puzzles"] = []
-        rounds.append(round)
 
+def _get_hints_from_db():
+    """The hint queue as served in /all."""
     try:
         conn, cursor = _read_cursor()
         cursor.execute(_HINT_QUERY)
@@ -277,20 +357,36 @@ def _get_all_from_db():
     except Exception as e:
         raise Exception("Exception in querying hint table") from e
 
-    hints = [_format_hint_row(row) for row in hint_rows]
+    return [_format_hint_row(row) for row in hint_rows]
 
-    return {"rounds": rounds, "hints": hints}
+
+def _get_rounds_from_db(round_ids):
+    """Rebuild specific /all rounds: {round_id: round dict with puzzles, or
+    None if the round no longer exists}. Same shape as the rounds in
+    _get_all_from_db, but filtered by id so it reads only those rounds."""
+    ids = sorted(round_ids)
+    if not ids:
+        return {}
+    rounds = dict.fromkeys(ids)
+    try:
+        conn, cursor = _read_cursor()
+        for round in pblib.get_all_rounds_with_puzzles(conn, ids):
+            rounds[round["id"]] = round
+    except Exception as e:
+        raise Exception("Exception in querying rounds for partial rebuild") from e
+    return rounds
 
 
-def _get_lastact_map():
+def _get_lastact_map(prefetched=None):
     """Return {puzzle_id (int): latest activity row} for all puzzles.
 
     Prefers the write-through Redis hash (O(1), always current — updated by
-    pblib.log_activity on every activity insert). Falls back to the indexed
+    pblib.log_activity on every activity insert), using prefetched when the
+    caller already read it alongside the blob. Falls back to the indexed
     GROUP BY when Redis is down or the hash is empty (cold start after a
     flush), backfilling the hash from the result.
     """
-    lastact = lastact_get_all()
+    lastact = lastact_get_all() if prefetched is None else prefetched
     if lastact:
         return lastact
 
@@ -329,70 +425,279 @@ def _get_lastact_map():
     return rows
 
 
-def _attach_lastact(data):
-    """Graft current lastact onto every puzzle in an /all response dict."""
-    lastact = _get_lastact_map()
+def _attach_lastact(data, lastact=None):
+    """Graft current lastact onto every puzzle in an /all response dict.
+    lastact is the hash as prefetched by _get_all_blob, if it was."""
+    lastact = _get_lastact_map(lastact)
     for rnd in data.get("rounds", []):
         for puzzle in rnd.get("puzzles", []):
             puzzle["lastact"] = lastact.get(puzzle["id"])
     return data
 
 
-def _get_all_with_cache():
-    """Get all rounds/puzzles plus current lastact per puzzle.
+def _get_all_blob():
+    """Return (structural /all data, blob version, lastact) — lastact not
+    yet attached.
 
-    The blob (structural data) comes from cache when warm — it carries a 15s
-    TTL and is invalidated only on structural changes. lastact is attached
-    fresh from the write-through hash on every request, so it is current
-    regardless of the blob's age.
+    The blob (structural data) is served stale-while-revalidate: fresh for
+    its 15s soft TTL, then stale until a structural change or the next
+    request triggers a rebuild. Only the worker holding the rebuild lock
+    reads MySQL; the others keep serving the stale blob meanwhile. The
+    version is the blob's content hash (see pbcachelib.all_fragments_set),
+    or None when the data was not cached (cache disabled, or a cold-miss
+    rebuild that didn't land in time). lastact is the decoded lastact hash,
+    read in the same round trip as the blob, or None if it wasn't.
     """
     debug_log(5, "start")
+    _init_all_cache()
+
+    if pbcachelib.rc is None:
+        return _get_all_from_db(), None, None
+
+    cached, version, fresh, lastact = all_snapshot_get()
+    if cached and fresh:
+        debug_log(5, "cache hit")
+        _count_serve(fresh=True)
+        return json.loads(cached), version, lastact
+
+    got_lock = try_acquire_rebuild_lock()
+    if cached and not got_lock:
+        # Stale, and another worker is already rebuilding: keep serving the
+        # previous blob rather than joining it in MySQL.
+        debug_log(4, "rebuild in progress — serving stale /all blob")
+        _count_serve(fresh=False)
+        return json.loads(cached), version, lastact
+
+    debug_log(5, "cache miss" if not cached else "cache stale, rebuilding")
+    _count_cache("cache_misses_total")
+    if got_lock:
+        return (*_rebuild_all_blob(), lastact)
+
+    # Cold miss (no blob at all) with a rebuild already running: wait for the
+    # holder's blob instead of stampeding MySQL.
+    cached, version = wait_for_all_blob()
+    if cached:
+        _count_serve(fresh=True)
+        return json.loads(cached), version, lastact
+    debug_log(3, "rebuild lock contended — serving /all from DB without caching")
+    _count_cache("cache_rebuild_lock_contentions_total")
+    return _get_all_from_db(), None, lastact
+
+
+def _rebuild_all_blob():
+    """Rebuild and store the /all blob. Caller must hold the rebuild lock;
+    it is released here, also if the rebuild fails.
+
+    Within the soft TTL of the last full rebuild, only the rounds touched by
+    targeted invalidations (see invalidate_all_cache) are re-queried and the
+    rest reused from Redis; otherwise everything is read from the database.
+    """
+    try:
+        full, dirty, puzzle_rounds = all_dirty_get()
+        lag = 0
+        if dirty:
+            # Rebuilding for a write that just committed: a lagging replica
+            # would cache the old rows. Soft-TTL refreshes read the replica.
+            mysql.read_primary()
+        else:
+            lag = mysql.read_lag()
+            as_of = all_as_of_get() if lag else None
+            if as_of is not None and time.time() - lag < as_of:
+                # The cached blob came from the primary inside the replica's
+                # lag window; a replica read could roll it back.
+                mysql.read_primary()
+                lag = 0
+        if not full:
+            blob, version = _rebuild_dirty_rounds(dirty, puzzle_rounds)
+            if blob is not None:
+                return json.loads(blob), version
+        data = _get_all_from_db()
+        version = all_fragments_set(data, processed=dirty, ttl=CACHE_TTL, lag=lag)
+    finally:
+        release_rebuild_lock()
+    return data, version
+
+
+def _rebuild_dirty_rounds(dirty, puzzle_rounds):
+    """Targeted /all rebuild from dirty markers. A changed puzzle rebuilds
+    the round it is in now and the round the cached index had it in (they
+    differ after a move, create or delete). Returns (blob, version), or
+    (None, None) if the stored fragments can't be built on."""
+    round_ids = set()
+    puzzle_ids = []
+    for marker in dirty:
+        kind, _, ident = marker.partition(":")
+        if kind == "round":
+            round_ids.add(int(ident))
+        elif kind == "puzzle":
+            puzzle_ids.append(int(ident))
+            if int(ident) in puzzle_rounds:
+                round_ids.add(puzzle_rounds[int(ident)])
+    if puzzle_ids:
+        placeholders = ", ".join(["%s"] * len(puzzle_ids))
+        try:
+            conn, cursor = _read_cursor()
+            cursor.execute(
+                f"SELECT DISTINCT round_id FROM puzzle WHERE id IN ({placeholders})",
+                puzzle_ids,
+            )
+            round_ids.update(row["round_id"] for row in cursor.fetchall())
+        except Exception as e:
+            raise Exception("Exception in querying puzzle rounds") from e
+    debug_log(4, f"partial /all rebuild: rounds {sorted(round_ids)}")
+    hints = _get_hints_from_db() if "hints" in dirty else None
+    return all_fragments_update(
+        _get_rounds_from_db(round_ids), hints, processed=dirty
+    )
+
 
-    # Lazy cache init on first request per worker. Guard mysql.connection
-    # access so it is only evaluated when initialization is actually needed —
-    # accessing mysql.connection triggers a new SSL MySQL connection (~40ms)
-    # even if ensure_cache_initialized would return immediately, because
-    # Python evaluates arguments before calling the function.
+def _background_rebuild_all(requests):
+    """Rebuild callback for pbcachelib.blob_rebuilder (runs on its thread,
+    holding the rebuild lock). requests is how many invalidations this one
+    rebuild absorbed; cache_rebuild_requests_total / cache_background_rebuilds_total
+    is the coalescing ratio."""
+    with app.app_context():
+        start = time.monotonic()
+        try:
+            _rebuild_all_blob()
+        except Exception as e:
+            debug_log(2, f"background /all rebuild failed: {e}")
+            return
+        elapsed = time.monotonic() - start
+        debug_log(4, f"background /all rebuild: {elapsed:.3f}s for {requests} request(s)")
+        count_botstat("cache_background_rebuilds_total")
+        count_botstat("cache_rebuild_requests_total", by=requests)
+        try:
+            update_botstat("cache_rebuild_seconds", f"{elapsed:.3f}", mysql.connection)
+        except Exception as e:
+            debug_log(3, f"failed to record rebuild stats: {e}")
+
+
+def _init_all_cache():
+    """Lazy per-worker cache init for the /all paths, plus this worker's
+    background rebuilder thread once Redis is up."""
+    # Guard mysql.connection access so it is only evaluated when
+    # initialization is actually needed — accessing mysql.connection borrows
+    # a pooled connection (a ping, or a new SSL connection at ~40ms when the
+    # pool is empty) even if ensure_cache_initialized would return
+    # immediately, because Python evaluates arguments before calling the
+    # function.
     if not pbcachelib._cache_initialized:
         ensure_cache_initialized(mysql.connection)
-
     if pbcachelib.rc is not None:
-        cached = cache_get(CACHE_KEY)
-        if cached:
-            debug_log(5, "cache hit")
-            _count_cache("cache_hits_total")
-            return _attach_lastact(json.loads(cached))
-        debug_log(5, "cache miss")
+        blob_rebuilder.start(_background_rebuild_all)
+
+
+def _get_all_with_cache():
+    """Get all rounds/puzzles plus current lastact per puzzle.
+
+    lastact is attached fresh from the write-through hash on every request,
+    so it is current regardless of the blob's age.
+    """
+    data, _, lastact = _get_all_blob()
+    return _attach_lastact(data, lastact)
+
+
+def _all_etag(blob_version, lastact_version):
+    """Strong ETag for an /all response: structural version + lastact version."""
+    return f"{blob_version}-{lastact_version}"
+
+
+def _negotiate_all_encoding():
+    """Best stored /all body encoding the client accepts ("identity" if none)."""
+    return request.accept_encodings.best_match(
+        BODY_ENCODINGS + ("identity",), default="identity"
+    )
+
+
+def _all_body_response(body, encoding, etag):
+    """Ready-to-send /all bytes with the headers a JSON response would get."""
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(body, status=200, headers=headers, mimetype="application/json")
+
+
+def _serve_all():
+    """Serve /all with conditional GET support and pre-compressed bodies.
+
+    When Redis is live, every response carries a strong ETag built from the
+    blob's content version and the lastact hash version. A request whose
+    If-None-Match still matches gets a bodyless 304 after a single MGET of
+    the two version stamps — no MySQL, no blob fetch, no JSON decode.
+
+    Otherwise the same ETag keys a ready-to-send body: the full response
+    (blob + lastact) serialized once and stored gzip/brotli-compressed. A
+    hit is one HGET of bytes, sent with the matching Content-Encoding. A miss
+    assembles the response as before, then serializes and compresses it once
+    for every worker that asks for the same ETag after it.
+
+    Once the blob goes stale, the first request to claim the rebuild lock
+    rebuilds it; concurrent requests keep answering from the stale version
+    (304 or stored body) until the new one lands.
+
+    Versions are read BEFORE the content, so a 200's ETag can only be older
+    than its body (costing one extra 200 later), never newer (which would
+    pin a client to stale data behind 304s).
+    """
+    _init_all_cache()
+
+    blob_version, lastact_version, fresh = all_versions()
+    encoding = _negotiate_all_encoding()
+    # A stale blob is rebuilt by whoever claims the lock first; everyone
+    # else keeps using the stale version's ETag and body below.
+    rebuilding = blob_version is not None and not fresh and try_acquire_rebuild_lock()
+    if blob_version is not None and not rebuilding:
+        etag = _all_etag(blob_version, lastact_version)
+        if request.if_none_match.contains(etag):
+            debug_log(5, "not modified")
+            return "", 304, {
+                "ETag": f'"{etag}"',
+                "Cache-Control": "no-cache",
+                "Vary": "Accept-Encoding",
+            }
+        body = all_body_get(etag, encoding)
+        if body is not None:
+            debug_log(5, f"body hit ({encoding})")
+            _count_serve(fresh)
+            return _all_body_response(body, encoding, etag)
+
+    lastact = None
+    if rebuilding:
         _count_cache("cache_misses_total")
+        data, blob_version = _rebuild_all_blob()
+    else:
+        data, blob_version, lastact = _get_all_blob()
+    data = _attach_lastact(data, lastact)
+    if blob_version is None or lastact_version is None:
+        return data
+    etag = _all_etag(blob_version, lastact_version)
+    # sort_keys matches Flask's JSON provider, so clients see the same key
+    # order as from a jsonify'd response.
+    body = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    encoded = encode_body(body)
+    all_body_set(etag, encoded)
+    return _all_body_response(
+        body if encoding == "identity" else encoded[encoding], encoding, etag
+    )
 
-    # Cache miss (or cache disabled): rebuild from the database. The lock
-    # makes one worker rebuild-and-cache; concurrent missers serve straight
-    # from the DB without caching, instead of stampeding redundant rebuilds.
-    got_lock = try_acquire_rebuild_lock()
-    if pbcachelib.rc is not None and not got_lock:
-        # Another worker is rebuilding; we serve from DB without caching.
-        debug_log(3, "rebuild lock contended — serving /all from DB without caching")
-        _count_cache("cache_rebuild_lock_contentions_total")
-    data = _get_all_from_db()
-    if pbcachelib.rc is not None and got_lock:
-        try:
-            cache_set(CACHE_KEY, json.dumps(data), ttl=CACHE_TTL)
-        finally:
-            release_rebuild_lock()
 
-    return _attach_lastact(data)
+def _count_serve(fresh):
+    """Count an /all response served from the cached blob, fresh or stale."""
+    _count_cache("cache_hits_total")
+    _count_cache("cache_fresh_serves_total" if fresh else "cache_stale_serves_total")
 
 
 def _count_cache(stat):
-    """Increment a cache botstat without raising. /all is the hot path, so a
-    counter failure must never affect the response.
-
-    Uses the request's mysql.connection. The parallel pbcachelib._incr helper
-    does the same thing but opens its own connection — that split is forced
-    because pbcachelib runs on paths without a Flask request context (e.g.
-    bigjimmybot's write-through), where mysql.connection is unavailable."""
+    """Count a cache botstat without raising. /all is the hot path, so a
+    counter failure must never affect the response. Buffered in process
+    memory (pblib.count_botstat), so /all does no DB writes for it."""
     try:
-        increment_botstat(stat, mysql.connection)
+        count_botstat(stat)
     except Exception as e:
         debug_log(3, f"failed to increment {stat}: {e}")
 
@@ -401,14 +706,218 @@ def _count_cache(stat):
 @swag_from("swag/getall.yaml", endpoint="all", methods=["GET"])
 def get_all_all():
     """Get all rounds and puzzles (uses cache if available)."""
-    return _get_all_with_cache()
+    return _serve_all()
 
 
 @app.route("/allcached", endpoint="allcached", methods=["GET"])
 @swag_from("swag/getallcached.yaml", endpoint="allcached", methods=["GET"])
 def get_all_cached():
     """Get all rounds and puzzles (uses cache if available). Alias for /all."""
-    return _get_all_with_cache()
+    return _serve_all()
+
+
+# SSE keepalive cadence: well under proxy/ALB idle timeouts (60s), and what
+# clients use to tell a quiet hunt from a dead stream.
+EVENTS_HEARTBEAT_SECONDS = 15
+# Browser reconnect delay after the stream drops.
+EVENTS_RETRY_MS = 2000
+
+
+@app.route("/events", endpoint="events", methods=["GET"])
+@swag_from("swag/getevents.yaml", endpoint="events", methods=["GET"])
+def get_events():
+    """Server-Sent Events stream of hunt changes.
+
+    Relays the pbcachelib pub/sub channel: an "all" event on every structural
+    /all invalidation (clients refetch /all, usually a 304-cheap ETag hit)
+    and a "lastact" event carrying the new activity row on every lastact
+    write-through (clients patch the puzzle in place). "ping" every
+    EVENTS_HEARTBEAT_SECONDS; "resync" when events may have been lost.
+
+    Each client holds its connection open indefinitely, so this is served by
+    the gevent gunicorn (gunicorn_events_config.py), not the sync workers.
+    """
+    if not pbcachelib._cache_initialized:
+        ensure_cache_initialized(mysql.connection)
+    if pbcachelib.rc is None:
+        return {"status": "error", "error": "Event stream unavailable (Redis disabled)"}, 503
+
+    sub = event_hub.subscribe()
+    debug_log(4, f"events client connected ({event_hub.subscriber_count()} total)")
+
+    def stream():
+        try:
+            yield f"retry: {EVENTS_RETRY_MS}\n\n"
+            yield format_sse("hello", "{}")
+            while True:
+                frame = sub.get(timeout=EVENTS_HEARTBEAT_SECONDS)
+                if sub.overflowed:
+                    # Fell too far behind; the client reconnects and refetches.
+                    yield format_sse("resync", "{}")
+                    return
+                yield frame if frame is not None else format_sse("ping", "{}")
+        finally:
+            event_hub.unsubscribe(sub)
+            debug_log(4, "events client disconnected")
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# A delta touching more distinct entities than this is answered with a full
+# snapshot instead — past this point one cached /all is cheaper than the
+# per-entity queries.
+CHANGES_MAX_ENTITIES = 500
+
+# change_log ids are allocated when a mutation inserts its row but become
+# visible when it commits, so a lower id can appear after a higher one has
+# been handed out. Rows younger than this may still have lower ids in
+# flight: their content is sent, but seq stays below them until they
+# settle, so the next poll asks again from there. Must exceed the longest
+# time a mutation holds its transaction open after record_change.
+CHANGES_SETTLE_SECONDS = 10
+
+
+def _settled_seq(cursor, since, max_seq):
+    """Highest change_log id every lower id is known to have committed by:
+    one below the oldest row after since inserted within the last
+    CHANGES_SETTLE_SECONDS, or max_seq when there is none."""
+    cursor.execute(
+        "SELECT MIN(id) AS recent FROM change_log "
+        "WHERE id > %s AND time > NOW() - INTERVAL %s SECOND",
+        (since, CHANGES_SETTLE_SECONDS),
+    )
+    recent = cursor.fetchone()["recent"]
+    return max_seq if recent is None else recent - 1
+
+
+def _full_changes_snapshot(seq):
+    """/all/changes response for clients that cannot apply a delta."""
+    data = _get_all_with_cache()
+    return {"status": "ok", "full": True, "seq": seq, **data}
+
+
+@app.route("/all/changes", endpoint="all_changes", methods=["GET"])
+@swag_from("swag/getallchanges.yaml", endpoint="all_changes", methods=["GET"])
+def get_all_changes():
+    """Return what changed in /all since sequence number `since`.
+
+    Clients start with since=0 (full snapshot plus the current seq), then
+    poll with the seq from their previous response. The response carries
+    only puzzles, rounds and lastact entries touched since then, plus the
+    whole hint queue if any hint changed. A client that has fallen behind
+    the retained change_log window (or passes a seq from a reset database)
+    gets a full snapshot again.
+
+    The change_log bounds are read BEFORE any content, so a delta can only
+    repeat entities on the next poll, never skip them. The seq handed out is
+    the settled high-water mark (see _settled_seq), not the newest id:
+    changes up to the newest id are sent, but anything younger than
+    CHANGES_SETTLE_SECONDS is asked for again on the next poll, so a
+    mutation that commits out of id order is still picked up.
+    """
+    debug_log(5, "start")
+    try:
+        since = int(request.args.get("since", "0"))
+    except ValueError:
+        return {"status": "error", "error": "since must be an integer"}, 400
+    if since < 0:
+        return {"status": "error", "error": "since must be non-negative"}, 400
+
+    try:
+        conn, cursor = _read_cursor()
+        cursor.execute("SELECT MIN(id) AS min_seq, MAX(id) AS max_seq FROM change_log")
+        bounds = cursor.fetchone()
+    except Exception as e:
+        raise Exception("Exception in querying change_log") from e
+    max_seq = bounds["max_seq"] or 0
+
+    if since == 0 or since > max_seq or (bounds["min_seq"] and since < bounds["min_seq"] - 1):
+        try:
+            seq = _settled_seq(cursor, 0, max_seq)
+        except Exception as e:
+            raise Exception("Exception in querying change_log") from e
+        return _full_changes_snapshot(seq)
+
+    delta = {
+        "status": "ok",
+        "full": False,
+        "seq": since,
+        "puzzles": [],
+        "deleted_puzzles": [],
+        "rounds": [],
+        "lastact": {},
+    }
+    if since == max_seq:
+        return delta
+
+    try:
+        delta["seq"] = _settled_seq(cursor, since, max_seq)
+        cursor.execute(
+            """
+            SELECT DISTINCT entity, entity_id FROM change_log
+            WHERE id > %s AND id <= %s
+            LIMIT %s
+            """,
+            (since, max_seq, CHANGES_MAX_ENTITIES + 1),
+        )
+        changes = cursor.fetchall()
+    except Exception as e:
+        raise Exception("Exception in querying change_log") from e
+    if len(changes) > CHANGES_MAX_ENTITIES:
+        return _full_changes_snapshot(delta["seq"])
+
+    changed = {"puzzle": set(), "round": set(), "hint": set(), "lastact": set()}
+    for row in changes:
+        changed[row["entity"]].add(row["entity_id"])
+
+    try:
+        if changed["puzzle"]:
+            ids = sorted(changed["puzzle"])
+            placeholders = ",".join(["%s"] * len(ids))
+            cursor.execute(f"SELECT * FROM puzzle_view WHERE id IN ({placeholders})", ids)
+            delta["puzzles"] = cursor.fetchall()
+            present = {p["id"] for p in delta["puzzles"]}
+            delta["deleted_puzzles"] = [pid for pid in ids if pid not in present]
+
+        if changed["round"]:
+            ids = sorted(changed["round"])
+            placeholders = ",".join(["%s"] * len(ids))
+            # Round membership travels on each puzzle's round_id; the
+            # nested puzzle lists are left to the full snapshot.
+            cursor.execute(
+                f"SELECT {pblib.ROUND_COLUMNS} FROM round WHERE id IN ({placeholders})", ids
+            )
+            delta["rounds"] = cursor.fetchall()
+
+        if changed["hint"]:
+            cursor.execute(_HINT_QUERY)
+            delta["hints"] = [_format_hint_row(row) for row in cursor.fetchall()]
+    except Exception as e:
+        raise Exception("Exception in querying /all changes") from e
+
+    # lastact for every changed puzzle (new puzzles need theirs too), one
+    # HMGET with a per-puzzle DB fallback for misses.
+    lastact_pids = (changed["puzzle"] | changed["lastact"]) - set(delta["deleted_puzzles"])
+    lastact = lastact_get_many(lastact_pids) or {}
+    for pid in lastact_pids:
+        if lastact.get(pid) is None:
+            lastact[pid] = pblib.serialize_activity(
+                pblib.get_last_activity_for_puzzle(pid, conn)
+            )
+    for puzzle in delta["puzzles"]:
+        puzzle["lastact"] = lastact.get(puzzle["id"])
+    delta["lastact"] = {pid: lastact[pid] for pid in changed["lastact"] if pid in lastact}
+
+    debug_log(
+        5,
+        f"changes since {since}: {len(delta['puzzles'])} puzzles, "
+        f"{len(delta['rounds'])} rounds, {len(delta['lastact'])} lastact",
+    )
+    return delta
 
 
 @app.route("/huntinfo", endpoint="huntinfo", methods=["GET"])
@@ -434,14 +943,8 @@ def get_hunt_info():
         # Get status names from DB ENUM
         status_names = _get_status_names()
 
-        # Parse metadata from config
-        status_metadata = {}
-        try:
-            metadata_json = configstruct.get("STATUS_METADATA", "[]")
-            metadata_list = json.loads(metadata_json)
-            status_metadata = {item["name"]: item for item in metadata_list}
-        except Exception as e:
-            debug_log(2, f"Could not parse STATUS_METADATA: {e}")
+        # Metadata by status name, parsed once per config version
+        status_metadata = get_config().get("STATUS_METADATA", {})
 
         # Build rich status objects
         status_list = []
@@ -675,8 +1178,12 @@ def get_puzzle_part(id, part):
 @app.route("/puzzles/<id>/activity", endpoint="puzzle_activity", methods=["GET"])
 @swag_from("swag/getpuzzleactivity.yaml", endpoint="puzzle_activity", methods=["GET"])
 def get_puzzle_activity(id):
-    """Get all activity for a specific puzzle."""
+    """Get a puzzle's activity, newest first, one keyset page at a time."""
     debug_log(4, f"start. id: {id}")
+    try:
+        limit, after = _activity_page_args()
+    except ValueError as e:
+        return {"status": "error", "error": str(e)}, 400
 
     # Check if puzzle exists
     try:
@@ -687,18 +1194,11 @@ def get_puzzle_activity(id):
     except Exception as e:
         raise Exception(f"Puzzle {id} not found in database")
 
-    # Fetch all activity for this puzzle
+    # Fetch one page of activity for this puzzle
     try:
-        cursor.execute(
-            """
-            SELECT id, time, solver_id, puzzle_id, source, type, uri, source_version
-            FROM activity
-            WHERE puzzle_id = %s
-            ORDER BY time DESC
-            """,
-            (id,),
+        activities, next_cursor = pblib.get_activity_page(
+            conn, ACTIVITY_COLUMNS, ["a.puzzle_id = %s"], [int(id)], limit, after
         )
-        activities = cursor.fetchall()
     except Exception as e:
         raise Exception(f"Exception fetching activity for puzzle {id}: {e}")
 
@@ -707,6 +1207,8 @@ def get_puzzle_activity(id):
         "status": "ok",
         "puzzle_id": int(id),
         "activity": activities,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
     }
 
 
@@ -855,8 +1357,12 @@ def get_solver_by_name(name):
 @app.route("/solvers/<id>/activity", endpoint="solver_activity", methods=["GET"])
 @swag_from("swag/getsolveractivity.yaml", endpoint="solver_activity", methods=["GET"])
 def get_solver_activity(id):
-    """Get all activity for a specific solver."""
+    """Get a solver's activity, newest first, one keyset page at a time."""
     debug_log(4, f"start. id: {id}")
+    try:
+        limit, after = _activity_page_args()
+    except ValueError as e:
+        return {"status": "error", "error": str(e)}, 400
 
     # Check if solver exists
     try:
@@ -867,18 +1373,11 @@ def get_solver_activity(id):
     except Exception as e:
         raise Exception(f"Solver {id} not found in database")
 
-    # Fetch all activity for this solver
+    # Fetch one page of activity for this solver
     try:
-        cursor.execute(
-            """
-            SELECT id, time, solver_id, puzzle_id, source, type, uri, source_version
-            FROM activity
-            WHERE solver_id = %s
-            ORDER BY time DESC
-            """,
-            (id,),
+        activities, next_cursor = pblib.get_activity_page(
+            conn, ACTIVITY_COLUMNS, ["a.solver_id = %s"], [int(id)], limit, after
         )
-        activities = cursor.fetchall()
     except Exception as e:
         raise Exception(f"Exception fetching activity for solver {id}: {e}")
 
@@ -887,6 +1386,8 @@ def get_solver_activity(id):
         "status": "ok",
         "solver_id": int(id),
         "activity": activities,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
     }
 
 
@@ -920,23 +1421,9 @@ def _update_single_solver_part(id, part, value, source="puzzleboss"):
         else:
             # Puzz is empty, so this is a de-assignment
             # Find the puzzle the solver is currently assigned to
-            conn, cursor = _cursor()
-            cursor.execute(
-                """
-                SELECT DISTINCT p.id FROM puzzle p,
-                JSON_TABLE(
-                    p.current_solvers,
-                    '$.solvers[*]' COLUMNS (
-                        solver_id INT PATH '$.solver_id'
-                    )
-                ) AS jt
-                WHERE jt.solver_id = %s
-            """,
-                (int(id),),
-            )
-            current_puzzle = cursor.fetchone()
-            if current_puzzle:
-                unassign_solver_from_puzzle(current_puzzle["id"], id, mysql.connection, source)
+            current_puzzle_ids = get_current_puzzle_ids(id, mysql.connection)
+            if current_puzzle_ids:
+                unassign_solver_from_puzzle(current_puzzle_ids[0], id, mysql.connection, source)
 
         debug_log(3, f"solver {id} puzz updated to {value}")
         return value
@@ -1046,12 +1533,19 @@ def put_config():
         )
     except Exception as e:
         raise Exception(f"Exception Interpreting input data for config change: {e}")
+    error = validate_config_value(mykey, myval)
+    if error:
+        debug_log(2, f"Config change rejected: {error}")
+        return {"status": "error", "error": error}, 400
     conn, cursor = _cursor()
     cursor.execute(
         "INSERT INTO config (`key`, `val`) VALUES (%s, %s) ON DUPLICATE KEY UPDATE `key`=%s, `val`=%s",
         (mykey, myval, mykey, myval),
     )
+    version = bump_config_version(cursor)
     conn.commit()
+    # Every process (this one included) reloads on the announcement.
+    publish_config_version(version)
 
     debug_log(2, f"Config value {mykey} changed successfully")
     return {"status": "ok"}
@@ -1274,6 +1768,7 @@ def delete_tag(tag):
         puzzles = cursor.fetchall()
 
         puzzles_updated = 0
+        updated_ids = []
         for puzzle in puzzles:
             if puzzle["tags"]:
                 current_tags = json.loads(puzzle["tags"])
@@ -1284,6 +1779,8 @@ def delete_tag(tag):
                         "UPDATE puzzle SET tags = %s WHERE id = %s",
                         (new_tags, puzzle["id"]),
                     )
+                    record_change("puzzle", puzzle["id"], conn)
+                    updated_ids.append(puzzle["id"])
                     puzzles_updated += 1
 
         # Now delete the tag from the tags table
@@ -1293,7 +1790,7 @@ def delete_tag(tag):
         # Removing the tag rewrote puzzle.tags on every affected puzzle, which
         # changes what /all serves and what the UI filters on — invalidate.
         if puzzles_updated:
-            invalidate_cache_with_stats()
+            invalidate_cache_with_stats(puzzles=updated_ids)
 
         debug_log(
             3,
@@ -1432,6 +1929,7 @@ def _run_creation_step(code, step):
             """,
             (name, puzzle_uri, round_id, chat_id, chat_link, name, drive_id, drive_uri, ismeta, sheetenabled),
         )
+        record_change("puzzle", cursor.lastrowid, conn)
         conn.commit()
 
         cursor.execute("SELECT id FROM puzzle WHERE name = %s", (name,))
@@ -1454,6 +1952,7 @@ def _run_creation_step(code, step):
 
         if is_speculative:
             cursor.execute("UPDATE puzzle SET status = 'Speculative' WHERE id = %s", (myid,))
+            record_change("puzzle", myid, conn)
             conn.commit()
             debug_log(3, f"Set puzzle {name} status to Speculative")
 
@@ -1461,7 +1960,7 @@ def _run_creation_step(code, step):
             chat_announce_new(name)
         except Exception as e:
             debug_log(2, f"Step 6: Discord announcement failed for {name}, continuing: {e}")
-        invalidate_cache_with_stats()
+        invalidate_cache_with_stats(puzzles=[myid])
 
         cursor.execute("DELETE FROM temp_puzzle_creation WHERE code = %s", (code,))
         conn.commit()
@@ -1703,6 +2202,7 @@ def activate_all_sheets():
                     "UPDATE puzzle SET sheetenabled = 1 WHERE id = %s",
                     (int(puzzle["id"]),),
                 )
+                record_change("puzzle", puzzle["id"], conn2)
                 conn2.commit()
                 activated += 1
                 results.append({"name": puzzle["name"], "status": "activated"})
@@ -1769,6 +2269,8 @@ def create_round():
         "INSERT INTO round (name, drive_uri) VALUES (%s, %s)",
         (roundname, round_drive_uri),
     )
+    round_id = cursor.lastrowid
+    record_change("round", round_id, conn)
     conn.commit()
 
     debug_log(
@@ -1776,7 +2278,7 @@ def create_round():
     )
 
     # Invalidate /allcached since new round was created
-    invalidate_cache_with_stats()
+    invalidate_cache_with_stats(rounds=[round_id])
 
     return {"status": "ok", "round": {"name": roundname}}
 
@@ -1826,6 +2328,7 @@ def _update_single_round_part(id, part, value):
     try:
         conn, cursor = _cursor()
         cursor.execute(f"UPDATE round SET {part} = %s WHERE id = %s", (value, id))
+        record_change("round", id, conn)
         conn.commit()
     except Exception as e:
         raise Exception(
@@ -1857,7 +2360,7 @@ def update_round_multi(id):
         updated_parts[part] = updated_value
 
     # Invalidate cache once after all updates
-    invalidate_cache_with_stats()
+    invalidate_cache_with_stats(rounds=[id])
 
     return {"status": "ok", "round": {"id": int(id), **updated_parts}}
 
@@ -1879,7 +2382,7 @@ def update_round_part(id, part):
     updated_value = _update_single_round_part(id, part, value)
 
     # Invalidate /allcached since round data changed
-    invalidate_cache_with_stats()
+    invalidate_cache_with_stats(rounds=[id])
 
     return {"status": "ok", "round": {"id": int(id), part: updated_value}}
 
@@ -2095,6 +2598,7 @@ def _update_single_puzzle_part(id, part, value, mypuzzle, source="puzzleboss"):
                     "UPDATE puzzle SET tags = %s WHERE id = %s",
                     (json.dumps(current_tags), id),
                 )
+                record_change("puzzle", id, conn)
                 conn.commit()
                 debug_log(3, f"Added tag {tag_name} to puzzle {id}")
                 tag_changed = True
@@ -2119,6 +2623,7 @@ def _update_single_puzzle_part(id, part, value, mypuzzle, source="puzzleboss"):
                     "UPDATE puzzle SET tags = %s WHERE id = %s",
                     (json.dumps(current_tags), id),
                 )
+                record_change("puzzle", id, conn)
                 conn.commit()
                 debug_log(3, f"Added tag id {tag_id} to puzzle {id}")
                 tag_changed = True
@@ -2140,6 +2645,7 @@ def _update_single_puzzle_part(id, part, value, mypuzzle, source="puzzleboss"):
                     "UPDATE puzzle SET tags = %s WHERE id = %s",
                     (json.dumps(current_tags), id),
                 )
+                record_change("puzzle", id, conn)
                 conn.commit()
                 debug_log(3, f"Removed tag {tag_name} from puzzle {id}")
                 tag_changed = True
@@ -2163,6 +2669,7 @@ def _update_single_puzzle_part(id, part, value, mypuzzle, source="puzzleboss"):
                     "UPDATE puzzle SET tags = %s WHERE id = %s",
                     (json.dumps(current_tags), id),
                 )
+                record_change("puzzle", id, conn)
                 conn.commit()
                 debug_log(3, f"Removed tag id {tag_id} from puzzle {id}")
                 tag_changed = True
@@ -2182,7 +2689,7 @@ def _update_single_puzzle_part(id, part, value, mypuzzle, source="puzzleboss"):
             # change is structural for the /all blob — invalidate (this handler
             # updates puzzle.tags directly, bypassing update_puzzle_field's
             # STRUCTURAL_PUZZLE_FIELDS allowlist).
-            invalidate_cache_with_stats()
+            invalidate_cache_with_stats(puzzles=[id])
 
     elif part in ("chat_channel_id", "drive_uri"):
         update_puzzle_part_in_db(id, part, value, source)
@@ -2637,12 +3144,8 @@ def delete_puzzle(puzzlename):
             f"Puzzle id {puzzid} deletion request but sheet deletion failed! continuing. this may cause a mess!",
         )
 
-    clear_puzzle_solvers(puzzid, mysql.connection)
-
     try:
-        conn, cursor = _cursor()
-        cursor.execute("DELETE from puzzle where id = %s", (puzzid,))
-        conn.commit()
+        pblib.delete_puzzle(puzzid, mysql.connection)
     except Exception as e:
         raise Exception(
             f"Puzzle deletion attempt for id {puzzid} name {puzzlename} failed in database operation."
@@ -2652,7 +3155,7 @@ def delete_puzzle(puzzlename):
 
     # Invalidate the blob (structural change) and drop the puzzle's entry
     # from the write-through lastact hash.
-    invalidate_cache_with_stats()
+    invalidate_cache_with_stats(puzzles=[puzzid])
     lastact_delete(puzzid)
 
     return {"status": "ok"}
@@ -2749,9 +3252,9 @@ def delete_pb_solver(username):
     """Delete a solver from the database by username."""
     debug_log(4, f"start, called with username {username}")
 
-    conn, cursor = _cursor()
-    cursor.execute("DELETE from solver where name = %s", (username,))
-    conn.commit()
+    puzzle_ids = pblib.delete_solver(username, mysql.connection)
+    if puzzle_ids:
+        invalidate_cache_with_stats(puzzles=puzzle_ids)
     return 0
 
 
@@ -2790,6 +3293,8 @@ def add_solver_to_history(id):
             "UPDATE puzzle SET solver_history = %s WHERE id = %s",
             (json.dumps(history), id),
         )
+        sync_solver_history(id, solver_id, conn, present=True)
+        record_change("puzzle", id, conn)
         conn.commit()
         debug_log(3, f"Added solver {solver_id} to history for puzzle {id}")
     else:
@@ -2817,6 +3322,8 @@ def remove_solver_from_history(id):
         "UPDATE puzzle SET solver_history = %s WHERE id = %s",
         (json.dumps(history), id),
     )
+    sync_solver_history(id, solver_id, conn, present=False)
+    record_change("puzzle", id, conn)
     conn.commit()
     debug_log(3, f"Removed solver {solver_id} from history for puzzle {id}")
 
@@ -2869,81 +3376,9 @@ def get_all_activities():
     """Get activity counts by type and puzzle timing information."""
     try:
         conn, cursor = _read_cursor()
-
-        # Get activity counts by type and source
-        cursor.execute(
-            """
-            SELECT type, source, COUNT(*) as count
-            FROM activity
-            GROUP BY type, source
-            """
-        )
-        activities = cursor.fetchall()
-
-        # Get puzzle solve timing information
-        cursor.execute(
-            """
-            SELECT
-                COUNT(DISTINCT a1.puzzle_id) as total_solves,
-                SUM(TIMESTAMPDIFF(SECOND, a2.time, a1.time)) as total_solve_time
-            FROM activity a1
-            JOIN activity a2 ON a1.puzzle_id = a2.puzzle_id AND a2.type = 'create'
-            WHERE a1.type = 'solve'
-            """
-        )
-        solve_timing = cursor.fetchone()
-
-        # Get open puzzles timing information
-        cursor.execute(
-            """
-            SELECT
-                COUNT(DISTINCT p.id) as total_open,
-                SUM(TIMESTAMPDIFF(SECOND, a.time, NOW())) as total_open_time
-            FROM puzzle p
-            JOIN activity a ON p.id = a.puzzle_id AND a.type = 'create'
-            WHERE p.status != 'Solved' AND p.status != '[hidden]'
-            """
-        )
-        open_timing = cursor.fetchone()
-
-        # Get time since last solve
-        cursor.execute(
-            """
-            SELECT TIMESTAMPDIFF(SECOND, time, NOW()) as seconds_since_last_solve
-            FROM activity
-            WHERE type = 'solve'
-            ORDER BY time DESC
-            LIMIT 1
-            """
-        )
-        last_solve = cursor.fetchone()
-
+        summary = pblib.get_activity_summary(conn)
         cursor.close()
-
-        # Build nested dict: {type: {source: count, ...}, ...}
-        activity_counts = {}
-        for row in activities:
-            t = row["type"]
-            s = row["source"]
-            if t not in activity_counts:
-                activity_counts[t] = {}
-            activity_counts[t][s] = row["count"]
-
-        return {
-                "status": "ok",
-                "activity": activity_counts,
-                "puzzle_solves_timer": {
-                    "total_solves": solve_timing["total_solves"] or 0,
-                    "total_solve_time_seconds": solve_timing["total_solve_time"] or 0,
-                },
-                "open_puzzles_timer": {
-                    "total_open": open_timing["total_open"] or 0,
-                    "total_open_time_seconds": open_timing["total_open_time"] or 0,
-                },
-                "seconds_since_last_solve": last_solve["seconds_since_last_solve"]
-                if last_solve
-                else None,
-            }
+        return {"status": "ok", **summary}
     except Exception as e:
         debug_log(1, f"Exception in getting activity counts: {e}")
         return {"status": "error", "error": str(e)}, 500
@@ -2958,10 +3393,8 @@ def get_all_activities():
 @swag_from("swag/getactivitysearch.yaml", endpoint="activitysearch", methods=["GET"])
 def activity_search():
     """Search activity log with filters for type, source, solver, and puzzle."""
-    VALID_TYPES = {"create", "revise", "comment", "interact", "solve", "change", "status", "assignment"}
-    VALID_SOURCES = set(
-        s.strip() for s in configstruct.get("ACTIVITY_SOURCES", "puzzleboss,bigjimmybot,discord").split(",") if s.strip()
-    )
+    VALID_TYPES = set(pblib.ACTIVITY_TYPES)
+    VALID_SOURCES = get_config().get("ACTIVITY_SOURCES", ("puzzleboss", "bigjimmybot", "discord"))
 
     try:
         # Parse query parameters
@@ -2979,18 +3412,22 @@ def activity_search():
         if limit not in (50, 100, 200, 500):
             return {"status": "error", "error": "limit must be 50, 100, 200, or 500"}, 400
 
+        cursor_param = request.args.get("cursor", "")
+        try:
+            after = pblib.decode_activity_cursor(cursor_param) if cursor_param else None
+        except ValueError as e:
+            return {"status": "error", "error": str(e)}, 400
+
         # Build WHERE clause dynamically
         conditions = []
         params = []
+        types = None
 
         if types_param:
             requested_types = [t.strip() for t in types_param.split(",") if t.strip()]
-            valid = [t for t in requested_types if t in VALID_TYPES]
-            if not valid:
+            types = [t for t in requested_types if t in VALID_TYPES]
+            if not types:
                 return {"status": "error", "error": "No valid types specified"}, 400
-            placeholders = ",".join(["%s"] * len(valid))
-            conditions.append(f"a.type IN ({placeholders})")
-            params.extend(valid)
 
         if sources_param:
             requested_sources = [s.strip() for s in sources_param.split(",") if s.strip()]
@@ -3017,24 +3454,32 @@ def activity_search():
             conditions.append("a.puzzle_id = %s")
             params.append(puzzle_id_int)
 
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-        params.append(limit + 1)
+        # A puzzle or solver filter leads with its own (id, time) index;
+        # otherwise several types page as one (type, time) range each.
+        split = None
+        if types and (puzzle_id or solver_id):
+            placeholders = ",".join(["%s"] * len(types))
+            conditions.append(f"a.type IN ({placeholders})")
+            params.extend(types)
+        elif types:
+            split = ("a.type", types)
 
         conn, cursor = _read_cursor()
-        cursor.execute(
-            f"""
+        rows, next_cursor = pblib.get_activity_page(
+            conn,
+            """
             SELECT a.id, a.time, a.type, a.source, a.puzzle_id, a.solver_id,
                    p.name AS puzzle_name, s.name AS solver_name
             FROM activity a
             LEFT JOIN puzzle p ON a.puzzle_id = p.id
             LEFT JOIN solver s ON a.solver_id = s.id
-            WHERE {where_clause}
-            ORDER BY a.time DESC
-            LIMIT %s
             """,
-            tuple(params),
+            conditions,
+            params,
+            limit,
+            after,
+            split,
         )
-        rows = cursor.fetchall()
         cursor.close()
 
         # Format results
@@ -3051,17 +3496,103 @@ def activity_search():
                 "solver_name": row["solver_name"],
             })
 
-        has_more = len(results) > limit
-        if has_more:
-            results = results[:limit]
-
-        return {"status": "ok", "activity": results, "count": len(results), "has_more": has_more}
+        return {
+            "status": "ok",
+            "activity": results,
+            "count": len(results),
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
+        }
 
     except Exception as e:
         debug_log(1, f"Exception in activity search: {e}")
         return {"status": "error", "error": str(e)}, 500
 
 
+ACTIVITY_EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _activity_export_args():
+    """Parse /activity/export query parameters into export_activity kwargs.
+
+    Raises ValueError with a client-facing message (answered with a 400).
+    """
+    import datetime
+
+    args = {"fmt": request.args.get("format", "ndjson")}
+    if args["fmt"] not in ACTIVITY_EXPORT_MIMETYPES:
+        raise ValueError("format must be ndjson or csv")
+
+    for name in ("since_id", "puzzle_id", "limit"):
+        value = request.args.get(name, "")
+        if not value:
+            continue
+        try:
+            args[name] = int(value)
+        except ValueError:
+            raise ValueError(f"{name} must be an integer")
+        if args[name] < (1 if name == "limit" else 0):
+            raise ValueError(f"{name} out of range")
+
+    for name in ("start", "end"):
+        value = request.args.get(name, "")
+        if not value:
+            continue
+        try:
+            args[name] = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"{name} must be an ISO 8601 time")
+
+    types_param = request.args.get("types", "")
+    if types_param:
+        types = [t.strip() for t in types_param.split(",") if t.strip()]
+        if not types or any(t not in pblib.ACTIVITY_TYPES for t in types):
+            raise ValueError(f"types must be among {', '.join(pblib.ACTIVITY_TYPES)}")
+        args["types"] = types
+    return args
+
+
+@app.route("/activity/export", endpoint="activityexport", methods=["GET"])
+@swag_from("swag/getactivityexport.yaml", endpoint="activityexport", methods=["GET"])
+def activity_export():
+    """Stream the activity log as NDJSON or CSV, oldest first.
+
+    Runs on a connection of its own rather than a pooled one: the stream
+    outlives the request's pooled-connection teardown, and
+    pblib.export_activity closes it when the client finishes or goes away.
+    A response that is closed before its first chunk never enters the
+    generator, so the connection is also closed when the response is.
+    """
+    try:
+        args = _activity_export_args()
+    except ValueError as e:
+        return {"status": "error", "error": str(e)}, 400
+
+    try:
+        conn = pblib.create_db_connection(init_command=pblib.ACTIVITY_EXPORT_SESSION)
+    except Exception as e:
+        debug_log(1, f"Exception opening activity export connection: {e}")
+        return {"status": "error", "error": str(e)}, 500
+
+    fmt = args["fmt"]
+    response = Response(
+        pblib.export_activity(conn, **args),
+        mimetype=ACTIVITY_EXPORT_MIMETYPES[fmt],
+        headers={
+            "Content-Disposition": f"attachment; filename=activity.{fmt}",
+            "X-Accel-Buffering": "no",
+        },
+    )
+    response.call_on_close(lambda: _close_if_open(conn))
+    return response
+
+
+def _close_if_open(conn):
+    """Close a MySQLdb connection unless something already has."""
+    if conn.open:
+        conn.close()
+
+
 # ============================================================================
 # LLM Query Endpoint - Natural language queries about hunt status
 # ============================================================================
@@ -3185,13 +3716,14 @@ def create_hint():
                VALUES (%s, %s, %s, %s, %s)""",
             (puzzle_id, solver, next_pos, request_text.strip(), initial_status),
         )
-        conn.commit()
         new_id = cursor.lastrowid
+        record_change("hint", new_id, conn)
+        conn.commit()
     except Exception as e:
         debug_log(1, f"Error creating hint: {e}")
         raise Exception(f"Exception creating hint: {e}")
 
-    invalidate_cache_with_stats()
+    invalidate_cache_with_stats(hints=True)
     debug_log(3, f"Created hint {new_id} for puzzle {puzzle_id} at position {next_pos}")
     return {"status": "ok", "hint": {"id": new_id, "queue_position": next_pos}}
 
@@ -3239,12 +3771,13 @@ def answer_hint(id):
             (answered_pos,),
         )
         _promote_top_hint(cursor)
+        record_change("hint", id, conn)
         conn.commit()
     except Exception as e:
         debug_log(1, f"Error answering hint {id}: {e}")
         raise Exception(f"Exception answering hint {id}: {e}")
 
-    invalidate_cache_with_stats()
+    invalidate_cache_with_stats(hints=True)
     debug_log(3, f"Hint {id} answered, remaining hints promoted")
     return {"status": "ok", "message": f"Hint {id} answered"}
 
@@ -3291,12 +3824,13 @@ def demote_hint(id):
                 (id,),
             )
         _promote_top_hint(cursor)
+        record_change("hint", id, conn)
         conn.commit()
     except Exception as e:
         debug_log(1, f"Error demoting hint {id}: {e}")
         raise Exception(f"Exception demoting hint {id}: {e}")
 
-    invalidate_cache_with_stats()
+    invalidate_cache_with_stats(hints=True)
     debug_log(3, f"Hint {id} demoted from position {current_pos} to {current_pos + 1}")
     return {"status": "ok", "message": f"Hint {id} demoted"}
 
@@ -3321,12 +3855,13 @@ def submit_hint(id):
             "UPDATE hint SET status = 'submitted', submitted_at = NOW() WHERE id = %s",
             (id,),
         )
+        record_change("hint", id, conn)
         conn.commit()
     except Exception as e:
         debug_log(1, f"Error submitting hint {id}: {e}")
         raise Exception(f"Exception submitting hint {id}: {e}")
 
-    invalidate_cache_with_stats()
+    invalidate_cache_with_stats(hints=True)
     debug_log(3, f"Hint {id} submitted to HQ")
     return {"status": "ok", "message": f"Hint {id} submitted to HQ"}
 
@@ -3358,12 +3893,13 @@ def delete_hint(id):
                 (deleted_pos,),
             )
         _promote_top_hint(cursor)
+        record_change("hint", id, conn)
         conn.commit()
     except Exception as e:
         debug_log(1, f"Error deleting hint {id}: {e}")
         raise Exception(f"Exception deleting hint {id}: {e}")
 
-    invalidate_cache_with_stats()
+    invalidate_cache_with_stats(hints=True)
     debug_log(3, f"Hint {id} deleted")
     return {"status": "ok", "message": f"Hint {id} deleted"}
 
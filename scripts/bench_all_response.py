@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Benchmark the /all cache-hit serving path: decode-attach-re-encode vs.
+pre-serialized, pre-compressed bytes. For local perf analysis only.
+
+Builds a synthetic hunt shaped like the January 2026 production data
+(275 puzzles, 18 rounds, puzzle_view columns, one lastact row per puzzle)
+and times the per-request work a sync Gunicorn worker does on a cache hit:
+
+  before  GET blob + HGETALL lastact, json.loads the blob and every lastact
+          entry, graft lastact onto each puzzle, re-encode the whole
+          document (what jsonify does), send identity.
+  after   MGET the two version stamps + HGET the ready-to-send body for the
+          client's encoding (br / gzip; identity = gunzip of the gzip copy).
+
+Requests/sec per worker is 1 / mean per-request time for that work alone
+(Flask/WSGI overhead is the same in both and excluded). Without --redis the
+Redis reads are dict lookups, isolating CPU; with --redis they are real
+round trips against that server (keys are written under a bench: prefix
+and deleted afterwards).
+
+Usage:
+  python scripts/bench_all_response.py
+  python scripts/bench_all_response.py --puzzles 275 --rounds 18 --iterations 500
+  python scripts/bench_all_response.py --redis localhost:6379
+"""
+
+import argparse
+import gzip
+import json
+import random
+import statistics
+import sys
+import time
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6  # keep in step with pbcachelib
+BROTLI_QUALITY = 5
+
+STATUSES = ["New", "Being worked", "Needs eyes", "Critical", "Solved", "WTF"]
+
+
+def build_fixture(n_puzzles=275, n_rounds=18, seed=2026):
+    """Return (structural /all dict without lastact, {pid: lastact row}).
+
+    Rows mirror puzzle_view / round_view / the lastact hash entries closely
+    enough that encoded sizes and parse costs match production.
+    """
+    rng = random.Random(seed)
+    solvers = [f"solver{i:03d}" for i in range(263)]
+    rounds = []
+    for rid in range(1, n_rounds + 1):
+        rounds.append({
+            "id": rid,
+            "name": f"Round{rid}TheQuickBrownFox",
+            "round_uri": f"https://hunt.example.com/round/{rid}",
+            "drive_uri": f"https://drive.google.com/drive/u/1/folders/{rng.getrandbits(96):024x}",
+            "drive_id": f"{rng.getrandbits(96):024x}",
+            "comments": rng.choice(["", "meta is about music", "backsolve candidates"]),
+            "status": rng.choice(["New", "Solved"]),
+            "puzzles": [],
+        })
+    lastact = {}
+    for pid in range(1, n_puzzles + 1):
+        rnd = rounds[(pid - 1) % n_rounds]
+        solved = rng.random() < 0.9
+        name = f"Puzzle{pid}{''.join(rng.choice('abcdefghij') for _ in range(14))}"
+        rnd["puzzles"].append({
+            "id": pid,
+            "name": name,
+            "status": "Solved" if solved else rng.choice(STATUSES[:-2]),
+            "answer": f"ANSWER{pid}" if solved else None,
+            "roundname": rnd["name"],
+            "round_id": rnd["id"],
+            "comments": rng.choice([None, "", "needs a fresh pair of eyes on the grid"]),
+            "drive_uri": f"https://docs.google.com/spreadsheets/d/{rng.getrandbits(160):040x}/edit#gid=1",
+            "chat_channel_name": name,
+            "chat_channel_id": str(rng.getrandbits(60)),
+            "chat_channel_link": f"https://discord.com/channels/1/{rng.getrandbits(60)}",
+            "drive_id": f"{rng.getrandbits(160):040x}",
+            "puzzle_uri": f"https://hunt.example.com/puzzle/{name.lower()}",
+            "ismeta": int(rng.random() < 0.08),
+            "solvers": ",".join(rng.sample(solvers, rng.randint(0, 12))),
+            "cursolvers": ",".join(rng.sample(solvers, rng.randint(0, 3))),
+            "xyzloc": rng.choice([None, "", "Room 4-231"]),
+            "sheetcount": rng.randint(1, 12),
+            "sheetenabled": 1,
+            "tags": rng.choice([None, "crossword", "logic,grid", "audio"]),
+        })
+        lastact[pid] = {
+            "id": rng.randint(1, 40000),
+            "puzzle_id": pid,
+            "solver_id": rng.randint(100, 363),
+            "source": rng.choice(["bigjimmybot", "puzzleboss"]),
+            "type": rng.choice(["revise", "interact", "comment"]),
+            "time": f"2026-01-17T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+            "uri": None,
+            "source_version": None,
+        }
+    hints = [{
+        "id": i, "puzzle_id": i, "puzzle_name": f"Puzzle{i}", "solver": "solver001",
+        "queue_position": i, "request_text": "We think the extraction is via the "
+        "ordering of the themed entries but are stuck.", "status": "queued",
+        "created_at": "2026-01-17T12:00:00Z", "answered_at": None, "submitted_at": None,
+    } for i in range(1, 4)]
+    return {"rounds": rounds, "hints": hints}, lastact
+
+
+def encode(body):
+    out = {"gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        out["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return out
+
+
+class DictStore:
+    """Stand-in for Redis reads when no server is given (CPU-only timing)."""
+
+    def __init__(self, blob, lastact_hash, bodies):
+        self.blob, self.lastact_hash, self.bodies = blob, lastact_hash, bodies
+
+    def before_fetch(self):
+        return self.blob, self.lastact_hash
+
+    def after_fetch(self, encoding):
+        # Copy, as reading the reply off a socket would.
+        return bytes(bytearray(self.bodies["gzip" if encoding == "identity" else encoding]))
+
+
+class RedisStore:
+    def __init__(self, addr, blob, lastact_hash, bodies):
+        import redis
+
+        host, _, port = addr.partition(":")
+        self.r = redis.Redis(host=host, port=int(port or 6379))
+        self.r.set("bench:all", blob)
+        self.r.set("bench:all:version", "v1")
+        self.r.set("bench:lastact:version", "1")
+        self.r.hset("bench:lastact", mapping=lastact_hash)
+        self.r.hset("bench:body", mapping=bodies)
+
+    def before_fetch(self):
+        blob, _ = self.r.mget("bench:all", "bench:all:version")
+        return blob, self.r.hgetall("bench:lastact")
+
+    def after_fetch(self, encoding):
+        self.r.mget("bench:all:version", "bench:lastact:version")
+        return self.r.hget("bench:body", "gzip" if encoding == "identity" else encoding)
+
+    def close(self):
+        self.r.delete("bench:all", "bench:all:version", "bench:lastact:version",
+                      "bench:lastact", "bench:body")
+
+
+def serve_before(store):
+    blob, lastact_hash = store.before_fetch()
+    data = json.loads(blob)
+    lastact = {int(k): json.loads(v) for k, v in lastact_hash.items()}
+    for rnd in data["rounds"]:
+        for puzzle in rnd["puzzles"]:
+            puzzle["lastact"] = lastact.get(puzzle["id"])
+    return json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def serve_after(store, encoding):
+    body = store.after_fetch(encoding)
+    if encoding == "identity":
+        body = gzip.decompress(body)
+    return body
+
+
+def timeit(fn, iterations):
+    fn()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def report(label, samples):
+    mean = statistics.mean(samples)
+    p99 = sorted(samples)[int(len(samples) * 0.99) - 1]
+    print(f"  {label:<28} mean {mean * 1000:7.3f} ms   p99 {p99 * 1000:7.3f} ms"
+          f"   {1 / mean:9.0f} req/s/worker")
+    return mean
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--puzzles", type=int, default=275)
+    ap.add_argument("--rounds", type=int, default=18)
+    ap.add_argument("--iterations", type=int, default=300)
+    ap.add_argument("--redis", metavar="HOST[:PORT]", help="time real Redis round trips")
+    args = ap.parse_args()
+
+    structural, lastact = build_fixture(args.puzzles, args.rounds)
+    blob = json.dumps(structural)
+    lastact_hash = {str(pid): json.dumps(row) for pid, row in lastact.items()}
+    full = json.loads(blob)
+    for rnd in full["rounds"]:
+        for puzzle in rnd["puzzles"]:
+            puzzle["lastact"] = lastact[puzzle["id"]]
+    body = json.dumps(full, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    t0 = time.perf_counter()
+    bodies = encode(body)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"fixture: {args.puzzles} puzzles, {args.rounds} rounds")
+    print(f"  body identity {len(body) / 1024:7.1f} KiB", end="")
+    for enc, data in bodies.items():
+        print(f" | {enc} {len(data) / 1024:6.1f} KiB", end="")
+    print(f" | build+compress once per version: {build_ms:.1f} ms")
+    if brotli is None:
+        print("  (brotli not installed - br variant skipped)")
+
+    store = (RedisStore(args.redis, blob, lastact_hash, bodies) if args.redis
+             else DictStore(blob, lastact_hash, bodies))
+    print(f"per-request cost on a cache hit ({'redis ' + args.redis if args.redis else 'in-process'}):")
+    if not args.redis:
+        print("  (after = a byte copy here; pass --redis to include the round trip)")
+    try:
+        before = report("before (decode/attach/encode)",
+                        timeit(lambda: serve_before(store), args.iterations))
+        for enc in ("br", "gzip", "identity"):
+            if enc == "br" and brotli is None:
+                continue
+            after = report(f"after ({enc})",
+                           timeit(lambda: serve_after(store, enc), args.iterations))
+            print(f"  {'':<28} speedup x{before / after:.1f}")
+    finally:
+        if args.redis:
+            store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
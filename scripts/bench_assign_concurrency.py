@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Benchmark concurrent solver assignment (pblib.assign_solver_to_puzzle).
+For local perf analysis only. WRITES TO THE DATABASE: run it against a
+scratch hunt, never a live one.
+
+Simulates a bigjimmybot auto-assign burst overlapping UI claims: --threads
+workers, each with its own connection, repeatedly assign a random solver
+from a small set to a random puzzle from a small set, so the same solver
+and the same puzzle are contended constantly. Reports throughput, p50/p99
+latency per assignment and failures by MySQL error code (1213 deadlock,
+1205 lock wait timeout), then checks the end state: every solver used must
+be current on exactly one puzzle, in both current_solvers JSON and
+puzzle_current_solver. Before assignment ran in one locked transaction,
+lost updates left solvers on two puzzles or on none. Only solvers that
+were assigned at least once are checked.
+
+Solvers and puzzles must already exist and the puzzles must not be Solved.
+
+Usage:
+  python scripts/bench_assign_concurrency.py --solvers 1-20 --puzzles 1-10
+  python scripts/bench_assign_concurrency.py --solvers 1-50 --puzzles 3,4,5 \\
+      --threads 32 --assignments 200
+"""
+
+import argparse
+import collections
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pblib  # noqa: E402
+
+
+def parse_ids(spec):
+    ids = []
+    for part in spec.split(","):
+        lo, _, hi = part.partition("-")
+        ids.extend(range(int(lo), int(hi or lo) + 1))
+    return ids
+
+
+def worker(solvers, puzzles, n, seed, samples, failures, assigned, lock):
+    rng = random.Random(seed)
+    conn = pblib.create_db_connection()
+    mine = []
+    solvers_done = set()
+    errors = collections.Counter()
+    try:
+        for _ in range(n):
+            solver_id = rng.choice(solvers)
+            t0 = time.perf_counter()
+            try:
+                pblib.assign_solver_to_puzzle(rng.choice(puzzles), solver_id, conn, source="bench")
+            except Exception as e:
+                code = e.args[0] if e.args and isinstance(e.args[0], int) else type(e).__name__
+                errors[code] += 1
+                continue
+            mine.append(time.perf_counter() - t0)
+            solvers_done.add(solver_id)
+    finally:
+        conn.close()
+    with lock:
+        samples.extend(mine)
+        failures.update(errors)
+        assigned.update(solvers_done)
+
+
+def check_consistency(solvers):
+    """Return a list of problems: solvers not current on exactly one puzzle."""
+    conn = pblib.create_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, current_solvers FROM puzzle")
+        on_json = collections.defaultdict(list)
+        for row in cursor.fetchall():
+            for s in json.loads(row["current_solvers"] or '{"solvers": []}')["solvers"]:
+                on_json[int(s["solver_id"])].append(row["id"])
+        cursor.execute("SELECT solver_id, puzzle_id FROM puzzle_current_solver")
+        on_table = {row["solver_id"]: row["puzzle_id"] for row in cursor.fetchall()}
+    finally:
+        conn.close()
+
+    problems = []
+    for sid in sorted(solvers):
+        if len(on_json[sid]) != 1:
+            problems.append(f"solver {sid} current on puzzles {on_json[sid]} (JSON)")
+        elif on_table.get(sid) != on_json[sid][0]:
+            problems.append(f"solver {sid}: JSON says {on_json[sid][0]}, table says {on_table.get(sid)}")
+    return problems
+
+
+def percentile(samples, p):
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--solvers", type=parse_ids, required=True, help="solver ids, e.g. 1-20 or 4,7,9")
+    ap.add_argument("--puzzles", type=parse_ids, required=True, help="puzzle ids, e.g. 1-10")
+    ap.add_argument("--threads", type=int, default=16)
+    ap.add_argument("--assignments", type=int, default=100, help="per thread")
+    args = ap.parse_args()
+
+    samples, failures, assigned, lock = [], collections.Counter(), set(), threading.Lock()
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(args.solvers, args.puzzles, args.assignments, i, samples, failures, assigned, lock),
+        )
+        for i in range(args.threads)
+    ]
+    print(f"{args.threads} threads x {args.assignments} assignments, "
+          f"{len(args.solvers)} solvers over {len(args.puzzles)} puzzles")
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    samples.sort()
+    if samples:
+        print(f"  ok {len(samples)}   {len(samples) / elapsed:8.1f} assignments/s"
+              f"   p50 {percentile(samples, 0.50) * 1000:7.2f} ms"
+              f"   p99 {percentile(samples, 0.99) * 1000:7.2f} ms"
+              f"   mean {statistics.mean(samples) * 1000:7.2f} ms")
+    for code, count in failures.most_common():
+        print(f"  failed {count} x {code}")
+
+    problems = check_consistency(assigned)
+    for problem in problems:
+        print(f"  INCONSISTENT: {problem}")
+    if not problems:
+        print("  consistent: every solver is current on exactly one puzzle")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Benchmark GET /puzzles/<id> latency with and without the MySQL pool.
+For local perf analysis only.
+
+pbrest borrows one pooled connection per request (pblib.db_pool): a ping
+instead of a new connection, and session variables set once per connection
+instead of on every read cursor. To compare, run two pbrest servers against
+the same database, one with the default pool and one with pooling disabled
+(POOL_SIZE: 0 under MYSQL in its puzzleboss.yaml, which opens and closes a
+connection per request like the old flask_mysqldb setup), and point this at
+both. Requests are sequential, so the numbers are per-request latency, not
+throughput. The effect is largest with MySQL SSL enabled, as in production.
+
+Usage:
+  python scripts/bench_db_pool.py --puzzle 12 \\
+      pooled=http://localhost:5000 unpooled=http://localhost:5002
+  python scripts/bench_db_pool.py --puzzle 12 --requests 1000 http://localhost:5000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+import requests
+
+
+def measure(session, url, n):
+    session.get(url).raise_for_status()  # warm-up (fills the pool)
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        session.get(url).raise_for_status()
+        samples.append(time.perf_counter() - t0)
+    return sorted(samples)
+
+
+def percentile(samples, p):
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("servers", nargs="+", metavar="[LABEL=]URL")
+    ap.add_argument("--puzzle", type=int, required=True, help="puzzle id to fetch")
+    ap.add_argument("--requests", type=int, default=500)
+    args = ap.parse_args()
+
+    print(f"GET /puzzles/{args.puzzle}, {args.requests} sequential requests per server")
+    for server in args.servers:
+        label, _, base = server.rpartition("=")
+        label = label or base
+        with requests.Session() as session:  # keep-alive, so HTTP setup isn't timed
+            samples = measure(session, f"{base.rstrip('/')}/puzzles/{args.puzzle}", args.requests)
+        print(f"  {label:<12} p50 {percentile(samples, 0.50) * 1000:7.2f} ms"
+              f"   p99 {percentile(samples, 0.99) * 1000:7.2f} ms"
+              f"   mean {statistics.mean(samples) * 1000:7.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
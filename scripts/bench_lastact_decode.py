@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark decoding the lastact hash: per-entry JSON vs. packed records.
+For local perf analysis only.
+
+Every /all request that isn't answered from a stored body reads the whole
+puzzleboss:lastact hash and decodes it into {puzzle_id: activity row}. This
+times that decode for the old layout (one JSON document per field, decoded
+one json.loads at a time) against pbcachelib's compact layout
+(LASTACT_RECORD structs, unpacked together by decode_lastact_many), and
+reports the stored size of each. Rows come from bench_all_response's
+synthetic hunt, so they match production's shape.
+
+Imports pbcachelib, so run it where the app runs (inside the app container,
+next to a puzzleboss.yaml). Redis is not needed: the HGETALL reply is built
+in memory.
+
+Usage:
+  python scripts/bench_lastact_decode.py
+  python scripts/bench_lastact_decode.py --puzzles 300 3000 --iterations 200
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pbcachelib  # noqa: E402
+from bench_all_response import build_fixture  # noqa: E402
+
+
+def decode_json(raw):
+    return {int(pid): json.loads(val) for pid, val in raw.items()}
+
+
+def timeit(fn, raw, iterations):
+    fn(raw)  # warm-up
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn(raw)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def report(label, samples, size):
+    mean = statistics.mean(samples)
+    p99 = sorted(samples)[int(len(samples) * 0.99) - 1]
+    print(f"  {label:<8} mean {mean * 1000:7.3f} ms   p99 {p99 * 1000:7.3f} ms"
+          f"   stored {size / 1024:7.1f} KiB")
+    return mean
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--puzzles", type=int, nargs="+", default=[300, 3000])
+    ap.add_argument("--iterations", type=int, default=200)
+    args = ap.parse_args()
+
+    for n in args.puzzles:
+        _, lastact = build_fixture(n_puzzles=n, n_rounds=max(1, n // 15))
+        # Byte keys and values, as an HGETALL reply on the bytes client.
+        as_json = {str(pid).encode(): json.dumps(row).encode() for pid, row in lastact.items()}
+        packed = {
+            str(pid).encode(): pbcachelib.encode_lastact(pid, row)
+            for pid, row in lastact.items()
+        }
+        assert decode_json(as_json) == pbcachelib.decode_lastact_many(packed) == lastact
+
+        print(f"{n} puzzles:")
+        before = report("json", timeit(decode_json, as_json, args.iterations),
+                        sum(len(v) for v in as_json.values()))
+        after = report("packed", timeit(pbcachelib.decode_lastact_many, packed, args.iterations),
+                       sum(len(v) for v in packed.values()))
+        print(f"  {'':<8} speedup x{before / after:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Benchmark assembling /all's rounds: round_view GROUP_CONCAT splitting vs.
+the ordered merge in pblib.assemble_rounds. For local perf analysis only.
+
+The old loader read puzzle_view into a dict, then split each round_view
+row's GROUP_CONCAT id string, checking every element with a try/except
+int(). MySQL truncates that string at group_concat_max_len (1024 bytes by
+default) without an error, so a round with more than ~200 puzzles (fewer
+with longer ids) silently lost the rest. pblib.get_all_rounds_with_puzzles
+now reads round and puzzle_view ordered by round and merges them in one
+pass.
+
+In-memory mode (the default) builds the rows both queries would return for
+a synthetic hunt (bench_all_response's fixture; 100 rounds x 50 puzzles
+unless told otherwise), truncates the GROUP_CONCAT strings the way MySQL
+would, and times only the Python assembly. --db also times both loaders
+end to end, queries included, against the configured database's current
+data (read-only).
+
+Imports pblib, so run it where the app runs (inside the app container, next
+to a puzzleboss.yaml).
+
+Usage:
+  python scripts/bench_round_loader.py
+  python scripts/bench_round_loader.py --rounds 100 --puzzles-per-round 50 --iterations 200
+  python scripts/bench_round_loader.py --db
+"""
+
+import argparse
+import copy
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pblib  # noqa: E402
+from bench_all_response import build_fixture  # noqa: E402
+
+GROUP_CONCAT_MAX_LEN = 1024  # MySQL default
+
+
+def split_group_concat(round_view, puzzle_view):
+    """The loader pblib and pbrest used to share, verbatim in behavior."""
+    all_puzzles = {}
+    for puzzle in puzzle_view:
+        all_puzzles[puzzle["id"]] = puzzle
+
+    def is_int(val):
+        try:
+            int(val)
+            return True
+        except Exception:
+            return False
+
+    rounds = []
+    for rnd in round_view:
+        if "puzzles" in rnd and rnd["puzzles"]:
+            rnd["puzzles"] = [
+                all_puzzles[int(pid)]
+                for pid in rnd["puzzles"].split(",")
+                if is_int(pid) and int(pid) in all_puzzles
+            ]
+        else:
+            rnd["puzzles"] = []
+        rounds.append(rnd)
+    return rounds
+
+
+def build_rows(n_rounds, per_round):
+    """Return (round rows, round_view rows, puzzle_view rows by round_id, id)."""
+    data, _ = build_fixture(n_puzzles=n_rounds * per_round, n_rounds=n_rounds)
+    rounds, round_view, puzzles = [], [], []
+    for rnd in data["rounds"]:
+        members = rnd.pop("puzzles")
+        rounds.append(dict(rnd))
+        ids = ",".join(str(p["id"]) for p in members)
+        round_view.append(dict(rnd, puzzles=ids[:GROUP_CONCAT_MAX_LEN]))
+        puzzles.extend(members)
+    puzzles.sort(key=lambda p: (p["round_id"], p["id"]))
+    return rounds, round_view, puzzles
+
+
+def timeit(fn, make_args, iterations):
+    samples = []
+    for _ in range(iterations + 1):  # first run is warm-up
+        args = make_args()
+        t0 = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - t0)
+    return samples[1:]
+
+
+def report(label, samples, n_puzzles):
+    mean = statistics.mean(samples)
+    p99 = sorted(samples)[max(0, int(len(samples) * 0.99) - 1)]
+    print(f"  {label:<13} mean {mean * 1000:8.3f} ms   p99 {p99 * 1000:8.3f} ms"
+          f"   puzzles {n_puzzles}")
+    return mean
+
+
+def bench_memory(args):
+    rounds, round_view, puzzles = build_rows(args.rounds, args.puzzles_per_round)
+    print(f"{args.rounds} rounds x {args.puzzles_per_round} puzzles (in memory):")
+
+    old = split_group_concat(copy.deepcopy(round_view), puzzles)
+    new = pblib.assemble_rounds(copy.deepcopy(rounds), puzzles)
+    old_count = sum(len(r["puzzles"]) for r in old)
+    new_count = sum(len(r["puzzles"]) for r in new)
+
+    # Copies are made outside the timed region; both loaders mutate rows.
+    before = report(
+        "group_concat",
+        timeit(split_group_concat, lambda: ([dict(r) for r in round_view], puzzles),
+               args.iterations),
+        old_count,
+    )
+    after = report(
+        "ordered merge",
+        timeit(pblib.assemble_rounds, lambda: ([dict(r) for r in rounds], puzzles),
+               args.iterations),
+        new_count,
+    )
+    print(f"  {'':<13} speedup x{before / after:.1f}")
+    if old_count < new_count:
+        print(f"  group_concat_max_len={GROUP_CONCAT_MAX_LEN} drops "
+              f"{new_count - old_count} puzzles from the old loader")
+
+
+def bench_db(args):
+    conn = pblib.create_db_connection()
+    cursor = conn.cursor()
+
+    def old_loader():
+        cursor.execute("SELECT * from puzzle_view")
+        puzzle_view = cursor.fetchall()
+        cursor.execute("SELECT * from round_view")
+        return split_group_concat(cursor.fetchall(), puzzle_view)
+
+    old = old_loader()
+    new = pblib.get_all_rounds_with_puzzles(conn)
+    print(f"{len(new)} rounds x {sum(len(r['puzzles']) for r in new)} puzzles (database):")
+    before = report("group_concat", timeit(old_loader, tuple, args.iterations),
+                    sum(len(r["puzzles"]) for r in old))
+    after = report(
+        "ordered merge",
+        timeit(pblib.get_all_rounds_with_puzzles, lambda: (conn,), args.iterations),
+        sum(len(r["puzzles"]) for r in new),
+    )
+    print(f"  {'':<13} speedup x{before / after:.1f}")
+    conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--rounds", type=int, default=100)
+    ap.add_argument("--puzzles-per-round", type=int, default=50)
+    ap.add_argument("--iterations", type=int, default=200)
+    ap.add_argument("--db", action="store_true",
+                    help="also time both loaders against the configured database")
+    args = ap.parse_args()
+
+    bench_memory(args)
+    if args.db:
+        bench_db(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
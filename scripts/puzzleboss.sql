@@ -33,10 +33,37 @@ CREATE TABLE `activity` (
   KEY `fk_google_activity_puzzle1_idx` (`puzzle_id`),
   KEY `time` (`time`),
   KEY `puzzle_id` (`puzzle_id`),
-  KEY `idx_puzzle_time` (`puzzle_id`,`time`)
+  KEY `idx_puzzle_time` (`puzzle_id`,`time`),
+  KEY `idx_solver_time` (`solver_id`,`time`,`id`),
+  KEY `idx_type_time` (`type`,`time`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Activity rollups behind GET /activity, kept in step by pblib as activity
+-- is logged (rebuild with the add_activity_rollups migration). NULL
+-- type/source are stored as ''.
+--
+
+DROP TABLE IF EXISTS `activity_counts`;
+CREATE TABLE `activity_counts` (
+  `type` varchar(32) NOT NULL DEFAULT '',
+  `source` varchar(32) NOT NULL DEFAULT '',
+  `count` bigint(20) NOT NULL DEFAULT 0,
+  PRIMARY KEY (`type`, `source`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+DROP TABLE IF EXISTS `puzzle_activity_rollup`;
+CREATE TABLE `puzzle_activity_rollup` (
+  `puzzle_id` int(11) NOT NULL,
+  `create_count` int(11) NOT NULL DEFAULT 0,
+  `create_time_sum` bigint(20) NOT NULL DEFAULT 0,
+  `solve_count` int(11) NOT NULL DEFAULT 0,
+  `solve_time_sum` bigint(20) NOT NULL DEFAULT 0,
+  `last_solve_time` timestamp NULL DEFAULT NULL,
+  PRIMARY KEY (`puzzle_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 --
 -- Table structure for table `newuser`
 --
@@ -109,6 +136,21 @@ CREATE TABLE `botstats` (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `bot_state`
+--
+
+DROP TABLE IF EXISTS `bot_state`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8mb4 */;
+CREATE TABLE `bot_state` (
+  `key` varchar(100) NOT NULL,
+  `val` varchar(1000) DEFAULT NULL,
+  `updated` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`key`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `tag`
 --
@@ -148,6 +190,22 @@ CREATE TABLE `hint` (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `change_log`
+--
+
+DROP TABLE IF EXISTS `change_log`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8mb4 */;
+CREATE TABLE `change_log` (
+  `id` bigint(20) NOT NULL AUTO_INCREMENT,
+  `entity` enum('puzzle','round','hint','lastact') NOT NULL,
+  `entity_id` int(11) NOT NULL,
+  `time` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `config`
 --
@@ -176,6 +234,7 @@ INSERT INTO `config` VALUES
   ('BIGJIMMY_ABANDONED_TIMEOUT_MINUTES', '10'),
   ('BIGJIMMY_AUTOASSIGN', 'false'),
   ('BIGJIMMY_GOOGLE_API_QPM', '55'),
+  ('BIGJIMMY_MAX_POLL_INTERVAL_SECONDS', '900'),
   ('BIGJIMMY_PUZZLEPAUSETIME', '1'),
   ('BIGJIMMY_QUOTAFAIL_DELAY', '5'),
   ('BIGJIMMY_QUOTAFAIL_MAX_RETRIES', '10'),
@@ -209,7 +268,7 @@ INSERT INTO `config` VALUES
   ('SKIP_GOOGLE_API', 'true'),
   ('SKIP_PUZZCORD', 'true'),
   ('STATUS_METADATA', '[{"name":"WTF","emoji":"☢️","text":"?","order":0},{"name":"Critical","emoji":"⚠️","text":"!","order":1},{"name":"Needs eyes","emoji":"👀","text":"E","order":2},{"name":"Being worked","emoji":"🙇","text":"W","order":3},{"name":"Speculative","emoji":"🔮","text":"S","order":4},{"name":"Under control","emoji":"🤝","text":"U","order":5},{"name":"New","emoji":"🆕","text":"N","order":6},{"name":"Grind","emoji":"⛏️","text":"G","order":7},{"name":"Waiting for HQ","emoji":"⌛","text":"H","order":8},{"name":"Abandoned","emoji":"🏳️","text":"A","order":9},{"name":"Solved","emoji":"✅","text":"*","order":10},{"name":"Unnecessary","emoji":"🙃","text":"X","order":11},{"name":"[hidden]","emoji":"👻","text":"H","order":99}]'),
-  ('METRICS_METADATA', '{"bigjimmy_loop_time_seconds":{"type":"gauge","description":"Total time in seconds for last full puzzle scan loop (setup + processing)"},"bigjimmy_loop_setup_seconds":{"type":"gauge","description":"Time in seconds for loop setup (API fetch, thread creation)"},"bigjimmy_loop_processing_seconds":{"type":"gauge","description":"Time in seconds for actual puzzle processing"},"bigjimmy_loop_puzzle_count":{"type":"gauge","description":"Number of puzzles processed in last loop"},"bigjimmy_avg_seconds_per_puzzle":{"type":"gauge","description":"Average processing seconds per puzzle in last loop"},"bigjimmy_quota_failures":{"type":"counter","description":"Total Google API quota failures (429 errors) since bot start"},"bigjimmy_loop_iterations_total":{"type":"counter","description":"Total number of loop iterations completed (resets on bot restart)"},"cache_invalidations_total":{"type":"counter","description":"Total /all blob cache invalidations (structural mutations)"},"cache_hits_total":{"type":"counter","description":"Total /all cache hits (blob served from Redis)"},"cache_misses_total":{"type":"counter","description":"Total /all cache misses (rebuilt from DB)"},"cache_write_through_failures_total":{"type":"counter","description":"Total lastact write-through failures to Redis"},"cache_rebuild_lock_contentions_total":{"type":"counter","description":"Total /all rebuilds served from DB without caching due to rebuild-lock contention"},"cache_cold_start_backfills_total":{"type":"counter","description":"Total lastact hash cold-start backfills from DB (Redis flush/restart)"},"tags_assigned_total":{"type":"counter","description":"Total tags assigned to puzzles"},"puzzcord_members_total":{"type":"gauge","description":"Total number of Discord team members (with member role)"},"puzzcord_members_online":{"type":"gauge","description":"Number of Discord team members online (according to Discord)"},"puzzcord_members_active_in_voice":{"type":"gauge","description":"Number of team members currently active in voice on Discord"},"puzzcord_members_active_in_text":{"type":"gauge","description":"Number of team members active in text on Discord in the last 15 minutes"},"puzzcord_members_active_in_sheets":{"type":"gauge","description":"Number of team members active in Sheets in the last 15 minutes"},"puzzcord_members_active_in_discord":{"type":"gauge","description":"Number of team members currently active in voice OR active in text in the last 15 minutes"},"puzzcord_members_active_anywhere":{"type":"gauge","description":"Number of team members currently active in voice OR active in (text OR Sheets) in the last 15 minutes"},"puzzcord_members_active_in_person":{"type":"gauge","description":"Number of in-person team members currently active in voice OR active in (text OR Sheets) in the last 15 minutes"},"puzzcord_messages_per_minute":{"type":"gauge","description":"Discord messages per minute"},"puzzcord_tables_in_use":{"type":"gauge","description":"Discord tables (voice channels) in use"}}'),
+  ('METRICS_METADATA', '{"bigjimmy_loop_time_seconds":{"type":"gauge","description":"Total time in seconds for last full puzzle scan loop (setup + processing)"},"bigjimmy_loop_setup_seconds":{"type":"gauge","description":"Time in seconds for loop setup (API fetch, thread creation)"},"bigjimmy_loop_processing_seconds":{"type":"gauge","description":"Time in seconds for actual puzzle processing"},"bigjimmy_loop_puzzle_count":{"type":"gauge","description":"Number of puzzles processed in last loop"},"bigjimmy_avg_seconds_per_puzzle":{"type":"gauge","description":"Average processing seconds per puzzle in last loop"},"bigjimmy_quota_failures":{"type":"counter","description":"Total Google API quota failures (429 errors) since bot start"},"bigjimmy_loop_iterations_total":{"type":"counter","description":"Total number of loop iterations completed (resets on bot restart)"},"cache_invalidations_total":{"type":"counter","description":"Total /all blob cache invalidations (structural mutations)"},"cache_hits_total":{"type":"counter","description":"Total /all cache hits (blob served from Redis)"},"cache_misses_total":{"type":"counter","description":"Total /all cache misses (rebuilt from DB)"},"cache_write_through_failures_total":{"type":"counter","description":"Total lastact write-through failures to Redis"},"cache_rebuild_lock_contentions_total":{"type":"counter","description":"Total /all cold misses served from DB because the concurrent rebuild did not land in time"},"cache_fresh_serves_total":{"type":"counter","description":"Total /all responses served from a fresh cached blob"},"cache_stale_serves_total":{"type":"counter","description":"Total /all responses served from a stale cached blob while another worker rebuilt it"},"cache_background_rebuilds_total":{"type":"counter","description":"Total /all blob rebuilds done by the background rebuilder"},"cache_rebuild_requests_total":{"type":"counter","description":"Total invalidations consumed by the background rebuilder (divide by rebuilds for the coalescing ratio)"},"cache_rebuild_seconds":{"type":"gauge","description":"Duration in seconds of the last background /all blob rebuild"},"cache_cold_start_backfills_total":{"type":"counter","description":"Total lastact hash cold-start backfills from DB (Redis flush/restart)"},"tags_assigned_total":{"type":"counter","description":"Total tags assigned to puzzles"},"puzzcord_members_total":{"type":"gauge","description":"Total number of Discord team members (with member role)"},"puzzcord_members_online":{"type":"gauge","description":"Number of Discord team members online (according to Discord)"},"puzzcord_members_active_in_voice":{"type":"gauge","description":"Number of team members currently active in voice on Discord"},"puzzcord_members_active_in_text":{"type":"gauge","description":"Number of team members active in text on Discord in the last 15 minutes"},"puzzcord_members_active_in_sheets":{"type":"gauge","description":"Number of team members active in Sheets in the last 15 minutes"},"puzzcord_members_active_in_discord":{"type":"gauge","description":"Number of team members currently active in voice OR active in text in the last 15 minutes"},"puzzcord_members_active_anywhere":{"type":"gauge","description":"Number of team members currently active in voice OR active in (text OR Sheets) in the last 15 minutes"},"puzzcord_members_active_in_person":{"type":"gauge","description":"Number of in-person team members currently active in voice OR active in (text OR Sheets) in the last 15 minutes"},"puzzcord_messages_per_minute":{"type":"gauge","description":"Discord messages per minute"},"puzzcord_tables_in_use":{"type":"gauge","description":"Discord tables (voice channels) in use"}}'),
   ('TEAMNAME', 'Default Team Name'),
   ('WIKI_CHROMADB_PATH', '/var/lib/puzzleboss/chromadb'),
   ('WIKI_EXCLUDE_PREFIXES', ''),
@@ -218,6 +277,21 @@ INSERT INTO `config` VALUES
 /*!40000 ALTER TABLE `config` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `config_version`
+--
+
+DROP TABLE IF EXISTS `config_version`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8mb4 */;
+CREATE TABLE `config_version` (
+  `id` tinyint(4) NOT NULL DEFAULT 1,
+  `version` bigint(20) NOT NULL DEFAULT 0,
+  PRIMARY KEY (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+INSERT INTO `config_version` (`id`, `version`) VALUES (1, 0);
 
 --
 -- Table structure for table `log`
@@ -322,6 +396,46 @@ CREATE TABLE `solver` (
   UNIQUE KEY `uid_UNIQUE` (`name`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+--
+-- Solver assignments. The primary key on puzzle_current_solver.solver_id
+-- allows one current puzzle per solver. puzzle.current_solvers and
+-- puzzle.solver_history still hold the same data as JSON for older code.
+--
+
+DROP TABLE IF EXISTS `puzzle_current_solver`;
+CREATE TABLE `puzzle_current_solver` (
+  `solver_id` int(11) NOT NULL,
+  `puzzle_id` int(11) NOT NULL,
+  PRIMARY KEY (`solver_id`),
+  KEY `idx_current_solver_puzzle` (`puzzle_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+DROP TABLE IF EXISTS `puzzle_solver_history`;
+CREATE TABLE `puzzle_solver_history` (
+  `puzzle_id` int(11) NOT NULL,
+  `solver_id` int(11) NOT NULL,
+  PRIMARY KEY (`puzzle_id`, `solver_id`),
+  KEY `idx_solver_history_solver` (`solver_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+--
+-- Per-solver summary served by solver_view and GET /solvers/<id>: current
+-- puzzle, history puzzle ids and latest activity. pblib keeps it in step
+-- with the assignment tables and activity in the same transactions.
+--
+
+DROP TABLE IF EXISTS `solver_state`;
+CREATE TABLE `solver_state` (
+  `solver_id` int(11) NOT NULL,
+  `current_puzzle_id` int(11) DEFAULT NULL,
+  `current_puzzle_name` varchar(255) DEFAULT NULL,
+  `history_puzzle_ids` json DEFAULT NULL,
+  `last_activity_id` int(11) DEFAULT NULL,
+  `last_activity_time` timestamp NULL DEFAULT NULL,
+  PRIMARY KEY (`solver_id`),
+  KEY `idx_solver_state_current_puzzle` (`current_puzzle_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 --
 -- Final view structure for view `round_view`
 --
@@ -356,7 +470,7 @@ CREATE TABLE `solver` (
 /*!40111 SET SQL_NOTES=@OLD_SQL_NOTES */;
 
 --
--- Helper functions for JSON-based solver tracking
+-- Helper functions for solver tracking
 --
 
 DELIMITER //
@@ -372,16 +486,10 @@ DETERMINISTIC
 SQL SECURITY INVOKER
 BEGIN
     DECLARE result TEXT;
-    SELECT GROUP_CONCAT(solver.name) INTO result
-    FROM puzzle p,
-    JSON_TABLE(
-        p.current_solvers,
-        '$.solvers[*]' COLUMNS (
-            solver_id INT PATH '$.solver_id'
-        )
-    ) AS jt
-    JOIN solver ON solver.id = jt.solver_id
-    WHERE p.id = puzzle_id;
+    SELECT GROUP_CONCAT(solver.name ORDER BY solver.name) INTO result
+    FROM puzzle_current_solver c
+    JOIN solver ON solver.id = c.solver_id
+    WHERE c.puzzle_id = puzzle_id;
     RETURN IFNULL(result, '');
 END //
 
@@ -391,16 +499,10 @@ DETERMINISTIC
 SQL SECURITY INVOKER
 BEGIN
     DECLARE result TEXT;
-    SELECT GROUP_CONCAT(DISTINCT solver.name) INTO result
-    FROM puzzle p,
-    JSON_TABLE(
-        p.solver_history,
-        '$.solvers[*]' COLUMNS (
-            solver_id INT PATH '$.solver_id'
-        )
-    ) AS jt
-    JOIN solver ON solver.id = jt.solver_id
-    WHERE p.id = puzzle_id;
+    SELECT GROUP_CONCAT(DISTINCT solver.name ORDER BY solver.name) INTO result
+    FROM puzzle_solver_history h
+    JOIN solver ON solver.id = h.solver_id
+    WHERE h.puzzle_id = puzzle_id;
     RETURN IFNULL(result, '');
 END //
 
@@ -411,15 +513,9 @@ SQL SECURITY INVOKER
 BEGIN
     DECLARE result TEXT CHARACTER SET utf8mb4;
     SELECT p.name INTO result
-    FROM puzzle p,
-    JSON_TABLE(
-        p.current_solvers,
-        '$.solvers[*]' COLUMNS (
-            sid INT PATH '$.solver_id'
-        )
-    ) AS jt
-    WHERE jt.sid = solver_id
-    LIMIT 1;
+    FROM puzzle_current_solver c
+    JOIN puzzle p ON p.id = c.puzzle_id
+    WHERE c.solver_id = solver_id;
     RETURN IFNULL(result, '');
 END //
 
@@ -429,15 +525,10 @@ DETERMINISTIC
 SQL SECURITY INVOKER
 BEGIN
     DECLARE result TEXT CHARACTER SET utf8mb4;
-    SELECT GROUP_CONCAT(DISTINCT p.name) INTO result
-    FROM puzzle p,
-    JSON_TABLE(
-        p.solver_history,
-        '$.solvers[*]' COLUMNS (
-            sid INT PATH '$.solver_id'
-        )
-    ) AS jt
-    WHERE jt.sid = solver_id;
+    SELECT GROUP_CONCAT(DISTINCT p.name ORDER BY p.name) INTO result
+    FROM puzzle_solver_history h
+    JOIN puzzle p ON p.id = h.puzzle_id
+    WHERE h.solver_id = solver_id;
     RETURN IFNULL(result, '');
 END //
 
@@ -462,24 +553,16 @@ SELECT
     p.puzzle_uri,
     p.ismeta,
     (
-        SELECT GROUP_CONCAT(DISTINCT s.name)
-        FROM JSON_TABLE(
-            p.solver_history,
-            '$.solvers[*]' COLUMNS (
-                solver_id INT PATH '$.solver_id'
-            )
-        ) AS jt
-        JOIN solver s ON s.id = jt.solver_id
+        SELECT GROUP_CONCAT(DISTINCT s.name ORDER BY s.name)
+        FROM puzzle_solver_history h
+        JOIN solver s ON s.id = h.solver_id
+        WHERE h.puzzle_id = p.id
     ) AS solvers,
     (
-        SELECT GROUP_CONCAT(DISTINCT s.name)
-        FROM JSON_TABLE(
-            p.current_solvers,
-            '$.solvers[*]' COLUMNS (
-                solver_id INT PATH '$.solver_id'
-            )
-        ) AS jt
-        JOIN solver s ON s.id = jt.solver_id
+        SELECT GROUP_CONCAT(DISTINCT s.name ORDER BY s.name)
+        FROM puzzle_current_solver c
+        JOIN solver s ON s.id = c.solver_id
+        WHERE c.puzzle_id = p.id
     ) AS cursolvers,
     p.xyzloc,
     p.sheetcount,
@@ -503,9 +586,19 @@ CREATE VIEW solver_view AS
 SELECT 
     solver.id,
     solver.name,
-    get_all_puzzles(solver.id) AS puzzles,
-    get_current_puzzle(solver.id) AS puzz,
+    IFNULL((
+        SELECT GROUP_CONCAT(DISTINCT p.name ORDER BY p.name)
+        FROM JSON_TABLE(
+            ss.history_puzzle_ids,
+            '$[*]' COLUMNS (
+                puzzle_id INT PATH '$'
+            )
+        ) AS jt
+        JOIN puzzle p ON p.id = jt.puzzle_id
+    ), '') AS puzzles,
+    IFNULL(ss.current_puzzle_name, '') AS puzz,
     solver.fullname,
     solver.chat_uid,
     solver.chat_name
-FROM solver;
\ No newline at end of file
+FROM solver
+LEFT JOIN solver_state ss ON ss.solver_id = solver.id;
\ No newline at end of file
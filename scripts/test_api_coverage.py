@@ -14,6 +14,7 @@ Usage:
 import json
 import random
 import string
+import struct
 import sys
 import time
 import traceback
@@ -37,6 +38,10 @@ from test_helpers import (
 
 # Configuration
 BASE_URL = API_URL
+# Layout of the lastact hash values; keep in step with pbcachelib.
+LASTACT_RECORD = struct.Struct("<BI19sIBB")
+LASTACT_TYPES = (None, "create", "revise", "comment", "interact", "solve", "change",
+                 "status", "assignment")
 
 
 # ============================================================================
@@ -1181,6 +1186,20 @@ class TestRunner:
 
         result.set_success("lastact write-through test completed successfully")
 
+    def _read_lastact_entry(self, pid):
+        """Read one lastact hash entry as a dict. Entries are compact
+        pbcachelib.LASTACT_RECORD structs (or JSON for rows that don't fit),
+        so this needs the raw bytes rather than the decoding client."""
+        import redis
+
+        kwargs = dict(self.redis.connection_pool.connection_kwargs, decode_responses=False)
+        raw = redis.Redis(**kwargs).hget("puzzleboss:lastact", str(pid))
+        if raw is None or len(raw) != LASTACT_RECORD.size or raw[0] != 1:
+            return None if raw is None else json.loads(raw)
+        _, aid, when, solver_id, type_code, _ = LASTACT_RECORD.unpack(raw)
+        return {"id": aid, "time": when.decode(), "solver_id": solver_id,
+                "type": LASTACT_TYPES[type_code]}
+
     # ------------------------------------------------------------------
     # Test 15d: lastact cold-start consistency (Redis backfill == DB)
     # After FLUSHALL, the first /all rebuilds the lastact hash from the DB.
@@ -1228,11 +1247,10 @@ class TestRunner:
 
         # Backfilled entry for our puzzle must match the authoritative row,
         # including the tie-break (the 'interact' was logged last → higher id).
-        raw = self.redis.hget("puzzleboss:lastact", str(pid))
-        if raw is None:
+        backfilled = self._read_lastact_entry(pid)
+        if backfilled is None:
             result.fail(f"puzzle {pid} missing from backfilled hash")
             return
-        backfilled = json.loads(raw)
         if backfilled.get("id") != authoritative.get("id"):
             result.fail(
                 f"cold-start hash disagrees with DB lastact for puzzle {pid}: "
@@ -1323,7 +1341,7 @@ class TestRunner:
         sid = self.get_all_solvers()[0]["id"]
         self.api_post(f"/puzzles/{pid}/lastact",
                       {"lastact": {"solver_id": sid, "source": "puzzleboss", "type": "comment"}})
-        if self.redis.hget("puzzleboss:lastact", str(pid)) is None:
+        if not self.redis.hexists("puzzleboss:lastact", str(pid)):
             result.fail(f"puzzle {pid} never got a lastact hash entry to delete")
             return
 
@@ -1333,7 +1351,7 @@ class TestRunner:
             result.fail(f"DELETE /deletepuzzle/{pname} failed: {r.status_code} - {r.text[:160]}")
             return
 
-        if self.redis.hget("puzzleboss:lastact", str(pid)) is not None:
+        if self.redis.hexists("puzzleboss:lastact", str(pid)):
             result.fail(f"puzzle {pid} still in lastact hash after deletion (hdel leak)")
             return
         self.logger.log_operation("  ✓ deleted puzzle removed from lastact hash")
@@ -1388,12 +1406,13 @@ class TestRunner:
             f"  warm /all best-of-7: {warm_ms:.1f}ms ({payload_kb:.0f}KB, {puzzle_count} puzzles)"
         )
 
-        # 2. Forced-miss latency: delete the blob each time so every request
-        #    rebuilds from the DB (the lastact attach is the same in both
-        #    paths; the difference is the blob rebuild the warm path skips).
+        # 2. Forced-miss latency: drop the blob's index and version each time
+        #    so every request rebuilds from the DB (the lastact attach is the
+        #    same in both paths; the difference is the blob rebuild the warm
+        #    path skips). Without the version, no stored body matches either.
         miss_best = float("inf")
         for _ in range(5):
-            self.redis.delete("puzzleboss:all")
+            self.redis.delete("puzzleboss:all:index", "puzzleboss:all:version")
             t0 = time.perf_counter()
             rr = requests.get(f"{self.base_url}/all")
             dt = time.perf_counter() - t0
@@ -0,0 +1,157 @@
+"""In-memory fakes of the Google Drive v3 changes API and the Sheets v4
+values API, for testing bigjimmybot's sheet polling offline.
+
+FakeDrive stands in for pbgooglelib.service: service.changes().list(...) and
+.getStartPageToken(...) build requests whose .execute() answers from an
+in-memory change log, the way Drive does:
+
+  - A page token is a position in the change log; the start token is the
+    current end of it.
+  - list returns up to pageSize changes from the token, with nextPageToken
+    while more remain and newStartPageToken on the last page.
+  - A token that was never handed out is rejected, like Drive's
+    "Invalid Value" 400.
+
+Tests record edits with touch(), queue failures with fail_next(), and read
+per-method call counts from calls.
+
+FakeSheets stands in for pbgooglelib.sheetsservice, serving
+spreadsheets().values().get() for "<tab>!A:C" and "<tab>!A<row>:C" ranges
+from in-memory tabs. It records each request's range and the rows it
+returned, and answers a missing tab with the "Unable to parse range" 400.
+"""
+
+import re
+from collections import Counter
+
+
+class FakeDriveError(Exception):
+    """Raised by execute() for queued failures and bad tokens."""
+
+
+class _Request:
+    def __init__(self, drive, method, respond):
+        self._drive = drive
+        self._method = method
+        self._respond = respond
+
+    def execute(self, http=None):
+        self._drive.calls[self._method] += 1
+        if self._drive._failures:
+            raise self._drive._failures.pop(0)
+        return self._respond()
+
+
+class _Changes:
+    def __init__(self, drive):
+        self._drive = drive
+
+    def getStartPageToken(self, **kwargs):
+        return _Request(
+            self._drive, "changes.getStartPageToken",
+            lambda: {"startPageToken": str(len(self._drive.log))},
+        )
+
+    def list(self, pageToken, pageSize=100, **kwargs):
+        return _Request(
+            self._drive, "changes.list",
+            lambda: self._drive._list(pageToken, pageSize),
+        )
+
+
+class FakeDrive:
+    """Drive service double holding an ordered log of changed file ids."""
+
+    def __init__(self):
+        self.log = []
+        self.calls = Counter()
+        self._failures = []
+
+    def touch(self, *file_ids):
+        """Record an edit to each file, in order."""
+        self.log.extend(file_ids)
+
+    def fail_next(self, error):
+        """Make the next execute() raise error (an exception instance)."""
+        self._failures.append(error)
+
+    def changes(self):
+        return _Changes(self)
+
+    def _list(self, page_token, page_size):
+        try:
+            start = int(page_token)
+        except (TypeError, ValueError):
+            start = -1
+        if not 0 <= start <= len(self.log):
+            raise FakeDriveError(f"<HttpError 400 Invalid Value: pageToken {page_token!r}>")
+        end = min(start + page_size, len(self.log))
+        response = {
+            "kind": "drive#changeList",
+            "changes": [{"fileId": fid, "removed": False} for fid in self.log[start:end]],
+        }
+        if end < len(self.log):
+            response["nextPageToken"] = str(end)
+        else:
+            response["newStartPageToken"] = str(end)
+        return response
+
+
+class FakeHttpError(Exception):
+    """Shaped like googleapiclient.errors.HttpError (resp.status)."""
+
+    def __init__(self, status, message):
+        super().__init__(f"<HttpError {status}: {message}>")
+        self.resp = type("Resp", (), {"status": status})()
+
+
+_RANGE = re.compile(r"^(?P<tab>[^!]+)!A(?P<start>\d*):C$")
+
+
+class _Values:
+    def __init__(self, sheets):
+        self._sheets = sheets
+
+    def get(self, spreadsheetId, range, **kwargs):
+        return _Request(
+            self._sheets, "values.get",
+            lambda: self._sheets._get(spreadsheetId, range),
+        )
+
+
+class _Spreadsheets:
+    def __init__(self, sheets):
+        self._sheets = sheets
+
+    def values(self):
+        return _Values(self._sheets)
+
+
+class FakeSheets:
+    """Sheets service double: tabs[spreadsheet_id][tab] is a list of rows."""
+
+    def __init__(self):
+        self.tabs = {}
+        self.calls = Counter()
+        self.requests = []  # (range, rows returned)
+        self._failures = []
+
+    def fail_next(self, error):
+        """Make the next execute() raise error (an exception instance)."""
+        self._failures.append(error)
+
+    def spreadsheets(self):
+        return _Spreadsheets(self)
+
+    def _get(self, spreadsheet_id, a1_range):
+        match = _RANGE.match(a1_range)
+        tab = self.tabs.get(spreadsheet_id, {}).get(match["tab"]) if match else None
+        if tab is None:
+            raise FakeHttpError(400, f"Unable to parse range: {a1_range}")
+        start = int(match["start"] or 1)
+        rows = [list(row) for row in tab[start - 1:]]
+        self.requests.append((a1_range, len(rows)))
+        response = {"range": a1_range, "majorDimension": "ROWS"}
+        if rows:
+            response["values"] = rows
+        return response
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Unit tests for incremental _pb_activity reads (bigjimmybot._read_activity_sheet
+over pbgooglelib.get_puzzle_sheet_info_activity), run offline against the
+FakeSheets service in tests/fake_drive.py.
+
+  - Sheets from the stock tracker (one row per editor, rewritten in place)
+    are read whole on every poll.
+  - Append-style sheets are read from the last consumed row down, so a
+    poll's response is the new rows plus one anchor row however long the
+    sheet is; the cursor survives restarts through bot_state.
+  - A truncated, rewritten or repaired sheet fails the anchor check and is
+    read whole once to resync.
+
+Run with: pytest tests/test_activity_sheet_tail.py -v
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mock the Google client libraries BEFORE importing pbgooglelib, restoring
+# the originals afterwards so the mocks don't leak (see test_rate_limiter).
+_saved_modules = {
+    name: sys.modules.get(name)
+    for name in (
+        'googleapiclient', 'googleapiclient.discovery',
+        'google.auth', 'google.auth.transport', 'google.auth.transport.requests',
+        'google.oauth2', 'google.oauth2.service_account', 'google_auth_httplib2',
+        'httplib2',
+    )
+}
+for _name in _saved_modules:
+    sys.modules[_name] = MagicMock()
+
+# bigjimmybot tests leave a MagicMock here; load the real module
+if isinstance(sys.modules.get('pbgooglelib'), MagicMock):
+    del sys.modules['pbgooglelib']
+
+import pbgooglelib  # noqa: E402
+import bigjimmybot  # noqa: E402
+
+for _name, _orig in _saved_modules.items():
+    if _orig is None:
+        sys.modules.pop(_name, None)
+    else:
+        sys.modules[_name] = _orig
+
+from fake_drive import FakeHttpError, FakeSheets  # noqa: E402
+
+DRIVE_ID = "sheet1"
+HEADER = ["editor", "timestamp", "num_sheets"]
+PUZZLE = {"id": 1, "name": "Puzzle1", "drive_id": DRIVE_ID, "sheetenabled": 1}
+
+
+def _row(editor, ts, num_sheets=3):
+    return [f"{editor}@example.org", str(ts), str(num_sheets)]
+
+
+@pytest.fixture
+def sheets():
+    fake = FakeSheets()
+    with patch.object(pbgooglelib, "sheetsservice", fake), \
+            patch.object(pbgooglelib, "_rate_limiter", MagicMock()), \
+            patch.object(pbgooglelib, "debug_log"), \
+            patch.object(pbgooglelib.googleapiclient.errors, "HttpError", FakeHttpError), \
+            patch.object(pbgooglelib, "configstruct", {
+                "SKIP_GOOGLE_API": "false",
+                "BIGJIMMY_QUOTAFAIL_MAX_RETRIES": "3",
+                "BIGJIMMY_QUOTAFAIL_DELAY": "0",
+            }):
+        yield fake
+
+
+@pytest.fixture
+def store(sheets):
+    """bigjimmybot reading through the real pbgooglelib, bot_state in a dict."""
+    state = {}
+    with patch.object(bigjimmybot, "get_puzzle_sheet_info_activity",
+                      pbgooglelib.get_puzzle_sheet_info_activity), \
+            patch.object(bigjimmybot, "get_bot_state", lambda key, conn: state.get(key)), \
+            patch.object(bigjimmybot, "set_bot_state",
+                         lambda key, value, conn: state.__setitem__(key, value)), \
+            patch.object(bigjimmybot, "_get_db_connection", MagicMock()), \
+            patch.object(bigjimmybot, "debug_log"), \
+            patch.dict(bigjimmybot._activity_cursors, clear=True):
+        yield state
+
+
+def _read():
+    return bigjimmybot._read_activity_sheet(PUZZLE, "test")
+
+
+class TestInPlaceSheet:
+    def test_read_whole_every_poll(self, sheets, store):
+        sheets.tabs[DRIVE_ID] = {"_pb_activity": [HEADER, _row("alice", 100), _row("bob", 110)]}
+        _read()
+        sheets.tabs[DRIVE_ID]["_pb_activity"][1] = _row("alice", 200)
+
+        info = _read()
+
+        assert [r for r, _ in sheets.requests] == ["_pb_activity!A:C"] * 2
+        assert {"solvername": "alice", "timestamp": 200} in info["editors"]
+        assert not any(store.values())
+
+    def test_missing_sheet(self, sheets, store):
+        sheets.tabs[DRIVE_ID] = {}
+        info = _read()
+        assert info["editors"] == [] and not info["error"]
+
+
+class TestAppendSheet:
+    ROWS = 5000
+
+    @pytest.fixture
+    def tab(self, sheets, store):
+        rows = [HEADER] + [_row(f"solver{i % 7}", 1000 + i) for i in range(self.ROWS)]
+        sheets.tabs[DRIVE_ID] = {"_pb_activity": rows}
+        first = _read()
+        assert len(first["editors"]) == self.ROWS
+        return rows
+
+    def test_reads_only_new_rows(self, sheets, tab):
+        tab.extend([_row("alice", 9000, 4), _row("bob", 9001, 5)])
+
+        info = _read()
+
+        assert sheets.requests[-1] == (f"_pb_activity!A{self.ROWS + 1}:C", 3)
+        assert [e["solvername"] for e in info["editors"]] == ["alice", "bob"]
+        assert info["sheetcount"] == 5
+
+    def test_response_stays_constant(self, sheets, tab):
+        for n in range(20):
+            tab.append(_row("carol", 9000 + n))
+            assert len(_read()["editors"]) == 1
+        assert max(rows for _, rows in sheets.requests[1:]) == 2
+
+    def test_quiet_poll_returns_anchor_only(self, sheets, tab):
+        info = _read()
+        assert sheets.requests[-1][1] == 1
+        assert info["editors"] == [] and info["sheetcount"] is None
+
+    def test_cursor_survives_restart(self, sheets, store, tab):
+        bigjimmybot._activity_cursors.clear()
+        tab.append(_row("alice", 9000))
+
+        info = _read()
+
+        assert sheets.requests[-1][0] == f"_pb_activity!A{self.ROWS + 1}:C"
+        assert [e["solvername"] for e in info["editors"]] == ["alice"]
+
+    def test_truncated_sheet_resyncs(self, sheets, tab):
+        del tab[100:]
+        tab.append(_row("alice", 9000))
+
+        info = _read()
+
+        assert [r for r, _ in sheets.requests[-2:]] == [
+            f"_pb_activity!A{self.ROWS + 1}:C", "_pb_activity!A:C",
+        ]
+        assert len(info["editors"]) == 100
+        assert _read()["editors"] == []
+
+    def test_repaired_sheet_resyncs(self, sheets, store, tab):
+        # repair_activity_sheet recreates the tab with just the header
+        sheets.tabs[DRIVE_ID]["_pb_activity"] = [HEADER, _row("alice", 9000)]
+
+        info = _read()
+
+        assert [e["solvername"] for e in info["editors"]] == ["alice"]
+        assert bigjimmybot._activity_cursors[DRIVE_ID] is None
+        assert store[bigjimmybot._ACTIVITY_CURSOR_KEY.format(DRIVE_ID)] is None
+
+    def test_error_keeps_cursor(self, sheets, tab):
+        cursor = dict(bigjimmybot._activity_cursors[DRIVE_ID])
+        sheets.fail_next(FakeHttpError(500, "backendError"))
+
+        assert _read()["error"] is True
+        assert bigjimmybot._activity_cursors[DRIVE_ID] == cursor
@@ -53,6 +53,8 @@ from bigjimmybot import (
     _parse_revision_timestamp,
     _get_solver_id,
     _process_activity_records,
+    SolverDirectory,
+    solver_directory,
 )
 
 # Restore the original sys.modules entries (drop the key if it had no entry)
@@ -104,46 +106,47 @@ class TestTimestampParsing:
 
 
 class TestSolverLookup:
-    """Test solver lookup with mocked database."""
+    """Test solver lookup through the in-memory solver directory."""
+
+    @pytest.fixture(autouse=True)
+    def empty_directory(self):
+        solver_directory.clear()
+        yield
+        solver_directory.clear()
+
+    def _directory(self, mock_get_ids):
+        solver = load_fixture('solver_benoc.json')
+        mock_get_ids.return_value = {solver['name']: solver['id']}
 
     @patch('bigjimmybot._get_db_connection')
-    @patch('bigjimmybot.get_solver_by_name_from_db')
-    def test_get_solver_id_by_name_found(self, mock_get_solver, mock_conn):
+    @patch('bigjimmybot.get_solver_ids')
+    def test_get_solver_id_by_name_found(self, mock_get_ids, mock_conn):
         """Test successful solver lookup by name."""
-        # Mock database response (solver dict directly, no API envelope)
-        solver_data = load_fixture('solver_benoc.json')
-        mock_get_solver.return_value = solver_data
+        self._directory(mock_get_ids)
 
         # Test
         result = _get_solver_id("benoc", "name")
 
         # Verify
         assert result == 456
-        mock_get_solver.assert_called_once()
-        # Verify username was lowercased
-        assert mock_get_solver.call_args[0][0] == "benoc"
+        mock_get_ids.assert_called_once()
 
     @patch('bigjimmybot._get_db_connection')
-    @patch('bigjimmybot.get_solver_by_name_from_db')
-    def test_get_solver_id_by_email_found(self, mock_get_solver, mock_conn):
+    @patch('bigjimmybot.get_solver_ids')
+    def test_get_solver_id_by_email_found(self, mock_get_ids, mock_conn):
         """Test successful solver lookup by email (extracts username)."""
-        # Mock database response
-        solver_data = load_fixture('solver_benoc.json')
-        mock_get_solver.return_value = solver_data
+        self._directory(mock_get_ids)
 
-        # Test with full email
+        # Test with full email - should extract "benoc"
         result = _get_solver_id("benoc@example.com", "email")
 
-        # Verify - should extract "benoc" from email
         assert result == 456
-        assert mock_get_solver.call_args[0][0] == "benoc"
 
     @patch('bigjimmybot._get_db_connection')
-    @patch('bigjimmybot.get_solver_by_name_from_db')
-    def test_get_solver_id_not_found(self, mock_get_solver, mock_conn):
+    @patch('bigjimmybot.get_solver_ids')
+    def test_get_solver_id_not_found(self, mock_get_ids, mock_conn):
         """Test solver lookup when solver doesn't exist."""
-        # Mock database returning None (not found)
-        mock_get_solver.return_value = None
+        self._directory(mock_get_ids)
 
         # Test
         result = _get_solver_id("nonexistent", "name")
@@ -152,11 +155,11 @@ class TestSolverLookup:
         assert result == 0
 
     @patch('bigjimmybot._get_db_connection')
-    @patch('bigjimmybot.get_solver_by_name_from_db')
-    def test_get_solver_id_db_error(self, mock_get_solver, mock_conn):
+    @patch('bigjimmybot.get_solver_ids')
+    def test_get_solver_id_db_error(self, mock_get_ids, mock_conn):
         """Test solver lookup when database raises exception."""
         # Mock database exception
-        mock_get_solver.side_effect = Exception("Database connection lost")
+        mock_get_ids.side_effect = Exception("Database connection lost")
 
         # Test
         result = _get_solver_id("benoc", "name")
@@ -165,8 +168,8 @@ class TestSolverLookup:
         assert result == 0
 
     @patch('bigjimmybot._get_db_connection')
-    @patch('bigjimmybot.get_solver_by_name_from_db')
-    def test_get_solver_id_connection_failure(self, mock_get_solver, mock_conn):
+    @patch('bigjimmybot.get_solver_ids')
+    def test_get_solver_id_connection_failure(self, mock_get_ids, mock_conn):
         """Test solver lookup when DB connection fails."""
         # Mock connection failure
         mock_conn.side_effect = Exception("Connection refused")
@@ -178,23 +181,80 @@ class TestSolverLookup:
         assert result == 0
 
     @patch('bigjimmybot._get_db_connection')
-    @patch('bigjimmybot.get_solver_by_name_from_db')
-    def test_get_solver_id_case_insensitive(self, mock_get_solver, mock_conn):
+    @patch('bigjimmybot.get_solver_ids')
+    def test_get_solver_id_case_insensitive(self, mock_get_ids, mock_conn):
         """Test solver lookup is case-insensitive."""
-        # Mock database response
-        solver_data = load_fixture('solver_benoc.json')
-        mock_get_solver.return_value = solver_data
+        self._directory(mock_get_ids)
 
         # Test with different cases
         result1 = _get_solver_id("BENOC", "name")
         result2 = _get_solver_id("BeNoC", "name")
 
-        # Verify both work
+        # Verify both work, from one directory load
         assert result1 == 456
         assert result2 == 456
-        # Verify both were lowercased in DB call
-        assert mock_get_solver.call_args_list[0][0][0] == "benoc"
-        assert mock_get_solver.call_args_list[1][0][0] == "benoc"
+        mock_get_ids.assert_called_once()
+
+
+    @patch('bigjimmybot._get_db_connection')
+    @patch('bigjimmybot.get_solver_ids')
+    def test_get_solver_id_matches_like_collation(self, mock_get_ids, mock_conn):
+        """Names match as utf8mb4_unicode_ci would: accents and trailing
+        spaces ignored."""
+        mock_get_ids.return_value = {"josé": 7}
+
+        assert _get_solver_id("jose@example.com", "email") == 7
+        assert _get_solver_id("JOSÉ ", "name") == 7
+
+
+class TestSolverDirectory:
+    """Directory loads, top-ups, negative cache and reloads."""
+
+    NOW = 1_000_000.0
+
+    @pytest.fixture
+    def get_ids(self):
+        with patch('bigjimmybot._get_db_connection'), \
+                patch('bigjimmybot.get_solver_ids') as mock_get_ids:
+            mock_get_ids.return_value = {"alice": 1, "bob": 2}
+            yield mock_get_ids
+
+    def _lookup(self, directory, name, at):
+        with patch('bigjimmybot.time.time', return_value=self.NOW + at):
+            return directory.lookup(name)
+
+    def test_known_names_need_no_query(self, get_ids):
+        directory = SolverDirectory()
+        for n in range(100):
+            assert self._lookup(directory, "alice" if n % 2 else "bob", n) in (1, 2)
+        get_ids.assert_called_once()
+
+    def test_new_solver_found_by_top_up(self, get_ids):
+        directory = SolverDirectory()
+        self._lookup(directory, "alice", 0)
+        get_ids.return_value = {"carol": 3}
+
+        assert self._lookup(directory, "carol", 1) == 3
+        assert get_ids.call_args[0][1] == 2  # only ids above the highest known
+
+    def test_unknown_name_cached_for_ttl(self, get_ids):
+        directory = SolverDirectory(miss_ttl=60)
+        assert self._lookup(directory, "stranger", 0) == 0
+        for n in range(1, 60):
+            assert self._lookup(directory, "stranger", n) == 0
+        assert get_ids.call_count == 1
+
+        get_ids.return_value = {"stranger": 9}
+        assert self._lookup(directory, "stranger", 60) == 9
+        assert get_ids.call_count == 2
+
+    def test_reload_drops_deleted_solvers(self, get_ids):
+        directory = SolverDirectory(reload_interval=600)
+        assert self._lookup(directory, "bob", 0) == 2
+        get_ids.return_value = {"alice": 1}
+
+        assert self._lookup(directory, "bob", 599) == 2
+        assert self._lookup(directory, "bob", 600) == 0
 
 
 class TestActivityProcessing:
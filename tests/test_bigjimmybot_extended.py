@@ -57,14 +57,23 @@ from bigjimmybot import (
     _record_solver_activity,
     _assign_solver_to_puzzle,
     _fetch_last_sheet_activity,
+    _get_sheet_watermark,
+    _sheet_watermarks,
+    _process_activity_records,
     _update_sheet_count,
-    _check_abandoned_puzzle,
+    _check_abandoned_puzzles,
     _process_puzzle,
     _get_db_connection,
     _fetch_sheet_info,
     _sheet_failure_counts,
     _REPAIR_AFTER_FAILURES,
     _SKIP_AFTER_FAILURES,
+    PuzzleWorkerPool,
+    PollScheduler,
+    _poll_interval,
+    POLL_HOT_SECONDS,
+    POLL_WARM_SECONDS,
+    POLL_IDLE_SECONDS,
 )
 
 # Restore original sys.modules entries so the mocks don't leak.
@@ -74,14 +83,12 @@ for _name, _orig in _saved_modules.items():
     else:
         sys.modules[_name] = _orig
 
-from conftest import load_fixture
-
 
 class TestRecordSolverActivity:
     """Test _record_solver_activity function."""
 
     @patch('bigjimmybot._get_db_connection')
-    @patch('bigjimmybot.log_activity')
+    @patch('bigjimmybot.log_activity', return_value=True)
     def test_record_activity_success(self, mock_log_activity, mock_conn):
         """Test successfully recording solver activity."""
         # Test
@@ -94,7 +101,7 @@ class TestRecordSolverActivity:
         )
 
     @patch('bigjimmybot._get_db_connection')
-    @patch('bigjimmybot.log_activity')
+    @patch('bigjimmybot.log_activity', return_value=True)
     def test_record_activity_with_edit_ts(self, mock_log_activity, mock_conn):
         """Test recording activity with explicit edit timestamp."""
         result = _record_solver_activity(123, 456, "test-thread", edit_ts=1770873089)
@@ -117,6 +124,12 @@ class TestRecordSolverActivity:
         # Verify returns False on failure
         assert result is False
 
+    @patch('bigjimmybot._get_db_connection')
+    @patch('bigjimmybot.log_activity', return_value=False)
+    def test_record_activity_insert_failure(self, mock_log_activity, mock_conn):
+        """log_activity returns False (not raise) when the insert fails."""
+        assert _record_solver_activity(123, 456, "test-thread") is False
+
 
 class TestAssignSolverToPuzzle:
     """Test _assign_solver_to_puzzle function."""
@@ -147,6 +160,12 @@ class TestAssignSolverToPuzzle:
         # Verify returns False on failure
         assert result is False
 
+    @patch('bigjimmybot._get_db_connection')
+    @patch('bigjimmybot.log_activity', return_value=False)
+    def test_record_activity_insert_failure(self, mock_log_activity, mock_conn):
+        """log_activity returns False (not raise) when the insert fails."""
+        assert _record_solver_activity(123, 456, "test-thread") is False
+
 
 class TestFetchLastSheetActivity:
     """Test _fetch_last_sheet_activity function."""
@@ -216,6 +235,84 @@ class TestFetchLastSheetActivity:
         assert result is None
 
 
+class TestSheetWatermark:
+    """Per-puzzle last sheet edit: queried once, then advanced in memory."""
+
+    PUZZLE = {"id": 7, "name": "Puzzle7", "status": "New", "cursolvers": "",
+              "sheetcount": 3, "sheetenabled": 1, "drive_id": "d7"}
+
+    @pytest.fixture(autouse=True)
+    def no_watermarks(self):
+        with patch.dict(_sheet_watermarks, clear=True):
+            yield
+
+    @patch('bigjimmybot._get_db_connection')
+    @patch('bigjimmybot.get_last_sheet_activity_for_puzzle')
+    def test_queried_once(self, mock_get_activity, mock_conn):
+        mock_get_activity.return_value = {"time": dt(2026, 1, 15, 12, 0, 0)}
+
+        first = _get_sheet_watermark(self.PUZZLE, "test-thread")
+        second = _get_sheet_watermark(self.PUZZLE, "test-thread")
+
+        assert first == second == dt(2026, 1, 15, 12, 0, 0).timestamp()
+        mock_get_activity.assert_called_once()
+
+    @patch('bigjimmybot._get_db_connection')
+    @patch('bigjimmybot._fetch_sheet_info')
+    def test_poll_without_new_edits_makes_no_queries(self, mock_fetch, mock_conn):
+        _sheet_watermarks[7] = 200
+        mock_fetch.return_value = (
+            {"editors": [{"solvername": "alice", "timestamp": 150},
+                         {"solvername": "bob", "timestamp": 200}],
+             "sheetcount": 3},
+            1,
+        )
+
+        _process_puzzle(self.PUZZLE, "test-thread")
+
+        mock_conn.assert_not_called()
+
+    @patch('bigjimmybot._record_solver_activity', return_value=True)
+    @patch('bigjimmybot._get_db_connection')
+    @patch('bigjimmybot.get_solver_by_id_from_db')
+    @patch('bigjimmybot._get_solver_id', return_value=5)
+    def test_recorded_edit_advances(self, mock_solver_id, mock_get_solver, mock_conn, mock_record):
+        mock_get_solver.return_value = {"name": "alice", "puzz": "Puzzle7", "lastact": None}
+        _sheet_watermarks[7] = 100
+        records = [{"solvername": "alice", "timestamp": 300}]
+
+        _process_activity_records(records, self.PUZZLE, _get_sheet_watermark(self.PUZZLE, "t"), "t", True)
+        _process_activity_records(records, self.PUZZLE, _get_sheet_watermark(self.PUZZLE, "t"), "t", True)
+
+        assert _sheet_watermarks[7] == 300
+        mock_record.assert_called_once()
+
+    @patch('bigjimmybot._record_solver_activity', return_value=False)
+    @patch('bigjimmybot._get_db_connection')
+    @patch('bigjimmybot.get_solver_by_id_from_db')
+    @patch('bigjimmybot._get_solver_id', return_value=5)
+    def test_failed_record_is_retried(self, mock_solver_id, mock_get_solver, mock_conn, mock_record):
+        mock_get_solver.return_value = {"name": "alice", "puzz": "Puzzle7", "lastact": None}
+        _sheet_watermarks[7] = 100
+
+        _process_activity_records([{"solvername": "alice", "timestamp": 300}], self.PUZZLE, 100, "t", True)
+
+        assert _sheet_watermarks[7] == 100
+
+    @patch('bigjimmybot.log_activity', return_value=False)
+    @patch('bigjimmybot._get_db_connection')
+    @patch('bigjimmybot.get_solver_by_id_from_db')
+    @patch('bigjimmybot._get_solver_id', return_value=5)
+    def test_failed_insert_does_not_advance(self, mock_solver_id, mock_get_solver, mock_conn, mock_log):
+        mock_get_solver.return_value = {"name": "alice", "puzz": "Puzzle7", "lastact": None}
+        _sheet_watermarks[7] = 100
+
+        _process_activity_records([{"solvername": "alice", "timestamp": 300}], self.PUZZLE, 100, "t", True)
+
+        assert _sheet_watermarks[7] == 100
+        mock_log.assert_called_once()
+
+
 class TestUpdateSheetCount:
     """Test _update_sheet_count function."""
 
@@ -248,73 +345,76 @@ class TestUpdateSheetCount:
         mock_update.assert_not_called()
 
 
-class TestCheckAbandonedPuzzle:
-    """Test _check_abandoned_puzzle function."""
+class TestCheckAbandonedPuzzles:
+    """Test _check_abandoned_puzzles: candidates from the round's activity
+    map, confirmed with one query."""
 
-    @patch('bigjimmybot._get_db_connection')
-    @patch('bigjimmybot.get_last_activity_for_puzzle')
-    def test_puzzle_with_current_solvers_not_abandoned(self, mock_get_activity, mock_conn):
-        """Test that puzzles with current solvers are not marked abandoned."""
-        # Puzzle with solvers assigned
-        puzzle = {
-            "id": 123,
-            "name": "TestPuzzle",
-            "cursolvers": "Alice, Bob",
-            "status": "Being worked"
-        }
+    NOW = 1_000_000.0
 
-        _check_abandoned_puzzle(puzzle, "test-thread")
+    def _puzzle(self, pid, cursolvers="", status="Being worked"):
+        return {"id": pid, "name": f"P{pid}", "cursolvers": cursolvers, "status": status}
 
-        # Verify no database call was made for lastact
-        mock_get_activity.assert_not_called()
+    @pytest.fixture
+    def db(self):
+        with patch('bigjimmybot.configstruct', {
+            'BIGJIMMY_ABANDONED_TIMEOUT_MINUTES': '10',
+            'BIGJIMMY_ABANDONED_STATUS': 'Abandoned',
+        }), patch('bigjimmybot._get_db_connection') as mock_conn, \
+                patch('bigjimmybot.update_puzzle_field') as mock_update, \
+                patch('bigjimmybot.get_last_activity_times') as mock_times, \
+                patch('bigjimmybot.time.time', return_value=self.NOW):
+            yield mock_conn, mock_update, mock_times
 
-    @patch('bigjimmybot.configstruct', {
-        'BIGJIMMY_ABANDONED_TIMEOUT_MINUTES': '10',
-        'BIGJIMMY_ABANDONED_STATUS': 'Abandoned',
-    })
-    @patch('bigjimmybot._get_db_connection')
-    @patch('bigjimmybot.update_puzzle_field')
-    @patch('bigjimmybot.get_last_activity_for_puzzle')
-    @patch('bigjimmybot.datetime')
-    def test_puzzle_abandoned_after_timeout(
-        self, mock_datetime, mock_get_activity, mock_update, mock_conn
-    ):
-        """Test marking puzzle as abandoned after inactivity timeout."""
-        # Last activity: 15 minutes ago (should trigger abandon at 10 min threshold)
-        now = dt(2026, 2, 11, 23, 15, 0)
-        last_activity_time = dt(2026, 2, 11, 23, 0, 0)  # 15 minutes ago
+    def test_no_candidates_no_query(self, db):
+        mock_conn, mock_update, mock_times = db
+        puzzles = [
+            self._puzzle(1, cursolvers="Alice, Bob"),  # has solvers
+            self._puzzle(2),  # active 1 min ago
+            self._puzzle(3),  # no activity yet
+            self._puzzle(4, status="Needs eyes"),
+        ]
+        snapshot = {1: self.NOW - 3600, 2: self.NOW - 60, 4: self.NOW - 3600}
 
-        # Mock datetime.datetime.utcnow() to return our current time
-        mock_datetime.datetime.utcnow.return_value = now
+        _check_abandoned_puzzles(puzzles, snapshot)
 
-        # Mock database returning activity with datetime object
-        mock_get_activity.return_value = {
-            "time": last_activity_time,
-            "type": "revise",
-        }
+        mock_times.assert_not_called()
+        mock_update.assert_not_called()
 
-        # Puzzle with no current solvers
-        puzzle = {
-            "id": 123,
-            "name": "TestPuzzle",
-            "cursolvers": "",  # No solvers assigned
-            "status": "Being worked"
-        }
+    def test_puzzle_abandoned_after_timeout(self, db):
+        mock_conn, mock_update, mock_times = db
+        mock_times.return_value = {123: self.NOW - 900}  # 15 minutes ago
 
-        _check_abandoned_puzzle(puzzle, "test-thread")
+        _check_abandoned_puzzles([self._puzzle(123)], {123: self.NOW - 900})
 
-        # Verify lastact was fetched
-        mock_get_activity.assert_called_once()
-        # Verify status update was attempted
         mock_update.assert_called_once_with(
             123, "status", "Abandoned", mock_conn.return_value, source="bigjimmybot"
         )
 
+    def test_candidates_confirmed_in_one_query(self, db):
+        mock_conn, mock_update, mock_times = db
+        puzzles = [self._puzzle(pid) for pid in (1, 2, 3)]
+        snapshot = {pid: self.NOW - 3600 for pid in (1, 2, 3)}
+        # 2 was edited after the round's map was read
+        mock_times.return_value = {1: self.NOW - 3600, 2: self.NOW - 30, 3: self.NOW - 3600}
+
+        _check_abandoned_puzzles(puzzles, snapshot)
+
+        mock_times.assert_called_once_with(mock_conn.return_value, [1, 2, 3])
+        assert [c.args[0] for c in mock_update.call_args_list] == [1, 3]
+
+    def test_query_failure_marks_nothing(self, db):
+        mock_conn, mock_update, mock_times = db
+        mock_times.side_effect = Exception("gone away")
+
+        _check_abandoned_puzzles([self._puzzle(1)], {1: self.NOW - 3600})
+
+        mock_update.assert_not_called()
+
 
 class TestPuzzleProcessing:
     """Test _process_puzzle function."""
 
-    @patch('bigjimmybot._check_abandoned_puzzle')
+    @patch('bigjimmybot._check_abandoned_puzzles')
     @patch('bigjimmybot._process_sheet_activity')
     @patch('bigjimmybot._update_sheet_count')
     @patch('bigjimmybot._fetch_sheet_info')
@@ -329,15 +429,28 @@ class TestPuzzleProcessing:
         puzzle = {"id": 123, "name": "TestPuzzle", "sheetlink": "http://example.com"}
 
         # Process puzzle
-        _process_puzzle(puzzle, "test-thread")
+        assert _process_puzzle(puzzle, "test-thread") is True
 
         # Verify all subfunctions were called
         mock_fetch.assert_called_once_with(puzzle, "test-thread")
         mock_update.assert_called_once()
         mock_activity.assert_called_once()
-        mock_abandoned.assert_called_once_with(puzzle, "test-thread")
+        # The abandoned check runs once per round in the main loop, not per poll
+        mock_abandoned.assert_not_called()
 
-    @patch('bigjimmybot._check_abandoned_puzzle')
+    @pytest.mark.parametrize("sheet_info, ok", [
+        ({"editors": [], "sheetcount": None, "error": True}, False),
+        ({"editors": [], "sheetcount": None, "error": True, "skipped": True}, True),
+    ])
+    @patch('bigjimmybot._process_sheet_activity')
+    @patch('bigjimmybot._update_sheet_count')
+    @patch('bigjimmybot._fetch_sheet_info')
+    def test_failed_read_reported(self, mock_fetch, mock_update, mock_activity, sheet_info, ok):
+        """A failed sheet read is reported for retry; a cooldown skip is not."""
+        mock_fetch.return_value = (sheet_info, 1)
+        assert _process_puzzle({"id": 1, "name": "p1"}, "test-thread") is ok
+
+    @patch('bigjimmybot._check_abandoned_puzzles')
     @patch('bigjimmybot._process_sheet_activity')
     @patch('bigjimmybot._update_sheet_count')
     @patch('bigjimmybot._fetch_sheet_info')
@@ -598,3 +711,213 @@ class TestFetchSheetInfoProbe:
         # Error on hidden sheet probe should fall back to legacy
         assert sheetenabled == 0
         mock_get_legacy.assert_called_once()
+
+
+class TestPuzzleWorkerPool:
+    """Persistent workers: blocking idle, unbounded queue, per-run completion."""
+
+    def _pool(self, process=None):
+        seen = []
+        lock = threading.Lock()
+
+        def record(puzzle, threadname):
+            with lock:
+                seen.append(puzzle["id"])
+
+        return PuzzleWorkerPool(process or record), seen
+
+    def test_more_than_300_puzzles(self):
+        pool, seen = self._pool()
+        pool.resize(4)
+        pool.run([{"id": i, "name": f"p{i}"} for i in range(1200)])
+        assert sorted(seen) == list(range(1200))
+
+    def test_workers_persist_across_runs(self):
+        pool, seen = self._pool()
+        pool.resize(3)
+        before = set(threading.enumerate())
+        for n in range(3):
+            pool.run([{"id": n, "name": "p"}])
+        assert set(threading.enumerate()) == before
+        assert seen == [0, 1, 2]
+
+    def test_empty_run_returns_immediately(self):
+        pool, _ = self._pool()
+        pool.resize(1)
+        pool.run([])
+
+    def test_failed_puzzle_still_completes_run(self):
+        def process(puzzle, threadname):
+            raise RuntimeError("sheet gone")
+
+        pool, _ = self._pool(process)
+        pool.resize(2)
+        failed = pool.run([{"id": 1, "name": "p1"}, {"id": 2, "name": "p2"}])
+        assert sorted(p["id"] for p in failed) == [1, 2]
+
+    def test_run_returns_failed_polls(self):
+        pool, _ = self._pool(lambda puzzle, threadname: puzzle["id"] != 2)
+        pool.resize(2)
+        failed = pool.run([{"id": i, "name": f"p{i}"} for i in range(1, 4)])
+        assert [p["id"] for p in failed] == [2]
+
+    def test_idle_workers_do_not_spin(self):
+        pool, _ = self._pool()
+        pool.resize(4)
+        start = time.process_time()
+        time.sleep(0.3)
+        assert time.process_time() - start < 0.05
+
+    def test_resize_retires_and_grows(self):
+        pool, seen = self._pool()
+        pool.resize(4)
+        pool.resize(2)
+        assert pool.size() == 2
+        pool.resize(3)
+        assert pool.size() == 3
+        pool.run([{"id": i, "name": "p"} for i in range(20)])
+        assert sorted(seen) == list(range(20))
+
+
+class TestPollScheduler:
+    """Adaptive polling: hot puzzles first, within budget, bounded staleness."""
+
+    NOW = 1_000_000.0
+    MAX = 900
+
+    def _puzzle(self, pid, status="New", cursolvers=None, sheetenabled=1):
+        return {"id": pid, "name": f"p{pid}", "status": status,
+                "cursolvers": cursolvers, "sheetenabled": sheetenabled}
+
+    @pytest.mark.parametrize("puzzle, last_activity, interval", [
+        ({"status": "New", "cursolvers": "alice"}, None, POLL_HOT_SECONDS),
+        ({"status": "Abandoned"}, NOW - 60, POLL_HOT_SECONDS),
+        ({"status": "Being worked"}, None, POLL_WARM_SECONDS),
+        ({"status": "New"}, NOW - 1800, POLL_WARM_SECONDS),
+        ({"status": "New"}, None, POLL_IDLE_SECONDS),
+        ({"status": "Abandoned"}, NOW - 7200, MAX),
+        ({"status": "Speculative"}, None, MAX),
+    ])
+    def test_interval_follows_activity(self, puzzle, last_activity, interval):
+        assert _poll_interval(puzzle, last_activity, self.NOW, self.MAX) == interval
+
+    def test_hot_puzzles_spend_budget_first(self):
+        scheduler = PollScheduler()
+        puzzles = [self._puzzle(i) for i in range(1, 300)] + [
+            self._puzzle(500, "Critical", cursolvers="alice"),
+        ]
+        selected = scheduler.select(puzzles, {}, self.NOW, 13, self.MAX)
+        assert len(selected) == 13
+        assert selected[0]["id"] == 500
+
+    def test_hot_puzzle_repolled_before_cold_ones_come_due(self):
+        scheduler = PollScheduler()
+        hot = self._puzzle(1, cursolvers="alice")
+        cold = self._puzzle(2, "Abandoned")
+        scheduler.select([hot, cold], {}, self.NOW, 10, self.MAX)
+
+        later = self.NOW + POLL_HOT_SECONDS
+        assert scheduler.select([hot, cold], {}, later, 10, self.MAX) == [hot]
+
+    def test_staleness_bound_beats_hot_load(self):
+        scheduler = PollScheduler()
+        cold = self._puzzle(1, "Abandoned")
+        hot = [self._puzzle(i, cursolvers="x") for i in range(2, 40)]
+        scheduler.select([cold], {}, self.NOW, 1, self.MAX)
+        scheduler.select(hot, {}, self.NOW + self.MAX - POLL_HOT_SECONDS, 100, self.MAX)
+
+        later = self.NOW + self.MAX
+        selected = scheduler.select([cold] + hot, {}, later, 1, self.MAX)
+        assert selected == [cold]
+
+    def test_legacy_sheets_cost_two_calls(self):
+        scheduler = PollScheduler()
+        puzzles = [self._puzzle(i, sheetenabled=0) for i in range(1, 10)]
+        assert len(scheduler.select(puzzles, {}, self.NOW, 6, self.MAX)) == 3
+
+    def test_always_polls_one_when_due(self):
+        scheduler = PollScheduler()
+        selected = scheduler.select([self._puzzle(1, sheetenabled=0)], {}, self.NOW, 1, self.MAX)
+        assert len(selected) == 1
+
+    def test_active_puzzle_polled_every_interval_under_load(self):
+        # 300 open puzzles, 55 QPM, 15s rounds: round-robin visits each
+        # puzzle every ~5.5 min; the scheduler keeps the hot one within
+        # about a round of its interval and still gets to every other one.
+        scheduler = PollScheduler()
+        puzzles = [self._puzzle(i) for i in range(1, 300)]
+        hot = self._puzzle(300, "Being worked", cursolvers="alice")
+        polls = []
+        for n in range(40):  # ten minutes
+            now = self.NOW + 15 * n
+            selected = scheduler.select(puzzles + [hot], {}, now, 13, self.MAX)
+            if hot in selected:
+                polls.append(now)
+        gaps = [b - a for a, b in zip(polls, polls[1:])]
+        assert polls[0] == self.NOW
+        assert max(gaps) <= POLL_HOT_SECONDS + 15
+        assert scheduler.oldest_poll_age(now) <= self.MAX
+
+    def test_only_changed_sheets_polled_when_changes_known(self):
+        scheduler = PollScheduler()
+        puzzles = [dict(self._puzzle(i), drive_id=f"s{i}") for i in range(1, 20)]
+        hot = dict(self._puzzle(20, cursolvers="alice"), drive_id="s20")
+        selected = scheduler.select(puzzles + [hot], {}, self.NOW, 100, self.MAX,
+                                    changed={"s3", "s7", "not-a-puzzle"})
+        assert sorted(p["id"] for p in selected) == [3, 7]
+
+        later = self.NOW + POLL_HOT_SECONDS
+        assert scheduler.select(puzzles + [hot], {}, later, 100, self.MAX, changed=set()) == []
+
+    def test_staleness_bound_holds_while_feed_is_healthy(self):
+        scheduler = PollScheduler()
+        puzzles = [dict(self._puzzle(i), drive_id=f"s{i}") for i in range(1, 5)]
+        scheduler.select(puzzles, {}, self.NOW, 100, self.MAX, changed=None)
+
+        quiet = scheduler.select(puzzles, {}, self.NOW + self.MAX - 15, 100, self.MAX, changed=set())
+        stale = scheduler.select(puzzles, {}, self.NOW + self.MAX, 100, self.MAX, changed=set())
+        assert quiet == []
+        assert stale == puzzles
+        assert scheduler.oldest_poll_age(self.NOW + self.MAX) == 0
+
+    def test_changed_sheets_go_before_stale_ones(self):
+        scheduler = PollScheduler()
+        puzzles = [dict(self._puzzle(i), drive_id=f"s{i}") for i in range(1, 5)]
+        scheduler.select(puzzles, {}, self.NOW, 100, self.MAX, changed=None)
+
+        selected = scheduler.select(puzzles, {}, self.NOW + self.MAX, 1, self.MAX, changed={"s3"})
+        assert [p["id"] for p in selected] == [3]
+
+    def test_failed_poll_keeps_change(self):
+        scheduler = PollScheduler()
+        puzzles = [dict(self._puzzle(i), drive_id=f"s{i}") for i in range(1, 4)]
+        first = scheduler.select(puzzles, {}, self.NOW, 100, self.MAX, changed={"s1", "s2"})
+        scheduler.poll_failed([p for p in first if p["id"] == 1])
+
+        retried = scheduler.select(puzzles, {}, self.NOW + 15, 100, self.MAX, changed=set())
+        assert [p["id"] for p in retried] == [1]
+        assert scheduler.select(puzzles, {}, self.NOW + 30, 100, self.MAX, changed=set()) == []
+
+    def test_failed_stale_poll_is_not_turned_into_a_change(self):
+        scheduler = PollScheduler()
+        puzzle = dict(self._puzzle(1), drive_id="s1")
+        scheduler.select([puzzle], {}, self.NOW, 100, self.MAX, changed=None)
+        stale = scheduler.select([puzzle], {}, self.NOW + self.MAX, 100, self.MAX, changed=set())
+        scheduler.poll_failed(stale)
+
+        assert scheduler.select([puzzle], {}, self.NOW + self.MAX + 15, 100, self.MAX, changed=set()) == []
+
+    def test_changes_over_budget_carry_over(self):
+        scheduler = PollScheduler()
+        puzzles = [dict(self._puzzle(i), drive_id=f"s{i}") for i in range(1, 11)]
+        changed = {f"s{i}" for i in range(1, 11)}
+        first = scheduler.select(puzzles, {}, self.NOW, 4, self.MAX, changed=changed)
+        second = scheduler.select(puzzles, {}, self.NOW + 15, 4, self.MAX, changed=set())
+        third = scheduler.select(puzzles, {}, self.NOW + 30, 4, self.MAX, changed=set())
+        assert (len(first), len(second), len(third)) == (4, 4, 2)
+        assert {p["id"] for p in first + second + third} == set(range(1, 11))
+
+    def test_unknown_changes_fall_back_to_intervals(self):
+        scheduler = PollScheduler()
+        puzzles = [dict(self._puzzle(i), drive_id=f"s{i}") for i in range(1, 5)]
+        assert len(scheduler.select(puzzles, {}, self.NOW, 100, self.MAX, changed=None)) == 4
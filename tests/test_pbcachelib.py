@@ -17,8 +17,10 @@ the integration tests in scripts/test_api_coverage.py against the Docker
 Redis container.
 """
 
+import gzip
 import json
-from unittest.mock import MagicMock, patch
+import time
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 
@@ -27,16 +29,18 @@ import pbcachelib
 
 @pytest.fixture
 def mock_rc():
-    """Patch pbcachelib.rc with a fresh MagicMock for the duration of a test."""
+    """Patch pbcachelib.rc with a fresh MagicMock for the duration of a test.
+    The bytes client (rcb) is the same mock, so call order across the two is
+    observable."""
     client = MagicMock()
-    with patch.object(pbcachelib, "rc", client):
+    with patch.object(pbcachelib, "rc", client), patch.object(pbcachelib, "rcb", client):
         yield client
 
 
 @pytest.fixture
 def no_rc():
-    """Patch pbcachelib.rc to None (caching disabled / Redis unreachable)."""
-    with patch.object(pbcachelib, "rc", None):
+    """Patch both Redis clients to None (caching disabled / Redis unreachable)."""
+    with patch.object(pbcachelib, "rc", None), patch.object(pbcachelib, "rcb", None):
         yield
 
 
@@ -86,10 +90,11 @@ class TestEnsureCacheInitialized:
 
         with patch.object(pbcachelib, "rc", None), patch(
             "pbcachelib.init_cache", side_effect=fake_init
-        ):
+        ), patch.object(pbcachelib, "config_watcher") as watcher:
             try:
                 pbcachelib.ensure_cache_initialized(conn)
                 assert pbcachelib._cache_initialized is True
+                watcher.start.assert_called_once_with()
             finally:
                 pbcachelib.rc = None
                 self._reset()
@@ -184,9 +189,13 @@ class TestFailsafeOnException:
         pbcachelib.lastact_delete(1)
 
     def test_lastact_set_many_swallows(self, mock_rc):
-        mock_rc.hset.side_effect = RuntimeError("boom")
+        mock_rc.eval.side_effect = RuntimeError("boom")
         pbcachelib.lastact_set_many({1: {"type": "create"}})
 
+    def test_all_snapshot_get_swallows(self, mock_rc):
+        mock_rc.pipeline.return_value.execute.side_effect = RuntimeError("boom")
+        assert pbcachelib.all_snapshot_get() == (None, None, False, None)
+
     def test_lock_acquire_failopen_on_exception(self, mock_rc):
         mock_rc.set.side_effect = RuntimeError("boom")
         assert pbcachelib.try_acquire_rebuild_lock() is True
@@ -220,6 +229,7 @@ class TestCacheBlobOps:
 
 class TestLastactHash:
     def test_set_encodes_json_with_string_int_key(self, mock_rc):
+        # A partial row doesn't fit the compact layout and is stored as JSON.
         row = {"id": 9, "puzzle_id": 42, "type": "revise", "time": "2026-01-01T00:00:00"}
         pbcachelib.lastact_set(42, row)
         mock_rc.hset.assert_called_once()
@@ -228,6 +238,12 @@ class TestLastactHash:
         assert args[1] == "42"  # field is str(int(pid))
         assert json.loads(args[2]) == row  # value is JSON
 
+    def test_set_packs_full_row(self, mock_rc):
+        pbcachelib.lastact_set(42, ACTIVITY_ROW)
+        value = mock_rc.hset.call_args[0][2]
+        assert len(value) == pbcachelib.LASTACT_RECORD.size
+        assert pbcachelib.decode_lastact_many({b"42": value}) == {42: ACTIVITY_ROW}
+
     def test_set_coerces_string_pid(self, mock_rc):
         # Integer-ID convention: a string pid is normalized to str(int(pid)).
         pbcachelib.lastact_set("042", {"type": "create"})
@@ -285,21 +301,624 @@ class TestLastactHash:
         mock_rc.hget.return_value = None
         assert pbcachelib.lastact_get(42) is None
 
+    def test_get_many_is_single_hmget(self, mock_rc):
+        mock_rc.hmget.return_value = [json.dumps({"id": 9}), None, "}{ not json"]
+        result = pbcachelib.lastact_get_many([42, "7", 3])
+        mock_rc.hmget.assert_called_once_with(pbcachelib.LASTACT_KEY, ["42", "7", "3"])
+        # Missing and corrupt entries map to None for a per-puzzle fallback.
+        assert result == {42: {"id": 9}, 7: None, 3: None}
+
+    def test_get_many_empty_skips_redis(self, mock_rc):
+        assert pbcachelib.lastact_get_many([]) == {}
+        mock_rc.hmget.assert_not_called()
+
     def test_delete_passes_string_field(self, mock_rc):
         pbcachelib.lastact_delete(42)
         mock_rc.hdel.assert_called_once_with(pbcachelib.LASTACT_KEY, "42")
 
-    def test_set_many_builds_mapping(self, mock_rc):
+    def test_set_many_fills_only_missing_fields(self, mock_rc):
+        # The backfill may come from a lagging replica: HSETNX keeps any
+        # write-through that landed first.
         rows = {1: {"type": "create"}, 2: {"type": "revise"}}
         pbcachelib.lastact_set_many(rows)
-        _, kwargs = mock_rc.hset.call_args
-        mapping = kwargs["mapping"]
+        mock_rc.hset.assert_not_called()
+        script, numkeys, key, *args = mock_rc.eval.call_args[0]
+        assert "HSETNX" in script
+        assert (numkeys, key) == (1, pbcachelib.LASTACT_KEY)
+        mapping = dict(zip(args[::2], args[1::2]))
         assert set(mapping) == {"1", "2"}
         assert json.loads(mapping["1"]) == {"type": "create"}
 
     def test_set_many_empty_is_noop(self, mock_rc):
         pbcachelib.lastact_set_many({})
-        mock_rc.hset.assert_not_called()
+        mock_rc.eval.assert_not_called()
+
+
+ACTIVITY_ROW = {
+    "id": 40213,
+    "time": "2026-01-17T13:45:07",
+    "solver_id": 118,
+    "puzzle_id": 42,
+    "source": "bigjimmybot",
+    "type": "revise",
+    "uri": None,
+    "source_version": None,
+}
+
+
+class TestLastactCodec:
+    def test_roundtrip_preserves_every_column(self):
+        value = pbcachelib.encode_lastact(42, ACTIVITY_ROW)
+        assert value[0] == pbcachelib.LASTACT_FORMAT
+        decoded = pbcachelib.decode_lastact_many({b"42": value})[42]
+        assert decoded == ACTIVITY_ROW
+        assert list(decoded) == list(ACTIVITY_ROW)  # activity column order
+
+    def test_null_enums_roundtrip(self):
+        row = dict(ACTIVITY_ROW, source=None, type=None)
+        value = pbcachelib.encode_lastact(42, row)
+        assert len(value) == pbcachelib.LASTACT_RECORD.size
+        assert pbcachelib.decode_lastact_many({"42": value}) == {42: row}
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            {"uri": "https://docs.google.com/x"},
+            {"source_version": 3},
+            {"type": "teleport"},
+            {"time": "2026-01-17T13:45:07.250000"},
+            {"puzzle_id": 7},
+        ],
+    )
+    def test_rows_outside_the_layout_fall_back_to_json(self, change):
+        row = dict(ACTIVITY_ROW, **change)
+        value = pbcachelib.encode_lastact(42, row)
+        assert json.loads(value) == row
+        assert pbcachelib.decode_lastact_many({b"42": value}) == {42: row}
+
+    def test_decodes_mixed_compact_and_legacy_json(self):
+        other = dict(ACTIVITY_ROW, id=7, puzzle_id=3, type="solve", source="puzzleboss")
+        raw = {
+            b"42": pbcachelib.encode_lastact(42, ACTIVITY_ROW),
+            b"3": pbcachelib.encode_lastact(3, other),
+            b"9": json.dumps({"id": 1, "type": "create"}).encode(),
+        }
+        assert pbcachelib.decode_lastact_many(raw) == {
+            42: ACTIVITY_ROW,
+            3: other,
+            9: {"id": 1, "type": "create"},
+        }
+
+    def test_corrupt_record_is_skipped(self):
+        bad = bytearray(pbcachelib.encode_lastact(42, ACTIVITY_ROW))
+        bad[-1] = 200  # source code out of range
+        raw = {b"42": bytes(bad), b"3": pbcachelib.encode_lastact(3, dict(ACTIVITY_ROW, puzzle_id=3))}
+        assert set(pbcachelib.decode_lastact_many(raw)) == {3}
+
+
+# ── /all blob versioning (ETag) ───────────────────────────────────────────
+
+
+class FakeRedis:
+    """Just enough of a dict-backed Redis to exercise the fragment store
+    end to end (TTLs are recorded, not enforced)."""
+
+    def __init__(self):
+        self.data, self.ttl = {}, {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, px=None, nx=False, xx=False):
+        if (nx and key in self.data) or (xx and key not in self.data):
+            return None
+        self.data[key] = value
+        self.ttl[key] = px if px is not None else ex * 1000 if ex else -1
+        return True
+
+    def mget(self, *keys):
+        if len(keys) == 1 and isinstance(keys[0], list):
+            keys = keys[0]
+        return [self.data.get(k) for k in keys]
+
+    def delete(self, *keys):
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+    def expire(self, key, seconds):
+        self.ttl[key] = seconds * 1000
+        return key in self.data
+
+    def pttl(self, key):
+        return self.ttl.get(key, -1) if key in self.data else -2
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        self.data.setdefault(key, {}).update(mapping or {field: value})
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def hincrby(self, key, field, amount=1):
+        fields = self.data.setdefault(key, {})
+        fields[field] = str(int(fields.get(field, 0)) + amount)
+        return int(fields[field])
+
+    def hdel(self, key, *fields):
+        removed = sum(self.data.get(key, {}).pop(f, None) is not None for f in fields)
+        if key in self.data and not self.data[key]:
+            del self.data[key]
+        return removed
+
+    def hlen(self, key):
+        return len(self.data.get(key, {}))
+
+    def eval(self, script, numkeys, *args):
+        # Only the dirty-marker release script runs against this fake.
+        assert script is pbcachelib._DIRTY_RELEASE_SCRIPT
+        (dirty_key, fresh_key), argv = args[:numkeys], args[numkeys:]
+        for marker, generation in zip(argv[::2], argv[1::2]):
+            if self.hget(dirty_key, marker) == generation:
+                self.hdel(dirty_key, marker)
+        left = self.hlen(dirty_key)
+        if left:
+            self.delete(fresh_key)
+        return left
+
+    def pipeline(self, transaction=True):
+        fake = self
+
+        class Pipe:
+            def __init__(self):
+                self.calls = []
+
+            def __getattr__(self, name):
+                return lambda *a, **kw: self.calls.append((name, a, kw))
+
+            def execute(self):
+                return [getattr(fake, n)(*a, **kw) for n, a, kw in self.calls]
+
+        return Pipe()
+
+
+def _round(rid, *pids, name=None):
+    return {
+        "id": rid,
+        "name": name or f"Round{rid}",
+        "puzzles": [{"id": pid, "name": f"P{pid}", "round_id": rid} for pid in pids],
+    }
+
+
+class TestFragments:
+    @pytest.fixture
+    def fake(self):
+        fake = FakeRedis()
+        with patch.object(pbcachelib, "rc", fake):
+            yield fake
+
+    def _store(self, *rounds, hints=()):
+        data = {"rounds": list(rounds), "hints": list(hints)}
+        return data, pbcachelib.all_fragments_set(data, ttl=15, hard_ttl=300)
+
+    def test_roundtrip_matches_json_dumps(self, fake):
+        data, version = self._store(_round(1, 10, 11), _round(2, 20), hints=[{"id": 5}])
+        blob, got_version, fresh = pbcachelib.all_blob_get()
+        assert blob == json.dumps(data)
+        assert (got_version, fresh) == (version, True)
+
+    def test_snapshot_reads_blob_and_lastact_together(self, fake):
+        data, version = self._store(_round(1, 42), hints=[])
+        fake.hset(pbcachelib.LASTACT_KEY, "42", pbcachelib.encode_lastact(42, ACTIVITY_ROW))
+        with patch.object(pbcachelib, "rcb", fake):
+            pipeline = MagicMock(wraps=fake.pipeline)
+            with patch.object(fake, "pipeline", pipeline):
+                blob, got_version, fresh, lastact = pbcachelib.all_snapshot_get()
+        assert blob == json.dumps(data)
+        assert (got_version, fresh) == (version, True)
+        assert lastact == {42: ACTIVITY_ROW}
+        pipeline.assert_called_once()  # one round trip before the fragments
+
+    def test_snapshot_miss_still_returns_lastact(self, fake):
+        fake.hset(pbcachelib.LASTACT_KEY, "42", pbcachelib.encode_lastact(42, ACTIVITY_ROW))
+        with patch.object(pbcachelib, "rcb", fake):
+            assert pbcachelib.all_snapshot_get() == (None, None, False, {42: ACTIVITY_ROW})
+
+    def test_snapshot_disabled(self, no_rc):
+        assert pbcachelib.all_snapshot_get() == (None, None, False, None)
+
+    def test_one_fragment_per_round(self, fake):
+        self._store(_round(1, 10), _round(2, 20))
+        assert json.loads(fake.get(pbcachelib.ROUND_KEY_PREFIX + "2")) == _round(2, 20)
+        index = json.loads(fake.get(pbcachelib.INDEX_KEY))
+        assert index == {"rounds": [1, 2], "puzzles": {"10": 1, "20": 2}}
+
+    def test_fragments_outlive_freshness(self, fake):
+        # Fragments stay servable (hard TTL) after the soft TTL marks them stale.
+        self._store(_round(1, 10))
+        assert fake.pttl(pbcachelib.ROUND_KEY_PREFIX + "1") == 300_000
+        assert fake.pttl(pbcachelib.BLOB_VERSION_KEY) == 300_000
+        assert fake.pttl(pbcachelib.FRESH_KEY) == 15_000
+
+    def test_replica_read_is_recorded_and_fresh_for_less(self, fake):
+        with patch("pbcachelib.time.time", return_value=1000.0):
+            pbcachelib.all_fragments_set({"rounds": [_round(1, 10)], "hints": []},
+                                         ttl=15, hard_ttl=300, lag=4)
+            assert pbcachelib.all_as_of_get() == 996.0
+        assert fake.pttl(pbcachelib.FRESH_KEY) == 11_000
+        assert fake.pttl(pbcachelib.FULL_KEY) == 11_000
+
+    def test_update_is_as_of_now(self, fake):
+        with patch("pbcachelib.time.time", return_value=1000.0):
+            pbcachelib.all_fragments_set({"rounds": [_round(1, 10)], "hints": []}, lag=4)
+        with patch("pbcachelib.time.time", return_value=1002.0):
+            pbcachelib.all_fragments_update({1: _round(1, 10, 11)})
+        assert pbcachelib.all_as_of_get() == 1002.0
+
+    def test_as_of_missing(self, fake):
+        assert pbcachelib.all_as_of_get() is None
+
+    def test_version_is_content_hash(self, fake):
+        # Identical content (e.g. a TTL rebuild with no changes) keeps the
+        # same ETag; different content gets a new one.
+        _, a = self._store(_round(1, 10))
+        _, b = self._store(_round(1, 10))
+        _, c = self._store(_round(1, 10, 11))
+        assert a == b
+        assert a != c
+
+    def test_missing_fragment_is_a_miss(self, fake):
+        self._store(_round(1, 10), _round(2, 20))
+        fake.delete(pbcachelib.ROUND_KEY_PREFIX + "2")
+        assert pbcachelib.all_blob_get() == (None, None, False)
+
+    def test_update_rebuilds_only_given_rounds(self, fake):
+        self._store(_round(1, 10), _round(2, 20, name="Old"))
+        blob, version = pbcachelib.all_fragments_update({2: _round(2, 20, name="New")})
+        assert json.loads(blob)["rounds"] == [_round(1, 10), _round(2, 20, name="New")]
+        assert pbcachelib.all_blob_get() == (blob, version, True)
+
+    def test_update_matches_full_rebuild(self, fake):
+        # A puzzle moving from round 1 to 2 rebuilds both; the result must be
+        # byte-identical (same ETag) to a full rebuild of the new state.
+        self._store(_round(1, 10, 11), _round(2, 20))
+        blob, version = pbcachelib.all_fragments_update(
+            {1: _round(1, 10), 2: _round(2, 11, 20)}
+        )
+        data, full_version = self._store(_round(1, 10), _round(2, 11, 20))
+        assert blob == json.dumps(data)
+        assert version == full_version
+
+    def test_update_adds_and_drops_rounds(self, fake):
+        self._store(_round(1, 10), _round(3, 30))
+        blob, _ = pbcachelib.all_fragments_update({2: _round(2), 3: None})
+        assert [r["id"] for r in json.loads(blob)["rounds"]] == [1, 2]
+        index = json.loads(fake.get(pbcachelib.INDEX_KEY))
+        assert index["puzzles"] == {"10": 1}
+
+    def test_update_replaces_hints(self, fake):
+        self._store(_round(1, 10), hints=[{"id": 1}])
+        blob, _ = pbcachelib.all_fragments_update({}, hints=[{"id": 2}])
+        assert json.loads(blob)["hints"] == [{"id": 2}]
+
+    def test_update_freshness_capped_at_full_rebuild_ttl(self, fake):
+        # Non-structural edits only reach the blob via full rebuilds, so a
+        # targeted rebuild must not extend freshness past the last full one.
+        self._store(_round(1, 10))
+        fake.ttl[pbcachelib.FULL_KEY] = 4_000
+        pbcachelib.all_fragments_update({1: _round(1, 10, 11)})
+        assert fake.pttl(pbcachelib.FRESH_KEY) == 4_000
+
+    def test_update_needs_a_full_rebuild_to_build_on(self, fake):
+        assert pbcachelib.all_fragments_update({1: _round(1)}) == (None, None)
+        self._store(_round(1, 10))
+        fake.delete(pbcachelib.FULL_KEY)
+        assert pbcachelib.all_fragments_update({1: _round(1)}) == (None, None)
+
+    def test_dirty_markers_drive_rebuild_scope(self, fake):
+        self._store(_round(1, 10), _round(2, 20))
+        pbcachelib.mark_all_dirty(puzzles=[20], rounds=["1"], hints=True)
+        full, dirty, puzzle_rounds = pbcachelib.all_dirty_get()
+        assert full is False
+        assert set(dirty) == {"puzzle:20", "round:1", "hints"}
+        assert puzzle_rounds == {10: 1, 20: 2}
+        assert pbcachelib.all_blob_get()[2] is False  # marked stale
+
+    def test_unscoped_invalidation_is_full(self, fake):
+        self._store(_round(1, 10))
+        pbcachelib.mark_all_dirty()
+        assert pbcachelib.all_dirty_get()[0] is True
+
+    def test_expired_full_rebuild_forces_full(self, fake):
+        self._store(_round(1, 10))
+        fake.delete(pbcachelib.FULL_KEY)
+        assert pbcachelib.all_dirty_get()[0] is True
+
+    def test_rebuild_clears_only_markers_it_covered(self, fake):
+        self._store(_round(1, 10), _round(2, 20))
+        pbcachelib.mark_all_dirty(rounds=[1])
+        _, dirty, _ = pbcachelib.all_dirty_get()
+        pbcachelib.mark_all_dirty(rounds=[2])  # lands mid-rebuild
+        pbcachelib.all_fragments_update({1: _round(1, 10)}, processed=dirty)
+        assert set(fake.hgetall(pbcachelib.DIRTY_KEY)) == {"round:2"}
+        # Still stale: round 2's change isn't in the blob yet.
+        assert pbcachelib.all_blob_get()[2] is False
+
+    def test_marker_re_added_mid_rebuild_stays_dirty(self, fake):
+        # The rebuild may have read round 1 before this second change to it
+        # committed, so its marker must survive the rebuild.
+        self._store(_round(1, 10), _round(2, 20))
+        pbcachelib.mark_all_dirty(rounds=[1], puzzles=[20])
+        _, dirty, _ = pbcachelib.all_dirty_get()
+        pbcachelib.mark_all_dirty(rounds=[1])  # lands mid-rebuild
+        pbcachelib.all_fragments_update({1: _round(1, 10), 2: _round(2, 20)}, processed=dirty)
+        assert set(fake.hgetall(pbcachelib.DIRTY_KEY)) == {"round:1"}
+        assert pbcachelib.all_blob_get()[2] is False
+        # The next rebuild covers it and the blob goes fresh.
+        _, dirty, _ = pbcachelib.all_dirty_get()
+        pbcachelib.all_fragments_update({1: _round(1, 10)}, processed=dirty)
+        assert fake.hgetall(pbcachelib.DIRTY_KEY) == {}
+        assert pbcachelib.all_blob_get()[2] is True
+
+    def test_full_rebuild_keeps_markers_re_added_mid_rebuild(self, fake):
+        pbcachelib.mark_all_dirty()
+        _, dirty, _ = pbcachelib.all_dirty_get()
+        pbcachelib.mark_all_dirty()  # lands mid-rebuild
+        pbcachelib.all_fragments_set({"rounds": [_round(1, 10)], "hints": []}, processed=dirty)
+        assert set(fake.hgetall(pbcachelib.DIRTY_KEY)) == {"*"}
+        assert pbcachelib.all_blob_get()[2] is False
+
+    def test_failsafe(self, mock_rc):
+        mock_rc.mget.side_effect = RuntimeError("down")
+        mock_rc.pipeline.side_effect = RuntimeError("down")
+        assert pbcachelib.all_blob_get() == (None, None, False)
+        assert pbcachelib.all_fragments_set({"rounds": [], "hints": []}) is None
+        assert pbcachelib.all_fragments_update({}) == (None, None)
+        assert pbcachelib.all_dirty_get() == (True, {}, {})
+        pbcachelib.mark_all_dirty(rounds=[1])  # no raise
+
+    def test_disabled(self, no_rc):
+        assert pbcachelib.all_blob_get() == (None, None, False)
+        assert pbcachelib.all_fragments_set({"rounds": [], "hints": []}) is None
+        assert pbcachelib.all_fragments_update({}) == (None, None)
+        assert pbcachelib.all_dirty_get() == (True, {}, {})
+
+
+class TestBlobVersions:
+    def test_versions_never_fetch_blob(self, mock_rc):
+        # The 304 path must not pull the multi-hundred-KB blob out of Redis.
+        mock_rc.mget.return_value = ["v1", "7", "1"]
+        assert pbcachelib.all_versions() == ("v1", "7", True)
+        mock_rc.mget.assert_called_once_with(
+            pbcachelib.BLOB_VERSION_KEY,
+            pbcachelib.LASTACT_VERSION_KEY,
+            pbcachelib.FRESH_KEY,
+        )
+
+    def test_versions_default_lastact_zero(self, mock_rc):
+        mock_rc.mget.return_value = ["v1", None, None]
+        assert pbcachelib.all_versions() == ("v1", "0", False)
+
+    def test_versions_blob_missing(self, mock_rc):
+        # No blob version → caller must rebuild, never answer 304.
+        mock_rc.mget.return_value = [None, "7", None]
+        assert pbcachelib.all_versions()[0] is None
+
+    def test_failsafe(self, mock_rc):
+        mock_rc.mget.side_effect = RuntimeError("down")
+        assert pbcachelib.all_versions() == (None, None, False)
+
+    def test_disabled(self, no_rc):
+        assert pbcachelib.all_versions() == (None, None, False)
+
+    def test_lastact_writes_bump_version_after_write(self, mock_rc):
+        pbcachelib.lastact_set(1, {"type": "create"})
+        pbcachelib.lastact_delete(1)
+        pbcachelib.lastact_set_many({2: {"type": "revise"}})
+        names = [c[0] for c in mock_rc.method_calls]
+        assert names == ["hset", "incr", "publish", "hdel", "incr", "eval", "incr"]
+        mock_rc.incr.assert_called_with(pbcachelib.LASTACT_VERSION_KEY)
+
+
+# ── pre-compressed /all bodies ────────────────────────────────────────────
+
+
+@pytest.fixture
+def mock_rcb():
+    """Patch the binary-safe client used for compressed /all bodies."""
+    client = MagicMock()
+    with patch.object(pbcachelib, "rcb", client):
+        yield client
+
+
+class TestAllBodies:
+    BODY = json.dumps({"rounds": [{"id": 1, "puzzles": []}]}).encode("utf-8")
+
+    def test_encode_body_roundtrips_gzip(self):
+        encoded = pbcachelib.encode_body(self.BODY)
+        assert set(encoded) == set(pbcachelib.BODY_ENCODINGS)
+        assert gzip.decompress(encoded["gzip"]) == self.BODY
+
+    def test_encode_body_is_deterministic(self):
+        # mtime=0: identical content yields identical bytes across workers.
+        assert pbcachelib.encode_body(self.BODY) == pbcachelib.encode_body(self.BODY)
+
+    def test_set_is_one_hset_plus_expire_keyed_by_etag(self, mock_rcb):
+        pipe = mock_rcb.pipeline.return_value
+        pbcachelib.all_body_set("abc-7", {"gzip": b"gz"}, ttl=15)
+        key = pbcachelib.BODY_KEY_PREFIX + "abc-7"
+        pipe.hset.assert_called_once_with(key, mapping={"gzip": b"gz"})
+        pipe.expire.assert_called_once_with(key, 15)
+        pipe.execute.assert_called_once()
+
+    def test_get_returns_stored_encoding(self, mock_rcb):
+        mock_rcb.hget.return_value = b"gz"
+        assert pbcachelib.all_body_get("abc-7", "gzip") == b"gz"
+        mock_rcb.hget.assert_called_once_with(pbcachelib.BODY_KEY_PREFIX + "abc-7", "gzip")
+
+    def test_identity_is_served_from_gzip_copy(self, mock_rcb):
+        mock_rcb.hget.return_value = gzip.compress(self.BODY)
+        assert pbcachelib.all_body_get("abc-7", "identity") == self.BODY
+        assert mock_rcb.hget.call_args[0][1] == "gzip"
+
+    def test_miss_returns_none(self, mock_rcb):
+        mock_rcb.hget.return_value = None
+        assert pbcachelib.all_body_get("abc-7", "identity") is None
+
+    def test_failsafe(self, mock_rcb):
+        mock_rcb.hget.side_effect = RuntimeError("down")
+        mock_rcb.pipeline.side_effect = RuntimeError("down")
+        assert pbcachelib.all_body_get("abc-7", "gzip") is None
+        pbcachelib.all_body_set("abc-7", {"gzip": b"gz"})  # no raise
+
+    def test_disabled(self):
+        with patch.object(pbcachelib, "rcb", None):
+            assert pbcachelib.all_body_get("abc-7", "gzip") is None
+            pbcachelib.all_body_set("abc-7", {"gzip": b"gz"})
+
+
+# ── change events (pub/sub → SSE) ─────────────────────────────────────────
+
+
+class TestChangeEvents:
+    def _published(self, mock_rc):
+        return [
+            (c.args[0], json.loads(c.args[1])) for c in mock_rc.publish.call_args_list
+        ]
+
+    def test_lastact_set_publishes_row(self, mock_rc):
+        pbcachelib.lastact_set("42", {"type": "revise"})
+        assert self._published(mock_rc) == [
+            (pbcachelib.EVENTS_CHANNEL,
+             {"event": "lastact", "puzzle_id": 42, "lastact": {"type": "revise"}})
+        ]
+
+    def test_failed_lastact_write_does_not_publish(self, mock_rc):
+        mock_rc.hset.side_effect = RuntimeError("down")
+        with patch("pbcachelib.count_botstat"):
+            pbcachelib.lastact_set(42, {"type": "revise"})
+        mock_rc.publish.assert_not_called()
+
+    def test_invalidation_publishes_all(self, mock_rc):
+        with patch("pbcachelib.increment_botstat"), patch(
+            "pbcachelib.ensure_cache_initialized"
+        ):
+            pbcachelib.invalidate_all_cache(MagicMock())
+        assert self._published(mock_rc) == [(pbcachelib.EVENTS_CHANNEL, {"event": "all"})]
+
+    def test_publish_disabled_noop(self, no_rc):
+        pbcachelib.publish_event("all")
+
+    def test_publish_swallows_errors(self, mock_rc):
+        mock_rc.publish.side_effect = RuntimeError("down")
+        pbcachelib.publish_event("all")  # must not raise
+
+    def test_format_sse(self):
+        assert pbcachelib.format_sse("all", '{"event": "all"}') == (
+            'event: all\ndata: {"event": "all"}\n\n'
+        )
+
+
+class TestEventHub:
+    @pytest.fixture
+    def hub(self):
+        # No listener thread: these tests drive broadcast/_dispatch directly.
+        hub = pbcachelib.EventHub()
+        with patch.object(pbcachelib.threading, "Thread"):
+            yield hub
+
+    def test_broadcast_reaches_every_subscriber(self, hub):
+        a, b = hub.subscribe(), hub.subscribe()
+        hub.broadcast("frame")
+        assert a.get(timeout=0) == "frame"
+        assert b.get(timeout=0) == "frame"
+
+    def test_single_listener_for_many_subscribers(self, hub):
+        hub.subscribe()
+        hub.subscribe()
+        assert pbcachelib.threading.Thread.call_count == 1
+
+    def test_unsubscribed_client_gets_nothing(self, hub):
+        sub = hub.subscribe()
+        hub.unsubscribe(sub)
+        hub.broadcast("frame")
+        assert sub.get(timeout=0) is None
+        assert hub.subscriber_count() == 0
+
+    def test_slow_client_overflows_instead_of_blocking(self, hub):
+        slow, fast = hub.subscribe(), hub.subscribe()
+        for i in range(pbcachelib.EVENT_QUEUE_SIZE + 1):
+            hub.broadcast(str(i))
+            fast.get(timeout=0)
+        assert slow.overflowed is True
+        assert fast.overflowed is False
+
+    def test_dispatch_formats_frame_once_per_message(self, hub):
+        sub = hub.subscribe()
+        hub._dispatch('{"event": "lastact", "puzzle_id": 7}')
+        assert sub.get(timeout=0) == (
+            'event: lastact\ndata: {"event": "lastact", "puzzle_id": 7}\n\n'
+        )
+
+    def test_dispatch_skips_malformed(self, hub):
+        sub = hub.subscribe()
+        hub._dispatch("not json")
+        assert sub.get(timeout=0) is None
+
+
+    def test_listener_relays_and_exits_with_last_subscriber(self, mock_rc):
+        # Real listener thread against a fake pubsub.
+        messages = [{"type": "message", "data": '{"event": "all"}'}]
+        pubsub = mock_rc.pubsub.return_value
+        pubsub.get_message.side_effect = (
+            lambda timeout: messages.pop() if messages else time.sleep(0.01)
+        )
+        hub = pbcachelib.EventHub()
+        sub = hub.subscribe()
+        assert sub.get(timeout=2) == 'event: all\ndata: {"event": "all"}\n\n'
+        listener = hub._listener
+        hub.unsubscribe(sub)
+        listener.join(timeout=2)
+        assert not listener.is_alive()
+        pubsub.subscribe.assert_called_once_with(pbcachelib.EVENTS_CHANNEL)
+        pubsub.close.assert_called_once()
+
+
+class TestConfigVersionPush:
+    def test_publish_sets_key_and_announces(self, mock_rc):
+        pbcachelib.publish_config_version(9)
+        pipe = mock_rc.pipeline.return_value
+        pipe.set.assert_called_once_with(pbcachelib.CONFIG_VERSION_KEY, 9)
+        pipe.publish.assert_called_once_with(pbcachelib.CONFIG_CHANNEL, 9)
+        pipe.execute.assert_called_once()
+
+    def test_publish_without_version_table_is_noop(self, mock_rc):
+        pbcachelib.publish_config_version(None)
+        mock_rc.pipeline.assert_not_called()
+
+    def test_publish_disabled_noop(self, no_rc):
+        pbcachelib.publish_config_version(9)
+
+    def test_watcher_seeds_then_relays_announcements(self, mock_rc):
+        mock_rc.get.return_value = "4"
+        pubsub = mock_rc.pubsub.return_value
+        pubsub.get_message.side_effect = [
+            {"type": "message", "data": "5"},
+            RuntimeError("connection lost"),
+        ]
+        with patch("pbcachelib.note_config_version") as note:
+            assert pbcachelib.ConfigWatcher()._listen() is True
+        pubsub.subscribe.assert_called_once_with(pbcachelib.CONFIG_CHANNEL)
+        assert note.call_args_list == [call("4", live=True), call("5"), call(live=False)]
+        pubsub.close.assert_called_once()
+
+    def test_watcher_without_redis_reports_down(self, no_rc):
+        with patch("pbcachelib.note_config_version") as note:
+            assert pbcachelib.ConfigWatcher()._listen() is False
+        note.assert_called_once_with(live=False)
 
 
 # ── rebuild lock ──────────────────────────────────────────────────────────
@@ -322,33 +941,161 @@ class TestRebuildLock:
         pbcachelib.release_rebuild_lock()
         mock_rc.delete.assert_called_once_with(pbcachelib.LOCK_KEY)
 
+    def test_wait_returns_blob_once_rebuilt(self, mock_rc):
+        with patch.object(pbcachelib, "REBUILD_WAIT_POLL", 0), patch(
+            "pbcachelib.all_blob_get",
+            side_effect=[(None, None, False), ('{"rounds": [], "hints": []}', "v2", True)],
+        ) as get:
+            assert pbcachelib.wait_for_all_blob(timeout=1) == (
+                '{"rounds": [], "hints": []}',
+                "v2",
+            )
+        assert get.call_count == 2
+
+    def test_wait_gives_up_after_timeout(self, mock_rc):
+        with patch.object(pbcachelib, "REBUILD_WAIT_POLL", 0.01), patch(
+            "pbcachelib.all_blob_get", return_value=(None, None, False)
+        ):
+            assert pbcachelib.wait_for_all_blob(timeout=0.05) == (None, None)
+
+    def test_wait_disabled(self, no_rc):
+        assert pbcachelib.wait_for_all_blob(timeout=1) == (None, None)
 
-# ── invalidate_all_cache: deletion + observability ───────────────────────
+
+# ── background rebuilder ──────────────────────────────────────────────────
+
+
+class TestRequestRebuild:
+    def test_queues_and_claims_when_rebuilder_running(self, mock_rc):
+        pipe = mock_rc.pipeline.return_value
+        pipe.execute.return_value = [1, True, True, 1]
+        pbcachelib.request_rebuild()
+        pipe.rpush.assert_called_once_with(pbcachelib.REBUILD_QUEUE_KEY, "1")
+        mock_rc.set.assert_called_once_with(
+            pbcachelib.LOCK_KEY,
+            pbcachelib.REBUILD_CLAIM,
+            nx=True,
+            ex=pbcachelib.REBUILD_CLAIM_TTL,
+        )
+
+    def test_no_claim_without_rebuilder(self, mock_rc):
+        # Nobody would consume the claim — readers must stay free to rebuild.
+        mock_rc.pipeline.return_value.execute.return_value = [1, True, True, 0]
+        pbcachelib.request_rebuild()
+        mock_rc.set.assert_not_called()
+
+    def test_failsafe(self, mock_rc):
+        mock_rc.pipeline.side_effect = RuntimeError("down")
+        pbcachelib.request_rebuild()  # no raise
+
+    def test_invalidation_queues_rebuild(self, mock_rc):
+        with patch("pbcachelib.increment_botstat"), patch(
+            "pbcachelib.ensure_cache_initialized"
+        ), patch("pbcachelib.request_rebuild") as req:
+            pbcachelib.invalidate_all_cache(MagicMock())
+        req.assert_called_once_with()
+
+
+class TestBlobRebuilder:
+    @pytest.fixture
+    def rebuilder(self):
+        rb = pbcachelib.BlobRebuilder()
+        rb._rebuild = MagicMock()
+        with patch.object(pbcachelib, "REBUILD_DEBOUNCE", 0), patch.object(
+            pbcachelib, "REBUILD_WAIT_POLL", 0
+        ), patch("pbcachelib.time.sleep"):
+            yield rb
+
+    def test_coalesces_burst_into_one_rebuild(self, mock_rc, rebuilder):
+        mock_rc.set.return_value = True  # lease, then rebuild lock
+        mock_rc.blpop.return_value = (pbcachelib.REBUILD_QUEUE_KEY, "1")
+        mock_rc.pipeline.return_value.execute.return_value = [4, 1]
+        rebuilder._step()
+        rebuilder._rebuild.assert_called_once_with(5)
+
+    def test_idle_poll_does_nothing(self, mock_rc, rebuilder):
+        mock_rc.set.return_value = True
+        mock_rc.blpop.return_value = None
+        rebuilder._step()
+        rebuilder._rebuild.assert_not_called()
+
+    def test_standby_does_not_consume_queue(self, mock_rc, rebuilder):
+        mock_rc.set.return_value = None
+        mock_rc.get.return_value = "otherhost:1"
+        rebuilder._step()
+        mock_rc.blpop.assert_not_called()
+        rebuilder._rebuild.assert_not_called()
+
+    def test_renews_own_lease(self, mock_rc, rebuilder):
+        mock_rc.set.return_value = None
+        mock_rc.get.return_value = rebuilder.ident
+        assert rebuilder._hold_lease() is True
+        mock_rc.expire.assert_called_once_with(
+            pbcachelib.REBUILDER_LEASE_KEY, pbcachelib.REBUILDER_LEASE_TTL
+        )
+
+    def test_takes_over_queued_claim(self, mock_rc, rebuilder):
+        mock_rc.set.side_effect = [None, True]  # NX fails, XX takeover works
+        mock_rc.get.return_value = pbcachelib.REBUILD_CLAIM
+        assert rebuilder._claim_lock() is True
+        assert mock_rc.set.call_args == call(
+            pbcachelib.LOCK_KEY, rebuilder.ident, xx=True, ex=pbcachelib.LOCK_TTL
+        )
+
+    def test_waits_out_reader_rebuild(self, mock_rc, rebuilder):
+        # A reader holds the lock ("1"): wait for it rather than rebuilding
+        # alongside it.
+        mock_rc.set.side_effect = [None, None, True]
+        mock_rc.get.return_value = "1"
+        assert rebuilder._claim_lock() is True
+        assert mock_rc.set.call_count == 3
+
+    def test_start_is_idempotent(self):
+        rb = pbcachelib.BlobRebuilder()
+        with patch("pbcachelib.threading.Thread") as thread:
+            rb.start(MagicMock())
+            rb.start(MagicMock())
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+
+
+# ── invalidate_all_cache: stale marking + observability ─────────────────
 
 
 class TestInvalidateAllCache:
-    def test_deletes_blob_and_counts(self, mock_rc):
+    def test_marks_stale_and_counts(self, mock_rc):
         conn = MagicMock()
         with patch("pbcachelib.increment_botstat") as inc, patch(
             "pbcachelib.ensure_cache_initialized"
-        ):
+        ), patch("pbcachelib.mark_all_dirty") as mark:
             pbcachelib.invalidate_all_cache(conn)
-        mock_rc.delete.assert_called_once_with(pbcachelib.CACHE_KEY)
+        # Only marked stale; the blob stays servable while the rebuild runs.
+        mark.assert_called_once_with((), (), False)
+        mock_rc.delete.assert_not_called()
         inc.assert_called_once_with("cache_invalidations_total", conn)
 
-    def test_stats_failure_does_not_block_delete(self, mock_rc):
+    def test_passes_scope_through(self, mock_rc):
+        with patch("pbcachelib.increment_botstat"), patch(
+            "pbcachelib.ensure_cache_initialized"
+        ), patch("pbcachelib.mark_all_dirty") as mark:
+            pbcachelib.invalidate_all_cache(MagicMock(), puzzles=[7], rounds=[2])
+        mark.assert_called_once_with([7], [2], False)
+
+    def test_stats_failure_does_not_block_invalidation(self, mock_rc):
         # The counter is fail-safe: a botstat error must not stop the
         # invalidation. increment_botstat already swallows internally; here we
-        # assert the delete still happens even if it were to raise.
+        # assert the stale marking still happens even if it were to raise.
         conn = MagicMock()
         with patch(
             "pbcachelib.increment_botstat", side_effect=RuntimeError("stats down")
-        ), patch("pbcachelib.ensure_cache_initialized"):
+        ), patch("pbcachelib.ensure_cache_initialized"), patch(
+            "pbcachelib.mark_all_dirty"
+        ) as mark:
             try:
                 pbcachelib.invalidate_all_cache(conn)
             except RuntimeError:
                 pytest.fail("invalidate_all_cache let a stats error escape")
-        mock_rc.delete.assert_called_once_with(pbcachelib.CACHE_KEY)
+        mark.assert_called_once()
 
 
 # ── observability: transition logging + new counters ──────────────────────
@@ -384,14 +1131,14 @@ class TestObservability:
     def test_write_through_failure_increments_counter(self, mock_rc):
         self._reset_health()
         mock_rc.hset.side_effect = RuntimeError("down")
-        with patch("pbcachelib._incr") as incr:
+        with patch("pbcachelib.count_botstat") as incr:
             pbcachelib.lastact_set(1, {"type": "create"})
         incr.assert_called_once_with("cache_write_through_failures_total")
         self._reset_health()
 
     def test_cold_start_backfill_increments_counter(self, mock_rc):
         self._reset_health()
-        with patch("pbcachelib._incr") as incr:
+        with patch("pbcachelib.count_botstat") as incr:
             pbcachelib.lastact_set_many({1: {"type": "create"}, 2: {"type": "revise"}})
         incr.assert_called_once_with("cache_cold_start_backfills_total")
         self._reset_health()
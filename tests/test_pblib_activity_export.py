@@ -0,0 +1,116 @@
+"""Unit tests for the streamed activity export (pblib.export_activity).
+
+  - Rows come off an unbuffered SSCursor in fetchmany batches, in id order,
+    one output chunk per batch; nothing is fetchall()ed.
+  - since_id and the time/type/puzzle filters become WHERE predicates.
+  - The dedicated connection is closed when the stream ends, fails, or is
+    abandoned by the client.
+"""
+
+import csv
+import datetime
+import io
+import json
+from unittest.mock import MagicMock
+
+import MySQLdb.cursors
+import pytest
+
+import pblib
+
+T0 = datetime.datetime(2026, 1, 16, 12, 0, 0)
+
+
+def _row(id, type="solve"):
+    return (id, T0 + datetime.timedelta(seconds=id), 101, 287, "puzzleboss", type, None, 3)
+
+
+def _conn(batches):
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    cursor.fetchmany.side_effect = list(batches) + [()]
+    return conn, cursor
+
+
+class TestQuery:
+    def test_unbuffered_cursor_in_id_order(self):
+        conn, cursor = _conn([])
+        list(pblib.export_activity(conn))
+
+        conn.cursor.assert_called_once_with(MySQLdb.cursors.SSCursor)
+        sql, params = cursor.execute.call_args[0]
+        assert sql.endswith("FROM activity WHERE 1=1 ORDER BY id")
+        assert params == ()
+        cursor.fetchall.assert_not_called()
+
+    def test_filters(self):
+        conn, cursor = _conn([])
+        end = T0 + datetime.timedelta(hours=1)
+        list(pblib.export_activity(
+            conn, since_id=500, start=T0, end=end, types=["create", "solve"],
+            puzzle_id=287, limit=10,
+        ))
+
+        sql, params = cursor.execute.call_args[0]
+        assert (
+            "WHERE id > %s AND time >= %s AND time < %s AND type IN (%s,%s)"
+            " AND puzzle_id = %s ORDER BY id LIMIT %s"
+        ) in sql
+        assert params == (500, T0, end, "create", "solve", 287, 10)
+
+
+class TestFormats:
+    def test_ndjson_one_chunk_per_batch(self):
+        conn, _ = _conn([[_row(1), _row(2)], [_row(3)]])
+
+        chunks = list(pblib.export_activity(conn, batch_size=2))
+
+        assert len(chunks) == 2
+        lines = "".join(chunks).splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [1, 2, 3]
+        assert json.loads(lines[0]) == {
+            "id": 1, "time": "2026-01-16T12:00:01", "solver_id": 101, "puzzle_id": 287,
+            "source": "puzzleboss", "type": "solve", "uri": None, "source_version": 3,
+        }
+
+    def test_csv_header_then_rows(self):
+        conn, _ = _conn([[_row(1)], [_row(2, type="create")]])
+
+        chunks = list(pblib.export_activity(conn, fmt="csv"))
+
+        assert len(chunks) == 3
+        rows = list(csv.reader(io.StringIO("".join(chunks))))
+        assert rows[0] == list(pblib.ACTIVITY_EXPORT_COLUMNS)
+        assert rows[1] == ["1", "2026-01-16T12:00:01", "101", "287", "puzzleboss", "solve", "", "3"]
+        assert rows[2][5] == "create"
+
+    def test_unknown_format(self):
+        conn, _ = _conn([])
+        with pytest.raises(ValueError, match="fmt must be one of"):
+            list(pblib.export_activity(conn, fmt="xml"))
+        conn.close.assert_called_once()
+
+
+class TestConnectionLifetime:
+    def test_closed_after_last_row(self):
+        conn, _ = _conn([[_row(1)]])
+        list(pblib.export_activity(conn))
+        conn.close.assert_called_once()
+
+    def test_closed_when_client_goes_away(self):
+        conn, cursor = _conn([[_row(1)], [_row(2)], [_row(3)]])
+
+        stream = pblib.export_activity(conn, batch_size=1)
+        next(stream)
+        stream.close()
+
+        conn.close.assert_called_once()
+        assert cursor.fetchmany.call_count == 1
+
+    def test_closed_when_query_fails(self):
+        conn, cursor = _conn([])
+        cursor.execute.side_effect = RuntimeError("Lost connection")
+        with pytest.raises(RuntimeError):
+            list(pblib.export_activity(conn))
+        conn.close.assert_called_once()
@@ -0,0 +1,143 @@
+"""Unit tests for keyset-paged activity listings (pblib.get_activity_page).
+
+  - Cursors are opaque, round-trip (time, id), and reject garbage with
+    ValueError (a 400 at the endpoints).
+  - Every page is ORDER BY time DESC, id DESC LIMIT limit + 1; a cursor
+    adds a bounded a.time <= T range plus an id tie-break, never OFFSET.
+  - A multi-valued type filter becomes one LIMITed branch per value.
+  - limit=None (a listing called without ?limit= or ?cursor=) returns
+    every row with no LIMIT and no next cursor.
+"""
+
+import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import pblib
+
+SELECT = "SELECT a.id, a.time FROM activity a"
+T0 = datetime.datetime(2026, 1, 16, 12, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    with patch("pblib.debug_log"):
+        yield
+
+
+def _conn(rows):
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    cursor.fetchall.return_value = rows
+    return conn, cursor
+
+
+def _rows(n, start_id=100):
+    # newest first; pairs share a second so the id tie-break matters
+    return [
+        {"id": start_id - i, "time": T0 - datetime.timedelta(seconds=i // 2)}
+        for i in range(n)
+    ]
+
+
+class TestCursor:
+    def test_round_trip(self):
+        token = pblib.encode_activity_cursor({"id": 42, "time": T0})
+        assert pblib.decode_activity_cursor(token) == (T0, 42)
+
+    def test_token_is_url_safe(self):
+        token = pblib.encode_activity_cursor({"id": 42, "time": T0})
+        assert all(c.isalnum() or c in "-_" for c in token)
+
+    @pytest.mark.parametrize("token", ["nope", "W10", "!!!", "WyJ4IiwxXQ"])
+    def test_garbage_raises_value_error(self, token):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            pblib.decode_activity_cursor(token)
+
+
+class TestGetActivityPage:
+    def test_first_page(self):
+        conn, cursor = _conn(_rows(3))
+
+        rows, next_cursor = pblib.get_activity_page(conn, SELECT, ["a.puzzle_id = %s"], [7], 5)
+
+        sql, params = cursor.execute.call_args[0]
+        assert sql == (
+            f"{SELECT} WHERE a.puzzle_id = %s ORDER BY a.time DESC, a.id DESC LIMIT %s"
+        )
+        assert params == (7, 6)
+        assert len(rows) == 3
+        assert next_cursor is None
+
+    def test_extra_row_means_another_page(self):
+        conn, cursor = _conn(_rows(6))
+
+        rows, next_cursor = pblib.get_activity_page(conn, SELECT, [], [], 5)
+
+        assert [r["id"] for r in rows] == [100, 99, 98, 97, 96]
+        assert pblib.decode_activity_cursor(next_cursor) == (rows[-1]["time"], 96)
+        assert "WHERE 1=1" in cursor.execute.call_args[0][0]
+
+    def test_cursor_is_bounded_range_with_tiebreak(self):
+        conn, cursor = _conn([])
+
+        pblib.get_activity_page(conn, SELECT, ["a.solver_id = %s"], [101], 50, after=(T0, 96))
+
+        sql, params = cursor.execute.call_args[0]
+        assert "a.solver_id = %s AND a.time <= %s AND (a.time < %s OR a.id < %s)" in sql
+        assert "OFFSET" not in sql
+        assert params == (101, T0, T0, 96, 51)
+
+    def test_several_types_page_as_one_branch_each(self):
+        conn, cursor = _conn([])
+
+        pblib.get_activity_page(
+            conn, SELECT, ["a.source = %s"], ["discord"], 50,
+            after=(T0, 96), split=("a.type", ["solve", "comment"]),
+        )
+
+        sql, params = cursor.execute.call_args[0]
+        branches = sql.split(" UNION ALL ")
+        assert len(branches) == 2
+        for branch in branches:
+            assert "a.type = %s" in branch
+            assert "ORDER BY a.time DESC, a.id DESC LIMIT %s" in branch
+        assert sql.endswith(f") {pblib.ACTIVITY_PAGE_ORDER} LIMIT %s")
+        assert params == (
+            "discord", T0, T0, 96, "solve", 51,
+            "discord", T0, T0, 96, "comment", 51,
+            51,
+        )
+
+    def test_single_type_needs_no_union(self):
+        conn, cursor = _conn([])
+
+        pblib.get_activity_page(conn, SELECT, [], [], 50, split=("a.type", ["solve"]))
+
+        sql, params = cursor.execute.call_args[0]
+        assert "UNION" not in sql
+        assert "WHERE a.type = %s" in sql
+        assert params == ("solve", 51)
+
+    def test_no_limit_returns_every_row(self):
+        conn, cursor = _conn(_rows(600))
+
+        rows, next_cursor = pblib.get_activity_page(conn, SELECT, ["a.puzzle_id = %s"], [7], None)
+
+        sql, params = cursor.execute.call_args[0]
+        assert sql == f"{SELECT} WHERE a.puzzle_id = %s ORDER BY a.time DESC, a.id DESC"
+        assert params == (7,)
+        assert len(rows) == 600
+        assert next_cursor is None
+
+    def test_no_limit_with_several_types(self):
+        conn, cursor = _conn([])
+
+        pblib.get_activity_page(conn, SELECT, [], [], None, split=("a.type", ["solve", "comment"]))
+
+        sql, params = cursor.execute.call_args[0]
+        assert "LIMIT" not in sql
+        assert sql.endswith(f") {pblib.ACTIVITY_PAGE_ORDER}")
+        assert params == ("solve", "comment")
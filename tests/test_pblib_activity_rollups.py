@@ -0,0 +1,192 @@
+"""Unit tests for the activity rollups behind GET /activity.
+
+  - Every activity insert bumps activity_counts in the same transaction;
+    only create/solve rows touch puzzle_activity_rollup, so bigjimmybot's
+    revise rows cost one extra upsert.
+  - A missing rollup table (ER_NO_SUCH_TABLE) is skipped, so it cannot
+    lose activity; any other rollup error fails the log and rolls back the
+    activity row with it.
+  - get_activity_summary reads the rollups (no activity scan) and falls
+    back to the old aggregate queries before the migration.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import pblib
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    with patch("pblib.debug_log"), patch("pblib._write_through_lastact"):
+        yield
+
+
+def _conn():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    cursor.lastrowid = 500
+    return conn, cursor
+
+
+def _writes(cursor, table):
+    return [
+        c[0] for c in cursor.execute.call_args_list
+        if f"INSERT INTO {table} " in c[0][0]
+    ]
+
+
+class TestRollUpOnInsert:
+    def test_revise_only_bumps_counts(self):
+        conn, cursor = _conn()
+        assert pblib.log_activity(287, "revise", 101, "bigjimmybot", conn, timestamp=1700000000)
+
+        counts = _writes(cursor, "activity_counts")
+        assert len(counts) == 1
+        assert "count = count + VALUES(count)" in counts[0][0]
+        assert counts[0][1] == ("revise", "bigjimmybot", 1)
+        assert _writes(cursor, "puzzle_activity_rollup") == []
+
+    def test_solve_updates_puzzle_timer(self):
+        conn, cursor = _conn()
+        pblib.log_activity(287, "solve", 101, "puzzleboss", conn)
+
+        rollup = _writes(cursor, "puzzle_activity_rollup")
+        assert len(rollup) == 1
+        sql, params = rollup[0]
+        # reads back only this statement's timed rows, by id range and count
+        assert "WHERE id >= %s AND puzzle_id = %s" in sql
+        assert params == (500, 287, 1)
+        assert "solve_time_sum = solve_time_sum + VALUES(solve_time_sum)" in sql
+
+    def test_rollups_written_before_commit(self):
+        conn, cursor = _conn()
+        order = []
+        cursor.execute.side_effect = lambda sql, params=None: order.append(sql.split()[2])
+        conn.commit.side_effect = lambda: order.append("commit")
+
+        pblib.log_activity(287, "create", 100, "puzzleboss", conn)
+
+        assert order.index("activity_counts") < order.index("commit")
+        assert order.index("puzzle_activity_rollup") < order.index("commit")
+
+    def test_batched_activities_grouped_by_type_and_source(self):
+        conn, cursor = _conn()
+        pblib._insert_activities(
+            287, [("status", 100), ("assignment", 101), ("assignment", 102)], "puzzleboss", conn
+        )
+        counts = _writes(cursor, "activity_counts")
+        assert len(counts) == 1
+        assert counts[0][1] == ("status", "puzzleboss", 1, "assignment", "puzzleboss", 2)
+
+    def test_null_source_counted_as_empty(self):
+        conn, cursor = _conn()
+        pblib._insert_activities(287, [("change", 100)], None, conn)
+        assert _writes(cursor, "activity_counts")[0][1] == ("change", "", 1)
+
+    def test_missing_rollup_tables_do_not_fail_logging(self):
+        conn, cursor = _conn()
+
+        def execute(sql, params=None):
+            if "activity_counts" in sql or "puzzle_activity_rollup" in sql:
+                raise Exception(1146, "Table doesn't exist")
+
+        cursor.execute.side_effect = execute
+        assert pblib.log_activity(287, "solve", 101, "puzzleboss", conn) is True
+        conn.commit.assert_called_once()
+
+    def test_failed_rollup_rolls_back_activity(self):
+        conn, cursor = _conn()
+
+        def execute(sql, params=None):
+            if "activity_counts" in sql:
+                raise Exception(1062, "Duplicate entry")
+
+        cursor.execute.side_effect = execute
+        assert pblib.log_activity(287, "solve", 101, "puzzleboss", conn) is False
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+    def test_failed_rollback_still_returns_false(self):
+        conn, cursor = _conn()
+        cursor.execute.side_effect = Exception(1213, "Deadlock found")
+        conn.rollback.side_effect = Exception(2006, "MySQL server has gone away")
+
+        assert pblib.log_activity(287, "solve", 101, "puzzleboss", conn) is False
+
+    def test_failed_insert_skips_rollups(self):
+        conn, cursor = _conn()
+
+        def execute(sql, params=None):
+            if sql.startswith("INSERT INTO activity "):
+                raise RuntimeError("deadlock")
+
+        cursor.execute.side_effect = execute
+        pblib._insert_activities(287, [("solve", 101)], "puzzleboss", conn)
+        assert _writes(cursor, "activity_counts") == []
+
+
+class TestGetActivitySummary:
+    def test_reads_rollups(self):
+        conn, cursor = _conn()
+        cursor.fetchall.return_value = [
+            {"type": "revise", "source": "bigjimmybot", "count": 40},
+            {"type": "solve", "source": "puzzleboss", "count": 3},
+            {"type": "", "source": "", "count": 2},
+        ]
+        cursor.fetchone.return_value = {
+            "total_solves": 3, "total_solve_time": 5400,
+            "total_open": 2, "total_open_time": 600,
+            "seconds_since_last_solve": 30,
+        }
+
+        summary = pblib.get_activity_summary(conn)
+
+        assert summary == {
+            "activity": {
+                "revise": {"bigjimmybot": 40},
+                "solve": {"puzzleboss": 3},
+                None: {None: 2},
+            },
+            "puzzle_solves_timer": {"total_solves": 3, "total_solve_time_seconds": 5400},
+            "open_puzzles_timer": {"total_open": 2, "total_open_time_seconds": 600},
+            "seconds_since_last_solve": 30,
+        }
+        statements = " ".join(c[0][0] for c in cursor.execute.call_args_list)
+        assert "FROM activity " not in statements and "FROM activity\n" not in statements
+
+    def test_empty_hunt(self):
+        conn, cursor = _conn()
+        cursor.fetchall.return_value = []
+        cursor.fetchone.return_value = {
+            "total_solves": None, "total_solve_time": None,
+            "total_open": None, "total_open_time": None,
+            "seconds_since_last_solve": None,
+        }
+        summary = pblib.get_activity_summary(conn)
+        assert summary["puzzle_solves_timer"] == {"total_solves": 0, "total_solve_time_seconds": 0}
+        assert summary["seconds_since_last_solve"] is None
+
+    def test_falls_back_to_activity_scan_before_migration(self):
+        conn, cursor = _conn()
+
+        def execute(sql, params=None):
+            if "activity_counts" in sql:
+                raise RuntimeError("Table 'activity_counts' doesn't exist")
+
+        cursor.execute.side_effect = execute
+        cursor.fetchall.return_value = [{"type": "create", "source": "puzzleboss", "count": 7}]
+        cursor.fetchone.side_effect = [
+            {"total_solves": 1, "total_solve_time": 100},
+            {"total_open": 6, "total_open_time": 900},
+            None,  # no solves yet
+        ]
+
+        summary = pblib.get_activity_summary(conn)
+
+        assert summary["activity"] == {"create": {"puzzleboss": 7}}
+        assert summary["open_puzzles_timer"]["total_open"] == 6
+        assert summary["seconds_since_last_solve"] is None
+        assert "GROUP BY type, source" in cursor.execute.call_args_list[1][0][0]
@@ -0,0 +1,107 @@
+"""Unit tests for pblib's buffered botstats counters.
+
+count_botstat keeps the /all hot path free of DB writes: increments are
+summed in process memory and flush_botstat_counts writes one delta per key.
+These cover the properties the totals depend on:
+  - increments aggregate, and a flush writes each key once as an additive
+    upsert (so several workers' deltas sum correctly);
+  - a failed flush keeps the deltas for the next one;
+  - a forked child does not re-flush its parent's buffer.
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import pblib
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    with patch("pblib.debug_log"):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def fresh_buffer():
+    """Start each test with an empty buffer owned by this process, and no
+    flush thread."""
+    with patch("pblib._start_count_flusher"):
+        pblib._pending_counts.clear()
+        pblib._pending_pid = None
+        yield
+        pblib._pending_counts.clear()
+        pblib._pending_pid = None
+
+
+def _conn():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    return conn, cursor
+
+
+class TestCountBotstat:
+    def test_increments_aggregate_without_db(self):
+        with patch.object(pblib.db_pool, "acquire") as connect:
+            pblib.count_botstat("cache_hits_total")
+            pblib.count_botstat("cache_hits_total")
+            pblib.count_botstat("cache_rebuild_requests_total", by=5)
+        connect.assert_not_called()
+        assert pblib._pending_counts == {
+            "cache_hits_total": 2,
+            "cache_rebuild_requests_total": 5,
+        }
+
+    def test_starts_flusher_once_per_process(self):
+        pblib.count_botstat("a")
+        pblib.count_botstat("b")
+        assert pblib._start_count_flusher.call_count == 1
+
+    def test_forked_child_drops_parent_buffer(self):
+        pblib.count_botstat("cache_hits_total", by=7)
+        pblib._pending_pid = os.getpid() + 1  # buffer now belongs to a "parent"
+        pblib.count_botstat("cache_hits_total")
+        assert pblib._pending_counts == {"cache_hits_total": 1}
+
+
+class TestFlushBotstatCounts:
+    def test_writes_one_additive_upsert_per_key(self):
+        pblib.count_botstat("cache_hits_total", by=3)
+        pblib.count_botstat("cache_misses_total")
+        conn, cursor = _conn()
+        assert pblib.flush_botstat_counts(conn) == 2
+        params = sorted(c.args[1] for c in cursor.execute.call_args_list)
+        assert params == [("cache_hits_total", "3", 3), ("cache_misses_total", "1", 1)]
+        assert "CAST(`val` AS UNSIGNED) +" in cursor.execute.call_args.args[0]
+        conn.commit.assert_called_once()
+        assert pblib._pending_counts == {}
+
+    def test_borrows_and_returns_pooled_connection(self):
+        pblib.count_botstat("cache_hits_total")
+        conn, _ = _conn()
+        with patch.object(pblib.db_pool, "acquire", return_value=conn), patch.object(
+            pblib.db_pool, "release"
+        ) as release:
+            pblib.flush_botstat_counts()
+        release.assert_called_once_with(conn)
+
+    def test_empty_buffer_skips_db(self):
+        with patch.object(pblib.db_pool, "acquire") as acquire:
+            assert pblib.flush_botstat_counts() == 0
+        acquire.assert_not_called()
+
+    def test_failure_keeps_deltas_for_next_flush(self):
+        pblib.count_botstat("cache_hits_total", by=2)
+        with patch.object(pblib.db_pool, "acquire", side_effect=RuntimeError("db down")):
+            assert pblib.flush_botstat_counts() == 0
+        pblib.count_botstat("cache_hits_total")
+        assert pblib._pending_counts == {"cache_hits_total": 3}
+
+    def test_other_process_buffer_is_not_flushed(self):
+        pblib.count_botstat("cache_hits_total")
+        pblib._pending_pid = os.getpid() + 1
+        conn, cursor = _conn()
+        assert pblib.flush_botstat_counts(conn) == 0
+        cursor.execute.assert_not_called()
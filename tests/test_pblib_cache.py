@@ -47,7 +47,8 @@ class TestStructuralAllowlist:
         with patch("pblib._invalidate_cache") as inval, patch("pblib.log_activity"):
             # 'answer' has no special path; a plain value works for all.
             pblib.update_puzzle_field(287, field, "x", conn, source="test")
-        inval.assert_called_once_with(conn)
+        # Scoped to the puzzle, so only its round(s) get rebuilt.
+        inval.assert_called_once_with(conn, puzzles=[287])
 
     @pytest.mark.parametrize("field", NON_STRUCTURAL)
     def test_non_structural_field_does_not_invalidate(self, field):
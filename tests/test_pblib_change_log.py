@@ -0,0 +1,118 @@
+"""Unit tests for the change_log mutation sequence behind /all/changes.
+
+  - record_change appends inside the caller's transaction (before commit).
+    A missing table (ER_NO_SUCH_TABLE) is skipped so it cannot fail a
+    mutation; any other error (deadlock, lock wait) is raised for the
+    caller to roll back.
+  - The pblib mutation paths that change /all record the right entity.
+  - prune_change_log keeps the newest rows and swallows failures.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import pblib
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    with patch("pblib.debug_log"):
+        yield
+
+
+def _conn():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    return conn, cursor
+
+
+def _change_log_inserts(cursor):
+    return [
+        c[0][1]
+        for c in cursor.execute.call_args_list
+        if "INSERT INTO change_log" in c[0][0]
+    ]
+
+
+class TestRecordChange:
+    def test_inserts_entity_and_int_id(self):
+        conn, cursor = _conn()
+        pblib.record_change("puzzle", "287", conn)
+        assert _change_log_inserts(cursor) == [("puzzle", 287)]
+
+    def test_does_not_commit(self):
+        # The caller's commit makes the sequence entry atomic with the change.
+        conn, cursor = _conn()
+        pblib.record_change("round", 3, conn)
+        conn.commit.assert_not_called()
+
+    def test_missing_table_is_swallowed(self):
+        conn, cursor = _conn()
+        cursor.execute.side_effect = Exception(1146, "Table 'change_log' doesn't exist")
+        pblib.record_change("hint", 5, conn)  # must not raise
+
+    def test_deadlock_is_raised(self):
+        conn, cursor = _conn()
+        cursor.execute.side_effect = Exception(1213, "Deadlock found when trying to get lock")
+        with pytest.raises(Exception, match="Deadlock"):
+            pblib.record_change("hint", 5, conn)
+
+
+class TestMutationsRecordChanges:
+    def test_update_puzzle_field_records_puzzle(self):
+        conn, cursor = _conn()
+        with patch("pblib._invalidate_cache"), patch("pblib.log_activity"):
+            pblib.update_puzzle_field(287, "xyzloc", "Room 1", conn, source="test")
+        assert _change_log_inserts(cursor) == [("puzzle", 287)]
+
+    def test_record_precedes_commit(self):
+        conn, cursor = _conn()
+        order = []
+        cursor.execute.side_effect = lambda sql, *a: order.append(sql.split()[0])
+        conn.commit.side_effect = lambda: order.append("COMMIT")
+        with patch("pblib._invalidate_cache"), patch("pblib.log_activity"):
+            pblib.update_puzzle_field(287, "comments", "hi", conn, source="test")
+        assert order == ["UPDATE", "INSERT", "COMMIT"]
+
+    def test_log_activity_records_lastact(self):
+        conn, cursor = _conn()
+        with patch("pbcachelib.rc", None), patch("pbcachelib.ensure_cache_initialized"):
+            pblib.log_activity(287, "revise", 101, "bigjimmybot", conn)
+        assert _change_log_inserts(cursor) == [("lastact", 287)]
+
+    def test_clear_puzzle_solvers_records_puzzle(self):
+        conn, cursor = _conn()
+        pblib.clear_puzzle_solvers(287, conn)
+        assert _change_log_inserts(cursor) == [("puzzle", 287)]
+
+    def test_round_completion_records_round(self):
+        conn, cursor = _conn()
+        cursor.fetchone.return_value = {"total": 2, "solved": 2}
+        with patch("pblib._invalidate_cache"):
+            pblib.check_round_completion(7, conn)
+        assert _change_log_inserts(cursor) == [("round", 7)]
+
+
+class TestPruneChangeLog:
+    def test_deletes_below_retention_window(self):
+        conn, cursor = _conn()
+        cursor.fetchone.return_value = {"max_seq": 25000}
+        cursor.rowcount = 5000
+        assert pblib.prune_change_log(conn, keep=20000) == 5000
+        sql, params = cursor.execute.call_args_list[-1][0]
+        assert sql.startswith("DELETE FROM change_log")
+        assert params == (5000,)
+        conn.commit.assert_called_once()
+
+    def test_noop_within_window(self):
+        conn, cursor = _conn()
+        cursor.fetchone.return_value = {"max_seq": 100}
+        assert pblib.prune_change_log(conn, keep=20000) == 0
+        assert cursor.execute.call_count == 1  # only the MAX(id) probe
+
+    def test_failure_returns_zero(self):
+        conn, cursor = _conn()
+        cursor.execute.side_effect = RuntimeError("db down")
+        assert pblib.prune_change_log(conn) == 0
@@ -0,0 +1,146 @@
+"""Unit tests for pblib's typed config snapshot.
+
+Each reload builds one immutable ConfigSnapshot with the CONFIG_TYPES keys
+parsed, so request handlers and the rate limiter read ready values. Covers:
+  - parsing: ints, bools, CSV lists and STATUS_METADATA once per snapshot,
+    other keys left as strings;
+  - rejection: a bad value keeps the key's previous value (or leaves it
+    absent so callers use their default) and never raises;
+  - subscriptions: callbacks run on subscribe and only when their keys
+    change, and a failing callback doesn't stop the others.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import pblib
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    with patch("pblib.debug_log"):
+        yield
+
+
+@pytest.fixture
+def isolated():
+    """Run against a private snapshot and subscriber list."""
+    with patch.object(pblib, "_config_snapshot", pblib.ConfigSnapshot({})), patch.object(
+        pblib, "_config_subscribers", []
+    ):
+        yield
+
+
+RAW = {
+    "BIGJIMMY_GOOGLE_API_QPM": "55",
+    "SKIP_GOOGLE_API": "True",
+    "ACTIVITY_SOURCES": "puzzleboss, bigjimmybot,,discord",
+    "STATUS_METADATA": '[{"name": "New", "emoji": "N", "order": 6}]',
+    "TEAMNAME": "Default Team Name",
+}
+
+
+class TestConfigSnapshot:
+    def test_parses_typed_keys_once(self):
+        cfg = pblib.ConfigSnapshot(RAW, version=3)
+        assert cfg.get("BIGJIMMY_GOOGLE_API_QPM") == 55
+        assert cfg.get("SKIP_GOOGLE_API") is True
+        assert cfg.get("ACTIVITY_SOURCES") == ("puzzleboss", "bigjimmybot", "discord")
+        assert cfg.get("STATUS_METADATA")["New"]["order"] == 6
+        assert cfg.get("TEAMNAME") == "Default Team Name"
+        assert cfg.raw == RAW
+        assert cfg.version == 3
+        assert not cfg.errors
+
+    def test_snapshot_is_read_only(self):
+        cfg = pblib.ConfigSnapshot(RAW)
+        with pytest.raises(TypeError):
+            cfg.raw["TEAMNAME"] = "x"
+        with pytest.raises(TypeError):
+            cfg.get("STATUS_METADATA")["New"]["order"] = 1
+
+    def test_invalid_value_keeps_previous(self):
+        previous = pblib.ConfigSnapshot(RAW)
+        cfg = pblib.ConfigSnapshot(
+            dict(RAW, BIGJIMMY_GOOGLE_API_QPM="fast", STATUS_METADATA="[{"),
+            previous=previous,
+        )
+        assert cfg.get("BIGJIMMY_GOOGLE_API_QPM") == 55
+        assert cfg.get("STATUS_METADATA") is previous.get("STATUS_METADATA")
+        assert set(cfg.errors) == {"BIGJIMMY_GOOGLE_API_QPM", "STATUS_METADATA"}
+
+    def test_invalid_value_without_previous_is_absent(self):
+        cfg = pblib.ConfigSnapshot({"SKIP_PUZZCORD": "maybe"})
+        assert "SKIP_PUZZCORD" not in cfg
+        assert cfg.get("SKIP_PUZZCORD", False) is False
+
+    def test_changed_keys(self):
+        a = pblib.ConfigSnapshot({"LOGLEVEL": "3", "TEAMNAME": "x"})
+        b = pblib.ConfigSnapshot({"LOGLEVEL": "03", "REGEMAIL": "a@b"})
+        # "3" and "03" parse to the same int, so LOGLEVEL is unchanged.
+        assert a.changed_keys(b) == {"TEAMNAME", "REGEMAIL"}
+
+
+class TestValidateConfigValue:
+    @pytest.mark.parametrize(
+        "key, val",
+        [
+            ("BIGJIMMY_THREADCOUNT", "2"),
+            ("SKIP_PUZZCORD", "false"),
+            ("STATUS_METADATA", "[]"),
+            ("TEAMNAME", "anything goes"),
+        ],
+    )
+    def test_accepts(self, key, val):
+        assert pblib.validate_config_value(key, val) is None
+
+    @pytest.mark.parametrize(
+        "key, val",
+        [
+            ("BIGJIMMY_THREADCOUNT", "two"),
+            ("SKIP_PUZZCORD", "yes"),
+            ("STATUS_METADATA", '{"name": "New"}'),
+            ("STATUS_METADATA", '[{"emoji": "N"}]'),
+        ],
+    )
+    def test_rejects(self, key, val):
+        assert key in pblib.validate_config_value(key, val)
+
+
+class TestSubscribeConfig:
+    def test_called_on_subscribe(self, isolated):
+        callback = MagicMock()
+        pblib.subscribe_config(callback)
+        callback.assert_called_once_with(pblib.get_config())
+
+    def test_called_only_when_its_keys_change(self, isolated):
+        callback = MagicMock()
+        pblib.subscribe_config(callback, keys=("BIGJIMMY_GOOGLE_API_QPM",))
+        callback.reset_mock()
+
+        pblib._install_config_snapshot(pblib.ConfigSnapshot({"TEAMNAME": "x"}))
+        callback.assert_not_called()
+
+        new = pblib.ConfigSnapshot({"TEAMNAME": "x", "BIGJIMMY_GOOGLE_API_QPM": "30"})
+        pblib._install_config_snapshot(new)
+        callback.assert_called_once_with(new)
+        assert pblib.get_config() is new
+
+    def test_failing_subscriber_does_not_block_others(self, isolated):
+        broken = MagicMock(side_effect=RuntimeError("boom"))
+        healthy = MagicMock()
+        pblib.subscribe_config(broken)
+        pblib.subscribe_config(healthy)
+        healthy.reset_mock()
+        pblib._install_config_snapshot(pblib.ConfigSnapshot({"TEAMNAME": "y"}))
+        healthy.assert_called_once()
+
+
+class TestReplaceRawConfig:
+    def test_updates_configstruct_in_place(self):
+        with patch.dict(pblib.configstruct, {"OLD": "1", "KEEP": "a"}, clear=True):
+            before = pblib.configstruct
+            pblib._replace_raw_config({"KEEP": "b", "NEW": "2"})
+            assert pblib.configstruct is before
+            assert pblib.configstruct == {"KEEP": "b", "NEW": "2"}
@@ -0,0 +1,134 @@
+"""Unit tests for pblib's push-based config reloads.
+
+maybe_refresh_config runs on every pbrest request and every bigjimmybot
+loop. These pin down when it actually reloads:
+  - push channel up: only when an announced version is newer than the
+    loaded one, with no DB access otherwise;
+  - push channel down: a config_version row poll at most every
+    CONFIG_REFRESH_INTERVAL, reloading only if the version moved;
+  - before the config_version table exists: the old timed full reload.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import pblib
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    with patch("pblib.debug_log"):
+        yield
+
+
+@pytest.fixture
+def state():
+    """Isolate the module-level version state; patch out the reload itself."""
+    with patch.object(pblib, "_config_version", 5), patch.object(
+        pblib, "_announced_config_version", None
+    ), patch.object(pblib, "_config_push_live", False), patch.object(
+        pblib, "_last_config_refresh", None
+    ), patch("pblib.refresh_config") as refresh, patch(
+        "pblib.read_config_version"
+    ) as read:
+        yield refresh, read
+
+
+class TestPushLive:
+    def test_same_version_is_a_memory_read(self, state):
+        refresh, read = state
+        pblib.note_config_version(5)
+        pblib.maybe_refresh_config()
+        refresh.assert_not_called()
+        read.assert_not_called()
+
+    def test_no_announcement_yet_skips(self, state):
+        refresh, read = state
+        pblib.note_config_version(None)
+        pblib.maybe_refresh_config()
+        refresh.assert_not_called()
+        read.assert_not_called()
+
+    def test_new_version_reloads(self, state):
+        refresh, read = state
+        pblib.note_config_version("6")  # pub/sub payloads arrive as strings
+        pblib.maybe_refresh_config()
+        refresh.assert_called_once_with()
+        read.assert_not_called()
+
+    def test_reload_past_announced_version_reloads_once(self, state):
+        # 6 is announced, but by the time the reload reads config_version
+        # another save has made it 7.
+        refresh, _ = state
+        refresh.side_effect = lambda: setattr(pblib, "_config_version", 7)
+        pblib.note_config_version(6)
+        for _ in range(3):
+            pblib.maybe_refresh_config()
+        refresh.assert_called_once_with()
+
+    def test_stale_announcement_does_not_reload(self, state):
+        refresh, _ = state
+        pblib.note_config_version(4)
+        pblib.maybe_refresh_config()
+        refresh.assert_not_called()
+
+    def test_malformed_announcement_is_ignored(self, state):
+        refresh, _ = state
+        pblib.note_config_version(5)
+        pblib.note_config_version("not-a-number")
+        assert pblib._announced_config_version == 5
+        pblib.maybe_refresh_config()
+        refresh.assert_not_called()
+
+
+class TestPolledFallback:
+    def test_unchanged_version_does_not_reload(self, state):
+        refresh, read = state
+        read.return_value = 5
+        pblib.maybe_refresh_config()
+        read.assert_called_once_with()
+        refresh.assert_not_called()
+
+    def test_changed_version_reloads(self, state):
+        refresh, read = state
+        read.return_value = 6
+        pblib.maybe_refresh_config()
+        refresh.assert_called_once_with()
+
+    def test_poll_is_rate_limited(self, state):
+        _, read = state
+        read.return_value = 5
+        pblib.maybe_refresh_config()
+        pblib.maybe_refresh_config()
+        assert read.call_count == 1
+
+    def test_push_going_down_falls_back_to_polling(self, state):
+        refresh, read = state
+        pblib.note_config_version(5)
+        pblib.note_config_version(live=False)
+        read.return_value = 7
+        pblib.maybe_refresh_config()
+        refresh.assert_called_once_with()
+
+    def test_without_version_table_reloads_on_timer(self, state):
+        refresh, read = state
+        read.return_value = None
+        with patch.object(pblib, "_config_version", None):
+            pblib.note_config_version(3)  # push up, but nothing to compare to
+            pblib.maybe_refresh_config()
+        refresh.assert_called_once_with()
+
+
+class TestBumpConfigVersion:
+    def test_bumps_and_returns_new_version(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = {"version": 8}
+        assert pblib.bump_config_version(cursor) == 8
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        assert statements[0].startswith("UPDATE config_version SET version = version + 1")
+
+    def test_missing_table_returns_none(self):
+        cursor = MagicMock()
+        cursor.execute.side_effect = RuntimeError("Table 'config_version' doesn't exist")
+        assert pblib.bump_config_version(cursor) is None
@@ -0,0 +1,105 @@
+"""Unit tests for pblib.ConnectionPool — pbrest's per-worker MySQL pool.
+
+Connections are MagicMocks; create_db_connection is patched so each test
+sees exactly which connections were opened. Covers:
+  - reuse: a released connection is handed out again (after a ping) instead
+    of opening a new one, and session setup is passed to connect only;
+  - hygiene: release rolls back, dead or failed connections are dropped,
+    the idle list is capped, size 0 disables pooling;
+  - fork safety: a child never reuses its parent's sockets;
+  - isolation: only the read pool runs READ UNCOMMITTED.
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import pblib
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    with patch("pblib.debug_log"):
+        yield
+
+
+@pytest.fixture
+def connect():
+    with patch("pblib.create_db_connection", side_effect=lambda **kw: MagicMock()) as connect:
+        yield connect
+
+
+class TestModulePools:
+    def test_primary_pool_keeps_default_isolation(self):
+        assert pblib.db_pool.init_command is None
+
+    def test_primary_reads_run_read_uncommitted(self):
+        assert pblib.read_pool.init_command == pblib.READ_UNCOMMITTED
+        assert pblib.read_pool is not pblib.db_pool
+
+
+class TestConnectionPool:
+    def test_new_connection_gets_session_setup(self, connect):
+        pool = pblib.ConnectionPool(size=2, init_command=pblib.READ_UNCOMMITTED)
+        pool.acquire()
+        connect.assert_called_once_with(init_command=pblib.READ_UNCOMMITTED, section="MYSQL")
+
+    def test_released_connection_is_reused_after_ping(self, connect):
+        pool = pblib.ConnectionPool(size=2)
+        conn = pool.acquire()
+        pool.release(conn)
+        assert pool.acquire() is conn
+        assert connect.call_count == 1
+        conn.ping.assert_called_once_with()
+
+    def test_release_rolls_back(self, connect):
+        pool = pblib.ConnectionPool(size=2)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.rollback.assert_called_once_with()
+        conn.close.assert_not_called()
+
+    def test_dead_connection_is_replaced(self, connect):
+        pool = pblib.ConnectionPool(size=2)
+        dead = pool.acquire()
+        pool.release(dead)
+        dead.ping.side_effect = RuntimeError("MySQL server has gone away")
+        fresh = pool.acquire()
+        assert fresh is not dead
+        dead.close.assert_called_once()
+        assert connect.call_count == 2
+
+    def test_discard_and_failed_rollback_close(self, connect):
+        pool = pblib.ConnectionPool(size=2)
+        broken, unrolled = pool.acquire(), pool.acquire()
+        unrolled.rollback.side_effect = RuntimeError("lost connection")
+        pool.release(broken, discard=True)
+        pool.release(unrolled)
+        broken.close.assert_called_once()
+        unrolled.close.assert_called_once()
+        assert pool._idle == []
+
+    def test_idle_connections_are_capped(self, connect):
+        pool = pblib.ConnectionPool(size=1)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        assert pool._idle == [first]
+        second.close.assert_called_once()
+
+    def test_size_zero_disables_pooling(self, connect):
+        pool = pblib.ConnectionPool(size=0)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.close.assert_called_once()
+        pool.acquire()
+        assert connect.call_count == 2
+
+    def test_forked_child_does_not_reuse_parent_connections(self, connect):
+        pool = pblib.ConnectionPool(size=2)
+        conn = pool.acquire()
+        pool.release(conn)
+        pool._pid = os.getpid() + 1  # the idle list now belongs to a "parent"
+        assert pool.acquire() is not conn
+        conn.ping.assert_not_called()
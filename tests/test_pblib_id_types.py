@@ -192,21 +192,19 @@ class TestUpdatePuzzleFieldIdType:
     def test_string_puzzle_id_solver_assignment(self, mock_log):
         """update_puzzle_field with field='solvers' delegates to assign_solver_to_puzzle."""
         conn, cursor = _make_conn()
-        # Mock the assign path: fetchall returns [] (no current puzzle), fetchone for solver_exists + current_solvers + history
-        cursor.fetchall.return_value = []
-        fetchone_count = {"n": 0}
+        # Mock the assign path: solver row lock (fetchone), current puzzle
+        # lookup (none) and the puzzle row lock (fetchall, FOR UPDATE)
+        cursor.fetchone.return_value = {"id": 101}
 
-        def mock_fetchone():
-            fetchone_count["n"] += 1
-            if fetchone_count["n"] == 1:
-                return {"id": 101}  # solver_exists check
-            elif fetchone_count["n"] == 2:
-                return {"current_solvers": json.dumps({"solvers": []}), "status": "Being worked"}
-            elif fetchone_count["n"] == 3:
-                return {"solver_history": json.dumps({"solvers": []})}
-            return None
+        def mock_fetchall():
+            sql = cursor.execute.call_args[0][0]
+            if "FOR UPDATE" in sql:
+                return [{"id": 287, "name": "puzzle287", "status": "Being worked",
+                         "current_solvers": json.dumps({"solvers": []}),
+                         "solver_history": json.dumps({"solvers": []})}]
+            return []
 
-        cursor.fetchone = mock_fetchone
+        cursor.fetchall = mock_fetchall
 
         pblib.update_puzzle_field("287", "solvers", "101", conn)
 
@@ -322,6 +320,31 @@ class TestGetLastActivityForPuzzleIdType:
         assert params == (287,)
 
 
+class TestGetSolverIdsIdType:
+    """get_solver_ids() must accept both int and string after_id."""
+
+    @patch('pblib.debug_log')
+    def test_string_after_id(self, mock_log):
+        conn, cursor = _make_conn()
+        cursor.fetchall.return_value = [{"id": 102, "name": "TestUser"}]
+
+        result = pblib.get_solver_ids(conn, "101")
+
+        params = cursor.execute.call_args_list[0][0][1]
+        assert params == (101,), f"Expected (101,), got {params}"
+        assert result == {"testuser": 102}
+
+    @patch('pblib.debug_log')
+    def test_int_after_id(self, mock_log):
+        conn, cursor = _make_conn()
+        cursor.fetchall.return_value = []
+
+        pblib.get_solver_ids(conn, 101)
+
+        params = cursor.execute.call_args_list[0][0][1]
+        assert params == (101,)
+
+
 # NOTE: Assign/unassign JSON integrity tests (int storage in current_solvers
 # and solver_history) live in test_pblib_solver_assignment.py to avoid
 # duplication.  This file focuses on int() normalization at function boundaries.
@@ -0,0 +1,130 @@
+"""Unit tests for read-replica routing (pblib.ReplicaPool,
+acquire_read_connection).
+
+  - Replica connections use the MYSQL_REPLICA section, with anything it
+    leaves out taken from MYSQL.
+  - Reads go to the replica only while it answers and is within
+    MAX_LAG_SECONDS; otherwise, or when replication is stopped, they fall
+    back to the primary's read pool.
+  - The health verdict is cached for check_interval, and a failed acquire
+    takes the replica out of use until the next check.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import pblib
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    with patch("pblib.debug_log"):
+        yield
+
+
+def _replica_conn(status):
+    conn = MagicMock()
+    conn.cursor.return_value.fetchone.return_value = status
+    return conn
+
+
+@pytest.fixture
+def primary():
+    pool = MagicMock()
+    pool.acquire.return_value = "primary-conn"
+    with patch("pblib.read_pool", pool):
+        yield pool
+
+
+def _replica(status, **kwargs):
+    pool = pblib.ReplicaPool(size=2, max_lag=5, **kwargs)
+    pool.conn = _replica_conn(status)
+    pool.acquire = MagicMock(return_value=pool.conn)
+    return pool
+
+
+class TestReplicaSettings:
+    def test_replica_section_overrides_primary(self):
+        config = {
+            "MYSQL": {
+                "HOST": "primary", "USERNAME": "pb", "PASSWORD": "pw",
+                "DATABASE": "puzzleboss", "SSL": {"CA": "/ca.pem"},
+            },
+            "MYSQL_REPLICA": {"HOST": "replica"},
+        }
+        with patch("pblib.config", config), patch("pblib.MySQLdb.connect") as connect:
+            pblib.create_db_connection(section="MYSQL_REPLICA")
+        params = connect.call_args.kwargs
+        assert params["host"] == "replica"
+        assert params["user"] == "pb" and params["db"] == "puzzleboss"
+        assert params["ssl"] == {"ca": "/ca.pem"}
+
+    def test_pool_connects_to_replica(self):
+        with patch("pblib.create_db_connection") as connect:
+            pblib.ReplicaPool(size=1, init_command="SET x").acquire()
+        connect.assert_called_once_with(init_command="SET x", section="MYSQL_REPLICA")
+
+
+class TestReplicaLag:
+    @pytest.mark.parametrize("status, lag", [
+        ({"Seconds_Behind_Source": 3}, 3),
+        ({"Seconds_Behind_Master": 2}, 2),  # MySQL < 8.0.22
+        ({"Seconds_Behind_Source": None}, None),  # replication stopped
+        (None, 0),  # managed reader endpoint, no replica status
+    ])
+    def test_reads_status(self, status, lag):
+        assert pblib.replica_lag(_replica_conn(status)) == lag
+
+
+class TestStaleness:
+    def test_primary_read_pool_is_current(self):
+        assert pblib.ConnectionPool(size=1).staleness() == 0
+
+    def test_replica_reports_measured_lag(self):
+        replica = _replica({"Seconds_Behind_Source": 2})
+        assert replica.staleness() == replica.max_lag  # not yet checked
+        assert replica.healthy()
+        assert replica.staleness() == 3  # whole seconds, rounded up
+
+
+class TestAcquireReadConnection:
+    def test_no_replica_reads_primary(self, primary):
+        with patch("pblib.replica_pool", None):
+            assert pblib.acquire_read_connection() == ("primary-conn", primary)
+
+    def test_current_replica_is_used(self, primary):
+        replica = _replica({"Seconds_Behind_Source": 1})
+        with patch("pblib.replica_pool", replica):
+            conn, pool = pblib.acquire_read_connection()
+        assert (conn, pool) == (replica.conn, replica)
+        primary.acquire.assert_not_called()
+
+    @pytest.mark.parametrize("status", [
+        {"Seconds_Behind_Source": 30},
+        {"Seconds_Behind_Source": None},
+    ])
+    def test_lagging_or_stopped_replica_falls_back(self, primary, status):
+        with patch("pblib.replica_pool", _replica(status)):
+            assert pblib.acquire_read_connection() == ("primary-conn", primary)
+
+    def test_unreachable_replica_falls_back(self, primary):
+        replica = pblib.ReplicaPool(size=1)
+        with patch("pblib.replica_pool", replica), \
+                patch("pblib.create_db_connection", side_effect=RuntimeError("refused")):
+            assert pblib.acquire_read_connection() == ("primary-conn", primary)
+
+    def test_verdict_is_cached(self, primary):
+        replica = _replica({"Seconds_Behind_Source": 0}, check_interval=60)
+        with patch("pblib.replica_pool", replica):
+            for _ in range(3):
+                pblib.acquire_read_connection()
+        status_checks = replica.conn.cursor.return_value.execute.call_count
+        assert status_checks == 1
+
+    def test_failed_acquire_marks_replica_down(self, primary):
+        replica = _replica({"Seconds_Behind_Source": 0}, check_interval=60)
+        replica.acquire.side_effect = [replica.conn, RuntimeError("gone away")]
+        with patch("pblib.replica_pool", replica):
+            assert pblib.acquire_read_connection() == ("primary-conn", primary)
+            assert replica.healthy() is False
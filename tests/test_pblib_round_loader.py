@@ -0,0 +1,84 @@
+"""Unit tests for the shared /all loader (pblib.get_all_rounds_with_puzzles).
+
+  - Rounds and puzzle_view are read as two ordered sets, never through
+    round_view's GROUP_CONCAT, so big rounds keep every puzzle.
+  - assemble_rounds nests puzzles in one merge pass, keeping empty rounds
+    and dropping puzzles whose round was not read.
+"""
+
+from unittest.mock import MagicMock
+
+import pblib
+
+
+def _round(id):
+    return {"id": id, "name": f"Round{id}", "status": "New"}
+
+
+def _puzzle(id, round_id):
+    return {"id": id, "name": f"Puzzle{id}", "round_id": round_id}
+
+
+def _conn(rounds, puzzles):
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    cursor.fetchall.side_effect = [rounds, puzzles]
+    return conn, cursor
+
+
+class TestAssembleRounds:
+    def test_nests_in_order(self):
+        rounds = pblib.assemble_rounds(
+            [_round(1), _round(2), _round(3)],
+            [_puzzle(10, 1), _puzzle(12, 1), _puzzle(11, 3)],
+        )
+        assert [[p["id"] for p in r["puzzles"]] for r in rounds] == [[10, 12], [], [11]]
+
+    def test_skips_puzzles_of_rounds_not_read(self):
+        rounds = pblib.assemble_rounds(
+            [_round(2), _round(4)],
+            [_puzzle(1, 1), _puzzle(2, 2), _puzzle(3, 3), _puzzle(4, 4), _puzzle(5, 5)],
+        )
+        assert [[p["id"] for p in r["puzzles"]] for r in rounds] == [[2], [4]]
+
+    def test_no_rounds(self):
+        assert pblib.assemble_rounds([], [_puzzle(1, 1)]) == []
+
+    def test_big_round_keeps_every_puzzle(self):
+        # ~1.5 KiB of ids: past round_view's default group_concat_max_len
+        puzzles = [_puzzle(pid, 1) for pid in range(1000, 1300)]
+        rounds = pblib.assemble_rounds([_round(1)], puzzles)
+        assert len(rounds[0]["puzzles"]) == 300
+
+
+class TestGetAllRoundsWithPuzzles:
+    def test_reads_ordered_sets(self):
+        conn, cursor = _conn([_round(1)], [_puzzle(10, 1)])
+
+        rounds = pblib.get_all_rounds_with_puzzles(conn)
+
+        statements = [c[0][0] for c in cursor.execute.call_args_list]
+        assert statements == [
+            f"SELECT {pblib.ROUND_COLUMNS} FROM round ORDER BY id",
+            "SELECT * FROM puzzle_view ORDER BY round_id, id",
+        ]
+        assert all("round_view" not in sql for sql in statements)
+        assert rounds[0]["puzzles"] == [_puzzle(10, 1)]
+
+    def test_filtered_by_round(self):
+        conn, cursor = _conn([_round(2), _round(5)], [])
+
+        pblib.get_all_rounds_with_puzzles(conn, {5, 2})
+
+        (round_sql, round_params), (puzzle_sql, puzzle_params) = [
+            c[0] for c in cursor.execute.call_args_list
+        ]
+        assert "FROM round WHERE id IN (%s, %s) ORDER BY id" in round_sql
+        assert "FROM puzzle_view WHERE round_id IN (%s, %s) ORDER BY round_id, id" in puzzle_sql
+        assert round_params == puzzle_params == (2, 5)
+
+    def test_no_round_ids_skips_queries(self):
+        conn, cursor = _conn([], [])
+        assert pblib.get_all_rounds_with_puzzles(conn, []) == []
+        cursor.execute.assert_not_called()
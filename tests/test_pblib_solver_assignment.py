@@ -8,11 +8,16 @@ INT PATH to extract solver_ids, which handles both int and string values.
 Assumes the normalize_solver_ids migration has been run so all existing
 database entries use integer solver_ids.
 
+They also pin down the transaction shape of an assignment: row locks taken
+solver-first then in puzzle-id order, one commit, rollback on failure, and
+cache side effects only after the commit.
+
 Run with: pytest tests/test_pblib_solver_assignment.py -v
 """
 
 import json
 import os
+import re
 import sys
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
@@ -66,62 +71,103 @@ else:
 # Ensure configstruct has LOGLEVEL so debug_log doesn't crash
 pblib.configstruct.setdefault("LOGLEVEL", "0")
 
-from pblib import assign_solver_to_puzzle, unassign_solver_from_puzzle
+from pblib import (
+    assign_solver_to_puzzle,
+    clear_puzzle_solvers,
+    get_current_puzzle_ids,
+    unassign_solver_from_puzzle,
+)
 
 
-def _make_mock_conn(current_solvers_json=None, solver_history_json=None, puzzle_status="Being worked"):
+def _make_mock_conn(current_solvers_json=None, solver_history_json=None,
+                    puzzle_status="Being worked", current_puzzles=None):
     """Create a mock DB connection that simulates puzzle JSON columns.
 
-    The mock cursor returns appropriate values for the SELECT queries
-    in assign/unassign functions, and tracks UPDATE calls.
+    The mock cursor routes fetchone/fetchall on the *last executed SQL*
+    rather than a call ordinal, so the tests don't depend on how many
+    queries the assign path issues.
 
     Args:
-        puzzle_status: The puzzle's current status (default "Being worked").
+        current_solvers_json / solver_history_json: JSON columns of the
+            target puzzle (287).
+        puzzle_status: The target puzzle's status (default "Being worked").
             Used by assign_solver_to_puzzle to decide whether to transition
             "New"/"Abandoned" → "Being worked".
+        current_puzzles: {puzzle_id: current_solvers_json} for puzzles the
+            solver is currently on (other than 287).
     """
     if current_solvers_json is None:
         current_solvers_json = json.dumps({"solvers": []})
     if solver_history_json is None:
         solver_history_json = json.dumps({"solvers": []})
+    current_puzzles = current_puzzles or {}
+
+    rows = {
+        287: {"id": 287, "name": "puzzle287", "status": puzzle_status,
+              "current_solvers": current_solvers_json,
+              "solver_history": solver_history_json},
+    }
+    for pid, cs in current_puzzles.items():
+        rows[pid] = {"id": pid, "name": f"puzzle{pid}", "status": "Being worked",
+                     "current_solvers": cs, "solver_history": None}
 
     conn = MagicMock()
     cursor = MagicMock()
     conn.cursor.return_value = cursor
 
-    # Dispatch fetchone on the *last executed SQL* rather than a call ordinal.
-    # The assign/unassign paths issue a variable number of queries (status
-    # transitions re-enter log_activity, and log_activity does a lastact
-    # write-through re-query when Redis is enabled), so a positional counter
-    # is too brittle. We key on distinctive fragments of each SELECT instead.
-    # cursor.execute stays the MagicMock (tests inspect its call_args_list);
-    # we just read the most recent call to route fetchone.
-    cursor.fetchall.return_value = []  # Not currently assigned to any puzzle
-
-    def _last_sql():
+    def _last():
         if not cursor.execute.call_args_list:
-            return ""
-        return str(cursor.execute.call_args_list[-1][0][0])
+            return "", ()
+        args = cursor.execute.call_args_list[-1][0]
+        return str(args[0]), (args[1] if len(args) > 1 else ())
 
     def mock_fetchone():
-        sql = _last_sql()
+        sql, _ = _last()
         if "FROM solver" in sql:
-            return {"id": 101}  # solver_exists check
-        if "current_solvers" in sql and "status" in sql:
-            return {"current_solvers": current_solvers_json, "status": puzzle_status}
-        if "solver_history" in sql:
-            return {"solver_history": solver_history_json}
+            return {"id": 101}  # solver exists (locked)
         if "FROM activity" in sql or "from activity" in sql:
             # lastact write-through re-query (only runs when Redis enabled)
             return {"id": 1, "puzzle_id": 287, "solver_id": 101,
                     "source": "puzzleboss", "type": "assignment", "time": None}
         return None
 
+    def mock_fetchall():
+        sql, params = _last()
+        if "FROM puzzle_current_solver" in sql:
+            return [{"id": pid} for pid in current_puzzles]
+        if "FROM puzzle" in sql and "FOR UPDATE" in sql:
+            return [rows[pid] for pid in params if pid in rows]
+        return []
+
     cursor.fetchone = mock_fetchone
+    cursor.fetchall = mock_fetchall
 
     return conn, cursor
 
 
+def _puzzle_updates(cursor, column):
+    """[(value, puzzle_id)] for every UPDATE puzzle statement that set column."""
+    found = []
+    for c in cursor.execute.call_args_list:
+        sql = str(c[0][0])
+        match = re.match(r"\s*UPDATE puzzle SET (.*) WHERE id = %s", sql, re.S)
+        if not match:
+            continue
+        columns = re.findall(r"(\w+) = %s", match.group(1))
+        params = c[0][1]
+        if column in columns:
+            found.append((params[columns.index(column)], params[-1]))
+    return found
+
+
+def _stored_solver_ids(cursor, column, puzzle_id=287):
+    return [
+        [s["solver_id"] for s in json.loads(value)["solvers"]]
+        for value, pid in _puzzle_updates(cursor, column)
+        if pid == puzzle_id
+    ]
+
+
 class TestAssignSolverTypeNormalization:
     """Test that solver_id is always stored as INT in JSON.
 
@@ -140,18 +186,9 @@ class TestAssignSolverTypeNormalization:
 
         assign_solver_to_puzzle("287", "101", conn)
 
-        # Find the UPDATE current_solvers call
-        update_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET current_solvers' in str(c)
-        ]
-        assert len(update_calls) >= 1, "Expected UPDATE current_solvers call"
-
-        # Extract the JSON that was written
-        stored_json = update_calls[0][0][1][0]  # First positional arg tuple, first element
-        stored = json.loads(stored_json)
-        assert stored["solvers"][0]["solver_id"] == 101
-        assert isinstance(stored["solvers"][0]["solver_id"], int)
+        stored = _stored_solver_ids(cursor, "current_solvers")
+        assert stored == [[101]], "Expected one current_solvers write"
+        assert isinstance(stored[0][0], int)
 
     @patch('pblib.debug_log')
     def test_int_solver_id_stored_as_int(self, mock_log):
@@ -160,15 +197,9 @@ class TestAssignSolverTypeNormalization:
 
         assign_solver_to_puzzle(287, 101, conn)
 
-        update_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET current_solvers' in str(c)
-        ]
-        assert len(update_calls) >= 1
-        stored_json = update_calls[0][0][1][0]
-        stored = json.loads(stored_json)
-        assert stored["solvers"][0]["solver_id"] == 101
-        assert isinstance(stored["solvers"][0]["solver_id"], int)
+        stored = _stored_solver_ids(cursor, "current_solvers")
+        assert stored == [[101]]
+        assert isinstance(stored[0][0], int)
 
     @patch('pblib.debug_log')
     def test_no_duplicate_when_already_present(self, mock_log):
@@ -178,11 +209,8 @@ class TestAssignSolverTypeNormalization:
 
         assign_solver_to_puzzle(287, 101, conn)
 
-        update_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET current_solvers' in str(c)
-        ]
-        assert len(update_calls) == 0, "Should not duplicate solver in current_solvers"
+        assert _puzzle_updates(cursor, "current_solvers") == [], \
+            "Should not duplicate solver in current_solvers"
 
 
 class TestUnassignSolverTypeNormalization:
@@ -198,18 +226,10 @@ class TestUnassignSolverTypeNormalization:
         existing = json.dumps({"solvers": [{"solver_id": 101}]})
         conn, cursor = _make_mock_conn(current_solvers_json=existing)
 
-        cursor.fetchone = lambda: {"current_solvers": existing}
-
         unassign_solver_from_puzzle("287", "101", conn)
 
-        update_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET current_solvers' in str(c)
-        ]
-        assert len(update_calls) == 1
-        stored_json = update_calls[0][0][1][0]
-        stored = json.loads(stored_json)
-        assert len(stored["solvers"]) == 0, "Solver should have been removed"
+        assert _stored_solver_ids(cursor, "current_solvers") == [[]], \
+            "Solver should have been removed"
 
     @patch('pblib.debug_log')
     def test_int_id_removes_int_entry(self, mock_log):
@@ -217,18 +237,9 @@ class TestUnassignSolverTypeNormalization:
         existing = json.dumps({"solvers": [{"solver_id": 101}]})
         conn, cursor = _make_mock_conn(current_solvers_json=existing)
 
-        cursor.fetchone = lambda: {"current_solvers": existing}
-
         unassign_solver_from_puzzle(287, 101, conn)
 
-        update_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET current_solvers' in str(c)
-        ]
-        assert len(update_calls) == 1
-        stored_json = update_calls[0][0][1][0]
-        stored = json.loads(stored_json)
-        assert len(stored["solvers"]) == 0, "Solver should have been removed"
+        assert _stored_solver_ids(cursor, "current_solvers") == [[]]
 
     @patch('pblib.debug_log')
     def test_unassign_preserves_other_solvers(self, mock_log):
@@ -240,18 +251,28 @@ class TestUnassignSolverTypeNormalization:
         ]})
         conn, cursor = _make_mock_conn(current_solvers_json=existing)
 
-        cursor.fetchone = lambda: {"current_solvers": existing}
-
         unassign_solver_from_puzzle(287, 202, conn)
 
-        update_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET current_solvers' in str(c)
-        ]
-        stored_json = update_calls[0][0][1][0]
-        stored = json.loads(stored_json)
-        remaining_ids = [s["solver_id"] for s in stored["solvers"]]
-        assert remaining_ids == [101, 303]
+        assert _stored_solver_ids(cursor, "current_solvers") == [[101, 303]]
+
+    @patch('pblib.debug_log')
+    def test_unassign_locks_row_and_commits(self, mock_log):
+        existing = json.dumps({"solvers": [{"solver_id": 101}]})
+        conn, cursor = _make_mock_conn(current_solvers_json=existing)
+
+        unassign_solver_from_puzzle(287, 101, conn)
+
+        assert "FOR UPDATE" in cursor.execute.call_args_list[0][0][0]
+        conn.commit.assert_called_once()
+
+    @patch('pblib.debug_log')
+    def test_unassign_missing_puzzle_rolls_back(self, mock_log):
+        conn, cursor = _make_mock_conn()
+
+        with pytest.raises(ValueError, match="does not exist"):
+            unassign_solver_from_puzzle(999, 101, conn)
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
 
 
 class TestAssignUnassignsFromOldPuzzle:
@@ -260,87 +281,26 @@ class TestAssignUnassignsFromOldPuzzle:
     @patch('pblib.debug_log')
     def test_unassign_from_old_puzzle(self, mock_log):
         """Assigning solver should unassign from old puzzle first."""
-        conn = MagicMock()
-        cursor = MagicMock()
-        conn.cursor.return_value = cursor
-
-        fetchone_count = {"n": 0}
-
-        # fetchall returns old puzzle (id=284) with solver on it
-        cursor.fetchall.return_value = [{"id": 284}]
-
-        def mock_fetchone():
-            fetchone_count["n"] += 1
-            n = fetchone_count["n"]
-            # Calls:
-            # 1. solver_exists() → SELECT id FROM solver
-            # 2. unassign_solver_from_puzzle: SELECT current_solvers for puzzle 284
-            # 3. assign: SELECT current_solvers, status for puzzle 287
-            # 4. assign: SELECT solver_history for puzzle 287
-            if n == 1:
-                return {"id": 101}  # solver_exists
-            elif n == 2:
-                return {"current_solvers": json.dumps({"solvers": [{"solver_id": 101}]})}
-            elif n == 3:
-                return {"current_solvers": json.dumps({"solvers": []}), "status": "Being worked"}
-            elif n == 4:
-                return {"solver_history": json.dumps({"solvers": []})}
-            return None
-
-        cursor.fetchone = mock_fetchone
+        on_284 = json.dumps({"solvers": [{"solver_id": 101}]})
+        conn, cursor = _make_mock_conn(current_puzzles={284: on_284})
 
         assign_solver_to_puzzle(287, 101, conn)
 
-        # Verify the unassign UPDATE was called for puzzle 284
-        unassign_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET current_solvers' in str(c) and '284' in str(c)
-        ]
-        assert len(unassign_calls) >= 1, "Should unassign from old puzzle 284"
-        stored_json = unassign_calls[0][0][1][0]
-        stored = json.loads(stored_json)
-        assert len(stored["solvers"]) == 0, "Old puzzle should have no solvers"
+        assert _stored_solver_ids(cursor, "current_solvers", 284) == [[]], \
+            "Old puzzle should have no solvers"
+        assert _stored_solver_ids(cursor, "current_solvers", 287) == [[101]]
 
     @patch('pblib.debug_log')
     def test_unassign_from_multiple_old_puzzles(self, mock_log):
         """Solver on multiple puzzles (stale data) should be unassigned from all."""
-        conn = MagicMock()
-        cursor = MagicMock()
-        conn.cursor.return_value = cursor
-
-        fetchone_count = {"n": 0}
-
-        # fetchall returns two old puzzles
-        cursor.fetchall.return_value = [{"id": 284}, {"id": 285}]
-
-        def mock_fetchone():
-            fetchone_count["n"] += 1
-            n = fetchone_count["n"]
-            # 1. solver_exists() → SELECT id FROM solver
-            # 2-3. unassign calls for 284 and 285 (SELECT current_solvers)
-            # 4. assign: SELECT current_solvers, status for 287
-            # 5. assign: SELECT solver_history for 287
-            if n == 1:
-                return {"id": 101}  # solver_exists
-            elif n <= 3:
-                return {"current_solvers": json.dumps({"solvers": [{"solver_id": 101}]})}
-            elif n == 4:
-                return {"current_solvers": json.dumps({"solvers": []}), "status": "Being worked"}
-            elif n == 5:
-                return {"solver_history": json.dumps({"solvers": []})}
-            return None
-
-        cursor.fetchone = mock_fetchone
+        on_it = json.dumps({"solvers": [{"solver_id": 101}]})
+        conn, cursor = _make_mock_conn(current_puzzles={284: on_it, 285: on_it})
 
         assign_solver_to_puzzle(287, 101, conn)
 
-        # Verify unassign was called for both old puzzles
-        unassign_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET current_solvers' in str(c)
-        ]
-        # Should have: unassign 284, unassign 285, assign 287 = at least 3 UPDATE calls
-        assert len(unassign_calls) >= 3, f"Expected at least 3 current_solvers UPDATEs, got {len(unassign_calls)}"
+        assert _stored_solver_ids(cursor, "current_solvers", 284) == [[]]
+        assert _stored_solver_ids(cursor, "current_solvers", 285) == [[]]
+        assert _stored_solver_ids(cursor, "current_solvers", 287) == [[101]]
 
 
 class TestAssignSolverHistoryType:
@@ -353,15 +313,9 @@ class TestAssignSolverHistoryType:
 
         assign_solver_to_puzzle("287", "101", conn)
 
-        update_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET solver_history' in str(c)
-        ]
-        assert len(update_calls) >= 1
-        stored_json = update_calls[0][0][1][0]
-        stored = json.loads(stored_json)
-        assert stored["solvers"][0]["solver_id"] == 101
-        assert isinstance(stored["solvers"][0]["solver_id"], int)
+        stored = _stored_solver_ids(cursor, "solver_history")
+        assert stored == [[101]]
+        assert isinstance(stored[0][0], int)
 
     @patch('pblib.debug_log')
     def test_history_no_duplicate_when_already_present(self, mock_log):
@@ -371,11 +325,8 @@ class TestAssignSolverHistoryType:
 
         assign_solver_to_puzzle("287", "101", conn)
 
-        update_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET solver_history' in str(c)
-        ]
-        assert len(update_calls) == 0, "Should not write to history when solver already present"
+        assert _puzzle_updates(cursor, "solver_history") == [], \
+            "Should not write to history when solver already present"
 
 
 class TestAssignStatusTransition:
@@ -394,12 +345,7 @@ class TestAssignStatusTransition:
 
         assign_solver_to_puzzle(287, 101, conn)
 
-        status_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET status' in str(c)
-        ]
-        assert len(status_calls) == 1, "Expected one status UPDATE"
-        assert status_calls[0][0][1] == ("Being worked", 287)
+        assert _puzzle_updates(cursor, "status") == [("Being worked", 287)]
 
     @patch('pblib.debug_log')
     def test_abandoned_puzzle_transitions_to_being_worked(self, mock_log):
@@ -408,12 +354,7 @@ class TestAssignStatusTransition:
 
         assign_solver_to_puzzle(287, 101, conn)
 
-        status_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET status' in str(c)
-        ]
-        assert len(status_calls) == 1, "Expected one status UPDATE"
-        assert status_calls[0][0][1] == ("Being worked", 287)
+        assert _puzzle_updates(cursor, "status") == [("Being worked", 287)]
 
     @patch('pblib.debug_log')
     def test_being_worked_puzzle_no_status_change(self, mock_log):
@@ -422,11 +363,8 @@ class TestAssignStatusTransition:
 
         assign_solver_to_puzzle(287, 101, conn)
 
-        status_calls = [
-            c for c in cursor.execute.call_args_list
-            if 'SET status' in str(c)
-        ]
-        assert len(status_calls) == 0, "Should not update status when already 'Being worked'"
+        assert _puzzle_updates(cursor, "status") == [], \
+            "Should not update status when already 'Being worked'"
 
     @patch('pblib.debug_log')
     def test_solved_puzzle_raises_error(self, mock_log):
@@ -435,3 +373,376 @@ class TestAssignStatusTransition:
 
         with pytest.raises(ValueError, match="already solved"):
             assign_solver_to_puzzle(287, 101, conn)
+
+    @patch('pblib.debug_log')
+    def test_status_and_assignment_logged_in_one_insert(self, mock_log):
+        conn, cursor = _make_mock_conn(puzzle_status="New")
+
+        assign_solver_to_puzzle(287, 101, conn)
+
+        inserts = [c[0] for c in cursor.execute.call_args_list
+                   if "INSERT INTO activity (" in c[0][0]]
+        assert len(inserts) == 1
+        assert inserts[0][1] == (287, 100, "system", "status",
+                                 287, 101, "system", "assignment")
+
+
+class TestAssignTransaction:
+    """One transaction: solver row then puzzle rows locked in id order, one
+    commit, rollback on failure, cache side effects after the commit."""
+
+    @patch('pblib.debug_log')
+    def test_locks_solver_then_puzzles_in_id_order(self, mock_log):
+        on_it = json.dumps({"solvers": [{"solver_id": 101}]})
+        conn, cursor = _make_mock_conn(current_puzzles={290: on_it, 284: on_it})
+
+        assign_solver_to_puzzle(287, 101, conn)
+
+        locks = [c[0] for c in cursor.execute.call_args_list if "FOR UPDATE" in c[0][0]]
+        assert "FROM solver" in locks[0][0]
+        assert "FROM puzzle" in locks[1][0] and "ORDER BY id" in locks[1][0]
+        assert locks[1][1] == (284, 287, 290)
+        assert len(locks) == 2
+
+    @patch('pblib.debug_log')
+    def test_single_commit(self, mock_log):
+        on_284 = json.dumps({"solvers": [{"solver_id": 101}]})
+        conn, cursor = _make_mock_conn(puzzle_status="New", current_puzzles={284: on_284})
+
+        # Cache invalidation bumps its own botstat counter after the commit.
+        with patch("pblib._invalidate_cache"):
+            assign_solver_to_puzzle(287, 101, conn)
+
+        conn.commit.assert_called_once()
+
+    @patch('pblib.debug_log')
+    def test_missing_solver_rolls_back(self, mock_log):
+        conn, cursor = _make_mock_conn()
+        cursor.fetchone = lambda: None
+
+        with pytest.raises(ValueError, match="Solver 101 does not exist"):
+            assign_solver_to_puzzle(287, 101, conn)
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+    @patch('pblib.debug_log')
+    def test_failed_update_rolls_back_everything(self, mock_log):
+        on_284 = json.dumps({"solvers": [{"solver_id": 101}]})
+        conn, cursor = _make_mock_conn(current_puzzles={284: on_284})
+        def execute(sql, params=None):
+            if sql.startswith("UPDATE puzzle SET current_solvers = %s, solver_history"):
+                raise RuntimeError("Lock wait timeout exceeded")
+
+        cursor.execute.side_effect = execute
+
+        with pytest.raises(RuntimeError):
+            assign_solver_to_puzzle(287, 101, conn)
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+    @patch('pblib.debug_log')
+    def test_side_effects_run_after_commit(self, mock_log):
+        conn, cursor = _make_mock_conn(puzzle_status="New")
+        order = []
+        conn.commit.side_effect = lambda: order.append("commit")
+
+        with patch("pblib._invalidate_cache", side_effect=lambda *a, **k: order.append("invalidate")), \
+                patch("pblib._write_through_lastact", side_effect=lambda *a: order.append("lastact")):
+            assign_solver_to_puzzle(287, 101, conn)
+
+        assert order == ["commit", "invalidate", "lastact"]
+
+    @patch('pblib.debug_log')
+    def test_no_invalidation_without_status_change(self, mock_log):
+        conn, cursor = _make_mock_conn(puzzle_status="Being worked")
+
+        with patch("pblib._invalidate_cache") as invalidate, \
+                patch("pblib._write_through_lastact") as lastact:
+            assign_solver_to_puzzle(287, 101, conn)
+
+        invalidate.assert_not_called()
+        lastact.assert_called_once_with(287, conn)
+
+    @pytest.mark.parametrize("statement", [
+        "INSERT INTO activity",
+        "INSERT INTO puzzle_current_solver",
+        "INSERT INTO solver_state",
+        "INSERT INTO change_log",
+    ])
+    @patch('pblib.debug_log')
+    def test_deadlock_rolls_back_assignment(self, mock_log, statement):
+        # InnoDB has already rolled the transaction back; committing what's
+        # left would keep the UPDATE puzzle half of the assignment only.
+        conn, cursor = _make_mock_conn(puzzle_status="New")
+
+        def execute(sql, params=None):
+            if sql.startswith(statement):
+                raise Exception(1213, "Deadlock found when trying to get lock")
+
+        cursor.execute.side_effect = execute
+
+        with patch("pblib._invalidate_cache") as invalidate, \
+                patch("pblib._write_through_lastact") as lastact:
+            with pytest.raises(Exception, match="Deadlock"):
+                assign_solver_to_puzzle(287, 101, conn)
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+        invalidate.assert_not_called()
+        lastact.assert_not_called()
+
+
+def _table_writes(cursor, table):
+    """(sql, params) of every statement that wrote to a normalized table."""
+    target = re.compile(rf"(INSERT (IGNORE )?INTO|DELETE FROM) puzzle_{table}\b")
+    return [
+        (c[0][0], c[0][1]) for c in cursor.execute.call_args_list
+        if target.match(str(c[0][0]))
+    ]
+
+
+class TestNormalizedAssignmentTables:
+    """Assignments are mirrored into puzzle_current_solver (one row per
+    solver) and puzzle_solver_history, and the solver's current puzzle is a
+    primary-key lookup instead of a JSON_TABLE scan."""
+
+    @patch('pblib.debug_log')
+    def test_assign_upserts_current_and_adds_history(self, mock_log):
+        conn, cursor = _make_mock_conn()
+
+        assign_solver_to_puzzle("287", "101", conn)
+
+        upserts = [w for w in _table_writes(cursor, "current_solver") if "INSERT" in w[0]]
+        assert len(upserts) == 1
+        assert "ON DUPLICATE KEY UPDATE" in upserts[0][0]
+        assert upserts[0][1] == (101, 287)
+        history = _table_writes(cursor, "solver_history")
+        assert history == [(history[0][0], (287, 101))]
+        assert "INSERT IGNORE" in history[0][0]
+
+    @patch('pblib.debug_log')
+    def test_unassign_deletes_current_row(self, mock_log):
+        existing = json.dumps({"solvers": [{"solver_id": 101}]})
+        conn, cursor = _make_mock_conn(current_solvers_json=existing)
+        cursor.fetchone = lambda: {"current_solvers": existing}
+
+        unassign_solver_from_puzzle(287, "101", conn)
+
+        deletes = _table_writes(cursor, "current_solver")
+        assert len(deletes) == 1
+        assert deletes[0][0].startswith("DELETE")
+        assert deletes[0][1] == (101, 287)
+
+    @patch('pblib.debug_log')
+    def test_clear_deletes_all_current_rows_for_puzzle(self, mock_log):
+        conn, cursor = _make_mock_conn()
+
+        clear_puzzle_solvers("287", conn)
+
+        assert _table_writes(cursor, "current_solver")[0][1] == (287,)
+
+    @patch('pblib.debug_log')
+    def test_current_puzzle_is_index_lookup(self, mock_log):
+        conn, cursor = _make_mock_conn()
+        cursor.fetchall = lambda: [{"id": 284}]
+
+        assert get_current_puzzle_ids("101", conn) == [284]
+        sql, params = cursor.execute.call_args[0]
+        assert "FROM puzzle_current_solver WHERE solver_id = %s" in sql
+        assert "JSON_TABLE" not in sql
+        assert params == (101,)
+
+    @patch('pblib.debug_log')
+    def test_current_puzzle_falls_back_to_json_before_migration(self, mock_log):
+        conn, cursor = _make_mock_conn()
+        cursor.fetchall = lambda: [{"id": 284}]
+
+        def execute(sql, params=None):
+            if "puzzle_current_solver" in sql:
+                raise Exception("Table 'puzzle_current_solver' doesn't exist")
+
+        cursor.execute.side_effect = execute
+
+        assert get_current_puzzle_ids(101, conn) == [284]
+        assert "JSON_TABLE" in cursor.execute.call_args[0][0]
+
+    @patch('pblib.debug_log')
+    def test_missing_tables_do_not_break_assignment(self, mock_log):
+        conn, cursor = _make_mock_conn()
+        real_calls = []
+
+        def execute(sql, params=None):
+            if any(t in sql for t in ("puzzle_current_solver", "puzzle_solver_history", "solver_state")):
+                raise Exception(1146, "table doesn't exist")
+            real_calls.append(sql)
+
+        cursor.execute.side_effect = execute
+
+        assign_solver_to_puzzle(287, 101, conn)
+
+        assert any("SET current_solvers" in sql for sql in real_calls)
+        conn.commit.assert_called()
+
+
+def _state_writes(cursor):
+    """(sql, params) of every statement that wrote solver_state."""
+    return [
+        (c[0][0], c[0][1]) for c in cursor.execute.call_args_list
+        if re.match(r"(INSERT INTO|UPDATE) solver_state\b", str(c[0][0]))
+    ]
+
+
+class TestSolverState:
+    """solver_state (one row per solver: current puzzle, history ids, last
+    activity) is written in the same transaction as the change it mirrors,
+    so solver_view and /solvers/<id> are primary-key reads."""
+
+    @patch('pblib.debug_log')
+    def test_assign_sets_current_puzzle_history_and_last_activity(self, mock_log):
+        conn, cursor = _make_mock_conn()
+        cursor.lastrowid = 9001
+
+        assign_solver_to_puzzle(287, "101", conn)
+
+        writes = _state_writes(cursor)
+        current = [w for w in writes if "current_puzzle_name" in w[0]]
+        assert current[0][1] == (101, 287, "puzzle287")
+        history = [w for w in writes if "history_puzzle_ids" in w[0]]
+        assert "FROM puzzle_solver_history WHERE solver_id = %s" in history[0][0]
+        assert history[0][1] == (101, 101)
+        last = [w for w in writes if "last_activity_id" in w[0]]
+        assert len(last) == 1
+        assert last[0][1] == (9001, 287, 101)
+        # every solver_state write precedes the single commit
+        assert conn.commit.call_count == 1
+
+    @patch('pblib.debug_log')
+    def test_moving_solver_clears_old_current_puzzle(self, mock_log):
+        on_284 = json.dumps({"solvers": [{"solver_id": 101}]})
+        conn, cursor = _make_mock_conn(current_puzzles={284: on_284})
+
+        assign_solver_to_puzzle(287, 101, conn)
+
+        clears = [w for w in _state_writes(cursor) if "current_puzzle_id = NULL" in w[0]]
+        assert clears == [(clears[0][0], (101, 284))]
+        assert "AND current_puzzle_id = %s" in clears[0][0]
+
+    @patch('pblib.debug_log')
+    def test_clear_puzzle_clears_its_solvers(self, mock_log):
+        conn, cursor = _make_mock_conn()
+
+        clear_puzzle_solvers(287, conn)
+
+        assert _state_writes(cursor)[0][1] == (287,)
+
+    @patch('pblib.debug_log')
+    def test_historical_activity_only_replaces_if_newer(self, mock_log):
+        conn, cursor = _make_mock_conn()
+        cursor.lastrowid = 42
+
+        assert pblib.log_activity(287, "revise", 101, "bigjimmybot", conn, timestamp=1700000000)
+
+        insert = cursor.execute.call_args_list[0][0]
+        assert "FROM_UNIXTIME(%s)" in insert[0]
+        assert insert[1] == (287, 101, "bigjimmybot", "revise", 1700000000)
+        sql, params = _state_writes(cursor)[0]
+        assert "VALUES(last_activity_time) >= last_activity_time" in sql
+        assert params == (42, 287, 101)
+
+    @patch('pblib.debug_log')
+    def test_rename_updates_current_puzzle_name(self, mock_log):
+        conn, cursor = _make_mock_conn()
+
+        pblib.update_puzzle_field(287, "name", "NewName", conn)
+
+        assert _state_writes(cursor) == [
+            ("UPDATE solver_state SET current_puzzle_name = %s WHERE current_puzzle_id = %s",
+             ("NewName", 287))
+        ]
+
+    @patch('pblib.debug_log')
+    def test_last_activity_is_primary_key_lookup(self, mock_log):
+        conn, cursor = _make_mock_conn()
+
+        pblib.get_last_activity_for_solver("101", conn)
+
+        sql, params = cursor.execute.call_args[0]
+        assert "JOIN activity a ON a.id = s.last_activity_id" in sql
+        assert "ORDER BY" not in sql
+        assert params == (101,)
+
+    @patch('pblib.debug_log')
+    def test_last_activity_falls_back_before_migration(self, mock_log):
+        conn, cursor = _make_mock_conn()
+
+        def execute(sql, params=None):
+            if "solver_state" in sql:
+                raise Exception("Table 'solver_state' doesn't exist")
+
+        cursor.execute.side_effect = execute
+
+        pblib.get_last_activity_for_solver(101, conn)
+        assert "ORDER BY time DESC LIMIT 1" in cursor.execute.call_args[0][0]
+
+
+class TestDeletion:
+    """Deleting a puzzle or a solver removes its rows from the assignment
+    tables and solver_state in the same transaction as the delete."""
+
+    @patch('pblib.debug_log')
+    def test_delete_puzzle_removes_assignment_rows(self, mock_log):
+        conn, cursor = _make_mock_conn()
+        cursor.fetchall = lambda: [{"solver_id": 101}, {"solver_id": 102}]
+
+        pblib.delete_puzzle("287", conn)
+
+        assert [w[1] for w in _table_writes(cursor, "current_solver")] == [(287,)]
+        assert [w[1] for w in _table_writes(cursor, "solver_history")] == [(287,)]
+        writes = _state_writes(cursor)
+        assert "current_puzzle_id = NULL" in writes[0][0] and writes[0][1] == (287,)
+        assert [w[1] for w in writes if "history_puzzle_ids" in w[0]] == [(101, 101), (102, 102)]
+        sqls = [str(c[0][0]) for c in cursor.execute.call_args_list]
+        assert sqls.index("DELETE FROM puzzle WHERE id = %s") > sqls.index(writes[-1][0])
+        conn.commit.assert_called_once()
+
+    @patch('pblib.debug_log')
+    def test_delete_puzzle_rolls_back_on_deadlock(self, mock_log):
+        conn, cursor = _make_mock_conn()
+
+        def execute(sql, params=None):
+            if sql.startswith("DELETE FROM puzzle_solver_history"):
+                raise Exception(1213, "Deadlock found when trying to get lock")
+
+        cursor.execute.side_effect = execute
+
+        with pytest.raises(Exception):
+            pblib.delete_puzzle(287, conn)
+
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+        assert not any(
+            c[0][0] == "DELETE FROM puzzle WHERE id = %s" for c in cursor.execute.call_args_list
+        )
+
+    @patch('pblib.debug_log')
+    def test_delete_solver_removes_assignment_rows(self, mock_log):
+        on_284 = json.dumps({"solvers": [{"solver_id": 101}, {"solver_id": 102}]})
+        conn, cursor = _make_mock_conn(current_puzzles={284: on_284})
+
+        assert pblib.delete_solver("alice", conn) == [284]
+
+        assert _stored_solver_ids(cursor, "current_solvers", puzzle_id=284) == [[102]]
+        assert [w[1] for w in _table_writes(cursor, "current_solver")] == [(101, 284)]
+        assert [w[1] for w in _table_writes(cursor, "solver_history")] == [(101,)]
+        sqls = [str(c[0][0]) for c in cursor.execute.call_args_list]
+        assert "DELETE FROM solver_state WHERE solver_id = %s" in sqls
+        assert sqls[-1] == "DELETE FROM solver WHERE id = %s"
+        conn.commit.assert_called_once()
+
+    @patch('pblib.debug_log')
+    def test_delete_unknown_solver(self, mock_log):
+        conn, cursor = _make_mock_conn()
+        cursor.fetchone = lambda: None
+
+        assert pblib.delete_solver("nobody", conn) == []
+        assert cursor.execute.call_count == 1
+        conn.commit.assert_not_called()
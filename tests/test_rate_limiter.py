@@ -150,17 +150,17 @@ class TestRateLimiterBasics:
 class TestRateLimiterConfig:
     """Test that rate limiter respects configuration."""
 
-    def test_uses_config_qpm(self):
-        """Rate limiter reads QPM from configstruct."""
+    def test_uses_configured_qpm(self):
+        """set_qpm (driven by the config subscription) changes the spacing."""
         limiter = _GoogleApiRateLimiter()
         with patch('pbgooglelib.time') as mock_time:
             mock_time.time.return_value = 1000.0
             mock_time.sleep = MagicMock()
 
             # Set QPM to 30 (slower rate)
-            with patch('pbgooglelib.configstruct', {'BIGJIMMY_GOOGLE_API_QPM': '30'}):
-                limiter.acquire()
-                limiter.acquire()
+            limiter.set_qpm(30)
+            limiter.acquire()
+            limiter.acquire()
 
             expected_interval = 60.0 / 30  # 2.0s
             actual_wait = mock_time.sleep.call_args[0][0]
@@ -173,38 +173,44 @@ class TestRateLimiterConfig:
             mock_time.time.return_value = 1000.0
             mock_time.sleep = MagicMock()
 
-            with patch('pbgooglelib.configstruct', {}):
-                limiter.acquire()
-                limiter.acquire()
+            with patch('pbgooglelib._rate_limiter', limiter):
+                pbgooglelib._apply_qpm_config({})
+            limiter.acquire()
+            limiter.acquire()
 
             expected_interval = 60.0 / _DEFAULT_QPM
             actual_wait = mock_time.sleep.call_args[0][0]
             assert abs(actual_wait - expected_interval) < 0.01
 
+    def test_config_change_retunes_module_limiter(self):
+        """The subscription callback applies BIGJIMMY_GOOGLE_API_QPM."""
+        limiter = _GoogleApiRateLimiter()
+        with patch('pbgooglelib._rate_limiter', limiter):
+            pbgooglelib._apply_qpm_config({'BIGJIMMY_GOOGLE_API_QPM': 120})
+        assert abs(limiter._min_interval - 0.5) < 1e-9
+
     def test_qpm_of_one_gives_60s_interval(self):
         """QPM=1 means one call per minute."""
-        limiter = _GoogleApiRateLimiter()
+        limiter = _GoogleApiRateLimiter(qpm=1)
         with patch('pbgooglelib.time') as mock_time:
             mock_time.time.return_value = 1000.0
             mock_time.sleep = MagicMock()
 
-            with patch('pbgooglelib.configstruct', {'BIGJIMMY_GOOGLE_API_QPM': '1'}):
-                limiter.acquire()
-                limiter.acquire()
+            limiter.acquire()
+            limiter.acquire()
 
             actual_wait = mock_time.sleep.call_args[0][0]
             assert abs(actual_wait - 60.0) < 0.01
 
     def test_qpm_zero_treated_as_one(self):
         """QPM=0 should not cause division by zero — treated as 1."""
-        limiter = _GoogleApiRateLimiter()
+        limiter = _GoogleApiRateLimiter(qpm=0)
         with patch('pbgooglelib.time') as mock_time:
             mock_time.time.return_value = 1000.0
             mock_time.sleep = MagicMock()
 
-            with patch('pbgooglelib.configstruct', {'BIGJIMMY_GOOGLE_API_QPM': '0'}):
-                limiter.acquire()
-                limiter.acquire()
+            limiter.acquire()
+            limiter.acquire()
 
             # max(0, 1) = 1, so interval = 60s
             actual_wait = mock_time.sleep.call_args[0][0]
@@ -216,7 +222,8 @@ class TestRateLimiterThreadSafety:
 
     def test_concurrent_acquires_all_complete(self):
         """Multiple threads calling acquire() should all complete without error."""
-        limiter = _GoogleApiRateLimiter()
+        # Use a high QPM for fast test execution
+        limiter = _GoogleApiRateLimiter(qpm=6000)
         errors = []
         completed = []
         lock = threading.Lock()
@@ -230,20 +237,18 @@ class TestRateLimiterThreadSafety:
                 with lock:
                     errors.append(e)
 
-        # Use a high QPM for fast test execution
-        with patch('pbgooglelib.configstruct', {'BIGJIMMY_GOOGLE_API_QPM': '6000'}):
-            threads = [threading.Thread(target=worker, args=(i,)) for i in range(10)]
-            for t in threads:
-                t.start()
-            for t in threads:
-                t.join(timeout=5)
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
 
         assert len(errors) == 0
         assert len(completed) == 10
 
     def test_next_slot_advances_under_contention(self):
         """Under contention, _next_slot should advance past the starting point."""
-        limiter = _GoogleApiRateLimiter()
+        limiter = _GoogleApiRateLimiter(qpm=6000)
         barrier = threading.Barrier(20)
 
         def worker():
@@ -251,12 +256,11 @@ class TestRateLimiterThreadSafety:
             limiter.acquire()
 
         start_time = time.time()
-        with patch('pbgooglelib.configstruct', {'BIGJIMMY_GOOGLE_API_QPM': '6000'}):
-            threads = [threading.Thread(target=worker) for _ in range(20)]
-            for t in threads:
-                t.start()
-            for t in threads:
-                t.join(timeout=10)
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
 
         # After 20 concurrent acquires at 6000 QPM (0.01s interval),
         # _next_slot should have advanced at least 19 intervals from start
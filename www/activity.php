@@ -190,7 +190,8 @@ if (!$allowed) {
   </table>
   <p v-if="results.length > 0">
     <small>{{ results.length }} result(s) returned.</small>
-    <small v-if="hasMore" style="color: var(--text-secondary);"> More results exist — increase the row limit or narrow your filters.</small>
+    <small v-if="hasMore" style="color: var(--text-secondary);"> More results exist.</small>
+    <button v-if="hasMore" type="button" @click="loadMore" :disabled="isLoading">Load more</button>
   </p>
 </div>
 
@@ -220,6 +221,8 @@ createApp({
       puzzles: [],
       results: [],
       hasMore: false,
+      nextCursor: null,
+      searchQuery: '',
       isLoading: false,
       hasSearched: false,
       visibleColumns: {
@@ -307,7 +310,6 @@ createApp({
       this.selectedPuzzleId = match ? match.id : null;
     },
     fetchActivity() {
-      this.isLoading = true;
       this.hasSearched = true;
 
       const params = new URLSearchParams();
@@ -317,23 +319,34 @@ createApp({
       if (this.selectedSolverId) params.set('solver_id', this.selectedSolverId);
       if (this.selectedPuzzleId) params.set('puzzle_id', this.selectedPuzzleId);
       params.set('limit', this.limit);
+      // "Load more" pages through this search, even if the filters change meanwhile.
+      this.searchQuery = params.toString();
 
       this.syncFiltersToUrl();
+      this.requestPage(null);
+    },
+    loadMore() {
+      if (this.nextCursor) this.requestPage(this.nextCursor);
+    },
+    requestPage(cursor) {
+      this.isLoading = true;
+
+      const params = new URLSearchParams(this.searchQuery);
+      if (cursor) params.set('cursor', cursor);
 
       fetch('apicall.php?' + params.toString())
         .then(r => r.json())
         .then(data => {
-          if (data && data.activity) {
-            this.results = data.activity;
-            this.hasMore = !!data.has_more;
-          } else {
-            this.results = [];
-            this.hasMore = false;
-          }
+          const page = (data && data.activity) ? data.activity : [];
+          this.results = cursor ? this.results.concat(page) : page;
+          this.hasMore = !!(data && data.has_more);
+          this.nextCursor = (data && data.next_cursor) || null;
         })
         .catch(e => {
           console.error('Activity search failed:', e);
-          this.results = [];
+          if (!cursor) this.results = [];
+          this.hasMore = false;
+          this.nextCursor = null;
         })
         .finally(() => { this.isLoading = false; });
     },
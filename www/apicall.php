@@ -104,7 +104,29 @@ else if ($_SERVER['REQUEST_METHOD'] === 'DELETE') {
 else {
   switch ($apicall) {
     case "all":
-      echo json_encode(readapi('/all'));
+      // Relay the API's ETag/304 so polling browsers skip unchanged payloads,
+      // and its pre-compressed body bytes as-is (no decode/re-encode here).
+      list($status, $etag, $body, $encoding) = readapi_conditional(
+        '/all',
+        $_SERVER['HTTP_IF_NONE_MATCH'] ?? '',
+        $_SERVER['HTTP_ACCEPT_ENCODING'] ?? ''
+      );
+      header('Vary: Accept-Encoding');
+      if ($etag !== '') {
+        header('ETag: ' . $etag);
+        header('Cache-Control: no-cache');
+      }
+      if ($status == 304) {
+        http_response_code(304);
+        break;
+      }
+      if ($encoding !== '') {
+        header('Content-Encoding: ' . $encoding);
+      }
+      echo $body;
+      break;
+    case "allchanges":
+      echo json_encode(readapi('/all/changes?since=' . intval($_GET['since'] ?? 0)));
       break;
     case "huntinfo":
       echo json_encode(readapi('/huntinfo'));
@@ -178,7 +200,7 @@ else {
       break;
     case "activitysearch":
       $searchParams = [];
-      foreach (['types', 'sources', 'solver_id', 'puzzle_id', 'limit'] as $param) {
+      foreach (['types', 'sources', 'solver_id', 'puzzle_id', 'limit', 'cursor'] as $param) {
         if (isset($_GET[$param]) && $_GET[$param] !== '') {
           $searchParams[] = $param . '=' . urlencode($_GET[$param]);
         }
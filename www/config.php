@@ -413,6 +413,7 @@ $keyCategoryMap = [
   'BIGJIMMY_ABANDONED_STATUS' => 'bigjimmy',
   'BIGJIMMY_ABANDONED_TIMEOUT_MINUTES' => 'bigjimmy',
   'BIGJIMMY_AUTOASSIGN' => 'bigjimmy',
+  'BIGJIMMY_MAX_POLL_INTERVAL_SECONDS' => 'bigjimmy',
   'BIGJIMMY_PUZZLEPAUSETIME' => 'bigjimmy',
   'BIGJIMMY_QUOTAFAIL_DELAY' => 'bigjimmy',
   'BIGJIMMY_QUOTAFAIL_MAX_RETRIES' => 'bigjimmy',
@@ -467,6 +468,7 @@ $keyDescriptions = [
   'BIGJIMMY_ABANDONED_STATUS' => 'Status to set when a puzzle is abandoned',
   'BIGJIMMY_ABANDONED_TIMEOUT_MINUTES' => 'Minutes of inactivity before marking abandoned',
   'BIGJIMMY_AUTOASSIGN' => 'Auto-assign solvers to puzzles from sheets',
+  'BIGJIMMY_MAX_POLL_INTERVAL_SECONDS' => 'Longest any open puzzle goes between sheet polls (default 900); busy puzzles are polled far more often',
   'BIGJIMMY_PUZZLEPAUSETIME' => 'Seconds between sheet polls per puzzle',
   'BIGJIMMY_QUOTAFAIL_DELAY' => 'Seconds to wait after a Google quota failure',
   'BIGJIMMY_QUOTAFAIL_MAX_RETRIES' => 'Max retries after quota failures',
@@ -508,6 +510,7 @@ $booleanKeys = ['ALLOW_USERNAME_OVERRIDE', 'BIGJIMMY_AUTOASSIGN', 'SKIP_GOOGLE_A
 
 // Known numeric keys
 $numericKeys = ['LOGLEVEL', 'BIGJIMMY_ABANDONED_TIMEOUT_MINUTES', 'BIGJIMMY_PUZZLEPAUSETIME',
+                'BIGJIMMY_MAX_POLL_INTERVAL_SECONDS',
                 'BIGJIMMY_QUOTAFAIL_DELAY', 'BIGJIMMY_QUOTAFAIL_MAX_RETRIES', 'BIGJIMMY_THREADCOUNT',
                 'PUZZCORD_PORT', 'REDIS_PORT'];
 
@@ -111,7 +111,7 @@ require_once('puzzlebosslib.php');
         import Round from './round.js';
         import solvesound from './solve-sound.js';
         import Consts from './consts.js';
-        import { onFetchSuccess, onFetchFailure } from './pb-utils.js';
+        import { onFetchSuccess, onFetchFailure, subscribeHuntEvents, applyLastact, EVENTS_SAFETY_POLL_MS, POLL_MS } from './pb-utils.js';
         import tagselect from './tag-select.js';
         import Settings from './settings.js';
 
@@ -190,6 +190,21 @@ require_once('puzzlebosslib.php');
                 const staleTimer = ref(null);
                 const errorTimer = ref(null);
                 const updateState = ref("circle stale");
+
+                //
+                // With the event stream up, a quiet hunt only sends a
+                // keepalive every 15s, so "stale" has to wait longer than
+                // the 6s that suits 5s polling.
+                //
+                let staleAfterMs = 6000;
+                const EVENTS_STALE_MS = 20000;
+
+                function markAlive() {
+                    if (staleTimer.value != null) clearTimeout(staleTimer.value);
+                    staleTimer.value = setTimeout(() => {
+                        updateState.value = "circle stale";
+                    }, staleAfterMs);
+                }
                 
                 const currPuzz = ref("0");
                 const initialPuzz = ref(null);
@@ -237,7 +252,7 @@ require_once('puzzlebosslib.php');
                     let success = false;
                     let temp = {'rounds': []};
                     try {
-                        temp = await (await fetch(url, {cache: "no-store"})).json();
+                        temp = await (await fetch(url, {cache: "no-cache"})).json();
                         data.value = temp;
 
                         if (firstUpdate) {
@@ -308,9 +323,7 @@ require_once('puzzlebosslib.php');
                             updateState.value = "circle active";
                         }, 1000);
 
-                        staleTimer.value = setTimeout(() => {
-                            updateState.value = "circle stale";
-                        }, 6000);
+                        markAlive();
                         
                         if (errorTimer.value != null) {
                             clearTimeout(errorTimer.value);
@@ -452,7 +465,31 @@ require_once('puzzlebosslib.php');
                         });
                         showBody.value = showBodyUpdate;
                     }
-                    setInterval(fetchData, 5000);
+
+                    //
+                    // Changes are pushed over the /events stream: structural
+                    // changes refetch /all, lastact updates patch in place.
+                    // Polling is the fallback while the stream is down, and a
+                    // slow safety net while it is up.
+                    //
+                    let pollTimer = setInterval(fetchData, POLL_MS);
+                    const setPoll = (ms) => {
+                        clearInterval(pollTimer);
+                        pollTimer = setInterval(fetchData, ms);
+                    };
+                    subscribeHuntEvents({
+                        all: () => fetchData(),
+                        lastact: (ev) => applyLastact(data.value, ev),
+                        alive: markAlive,
+                        up: () => {
+                            staleAfterMs = EVENTS_STALE_MS;
+                            setPoll(EVENTS_SAFETY_POLL_MS);
+                        },
+                        down: () => {
+                            staleAfterMs = 6000;
+                            setPoll(POLL_MS);
+                        },
+                    });
                 });
 
                 function clearInitPuzz() {
@@ -5,6 +5,7 @@
 //   - HTML/attribute escaping (XSS protection)
 //   - API fetch wrapper with auth callbacks
 //   - Status message display helper
+//   - Hunt change event stream (SSE) subscription
 //
 // Usage:
 //   ES module:  import { onFetchSuccess, onFetchFailure, apiCall, ... } from './pb-utils.js'
@@ -100,6 +101,69 @@ function showStatus(target, type, html, autoHideMs) {
     }
 }
 
+// ─── Hunt change events (SSE) ────────────────────────────────────────
+
+// Endpoint relative to the page, proxied by Apache to the gevent gunicorn.
+const EVENTS_URL = './events';
+
+// While the stream is up, pages keep a slow poll as a safety net for missed
+// events; while it is down they poll at the classic rate.
+const EVENTS_SAFETY_POLL_MS = 60000;
+const POLL_MS = 5000;
+
+/**
+ * Subscribe to the /events stream. Handlers (all optional):
+ *   all()            - /all structure changed; refetch it
+ *   lastact(ev)      - ev = {puzzle_id, lastact}; patch in place
+ *   alive()          - any frame arrived (including keepalive pings)
+ *   up() / down()    - stream connected / lost (switch poll cadence)
+ *
+ * "hello" and "resync" are delivered as all() so state is reloaded after
+ * every (re)connect. EventSource reconnects on its own; if the browser
+ * lacks it, down() is called once and the page keeps polling.
+ */
+function subscribeHuntEvents(handlers = {}) {
+    const call = (name, arg) => { if (handlers[name]) handlers[name](arg); };
+    if (typeof EventSource === 'undefined') {
+        call('down');
+        return null;
+    }
+    const es = new EventSource(EVENTS_URL);
+    // Many clients receive each event at once; spread their refetches.
+    let refetch = null;
+    const refetchAll = () => {
+        call('alive');
+        if (refetch) return;
+        refetch = setTimeout(() => { refetch = null; call('all'); }, Math.random() * 250);
+    };
+    es.addEventListener('hello', () => { call('up'); refetchAll(); });
+    es.addEventListener('all', refetchAll);
+    es.addEventListener('resync', refetchAll);
+    es.addEventListener('ping', () => call('alive'));
+    es.addEventListener('lastact', (msg) => {
+        call('alive');
+        call('lastact', JSON.parse(msg.data));
+    });
+    es.onerror = () => call('down');
+    return es;
+}
+
+/**
+ * Apply a lastact event to an /all-shaped data object in place.
+ * Returns true if the puzzle was found.
+ */
+function applyLastact(data, ev) {
+    for (const round of data.rounds || []) {
+        for (const puzzle of round.puzzles || []) {
+            if (puzzle.id === ev.puzzle_id) {
+                puzzle.lastact = ev.lastact;
+                return true;
+            }
+        }
+    }
+    return false;
+}
+
 // ─── Expose globally for non-module scripts ──────────────────────────
 // Traditional pages load this as <script type="module" src="./pb-utils.js">
 // and then call window.onFetchSuccess(), window.pbUtils.escapeHtml(), etc.
@@ -112,6 +176,8 @@ window.pbUtils = {
     escapeAttr,
     apiCall,
     showStatus,
+    subscribeHuntEvents,
+    applyLastact,
 };
 
 // ─── ES module exports ───────────────────────────────────────────────
@@ -123,4 +189,8 @@ export {
     escapeAttr,
     apiCall,
     showStatus,
+    subscribeHuntEvents,
+    applyLastact,
+    EVENTS_SAFETY_POLL_MS,
+    POLL_MS,
 };
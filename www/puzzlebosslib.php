@@ -23,6 +23,42 @@ function readapi($apicall) {
   return json_decode($resp);
 }
 
+// Conditional GET passthrough: forwards the browser's If-None-Match to the
+// API and returns [status, etag, raw body] without decoding the body, so a
+// 304 from the API can be relayed to the browser as-is.
+function readapi_conditional($apicall, $if_none_match, $accept_encoding = '') {
+  // $accept_encoding is forwarded verbatim and the body is returned still
+  // encoded (no CURLOPT_ENCODING), so callers can relay pre-compressed bytes.
+  $url = $GLOBALS['apiroot'] . $apicall;
+  $curl = curl_init($url);
+  curl_setopt($curl, CURLOPT_URL, $url);
+  curl_setopt($curl, CURLOPT_RETURNTRANSFER, true);
+  $headers = array(
+    "Accept: application/json",
+  );
+  if ($if_none_match !== '') {
+    $headers[] = "If-None-Match: " . $if_none_match;
+  }
+  if ($accept_encoding !== '') {
+    $headers[] = "Accept-Encoding: " . $accept_encoding;
+  }
+  curl_setopt($curl, CURLOPT_HTTPHEADER, $headers);
+  $etag = '';
+  $content_encoding = '';
+  curl_setopt($curl, CURLOPT_HEADERFUNCTION, function ($curl, $line) use (&$etag, &$content_encoding) {
+    if (stripos($line, 'ETag:') === 0) {
+      $etag = trim(substr($line, 5));
+    } elseif (stripos($line, 'Content-Encoding:') === 0) {
+      $content_encoding = trim(substr($line, 17));
+    }
+    return strlen($line);
+  });
+  $resp = curl_exec($curl);
+  $status = curl_getinfo($curl, CURLINFO_HTTP_CODE);
+  curl_close($curl);
+  return array($status, $etag, $resp, $content_encoding);
+}
+
 // Load huntinfo (config + statuses + tags) once for all pages
 $huntinfo = readapi('/huntinfo');
 $config = (object) $huntinfo->config;
@@ -413,7 +413,7 @@ $solver = getauthenticatedsolver();
     <script type="module">
         import { createApp, ref, computed, onMounted, watch } from 'https://unpkg.com/vue@3/dist/vue.esm-browser.prod.js'
         import Consts from './consts.js'
-        import { onFetchSuccess, onFetchFailure } from './pb-utils.js'
+        import { onFetchSuccess, onFetchFailure, subscribeHuntEvents, applyLastact, EVENTS_SAFETY_POLL_MS, POLL_MS } from './pb-utils.js'
         import HintSubmit from './hint-submit.js'
 
         <?php
@@ -802,9 +802,19 @@ $solver = getauthenticatedsolver();
                     return solvers.split(',').map(s => s.trim()).filter(s => s)
                 }
                 
+                // Keepalives arrive every 15s on a quiet event stream, so
+                // "stale" waits longer while it is connected.
+                let staleAfterMs = 6000
+                const EVENTS_STALE_MS = 20000
+
+                function markAlive() {
+                    if (staleTimer.value) clearTimeout(staleTimer.value)
+                    staleTimer.value = setTimeout(() => updateState.value = 'circle stale', staleAfterMs)
+                }
+
                 async function fetchData() {
                     try {
-                        const response = await fetch('./apicall.php?apicall=all', { cache: 'no-store' })
+                        const response = await fetch('./apicall.php?apicall=all', { cache: 'no-cache' })
                         const newData = await response.json()
                         data.value = newData
                         hints.value = newData.hints || []
@@ -822,7 +832,7 @@ $solver = getauthenticatedsolver();
                         if (staleTimer.value) clearTimeout(staleTimer.value)
                         updateState.value = 'circle active pulse'
                         setTimeout(() => updateState.value = 'circle active', 1000)
-                        staleTimer.value = setTimeout(() => updateState.value = 'circle stale', 6000)
+                        markAlive()
                         
                         lastUpdate.value = new Date().toLocaleTimeString('en-US', {
                             timeZone: 'America/New_York',
@@ -948,7 +958,26 @@ $solver = getauthenticatedsolver();
                     loadColumnVisibility()
                     await fetchStatuses()
                     await fetchData()
-                    setInterval(fetchData, 5000)
+
+                    // Push via /events; poll only as fallback / safety net.
+                    let pollTimer = setInterval(fetchData, POLL_MS)
+                    const setPoll = (ms) => {
+                        clearInterval(pollTimer)
+                        pollTimer = setInterval(fetchData, ms)
+                    }
+                    subscribeHuntEvents({
+                        all: () => fetchData(),
+                        lastact: (ev) => applyLastact(data.value, ev),
+                        alive: markAlive,
+                        up: () => {
+                            staleAfterMs = EVENTS_STALE_MS
+                            setPoll(EVENTS_SAFETY_POLL_MS)
+                        },
+                        down: () => {
+                            staleAfterMs = 6000
+                            setPoll(POLL_MS)
+                        },
+                    })
                 })
 
                 watch(visibleColumns, () => {